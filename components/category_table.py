@@ -0,0 +1,279 @@
+from PyQt6.QtWidgets import QStyledItemDelegate, QComboBox, QStyle, QApplication
+from PyQt6.QtCore import (Qt, QAbstractTableModel, QSortFilterProxyModel, QModelIndex, QRect,
+                          QTimer, pyqtSignal)
+from PyQt6.QtGui import QFont, QBrush, QColor
+import pandas as pd
+from datetime import datetime, date
+
+# (patient key, header) for the Excel columns A-N; the last column is the editable status
+COLUMNS = [
+    ('datum', "Datum"),
+    ('tumorboard', "Tumorboard"),
+    ('name', "Name"),
+    ('geburtsdatum', "Geburtsdatum"),
+    ('patientennummer', "Patienten-Nr."),
+    ('diagnose', "Diagnose"),
+    ('icd_code', "ICD-Code"),
+    ('radiotherapie', "Radiotherapie indiziert"),
+    ('art_aufgebot', "Art des Aufgebots"),
+    ('teams_priorisierung', "Teams Priorisierung"),
+    ('studie', "Vormerken für Studie"),
+    ('bemerkung', "Bemerkung/Procedere"),
+    ('timestamp', "Timestamp"),
+    ('status', "Bearbeitet"),
+]
+TIMESTAMP_COLUMN = 12
+STATUS_COLUMN = 13
+
+STATUS_OPTIONS = ["Nein", "Ja"]
+
+
+def format_datum(value):
+    """Datum column as dd.mm.yyyy (Excel dates are read as timestamps)"""
+    if not pd.notna(value):
+        return ''
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.strftime("%d.%m.%Y")
+    return str(value)
+
+
+def parse_datum(value):
+    """
+    Returns:
+        date | None: Date of a Datum cell, None for empty or unparseable values
+    """
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return None if pd.isna(value) else value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value).strip(), '%d.%m.%Y').date()
+    except ValueError:
+        return None
+
+
+def make_patient(values, row_index):
+    """Patient dict for one Excel row (values in column order A-N)"""
+    def cell(i):
+        return str(values[i]) if len(values) > i else ''
+
+    return {
+        'row_index': row_index,
+        'datum': format_datum(values[0]) if len(values) > 0 else '',
+        'tumorboard': cell(1),
+        'name': cell(2),
+        'geburtsdatum': cell(3),
+        'patientennummer': cell(4),
+        'diagnose': cell(5),
+        'icd_code': cell(6),
+        'radiotherapie': cell(7),
+        'art_aufgebot': cell(8),
+        'teams_priorisierung': cell(9),
+        'studie': cell(10),
+        'bemerkung': cell(11),
+        'timestamp': str(values[12]) if len(values) > 12 and pd.notna(values[12]) else '',
+        'status': str(values[13]).strip().lower() if len(values) > 13 else 'nein',
+    }
+
+
+class CategoryPatientsModel(QAbstractTableModel):
+    """
+    Table model for the Kat I/II/III workbooks.
+
+    Rows are kept as the raw Excel values; the patient dict (formatted strings) of a row is
+    only built when the view first asks for it, so only visible rows are materialized.
+    Tumorboard and date for the filters are extracted once per load.
+    """
+
+    # (source row, new status) - emitted when the user picks a new status in the delegate
+    status_change_requested = pyqtSignal(int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._patients = []
+        self.tumorboard_keys = []
+        self.date_keys = []
+        self.font = QFont("Helvetica", 11)
+        self.status_brushes = {
+            'ja': QBrush(Qt.GlobalColor.darkGreen),
+            'nein': QBrush(Qt.GlobalColor.darkRed),
+        }
+
+    def set_rows(self, rows, first_row_index=2):
+        """Replace the data with raw Excel rows (tuples in column order A-N)"""
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._patients = [None] * len(self._rows)
+        self._first_row_index = first_row_index
+        self.tumorboard_keys = [str(values[1]) if len(values) > 1 else '' for values in self._rows]
+        self.date_keys = [parse_datum(values[0]) if len(values) > 0 else None for values in self._rows]
+        self.endResetModel()
+
+    def patient(self, row):
+        patient = self._patients[row]
+        if patient is None:
+            patient = make_patient(self._rows[row], row + self._first_row_index)
+            self._patients[row] = patient
+        return patient
+
+    def patients(self):
+        return [self.patient(row) for row in range(len(self._rows))]
+
+    def tumorboards(self):
+        return sorted({tumorboard for tumorboard in self.tumorboard_keys if tumorboard})
+
+    def update_patient(self, row, **changes):
+        """Change fields of a patient (after the workbook was written) and repaint the row"""
+        self.patient(row).update(changes)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section][1]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        patient = self.patient(index.row())
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if column == STATUS_COLUMN:
+                return "Ja" if patient['status'] == 'ja' else "Nein"
+            return patient[COLUMNS[column][0]]
+        if role == Qt.ItemDataRole.ToolTipRole and column != STATUS_COLUMN:
+            return patient[COLUMNS[column][0]] or None
+        if role == Qt.ItemDataRole.FontRole:
+            return self.font
+        if role == Qt.ItemDataRole.BackgroundRole and column != STATUS_COLUMN:
+            # Color coding based on status (green = completed, red = pending)
+            return self.status_brushes.get(patient['status'])
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() == STATUS_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """The status is not changed here: the page confirms, writes the workbook and calls update_patient()"""
+        if role != Qt.ItemDataRole.EditRole or index.column() != STATUS_COLUMN:
+            return False
+        new_status = str(value)
+        if new_status != self.data(index, Qt.ItemDataRole.EditRole):
+            self.status_change_requested.emit(index.row(), new_status)
+        return False
+
+
+class CategoryFilterProxyModel(QSortFilterProxyModel):
+    """Tumorboard / date filter and sorting on top of CategoryPatientsModel"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._accepted = None
+
+    def set_filters(self, tumorboard=None, min_date=None):
+        """
+        Args:
+            tumorboard (str | None): Only this tumorboard (None = all)
+            min_date (date | None): Only rows on or after this date; rows without a readable date are kept
+        """
+        model = self.sourceModel()
+        self._accepted = [
+            (tumorboard is None or tumorboard_key == tumorboard)
+            and (min_date is None or date_key is None or date_key >= min_date)
+            for tumorboard_key, date_key in zip(model.tumorboard_keys, model.date_keys)
+        ]
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._accepted is None or source_row >= len(self._accepted):
+            return True
+        return self._accepted[source_row]
+
+
+class StatusComboDelegate(QStyledItemDelegate):
+    """
+    Paints the Ja/Nein status as a colored box and opens a QComboBox only while the
+    cell is edited (instead of one live combo box widget per row).
+    """
+
+    BOX_WIDTH = 60
+    BOX_HEIGHT = 30
+    COLORS = {"Ja": QColor("#2e7d32"), "Nein": QColor("#d32f2f")}
+
+    def box_rect(self, rect):
+        return QRect(rect.center().x() - self.BOX_WIDTH // 2, rect.center().y() - self.BOX_HEIGHT // 2,
+                     self.BOX_WIDTH, self.BOX_HEIGHT)
+
+    def paint(self, painter, option, index):
+        # Background (alternating rows / selection) without the text
+        self.initStyleOption(option, index)
+        status = option.text
+        option.text = ""
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, option, painter, option.widget)
+
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.COLORS.get(status, self.COLORS["Nein"]))
+        box = self.box_rect(option.rect)
+        painter.drawRoundedRect(box, 4, 4)
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QColor("white"))
+        painter.drawText(box, Qt.AlignmentFlag.AlignCenter, status)
+        painter.restore()
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.addItems(STATUS_OPTIONS)
+        editor.setStyleSheet("""
+            QComboBox {
+                background-color: #232F3B;
+                border: none;
+                border-radius: 4px;
+                padding: 3px 3px;
+                color: white;
+                font-weight: bold;
+            }
+            QComboBox::drop-down {
+                border: none;
+            }
+            QComboBox QAbstractItemView {
+                background-color: #232F3B;
+                border: 1px solid #425061;
+                selection-background-color: #3292ea;
+                color: white;
+            }
+        """)
+        # Selecting an entry commits immediately (like the former per-row combo box)
+        editor.activated.connect(lambda _index, e=editor: self.commit_and_close(e))
+        QTimer.singleShot(0, editor.showPopup)
+        return editor
+
+    def commit_and_close(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data(Qt.ItemDataRole.EditRole))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.ItemDataRole.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(self.box_rect(option.rect))
@@ -3,14 +3,26 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
                              QListWidget, QListWidgetItem, QLabel, QFrame)
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QEvent
 from PyQt6.QtGui import QFont, QPalette, QColor, QKeyEvent
+from utils.sop_search_index import get_sop_search_index, collect_pdf_files, title_for, MAX_RESULTS
+
+# Rolle für die Trefferseite (UserRole enthält den Dateipfad)
+PAGE_ROLE = Qt.ItemDataRole.UserRole + 1
+
 
 class SopSearchWidget(QWidget):
+    """
+    Suchfeld für SOPs und Guidelines.
+    
+    Sucht im Volltextindex (utils/sop_search_index.py) und zeigt Treffer pro Seite mit
+    Textausschnitt an. Ohne Index (SQLite ohne FTS5) wird wie bisher nur im Dateinamen gesucht.
+    """
     # Signal wird ausgesendet, wenn eine PDF ausgewählt wird
-    pdf_selected = pyqtSignal(str)  # Dateipfad der ausgewählten PDF
+    pdf_selected = pyqtSignal(str, int)  # Dateipfad der ausgewählten PDF, Seite (0 = erste Seite)
     
-    def __init__(self, sop_files_list=None, parent=None):
+    def __init__(self, sop_files_list=None, parent=None, search_index=None):
         super().__init__(parent)
-        self.sop_files = sop_files_list or []
+        self.sop_files = sop_files_list
+        self.search_index = search_index if search_index is not None else get_sop_search_index()
         self.search_timer = QTimer()
         self.search_timer.setSingleShot(True)
         self.search_timer.timeout.connect(self.perform_search)
@@ -30,7 +42,7 @@ class SopSearchWidget(QWidget):
         
         # Suchfeld
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("SOP-Dateien durchsuchen...")
+        self.search_input.setPlaceholderText("SOPs & Guidelines durchsuchen...")
         self.search_input.setFixedHeight(40)  # 5px höher für bessere Textdarstellung
         self.search_input.setFixedWidth(300)
         self.search_input.textChanged.connect(self.on_text_changed)
@@ -39,7 +51,8 @@ class SopSearchWidget(QWidget):
         # Ergebnisliste (Dropdown)
         self.results_list = QListWidget()
         self.results_list.setFixedWidth(300)
-        self.results_list.setMaximumHeight(200)
+        self.results_list.setMaximumHeight(320)
+        self.results_list.setWordWrap(True)  # Titel + Textausschnitt über mehrere Zeilen
         self.results_list.hide()  # Standardmäßig versteckt
         self.results_list.itemClicked.connect(self.on_result_selected)
         
@@ -108,8 +121,13 @@ class SopSearchWidget(QWidget):
         """)
     
     def set_sop_files(self, sop_files_list):
-        """Aktualisiert die Liste der verfügbaren SOP-Dateien"""
+        """Aktualisiert die Liste der verfügbaren SOP-Dateien (nur für die Dateinamen-Suche ohne Index)"""
         self.sop_files = sop_files_list
+    
+    def update_index(self):
+        """Aktualisiert den Volltextindex im Hintergrund (nur neue/geänderte PDFs werden gelesen)"""
+        if self.search_index is not None:
+            self.search_index.update_async()
         
     def on_text_changed(self, text):
         """Wird aufgerufen, wenn sich der Text im Suchfeld ändert"""
@@ -119,7 +137,7 @@ class SopSearchWidget(QWidget):
             
         # Verzögerung für bessere Performance
         self.search_timer.stop()
-        self.search_timer.start(300)  # 300ms Verzögerung
+        self.search_timer.start(150)  # 150ms Verzögerung (die Indexsuche selbst dauert nur wenige ms)
         
     def perform_search(self):
         """Führt die eigentliche Suche durch"""
@@ -129,17 +147,30 @@ class SopSearchWidget(QWidget):
             self.hide_results()
             return
             
-        # Suche in den SOP-Dateien
+        if self.search_index is not None:
+            try:
+                matches = self.search_index.search(query)
+            except Exception as e:
+                print(f"WARNUNG: Volltextsuche fehlgeschlagen, Suche im Dateinamen: {e}")
+                matches = self.search_file_names(query)
+        else:
+            matches = self.search_file_names(query)
+        
+        self.show_results(matches)
+    
+    def search_file_names(self, query):
+        """Dateinamen-Suche (Fallback ohne Volltextindex), Treffer im selben Format wie der Index"""
+        if self.sop_files is None:
+            self.sop_files = [str(full_path) for _kind, _rel_path, full_path in collect_pdf_files()]
         matches = []
         for file_path in self.sop_files:
             filename = os.path.basename(file_path).lower()
             if query in filename:
-                matches.append(file_path)
-        
-        self.show_results(matches)
+                matches.append({'path': file_path, 'title': title_for(file_path), 'page': 0, 'snippet': ""})
+        return matches
         
     def show_results(self, matches):
-        """Zeigt die Suchergebnisse an"""
+        """Zeigt die Suchergebnisse an (Titel, Seite und Textausschnitt pro Treffer)"""
         self.results_list.clear()
         
         if not matches:
@@ -149,22 +180,25 @@ class SopSearchWidget(QWidget):
             self.results_list.addItem(item)
         else:
             # Ergebnisse hinzufügen (maximal 10)
-            for file_path in matches[:10]:
-                filename = os.path.basename(file_path)
-                # Entferne .pdf Endung für bessere Anzeige
-                display_name = filename.replace('.pdf', '')
+            for match in matches[:MAX_RESULTS]:
+                display_name = match['title']
+                if match['snippet']:
+                    # Treffer im Text: Seite und Ausschnitt anzeigen
+                    display_name = f"{display_name} – S. {match['page']}\n{match['snippet']}"
                 
                 item = QListWidgetItem(display_name)
-                item.setData(Qt.ItemDataRole.UserRole, file_path)  # Vollständiger Pfad als Daten
+                item.setToolTip(display_name)
+                item.setData(Qt.ItemDataRole.UserRole, match['path'])  # Vollständiger Pfad als Daten
+                item.setData(PAGE_ROLE, match['page'] if match['snippet'] else 0)
                 self.results_list.addItem(item)
         
         # Position der Liste unter dem Suchfeld
         search_pos = self.search_input.mapToGlobal(self.search_input.rect().bottomLeft())
         self.results_list.move(search_pos)
         
-        # Höhe anpassen basierend auf Anzahl der Ergebnisse
-        item_height = 40  # Geschätzte Höhe pro Item
-        list_height = min(len(matches) * item_height + 10, 200)
+        # Höhe anpassen basierend auf Anzahl der Ergebnisse (Treffer mit Textausschnitt sind höher)
+        content_height = sum(self.results_list.sizeHintForRow(row) for row in range(self.results_list.count()))
+        list_height = min(max(content_height, 40) + 10, 320)
         self.results_list.setFixedHeight(list_height)
         
         self.results_list.show()
@@ -187,7 +221,7 @@ class SopSearchWidget(QWidget):
         """Wird aufgerufen, wenn ein Suchergebnis angeklickt wird"""
         file_path = item.data(Qt.ItemDataRole.UserRole)
         if file_path:
-            self.pdf_selected.emit(file_path)
+            self.pdf_selected.emit(file_path, item.data(PAGE_ROLE) or 0)
             self.search_input.clear()
             self.hide_results()
             # Fokus zurück zum Suchfeld nach der Auswahl
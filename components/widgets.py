@@ -1,7 +1,8 @@
 from PyQt6.QtWidgets import QPushButton, QVBoxLayout, QLabel
-from PyQt6.QtGui import QFont, QPixmap, QPainter, QPainterPath
-from PyQt6.QtCore import Qt, QSize, QRectF # Added QSize import
+from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, QSize # Added QSize import
 import os # Needed for path joining
+from utils.asset_thumbnails import request_thumbnail, device_pixel_ratio
 
 class StaticTile(QPushButton):
     def __init__(self, text, image_path=None, parent=None):
@@ -40,41 +41,17 @@ class StaticTile(QPushButton):
         # Add image if provided
         if image_path and os.path.exists(image_path):
             image_label = QLabel()
-            pixmap = QPixmap(image_path)
-            # Scale image to fit within tile (max 280px height, maintaining aspect ratio)
-            pixmap = pixmap.scaledToHeight(200, Qt.TransformationMode.SmoothTransformation)
-            
-            # Create rounded corners using QPainter
-            rounded_pixmap = self.create_rounded_pixmap(pixmap, 10)
-            
-            image_label.setPixmap(rounded_pixmap)
+            # Reserve the image height so the tile does not change size when the image arrives
+            image_label.setMinimumHeight(200)
             image_label.setAlignment(Qt.AlignmentFlag.AlignHCenter)
             image_label.setStyleSheet("background: transparent;")
             layout.addWidget(image_label)
+            # Cached thumbnail scaled to 200px height with rounded corners (decoded in the
+            # background on the first use, see utils/asset_thumbnails.py)
+            request_thumbnail(image_path, 200, image_label.setPixmap, radius=10, dpr=device_pixel_ratio(self))
             
         # Add stretch to push content to top
         layout.addStretch()
-    
-    def create_rounded_pixmap(self, pixmap, radius):
-        """Create a pixmap with rounded corners"""
-        # Create a new pixmap with transparent background
-        rounded = QPixmap(pixmap.size())
-        rounded.fill(Qt.GlobalColor.transparent)
-        
-        # Create painter
-        painter = QPainter(rounded)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Create rounded rectangle path
-        path = QPainterPath()
-        path.addRoundedRect(QRectF(rounded.rect()), radius, radius)
-        
-        # Set the clipping path and draw the original pixmap
-        painter.setClipPath(path)
-        painter.drawPixmap(0, 0, pixmap)
-        painter.end()
-        
-        return rounded
 
 class SmallTile(QPushButton):
     def __init__(self, text, filename=None, script_exists=True, image_path=None, parent=None):
@@ -139,11 +116,10 @@ class SmallTile(QPushButton):
             if subtitle_text:
                 layout.setSpacing(6) # Reset to default spacing if both subtitle and image exist
             image_label = QLabel()
-            pixmap = QPixmap(image_path)
-            pixmap = pixmap.scaledToHeight(80, Qt.TransformationMode.SmoothTransformation)
-            image_label.setPixmap(pixmap)
+            image_label.setMinimumHeight(80)
             image_label.setAlignment(Qt.AlignmentFlag.AlignHCenter)
             layout.addWidget(image_label)
+            request_thumbnail(image_path, 80, image_label.setPixmap, dpr=device_pixel_ratio(self))
             
         # Add stretch to push content to top
         layout.addStretch()
\ No newline at end of file
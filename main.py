@@ -1,4 +1,11 @@
+import time
+_STARTUP_T0 = time.perf_counter()  # Reference point of the startup timing report
 import os
+import sys
+if __name__ == '__main__' and '--ocr-service' in sys.argv:
+    # The bundled exe restarts itself as the OCR service (scripts/ocr_service.py); no Qt needed there
+    from scripts import ocr_service
+    sys.exit(ocr_service.main())
 os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = '--disable-gpu'
 
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QStackedWidget, QWidget, QVBoxLayout,
@@ -6,56 +13,31 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QStackedWidget, QWidget,
                              QLineEdit, QDialogButtonBox, QMessageBox)
 from PyQt6.QtCore import Qt, QSize, pyqtSignal, QCoreApplication, QTimer, QUrl
 from PyQt6.QtGui import QPalette, QColor, QFont, QPixmap, QIcon, QScreen
+# QtWebEngineWidgets has to be imported before the QApplication is created, so it stays here
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebEngineCore import QWebEngineSettings, QWebEngineProfile
 
-# Page Imports (ensure these paths are correct relative to main.py)
+# Page Imports: only the start page is imported here, all other pages are imported
+# on first navigation through the page registry (see utils/page_registry.py)
 from pages.tumorgroup_pages.tumor_group_page import TumorGroupPage
-from pages.entity_pages.EntityPage import EntityPage
-from pages.entity_pages.sop_page import SOPPage
-from pages.entity_pages.contouring_page import ContouringPage
+from utils.page_registry import get_page_class, is_page, GROUP_PAGES
+from utils.startup_timing import StartupTimer
+from utils.path_management import BackofficePathManager
+from utils.asset_thumbnails import load_thumbnail
 
 # Component Imports
 from components.sop_search_widget import SopSearchWidget
 
-from pages.tumorgroup_pages.neuroonkologie_page import NeuroonkologiePage
-from pages.tumorgroup_pages.bindegewebstumore_page import BindegewebstumorePage
-from pages.tumorgroup_pages.KopfHalsTumorePage import KopfHalsTumorePage
-from pages.tumorgroup_pages.ThorakaleTumorePage import ThorakaleTumorePage
-from pages.tumorgroup_pages.GastrointestinaleTumorePage import GastrointestinaleTumorePage
-from pages.tumorgroup_pages.UrogenitaleTumorePage import UrogenitaleTumorePage
-from pages.tumorgroup_pages.GynPage import GynPage
-from pages.tumorgroup_pages.HauttumorePage import HauttumorePage
-from pages.tumorgroup_pages.LymphomePage import LymphomePage
-from pages.tumorgroup_pages.FernmetastasenPage import FernmetastasenPage
-from pages.tumorgroup_pages.GutartigeErkrankungenPage import GutartigeErkrankungenPage
-from pages.tumorgroup_pages.placeholder_group_page import PlaceholderGroupPage
-
-from pages.kisim_page import KisimPage
-from pages.utilities_page import UtilitiesPage
-from pages.cmdscripts_page import CmdScriptsPage
-from pages.pdf_reader import PdfReaderPage
-
-from pages.tumorboards_page import TumorboardsPage
-from pages.specific_tumorboard_page import SpecificTumorboardPage
-from pages.excel_viewer_page import ExcelViewerPage
-from pages.tumorboard_session_page import TumorboardSessionPage
-
 # Utils imports (removed initialize_all_collection_files as it's no longer needed)
 
 # Standard Library Imports
-import sys
 import datetime
 import base64
 import json
 import traceback
 import re
 import subprocess
-
-# Cryptography Imports
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.hazmat.primitives import serialization
+import threading
 
 # --- Global Print Prefix ---
 APP_PREFIX = "INFO: USZ-RAO-App: main.py - "
@@ -71,6 +53,9 @@ if sys.platform == 'win32':
     except Exception as e:
         print(f"WARNUNG: {APP_PREFIX}Fehler beim Setzen der AppUserModelID: {e}")
 
+startup_timer = StartupTimer(_STARTUP_T0)
+startup_timer.mark("imports")
+
 # --- Constants ---
 PUBLIC_KEY_PEM = """-----BEGIN PUBLIC KEY-----
 MIIBIjANBgkqhkiG9w0BAQEFAAOCAQ8AMIIBCgKCAQEA2IFO7yr+4s/9vlmLZXfY
@@ -96,6 +81,10 @@ def initialize_global_webengine_settings():
         traceback.print_exc()
 
 def verify_license(public_key_pem, license_key_b64, expected_data_str):
+    # Imported here: the license is only verified once per month
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
+    from cryptography.hazmat.primitives import serialization
     try:
         public_key = serialization.load_pem_public_key(public_key_pem.encode('utf-8'))
         signature = base64.b64decode(license_key_b64)
@@ -196,9 +185,8 @@ class TumorGuideApp(QMainWindow):
         self.stacked_widget.currentChanged.connect(self.update_breadcrumb)
         self.stacked_widget.currentChanged.connect(self.handle_page_change)
         
-        # SOP-Dateien sammeln und Searchbar initialisieren
-        self.sop_files = self._collect_sop_files()
-        self.sop_search_widget = SopSearchWidget(self.sop_files, self)
+        # Searchbar initialisieren (Volltextindex der SOP- und Guideline-PDFs, siehe utils/sop_search_index.py)
+        self.sop_search_widget = SopSearchWidget(parent=self)
         self.sop_search_widget.pdf_selected.connect(self.open_sop_from_search)
         self.sop_search_widget.hide()  # Standardmäßig versteckt
         
@@ -267,26 +255,6 @@ class TumorGuideApp(QMainWindow):
             self.show()
             self.showMaximized()
 
-    def _collect_sop_files(self):
-        """Sammelt alle PDF-Dateien aus dem assets/sop Verzeichnis rekursiv"""
-        sop_files = []
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        sop_dir = os.path.join(base_dir, 'assets', 'sop')
-        
-        if not os.path.exists(sop_dir):
-            print(f"WARNUNG: {APP_PREFIX}SOP-Verzeichnis nicht gefunden: {sop_dir}")
-            return sop_files
-            
-        # Rekursiv alle PDF-Dateien sammeln
-        for root, dirs, files in os.walk(sop_dir):
-            for file in files:
-                if file.lower().endswith('.pdf'):
-                    full_path = os.path.join(root, file)
-                    sop_files.append(full_path)
-                    
-        print(f"{APP_PREFIX}Gefundene SOP-PDF-Dateien: {len(sop_files)}")
-        return sop_files
-        
     def _add_searchbar_to_header(self):
         """Fügt die Searchbar zum kombinierten Header-Breadcrumb-Layout hinzu"""
         if hasattr(self, 'sop_search_widget') and hasattr(self, 'header_breadcrumb_layout'):
@@ -294,28 +262,34 @@ class TumorGuideApp(QMainWindow):
             self.header_breadcrumb_layout.addWidget(self.sop_search_widget)
             print(f"{APP_PREFIX}Searchbar zum kombinierten Header-Breadcrumb-Layout hinzugefügt")
                 
-    def open_sop_from_search(self, pdf_path):
-        """Öffnet eine SOP-PDF aus der Suche in der PdfReaderPage"""
+    def open_sop_from_search(self, pdf_path, page=0):
+        """Öffnet eine SOP-/Guideline-PDF aus der Suche in der PdfReaderPage (bei Volltext-Treffern auf der Trefferseite)"""
         if not os.path.exists(pdf_path):
             print(f"ERROR: {APP_PREFIX}PDF-Datei nicht gefunden: {pdf_path}")
             return
             
         try:
             # Extrahiere Gruppen- und Entity-Namen aus dem Pfad für die Breadcrumbs
-            rel_path = os.path.relpath(pdf_path, os.path.join(os.path.dirname(__file__), 'assets', 'sop'))
+            assets_dir = os.path.join(os.path.dirname(__file__), 'assets')
+            rel_path = os.path.relpath(pdf_path, os.path.join(assets_dir, 'sop'))
             path_parts = rel_path.split(os.sep)
             
-            group_name = path_parts[0] if len(path_parts) > 1 else "SOP"
-            entity_name = path_parts[1] if len(path_parts) > 2 else os.path.basename(pdf_path).replace('.pdf', '')
+            if path_parts[0] == os.pardir:
+                # Guideline (assets/guidelines): Breadcrumb "Guidelines > Dateiname"
+                group_name = None
+                entity_name = "Guidelines"
+            else:
+                group_name = path_parts[0] if len(path_parts) > 1 else "SOP"
+                entity_name = path_parts[1] if len(path_parts) > 2 else os.path.basename(pdf_path).replace('.pdf', '')
             
             # Erstelle PdfReaderPage
-            pdf_reader = PdfReaderPage(self, pdf_path, group_name, entity_name)
+            pdf_reader = get_page_class("PdfReaderPage")(self, pdf_path, group_name, entity_name, page=page or None)
             
             # Füge zur StackedWidget hinzu und zeige an
             pdf_index = self.stacked_widget.addWidget(pdf_reader)
             self.stacked_widget.setCurrentIndex(pdf_index)
             
-            print(f"{APP_PREFIX}SOP-PDF geöffnet: {os.path.basename(pdf_path)}")
+            print(f"{APP_PREFIX}SOP-PDF geöffnet: {os.path.basename(pdf_path)}" + (f" (Seite {page})" if page else ""))
             
         except Exception as e:
             print(f"ERROR: {APP_PREFIX}Fehler beim Öffnen der SOP-PDF: {e}")
@@ -356,7 +330,7 @@ class TumorGuideApp(QMainWindow):
         print(f"{APP_PREFIX}attempt_first_run_pdf_load_workaround: Creating PdfReaderPage for: {target_pdf_path}")
         try:
             # Pass placeholder group/entity names for dummy.pdf
-            workaround_pdf_viewer = PdfReaderPage(self, target_pdf_path, "WORKAROUND_DUMMY", "INIT_PDF")
+            workaround_pdf_viewer = get_page_class("PdfReaderPage")(self, target_pdf_path, "WORKAROUND_DUMMY", "INIT_PDF")
             
             original_main_idx = self.stacked_widget.currentIndex()
             temp_idx = self.stacked_widget.addWidget(workaround_pdf_viewer)
@@ -429,44 +403,44 @@ class TumorGuideApp(QMainWindow):
         def add_button(text,target_page_class,**kwargs):
             button=QPushButton(text);button.setCursor(Qt.CursorShape.PointingHandCursor);button.setStyleSheet(page_button_style);page_idx=self.find_page_index(target_page_class,**kwargs)
             if page_idx is not None:button.clicked.connect(lambda checked=False,idx=page_idx:self.navigate_with_session_check(idx))
-            else:button.setEnabled(False);print(f"WARNUNG: {APP_PREFIX}Could not find index for breadcrumb button: {text} ({target_page_class.__name__}) with args {kwargs}")
+            else:button.setEnabled(False);print(f"WARNUNG: {APP_PREFIX}Could not find index for breadcrumb button: {text} ({getattr(target_page_class,'__name__',target_page_class)}) with args {kwargs}")
             self.breadcrumb_layout.addWidget(button)
         def add_label(text):label=QLabel(text);label.setStyleSheet(page_label_style);self.breadcrumb_layout.addWidget(label)
         home_breadcrumb_btn=QPushButton();home_icon_path=os.path.join(os.path.dirname(__file__),"assets","home_button.png")
-        if os.path.exists(home_icon_path):home_icon=QPixmap(home_icon_path).scaledToHeight(60,Qt.TransformationMode.SmoothTransformation);home_breadcrumb_btn.setIcon(QIcon(home_icon));home_breadcrumb_btn.setIconSize(QSize(60,60))
+        home_icon=load_thumbnail(home_icon_path,60,dpr=home_breadcrumb_btn.devicePixelRatioF()) # Cached thumbnail, the full-size PNG was decoded on every breadcrumb update
+        if home_icon is not None:home_breadcrumb_btn.setIcon(QIcon(home_icon));home_breadcrumb_btn.setIconSize(QSize(60,60))
         else:home_breadcrumb_btn.setText("Home")
         home_breadcrumb_btn.setCursor(Qt.CursorShape.PointingHandCursor);home_breadcrumb_btn.clicked.connect(self.go_home);home_breadcrumb_btn.setStyleSheet("QPushButton { background: transparent; border: none; padding: 0; margin-right: 3px; } QPushButton:hover { background-color: rgba(255, 255, 255, 30); }");self.breadcrumb_layout.addWidget(home_breadcrumb_btn)
-        group_page_map={"Neuroonkologie":NeuroonkologiePage,"Kopf-Hals-Tumore":KopfHalsTumorePage,"Thorakale Tumore":ThorakaleTumorePage,"Gastrointestinale Tumore":GastrointestinaleTumorePage,"Urogenitale Tumore":UrogenitaleTumorePage,"Gynäkologische Tumore":GynPage,"Bindegewebstumore":BindegewebstumorePage,"Hauttumore":HauttumorePage,"Lymphome":LymphomePage,"Fernmetastasen":FernmetastasenPage,"Gutartige Erkrankungen":GutartigeErkrankungenPage}
-        if isinstance(current_widget,TumorGroupPage):pass
-        elif isinstance(current_widget,tuple(group_page_map.values())):add_separator();add_label(getattr(current_widget,'group_name',page_name.replace('Page','')))
-        elif isinstance(current_widget,EntityPage):
+        if is_page(current_widget,"TumorGroupPage"):pass
+        elif any(is_page(current_widget,name)for name in GROUP_PAGES.values()):add_separator();add_label(getattr(current_widget,'group_name',page_name.replace('Page','')))
+        elif is_page(current_widget,"EntityPage"):
             group_name=getattr(current_widget,'group_name',None);entity_name=getattr(current_widget,'entity_name','Entity')
-            if group_name:group_page_class=group_page_map.get(group_name);
+            if group_name:group_page_class=GROUP_PAGES.get(group_name);
             if group_page_class:add_separator();add_button(group_name,group_page_class)
             else:add_separator();add_label(group_name)
             add_separator();add_label(entity_name)
-        elif isinstance(current_widget,PdfReaderPage):
+        elif is_page(current_widget,"PdfReaderPage"):
             group_name=getattr(current_widget,'group_name',None);entity_name=getattr(current_widget,'entity_name',None);pdf_filename=os.path.basename(getattr(current_widget,'pdf_path','PDF'))
             if group_name and entity_name:
-                group_page_class=group_page_map.get(group_name)
+                group_page_class=GROUP_PAGES.get(group_name)
                 if group_page_class:add_separator();add_button(group_name,group_page_class)
                 else:add_separator();add_label(group_name)
-                add_separator();add_button(entity_name,EntityPage,entity_name=entity_name,group_name=group_name)
+                add_separator();add_button(entity_name,"EntityPage",entity_name=entity_name,group_name=group_name)
             elif entity_name:add_separator();add_label(entity_name)
             add_separator();add_label(pdf_filename)
-        elif isinstance(current_widget,(SOPPage,ContouringPage)):
-            group_name=getattr(current_widget,'group_name',None);entity_name=getattr(current_widget,'tumor_type','Entity');page_type_label="SOP" if isinstance(current_widget,SOPPage) else "Contouring"
+        elif is_page(current_widget,"SOPPage")or is_page(current_widget,"ContouringPage"):
+            group_name=getattr(current_widget,'group_name',None);entity_name=getattr(current_widget,'tumor_type','Entity');page_type_label="SOP" if is_page(current_widget,"SOPPage") else "Contouring"
             if group_name:
-                group_page_class=group_page_map.get(group_name)
+                group_page_class=GROUP_PAGES.get(group_name)
                 if group_page_class:add_separator();add_button(group_name,group_page_class)
                 else:add_separator();add_label(group_name)
-            add_separator();add_button(entity_name,EntityPage,entity_name=entity_name,group_name=group_name);add_separator();add_label(page_type_label)
-        elif isinstance(current_widget,TumorboardsPage):add_separator();add_label("Tumorboards")
-        elif isinstance(current_widget,SpecificTumorboardPage):add_separator();add_button("Tumorboards",TumorboardsPage);add_separator();add_label(getattr(current_widget,'tumorboard_name','Tumorboard'))
-        elif isinstance(current_widget,ExcelViewerPage):add_separator();add_button("Tumorboards",TumorboardsPage);add_separator();add_button(getattr(current_widget,'tumorboard_name','Tumorboard'),SpecificTumorboardPage,entity_name=getattr(current_widget,'tumorboard_name','Tumorboard'));add_separator();add_label(getattr(current_widget,'date_str','Datum'))
-        elif isinstance(current_widget,TumorboardSessionPage):add_separator();add_button("Tumorboards",TumorboardsPage);add_separator();add_button(getattr(current_widget,'tumorboard_name','Tumorboard'),SpecificTumorboardPage,entity_name=getattr(current_widget,'tumorboard_name','Tumorboard'));add_separator();add_button(getattr(current_widget,'date_str','Datum'),ExcelViewerPage,entity_name=f"{getattr(current_widget,'tumorboard_name','Tumorboard')}_{getattr(current_widget,'date_str','Datum')}");add_separator();add_label("Session")
-        elif isinstance(current_widget,KisimPage):add_separator();add_label("KISIM Scripts")
-        elif isinstance(current_widget,UtilitiesPage):add_separator();add_label("Utilities")
+            add_separator();add_button(entity_name,"EntityPage",entity_name=entity_name,group_name=group_name);add_separator();add_label(page_type_label)
+        elif is_page(current_widget,"TumorboardsPage"):add_separator();add_label("Tumorboards")
+        elif is_page(current_widget,"SpecificTumorboardPage"):add_separator();add_button("Tumorboards","TumorboardsPage");add_separator();add_label(getattr(current_widget,'tumorboard_name','Tumorboard'))
+        elif is_page(current_widget,"ExcelViewerPage"):add_separator();add_button("Tumorboards","TumorboardsPage");add_separator();add_button(getattr(current_widget,'tumorboard_name','Tumorboard'),"SpecificTumorboardPage",entity_name=getattr(current_widget,'tumorboard_name','Tumorboard'));add_separator();add_label(getattr(current_widget,'date_str','Datum'))
+        elif is_page(current_widget,"TumorboardSessionPage"):add_separator();add_button("Tumorboards","TumorboardsPage");add_separator();add_button(getattr(current_widget,'tumorboard_name','Tumorboard'),"SpecificTumorboardPage",entity_name=getattr(current_widget,'tumorboard_name','Tumorboard'));add_separator();add_button(getattr(current_widget,'date_str','Datum'),"ExcelViewerPage",entity_name=f"{getattr(current_widget,'tumorboard_name','Tumorboard')}_{getattr(current_widget,'date_str','Datum')}");add_separator();add_label("Session")
+        elif is_page(current_widget,"KisimPage"):add_separator();add_label("KISIM Scripts")
+        elif is_page(current_widget,"UtilitiesPage"):add_separator();add_label("Utilities")
         elif current_widget.__class__.__name__ == "BackofficePage":add_separator();add_label("Backoffice")
         elif current_widget.__class__.__name__ == "BackofficeTumorboardsPage":
             # Import BackofficePage for breadcrumb button
@@ -534,7 +508,7 @@ class TumorGuideApp(QMainWindow):
             except ImportError:
                 add_separator();add_label("Backoffice");add_separator();add_label("Erstkonsultationen");add_separator();add_label("Kategorie III")
         elif current_widget.__class__.__name__ == "DeveloperAreaPage":add_separator();add_label("Developer Area")
-        elif isinstance(current_widget,CmdScriptsPage):
+        elif is_page(current_widget,"CmdScriptsPage"):
             # Check if we came from Developer Area by looking at the script being run
             script_name_full=getattr(current_widget.title_label,'text',lambda:"Script Output")();script_name=script_name_full.split(" (")[0] if " (" in script_name_full else script_name_full
             if not script_name or script_name.startswith("Error:")or script_name=="Script Output":script_name="Script Output"
@@ -556,17 +530,17 @@ class TumorGuideApp(QMainWindow):
                 except ImportError:
                     add_separator();add_label("Backoffice");add_separator();add_label(script_name)
             else:
-                add_separator();add_button("KISIM Scripts",KisimPage);add_separator();add_label(script_name)
+                add_separator();add_button("KISIM Scripts","KisimPage");add_separator();add_label(script_name)
         else:add_separator();add_label(page_name.replace('Page',''))
         # addStretch() wird jetzt im übergeordneten header_breadcrumb_layout gemacht
     def find_page_index(self,page_type,entity_name=None,group_name=None):
         for i in range(self.stacked_widget.count()):
             widget=self.stacked_widget.widget(i)
-            if isinstance(widget,page_type):
+            if is_page(widget,page_type):
                 match=True
                 if entity_name is not None:
                     widget_entity_name=getattr(widget,'entity_name',getattr(widget,'tumor_type',None));widget_group_name_attr=getattr(widget,'group_name',None)
-                    if not(widget_entity_name==entity_name or(isinstance(widget,PlaceholderGroupPage)and widget_group_name_attr==entity_name)):match=False
+                    if not(widget_entity_name==entity_name or(is_page(widget,"PlaceholderGroupPage")and widget_group_name_attr==entity_name)):match=False
                 if match and group_name is not None and getattr(widget,'group_name',None)!=group_name:match=False
                 if match:return i
         return None    
@@ -596,7 +570,7 @@ class TumorGuideApp(QMainWindow):
             
         if self.kisim_page is None:
             print(f"{APP_PREFIX}Creating KisimPage instance.")
-            self.kisim_page=KisimPage(self)
+            self.kisim_page=get_page_class("KisimPage")(self)
             self.stacked_widget.addWidget(self.kisim_page)
         
         self.stacked_widget.setCurrentWidget(self.kisim_page)
@@ -608,7 +582,7 @@ class TumorGuideApp(QMainWindow):
             
         if self.tumorboards_page is None:
             print(f"{APP_PREFIX}Creating TumorboardsPage instance.")
-            self.tumorboards_page=TumorboardsPage(self)
+            self.tumorboards_page=get_page_class("TumorboardsPage")(self)
             self.stacked_widget.addWidget(self.tumorboards_page)
         
         self.stacked_widget.setCurrentWidget(self.tumorboards_page)
@@ -621,7 +595,7 @@ class TumorGuideApp(QMainWindow):
             
         if self.utilities_page is None:
             print(f"{APP_PREFIX}Creating UtilitiesPage instance.")
-            self.utilities_page=UtilitiesPage(self)
+            self.utilities_page=get_page_class("UtilitiesPage")(self)
             self.stacked_widget.addWidget(self.utilities_page)
         
         self.stacked_widget.setCurrentWidget(self.utilities_page)
@@ -757,7 +731,7 @@ class TumorGuideApp(QMainWindow):
     def open_cmd_scripts_page(self,script_key:str):
         print(f"{APP_PREFIX}Attempting to open CmdScriptsPage for script key: {script_key}")
         if not script_key:print(f"ERROR: {APP_PREFIX}No script key provided for CmdScriptsPage.");QMessageBox.warning(self,"Navigation Error","No script selected to run.");return
-        if self.cmd_scripts_page is None:print(f"{APP_PREFIX}Creating CmdScriptsPage instance.");self.cmd_scripts_page=CmdScriptsPage(self);self.stacked_widget.addWidget(self.cmd_scripts_page)
+        if self.cmd_scripts_page is None:print(f"{APP_PREFIX}Creating CmdScriptsPage instance.");self.cmd_scripts_page=get_page_class("CmdScriptsPage")(self);self.stacked_widget.addWidget(self.cmd_scripts_page)
         
         # Reset backoffice flag since this is from regular KISIM Scripts
         self.cmd_scripts_page.launched_from_backoffice = False
@@ -774,7 +748,7 @@ class TumorGuideApp(QMainWindow):
         """Open CmdScriptsPage from Backoffice context (keeps Backoffice breadcrumb and menu active)"""
         print(f"{APP_PREFIX}Attempting to open CmdScriptsPage from Backoffice for script key: {script_key}")
         if not script_key:print(f"ERROR: {APP_PREFIX}No script key provided for CmdScriptsPage.");QMessageBox.warning(self,"Navigation Error","No script selected to run.");return
-        if self.cmd_scripts_page is None:print(f"{APP_PREFIX}Creating CmdScriptsPage instance.");self.cmd_scripts_page=CmdScriptsPage(self);self.stacked_widget.addWidget(self.cmd_scripts_page)
+        if self.cmd_scripts_page is None:print(f"{APP_PREFIX}Creating CmdScriptsPage instance.");self.cmd_scripts_page=get_page_class("CmdScriptsPage")(self);self.stacked_widget.addWidget(self.cmd_scripts_page)
         
         # Mark that this script was launched from Backoffice
         self.cmd_scripts_page.launched_from_backoffice = True
@@ -789,7 +763,7 @@ class TumorGuideApp(QMainWindow):
         print(f"{APP_PREFIX}Navigating back to Excel viewer for {tumorboard_name} on {date_str}")
         
         # Find existing Excel viewer page
-        existing_page_index = self.find_page_index(ExcelViewerPage, 
+        existing_page_index = self.find_page_index("ExcelViewerPage", 
                                                    entity_name=f"{tumorboard_name}_{date_str}")
         if existing_page_index is not None:
             print(f"{APP_PREFIX}Found existing Excel viewer page, switching to it.")
@@ -803,7 +777,7 @@ class TumorGuideApp(QMainWindow):
                 excel_page.refresh_finalization_state()
         else:
             print(f"{APP_PREFIX}Creating new Excel viewer page.")
-            excel_page = ExcelViewerPage(self, tumorboard_name, date_str)
+            excel_page = get_page_class("ExcelViewerPage")(self, tumorboard_name, date_str)
             new_index = self.stacked_widget.addWidget(excel_page)
             self.stacked_widget.setCurrentIndex(new_index)
 
@@ -945,9 +919,15 @@ if __name__ == '__main__':
 
     app = QApplication(sys.argv)
     print(f"{APP_PREFIX}QApplication instance created.")
+    startup_timer.mark("qapplication")
+
+    # Probe the K: share in the background from the start; path lookups only read the cached status
+    BackofficePathManager.signals()
+    print(f"{APP_PREFIX}Network path monitor started.")
 
     # UPDATE CHECK
     run_update_check()
+    startup_timer.mark("update_check")
 
     initialize_global_webengine_settings()
     print(f"{APP_PREFIX}Global WebEngine settings initialized.")
@@ -970,6 +950,7 @@ if __name__ == '__main__':
         QScrollBar::add-page:horizontal, QScrollBar::sub-page:horizontal { background: none; }
     """)
     print(f"{APP_PREFIX}Application stylesheet set.")
+    startup_timer.mark("webengine_and_theme")
 
     today = datetime.date.today(); current_month_str = today.strftime("%Y-%m")
     current_iso_year, current_iso_week, _ = today.isocalendar()
@@ -1024,11 +1005,20 @@ if __name__ == '__main__':
         else: print(f"{APP_PREFIX}License dialog cancelled by user."); license_ok = False
     else: print(f"{APP_PREFIX}License check skipped for month {current_month_str} (already validated or not needed).")
 
+    startup_timer.mark("license_check")
+
     if license_ok:
         print(f"{APP_PREFIX}License check passed or was not required.")
         print(f"{APP_PREFIX}Starting TumorGuideApp...")
         window = TumorGuideApp()
         print(f"{APP_PREFIX}TumorGuideApp instance created.")
+        startup_timer.mark("main_window")
+
+        def report_startup_timing():
+            # Runs on the first event loop iteration, i.e. once the first frame is shown
+            startup_timer.mark("first_frame")
+            for line in startup_timer.report(app_version=window.app_version):
+                print(f"{APP_PREFIX}{line}")
         
         def perform_initialization_workaround():
             print(f"{APP_PREFIX}perform_initialization_workaround: Scheduled actions starting.")
@@ -1048,6 +1038,21 @@ if __name__ == '__main__':
         # Window positioning and showing is handled by setup_monitor_positioning()
         print(f"{APP_PREFIX}Application window positioning completed.")
         
+        def start_ocr_service():
+            # Loads the EasyOCR/Tesseract engines in a separate process so scripts can use them warm
+            try:
+                from scripts import ocr_service
+                status = ocr_service.ensure_service(parent_pid=os.getpid())
+                print(f"{APP_PREFIX}OCR service {status}.")
+            except Exception as e_ocr_service:
+                print(f"WARNING: {APP_PREFIX}Could not start OCR service: {e_ocr_service}")
+
+        QTimer.singleShot(0, report_startup_timing)
+        # Off the GUI thread: connecting to a running service may take a moment
+        QTimer.singleShot(1000, lambda: threading.Thread(target=start_ocr_service, daemon=True).start())
+        # Volltextindex der SOP-/Guideline-PDFs nachführen (eigener Thread, nur geänderte PDFs werden gelesen)
+        QTimer.singleShot(2000, window.sop_search_widget.update_index)
+
         # Schedule the workaround to run after the window is shown and event loop has started.
         QTimer.singleShot(200, perform_initialization_workaround) # 200ms delay
 
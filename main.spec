@@ -12,7 +12,8 @@ a = Analysis(
         ('offline_packages/tesseract/tessdata', 'tesseract/tessdata'),
         ('offline_packages/easyocr_models', 'easyocr_models'),
         ('assets', 'assets'),
-        ('scripts', 'scripts')
+        ('scripts', 'scripts'),
+        ('utils/icd_database.json', 'utils')
     ],
     hiddenimports=[
         # Placeholder for future hidden imports
@@ -30,7 +31,39 @@ a = Analysis(
         'openpyxl',
         'cryptography',
         'pkg_resources.py2_warn', # Often needed to suppress warnings
-        'fliesstexte' # Local script dependency
+        'fliesstexte', # Local script dependency
+        # Pages imported on first navigation via importlib (utils/page_registry.py),
+        # invisible to PyInstaller's import analysis
+        'pages.tumorgroup_pages.tumor_group_page',
+        'pages.tumorgroup_pages.neuroonkologie_page',
+        'pages.tumorgroup_pages.KopfHalsTumorePage',
+        'pages.tumorgroup_pages.ThorakaleTumorePage',
+        'pages.tumorgroup_pages.GastrointestinaleTumorePage',
+        'pages.tumorgroup_pages.UrogenitaleTumorePage',
+        'pages.tumorgroup_pages.GynPage',
+        'pages.tumorgroup_pages.bindegewebstumore_page',
+        'pages.tumorgroup_pages.HauttumorePage',
+        'pages.tumorgroup_pages.LymphomePage',
+        'pages.tumorgroup_pages.FernmetastasenPage',
+        'pages.tumorgroup_pages.GutartigeErkrankungenPage',
+        'pages.tumorgroup_pages.placeholder_group_page',
+        'pages.entity_pages.EntityPage',
+        'pages.entity_pages.sop_page',
+        'pages.entity_pages.contouring_page',
+        'pages.pdf_reader',
+        'pages.kisim_page',
+        'pages.utilities_page',
+        'pages.cmdscripts_page',
+        'pages.tumorboards_page',
+        'pages.specific_tumorboard_page',
+        'pages.excel_viewer_page',
+        'pages.tumorboard_session_page',
+        'pages.backoffice_page',
+        'pages.backoffice_tumorboards_page',
+        'pages.backoffice_excel_viewer_page',
+        'pages.backoffice_page_leistungsabrechnungen',
+        'pages.backoffice_page_erstkonsultationen',
+        'pages.developer_area_page_simple',
     ],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,790 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
+                             QFrame, QMessageBox, QTableView, QAbstractItemView,
+                             QHeaderView, QScrollArea, QComboBox,
+                             QDateEdit, QDialog, QApplication)
+from PyQt6.QtCore import Qt, QDate, QTimer, QThread, QObject, pyqtSignal
+from PyQt6.QtGui import QFont
+import logging
+import time
+import pandas as pd
+from datetime import datetime, date
+import getpass
+
+# Import centralized path management
+from utils.path_management import BackofficePathManager
+from components.category_table import (CategoryPatientsModel, CategoryFilterProxyModel,
+                                       StatusComboDelegate, COLUMNS, STATUS_COLUMN)
+from utils.category_workbook import (get_category_writer, flush_category_writes, flush_all_category_writes,
+                                     file_stamp, KEEP, STATUS_PENDING, STATUS_SAVING, STATUS_SAVED,
+                                     STATUS_ERROR, STATUS_CONFLICT)
+
+# Pending status changes are written after this long without a further change
+FLUSH_IDLE_MS = 3000
+# Next attempt after a failed write (file locked, share not reachable)
+FLUSH_RETRY_MS = 15000
+
+class CategoryLoadThread(QThread):
+    """Thread for reading a category workbook (parsing large workbooks takes seconds)"""
+    rows_loaded = pyqtSignal(list, str, object)  # Raw rows (tuples in column order A-N), path, file stamp
+
+    def __init__(self, excel_filename):
+        super().__init__()
+        self.excel_filename = excel_filename
+
+    def run(self):
+        rows = []
+        excel_path = ""
+        stamp = None
+        try:
+            # Use centralized path management with network/local priority
+            backoffice_dir, using_network = BackofficePathManager.get_backoffice_path(show_warnings=False)
+            excel_path = backoffice_dir / self.excel_filename
+            
+            if not excel_path.exists():
+                logging.warning(f"Category Excel file not found: {excel_path}")
+            else:
+                # Pending status changes go into the file first, so the table shows them
+                flush_category_writes(excel_path)
+                # Stamp before reading: a later change by another writer is detected on the next write
+                stamp = file_stamp(excel_path)
+                start = time.perf_counter()
+                # Read Excel file; rows stay raw until the table shows them
+                df = pd.read_excel(excel_path, engine='openpyxl')
+                rows = list(df.itertuples(index=False, name=None))
+                logging.info(f"Loaded {len(rows)} patients from {self.excel_filename} "
+                             f"in {time.perf_counter() - start:.2f}s")
+            
+        except Exception as e:
+            logging.error(f"Error loading data from {self.excel_filename}: {e}")
+            rows = []
+        
+        self.rows_loaded.emit(rows, str(excel_path), stamp)
+
+
+class CategorySaveNotifier(QObject):
+    """Forwards save status from the category workbook I/O thread to the GUI thread"""
+    status_changed = pyqtSignal(str, str)
+
+
+class BackofficeCategoryPage(QWidget):
+    """
+    Shared page for the Kat I/II/III workbooks (subclasses set category_name,
+    excel_filename and title_text).
+
+    The table is a QTableView on CategoryPatientsModel + CategoryFilterProxyModel; the
+    Bearbeitet column uses StatusComboDelegate instead of one QComboBox widget per row.
+    """
+
+    category_name = ""
+    excel_filename = ""
+    title_text = ""
+
+    def __init__(self, main_window):
+        super().__init__()
+        logging.info(f"Initializing {type(self).__name__}...")
+        self.main_window = main_window
+        self.load_thread = None
+        self.reload_pending = False
+        
+        # Status changes are queued and written in batches (utils/category_workbook.py)
+        self.writer = None
+        self.save_notifier = CategorySaveNotifier()
+        self.save_notifier.status_changed.connect(self.on_save_status_changed)
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush_pending_changes)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(flush_all_category_writes)
+        
+        # Column visibility configuration
+        # User can customize which columns to show/hide
+        self.column_visibility = {
+            0: True,   # Datum
+            1: True,   # Tumorboard  
+            2: True,   # Name
+            3: True,   # Geburtsdatum
+            4: True,   # Patientennummer
+            5: True,   # Diagnose
+            6: True,   # ICD-Code
+            7: False,  # Radiotherapie indiziert (hidden per user request)
+            8: False,  # Art des Aufgebots (hidden per user request)
+            9: True,   # Teams Priorisierung
+            10: False, # Vormerken für Studie (hidden per user request)
+            11: False, # Bemerkung/Procedere (hidden per user request)
+            12: True,  # Timestamp
+            13: True,  # Bearbeitet (Aktionen)
+        }
+        
+        self.setup_ui()
+        self.load_data()
+        logging.info(f"{type(self).__name__} initialization complete.")
+
+    def setup_ui(self):
+        """Setup the category page user interface"""
+        # Main layout
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(30, 20, 30, 30)
+        main_layout.setSpacing(20)
+        self.setLayout(main_layout)
+
+        # Header with title
+        header_layout = QHBoxLayout()
+        header_layout.setSpacing(15)
+
+        # Title
+        title_label = QLabel(f"📋 {self.category_name} - {self.title_text}")
+        title_label.setFont(QFont("Helvetica", 24, QFont.Weight.Bold))
+        title_label.setStyleSheet("color: white;")
+        header_layout.addWidget(title_label)
+        header_layout.addStretch()
+
+        # Refresh button
+        self.refresh_button = QPushButton("🔄 Aktualisieren")
+        self.refresh_button.setFont(QFont("Helvetica", 12))
+        self.refresh_button.setFixedSize(170, 40)  # Made 30px wider
+        self.refresh_button.setStyleSheet("""
+            QPushButton {
+                background-color: #114473;
+                color: white;
+                border: none;
+                border-radius: 6px;
+                padding: 8px 15px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #1a5a9e;
+            }
+            QPushButton:pressed {
+                background-color: #0d3355;
+            }
+        """)
+        self.refresh_button.clicked.connect(self.refresh_data)
+        
+        # Save indicator and "save now" for queued status changes
+        self.save_status_label = QLabel("")
+        self.save_status_label.setFont(QFont("Helvetica", 11))
+        self.save_status_label.setStyleSheet("color: #8a9bb0;")
+        header_layout.addWidget(self.save_status_label)
+        
+        self.save_button = QPushButton("💾 Jetzt speichern")
+        self.save_button.setFont(QFont("Helvetica", 12))
+        self.save_button.setFixedSize(170, 40)
+        self.save_button.setStyleSheet(self.refresh_button.styleSheet() + """
+            QPushButton:disabled {
+                background-color: #2A3642;
+                color: #8a9bb0;
+            }
+        """)
+        self.save_button.setEnabled(False)
+        self.save_button.clicked.connect(self.flush_pending_changes)
+        header_layout.addWidget(self.save_button)
+        
+        header_layout.addWidget(self.refresh_button)
+
+        main_layout.addLayout(header_layout)
+
+        # Content
+        self.create_content(main_layout)
+
+    def create_content(self, parent_layout):
+        """Create the main content"""
+        # Scrollable area for content
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setStyleSheet("""
+            QScrollArea {
+                border: none;
+                background-color: transparent;
+            }
+            QScrollBar:vertical {
+                background-color: #232F3B;
+                width: 12px;
+                border-radius: 6px;
+            }
+            QScrollBar::handle:vertical {
+                background-color: #425061;
+                border-radius: 6px;
+                min-height: 20px;
+            }
+            QScrollBar::handle:vertical:hover {
+                background-color: #5A6B7D;
+            }
+        """)
+        
+        # Content widget inside scroll area
+        content_widget = QWidget()
+        content_layout = QVBoxLayout(content_widget)
+        content_layout.setSpacing(25)
+        content_layout.setContentsMargins(0, 0, 0, 0)
+
+        # Filter section
+        self.create_filter_section(content_layout)
+
+        # Table section
+        self.create_table_section(content_layout)
+
+        # Set scroll area content
+        scroll_area.setWidget(content_widget)
+        parent_layout.addWidget(scroll_area)
+
+    def create_filter_section(self, parent_layout):
+        """Create filter controls"""
+        filter_frame = QFrame()
+        filter_frame.setStyleSheet("""
+            QFrame {
+                background-color: #1a2633;
+                border: 1px solid #425061;
+                border-radius: 8px;
+                padding: 15px;
+            }
+        """)
+        
+        filter_layout = QHBoxLayout(filter_frame)
+        filter_layout.setSpacing(20)
+
+        # Tumorboard filter
+        tumorboard_label = QLabel("Tumorboard:")
+        tumorboard_label.setFont(QFont("Helvetica", 12))
+        tumorboard_label.setStyleSheet("color: white;")
+        filter_layout.addWidget(tumorboard_label)
+
+        self.tumorboard_filter = QComboBox()
+        self.tumorboard_filter.setStyleSheet("""
+            QComboBox {
+                background-color: #232F3B;
+                border: none;
+                outline: none;
+                border-radius: 4px;
+                padding: 5px;
+                color: white;
+                min-width: 150px;
+            }
+            QComboBox::drop-down {
+                border: none;
+                outline: none;
+            }
+            QComboBox::down-arrow {
+                width: 12px;
+                height: 12px;
+            }
+            QComboBox QAbstractItemView {
+                border: 1px solid #425061;
+                outline: none;
+            }
+        """)
+        self.tumorboard_filter.currentTextChanged.connect(self.apply_filters)
+        filter_layout.addWidget(self.tumorboard_filter)
+
+        filter_layout.addSpacing(30)
+
+        # Date range filter
+        date_label = QLabel("Datum ab:")
+        date_label.setFont(QFont("Helvetica", 12))
+        date_label.setStyleSheet("color: white;")
+        filter_layout.addWidget(date_label)
+
+        self.date_filter = QDateEdit()
+        self.date_filter.setDate(QDate.currentDate().addDays(-30))  # Default: last 30 days
+        self.date_filter.setStyleSheet("""
+            QDateEdit {
+                background-color: #232F3B;
+                border: none;
+                outline: none;
+                border-radius: 4px;
+                padding: 5px;
+                color: white;
+                min-width: 120px;
+            }
+            QDateEdit::drop-down {
+                border: none;
+                outline: none;
+            }
+        """)
+        self.date_filter.dateChanged.connect(self.apply_filters)
+        filter_layout.addWidget(self.date_filter)
+
+        filter_layout.addStretch()
+        parent_layout.addWidget(filter_frame)
+
+    def create_table_section(self, parent_layout):
+        """Create the main table section"""
+        # Table frame (same styling as Leistungsabrechnungen)
+        table_frame = QFrame()
+        table_frame.setStyleSheet("""
+            QFrame {
+                background-color: transparent;
+                border: none;
+                padding: 0px;
+            }
+        """)
+        
+        table_layout = QVBoxLayout(table_frame)
+        
+        # Model (all rows) -> filter/sort proxy -> view (only visible rows are painted)
+        self.table_model = CategoryPatientsModel(self)
+        self.table_model.status_change_requested.connect(
+            self.on_status_changed, Qt.ConnectionType.QueuedConnection
+        )
+        self.proxy_model = CategoryFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.table_model)
+        
+        # Create table (A-M + Bearbeitet column, 14 total)
+        self.patients_table = QTableView()
+        self.patients_table.setModel(self.proxy_model)
+        self.status_delegate = StatusComboDelegate(self.patients_table)
+        self.patients_table.setItemDelegateForColumn(STATUS_COLUMN, self.status_delegate)
+        
+        # Apply exact same styling as Leistungsabrechnungen table
+        self.patients_table.setStyleSheet("""
+            QTableView {
+                background-color: #232F3B;
+                alternate-background-color: #2A3642;
+                selection-background-color: #3292ea;
+                gridline-color: #425061;
+                color: white;
+                border: 1px solid #425061;
+            }
+            QTableView::item {
+                padding: 3px;
+                border-bottom: 1px solid #425061;
+            }
+            QTableView::item:selected {
+                background-color: #3292ea;
+            }
+            QHeaderView::section {
+                background-color: #1a2633;
+                color: white;
+                padding: 3px;
+                border: 1px solid #425061;
+                font-weight: bold;
+                font-size: 16px;
+            }
+            QTableView QTableCornerButton::section {
+                background-color: #1a2633;
+                border: 1px solid #425061;
+            }
+        """)
+        
+        # Set table properties (same as Leistungsabrechnungen)
+        self.patients_table.setAlternatingRowColors(True)
+        self.patients_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        # Only the Bearbeitet column is editable (model flags); a click opens its combo box
+        self.patients_table.setEditTriggers(
+            QAbstractItemView.EditTrigger.CurrentChanged
+            | QAbstractItemView.EditTrigger.SelectedClicked
+            | QAbstractItemView.EditTrigger.DoubleClicked
+        )
+        # Keep the Excel order until the user clicks a header
+        self.patients_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.patients_table.setSortingEnabled(True)
+
+        # Configure headers - make all columns resizable by dragging
+        horizontal_header = self.patients_table.horizontalHeader()
+        
+        # Set ALL columns to Interactive mode (resizable by dragging)
+        for col in range(len(COLUMNS)):
+            horizontal_header.setSectionResizeMode(col, QHeaderView.ResizeMode.Interactive)
+        
+        # Set some reasonable default widths
+        horizontal_header.resizeSection(0, 100)   # Datum
+        horizontal_header.resizeSection(1, 120)   # Tumorboard
+        horizontal_header.resizeSection(2, 157)   # Name
+        horizontal_header.resizeSection(3, 120)   # Geburtsdatum
+        horizontal_header.resizeSection(4, 110)   # Patientennummer
+        horizontal_header.resizeSection(5, 250)   # Diagnose
+        horizontal_header.resizeSection(6, 100)   # ICD-Code
+        horizontal_header.resizeSection(7, 150)   # Radiotherapie indiziert
+        horizontal_header.resizeSection(8, 130)   # Art des Aufgebots
+        horizontal_header.resizeSection(9, 280)   # Teams Priorisierung
+        horizontal_header.resizeSection(10, 140)  # Vormerken für Studie
+        horizontal_header.resizeSection(11, 180)  # Bemerkung/Procedere
+        horizontal_header.resizeSection(12, 150)  # Timestamp
+        horizontal_header.resizeSection(13, 150)  # Bearbeitet
+        
+        # Don't stretch last section to allow custom widths
+        horizontal_header.setStretchLastSection(False)
+
+        # Fixed row height: ResizeToContents would measure every row of the workbook
+        vertical_header = self.patients_table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(60)
+        
+        # Hide the vertical header (row numbers) to avoid offset issues
+        vertical_header.setVisible(False)
+        
+        # Hide columns based on visibility configuration
+        self.apply_column_visibility()
+        
+        # Fix corner button styling after widget is created
+        QTimer.singleShot(100, self._fix_corner_button_styling)
+        
+        table_layout.addWidget(self.patients_table)
+        parent_layout.addWidget(table_frame)
+
+    def _fix_corner_button_styling(self):
+        """Fix the corner button styling after the widget is fully initialized"""
+        try:
+            # Find the corner button and apply styling
+            corner_button = self.patients_table.findChild(QPushButton)
+            if corner_button:
+                corner_button.setStyleSheet("""
+                    QPushButton {
+                        background-color: #1a2633;
+                        border: 1px solid #425061;
+                    }
+                """)
+                # Disable the corner button to prevent select all functionality
+                corner_button.setEnabled(False)
+                logging.info("Corner button styling applied successfully")
+        except Exception as e:
+            logging.warning(f"Could not apply corner button styling: {e}")
+
+    def apply_column_visibility(self):
+        """Apply column visibility settings - hide/show columns based on configuration"""
+        for col_index, is_visible in self.column_visibility.items():
+            if col_index < self.table_model.columnCount():
+                if is_visible:
+                    self.patients_table.showColumn(col_index)
+                else:
+                    self.patients_table.hideColumn(col_index)
+        
+        logging.info(f"Applied column visibility settings - Hidden columns: {[col for col, visible in self.column_visibility.items() if not visible]}")
+
+    def load_data(self):
+        """Load data from the category Excel file (in the background, the table fills when done)"""
+        if self.load_thread is not None and self.load_thread.isRunning():
+            self.reload_pending = True
+            return
+        
+        self.reload_pending = False
+        self.refresh_button.setEnabled(False)
+        self.refresh_button.setText("⏳ Lädt...")
+        # No status changes while the rows are replaced
+        self.patients_table.setEnabled(False)
+        
+        self.load_thread = CategoryLoadThread(self.excel_filename)
+        self.load_thread.rows_loaded.connect(self.on_rows_loaded)
+        self.load_thread.start()
+
+    def on_rows_loaded(self, rows, excel_path, stamp):
+        """Show the rows read by CategoryLoadThread"""
+        if self.reload_pending:
+            # Refresh was requested while reading: read again
+            self.load_thread.wait()
+            self.load_data()
+            return
+        
+        if excel_path:
+            self.get_writer(excel_path).set_known_stamp(stamp)
+        
+        # Excel row = index + 2 (1-based + header)
+        self.table_model.set_rows(rows, first_row_index=2)
+        
+        # Populate UI elements
+        self.populate_tumorboard_filter()
+        self.populate_table()
+        
+        self.patients_table.setEnabled(True)
+        self.refresh_button.setText("🔄 Aktualisieren")
+        self.refresh_button.setEnabled(True)
+
+    @property
+    def patients_data(self):
+        """All patients of the workbook (materializes every row, prefer table_model.patient())"""
+        return self.table_model.patients()
+
+    def populate_tumorboard_filter(self):
+        """Populate the tumorboard filter dropdown (keeps the current selection if it still exists)"""
+        current = self.tumorboard_filter.currentText()
+        
+        self.tumorboard_filter.blockSignals(True)
+        self.tumorboard_filter.clear()
+        self.tumorboard_filter.addItem("Alle")
+        for tumorboard in self.table_model.tumorboards():
+            self.tumorboard_filter.addItem(tumorboard)
+        index = self.tumorboard_filter.findText(current)
+        self.tumorboard_filter.setCurrentIndex(max(index, 0))
+        self.tumorboard_filter.blockSignals(False)
+
+    def populate_table(self):
+        """Apply the current filters to the table (rows are painted on demand by the view)"""
+        tumorboard = self.tumorboard_filter.currentText()
+        qdate = self.date_filter.date()
+        self.proxy_model.set_filters(
+            tumorboard=None if tumorboard in ("Alle", "") else tumorboard,
+            min_date=date(qdate.year(), qdate.month(), qdate.day()),
+        )
+
+    def on_status_changed(self, row, new_status):
+        """Handle status change from the Bearbeitet column (row = row of table_model)"""
+        patient = self.table_model.patient(row)
+        try:
+            old_status = patient['status'].lower()
+            new_status_lower = new_status.lower()
+            
+            # Check if user is trying to revert from Ja to Nein
+            if old_status == 'ja' and new_status_lower == 'nein':
+                # Show warning dialog with timestamp information
+                if not self.confirm_status_revert(patient):
+                    # User cancelled - the model still holds the original value
+                    return
+                
+                # Log the reversion
+                self.log_status_reversion(patient)
+            
+            changes = {'status': new_status_lower}
+            timestamp = KEEP
+            
+            # Handle timestamp for Nein -> Ja transition
+            if old_status == 'nein' and new_status_lower == 'ja':
+                # Create timestamp with date/time and username
+                timestamp = self.create_timestamp()
+                changes['timestamp'] = timestamp
+            
+            # Clear timestamp when reverting from Ja to Nein
+            elif old_status == 'ja' and new_status_lower == 'nein':
+                timestamp = ''
+                changes['timestamp'] = ''
+            
+            # Queue status (column N) and timestamp (column M); written in one batch when idle
+            self.get_writer().queue_status(
+                patient['row_index'], new_status, old_status,
+                patient['patientennummer'], patient['name'], timestamp=timestamp
+            )
+            
+            logging.info(f"Queued status change of patient {patient['name']} to {new_status} in {self.excel_filename}")
+            
+            # Update patient data in memory (repaints status, timestamp and row color)
+            self.table_model.update_patient(row, **changes)
+            self.flush_timer.start(FLUSH_IDLE_MS)
+            
+        except Exception as e:
+            logging.error(f"Error changing patient status: {e}")
+            QMessageBox.critical(
+                self, 
+                "Fehler", 
+                f"Fehler beim Ändern des Status:\n\n{str(e)}"
+            )
+    
+    def get_writer(self, excel_path=None):
+        """Batched writer of the category workbook (shared per file)"""
+        if excel_path is None:
+            # Use centralized path management with network/local priority
+            backoffice_dir, using_network = BackofficePathManager.get_backoffice_path(show_warnings=False)
+            excel_path = backoffice_dir / self.excel_filename
+        writer = get_category_writer(excel_path)
+        if writer is not self.writer:
+            if self.writer is not None:
+                self.writer.remove_status_callback(self.save_notifier.status_changed.emit)
+            writer.add_status_callback(self.save_notifier.status_changed.emit)
+            self.writer = writer
+        return writer
+
+    def flush_pending_changes(self):
+        """Write queued status changes in the background (idle timer, page leave, save button)"""
+        self.flush_timer.stop()
+        if self.writer is not None:
+            self.writer.flush_async()
+
+    def on_save_status_changed(self, status, message):
+        """Update the pending/saved indicator (GUI thread)"""
+        pending = self.writer.pending_count if self.writer is not None else 0
+        self.save_button.setEnabled(pending > 0)
+        if status == STATUS_PENDING:
+            self.save_status_label.setStyleSheet("color: #FFD700;")
+            self.save_status_label.setText(f"● {pending} Änderung(en) nicht gespeichert")
+        elif status == STATUS_SAVING:
+            self.save_status_label.setStyleSheet("color: #8a9bb0;")
+            self.save_status_label.setText(f"Speichere {message} Änderung(en)...")
+        elif status == STATUS_SAVED:
+            self.save_status_label.setStyleSheet("color: #8a9bb0;")
+            self.save_status_label.setText("✓ Alle Änderungen gespeichert")
+        elif status == STATUS_ERROR:
+            self.save_status_label.setStyleSheet("color: #FF6B35; font-weight: bold;")
+            self.save_status_label.setText("Speichern fehlgeschlagen – neuer Versuch folgt")
+            self.save_status_label.setToolTip(message)
+            self.flush_timer.start(FLUSH_RETRY_MS)
+        elif status == STATUS_CONFLICT:
+            self.save_status_label.setStyleSheet("color: #FF6B35; font-weight: bold;")
+            self.save_status_label.setText("Datei wurde extern geändert – Daten neu geladen")
+            if message:
+                QMessageBox.warning(
+                    self,
+                    "Konflikt beim Speichern",
+                    f"Der Status folgender Patienten wurde inzwischen von einem anderen Benutzer geändert "
+                    f"und nicht überschrieben:\n\n{message}"
+                )
+            # Show the current content of the file (including the other writer's changes)
+            self.load_data()
+
+    def hideEvent(self, event):
+        """Write queued changes when the page is left"""
+        self.flush_pending_changes()
+        super().hideEvent(event)
+    
+    def create_timestamp(self):
+        """Create a timestamp string with date/time and username"""
+        now = datetime.now()
+        date_time = now.strftime("%d.%m.%Y %H:%M:%S")
+        try:
+            username = getpass.getuser()
+        except:
+            username = "Unbekannt"
+        
+        return f"{date_time}\n{username}"
+    
+    def confirm_status_revert(self, patient):
+        """Show confirmation dialog when reverting status from Ja to Nein"""
+        # Parse timestamp if available
+        timestamp_info = "Unbekannt"
+        if patient['timestamp']:
+            try:
+                lines = patient['timestamp'].split('\n')
+                if len(lines) >= 2:
+                    date_time = lines[0]
+                    username = lines[1]
+                    timestamp_info = f"{date_time} durch {username}"
+                else:
+                    timestamp_info = patient['timestamp']
+            except:
+                timestamp_info = patient['timestamp']
+        
+        # Create confirmation dialog
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Bearbeitungsstatus zurücksetzen")
+        dialog.setFixedSize(500, 200)
+        dialog.setStyleSheet("""
+            QDialog {
+                background-color: #19232D;
+                color: white;
+            }
+            QLabel {
+                color: white;
+                font-size: 12px;
+            }
+            QPushButton {
+                background-color: #114473;
+                color: white;
+                border: none;
+                border-radius: 6px;
+                padding: 8px 15px;
+                font-weight: bold;
+                min-width: 80px;
+            }
+            QPushButton:hover {
+                background-color: #1a5a9e;
+            }
+        """)
+        
+        layout = QVBoxLayout(dialog)
+        layout.setSpacing(15)
+        
+        # Warning message
+        warning_label = QLabel("Dieser Patient wurde bereits als bearbeitet markiert am:")
+        warning_label.setFont(QFont("Helvetica", 12, QFont.Weight.Bold))
+        layout.addWidget(warning_label)
+        
+        # Timestamp info
+        timestamp_label = QLabel(timestamp_info)
+        timestamp_label.setFont(QFont("Helvetica", 11))
+        timestamp_label.setStyleSheet("color: #FFD700; margin-left: 20px;")
+        layout.addWidget(timestamp_label)
+        
+        # Confirmation question
+        question_label = QLabel("Sind Sie sicher, dass Sie den Bearbeitungszustand auf Nein zurücksetzen möchten?")
+        question_label.setFont(QFont("Helvetica", 11))
+        question_label.setWordWrap(True)
+        layout.addWidget(question_label)
+        
+        # Log info
+        log_label = QLabel("Dieser Vorgang wird in den programminternen Logs dokumentiert.")
+        log_label.setFont(QFont("Helvetica", 10))
+        log_label.setStyleSheet("color: #CCCCCC; font-style: italic;")
+        layout.addWidget(log_label)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        
+        yes_button = QPushButton("Ja")
+        yes_button.clicked.connect(dialog.accept)
+        button_layout.addWidget(yes_button)
+        
+        no_button = QPushButton("Nein")
+        no_button.clicked.connect(dialog.reject)
+        button_layout.addWidget(no_button)
+        
+        layout.addLayout(button_layout)
+        
+        return dialog.exec() == QDialog.DialogCode.Accepted
+    
+    def log_status_reversion(self, patient):
+        """Log status reversion from Ja to Nein"""
+        try:
+            # Create log entry
+            timestamp = datetime.now().strftime("%d.%m.%Y %H:%M:%S")
+            username = getpass.getuser()
+            category = self.category_name
+            
+            log_entry = f"[{timestamp}] {category}: Patient {patient['name']} (ID: {patient['patientennummer']}) von Ja→Nein geändert durch {username}\n"
+            
+            # Determine log file path using centralized path management
+            backoffice_dir, using_network = BackofficePathManager.get_backoffice_path(show_warnings=False)
+            log_file = backoffice_dir / "erstkons-logs.txt"
+            
+            # Ensure directory exists
+            backoffice_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Append to log file
+            with open(log_file, 'a', encoding='utf-8') as f:
+                f.write(log_entry)
+            
+            logging.info(f"Status reversion logged for patient {patient['name']}")
+            
+        except Exception as e:
+            logging.error(f"Error logging status reversion: {e}")
+            # Don't show error to user, as this is just logging
+
+    def mark_as_processed(self, row, patient):
+        """Mark a patient as processed (change status from Nein to Ja); row = row of table_model"""
+        try:
+            # Queue status in column N (column 14); written together with other pending changes
+            self.get_writer().queue_status(
+                patient['row_index'], "Ja", patient['status'], patient['patientennummer'], patient['name']
+            )
+            self.table_model.update_patient(row, status='ja')
+            self.flush_pending_changes()
+            
+            logging.info(f"Marked patient {patient['name']} as processed in {self.excel_filename}")
+            
+            # Show success message
+            QMessageBox.information(
+                self, 
+                "Erfolgreich bearbeitet", 
+                f"Patient {patient['name']} wurde als bearbeitet markiert."
+            )
+            
+        except Exception as e:
+            logging.error(f"Error marking patient as processed: {e}")
+            QMessageBox.critical(
+                self, 
+                "Fehler", 
+                f"Fehler beim Markieren des Patienten:\n\n{str(e)}"
+            )
+
+    def get_filtered_data(self):
+        """Get filtered patient data based on current filter settings (in table order)"""
+        return [
+            self.table_model.patient(self.proxy_model.mapToSource(self.proxy_model.index(row, 0)).row())
+            for row in range(self.proxy_model.rowCount())
+        ]
+
+    def apply_filters(self):
+        """Apply current filter settings to the table"""
+        self.populate_table()
+
+    def refresh_data(self):
+        """Refresh data from Excel file"""
+        self.load_data()
+        logging.info(f"Data refreshed for {self.category_name}") 
\ No newline at end of file
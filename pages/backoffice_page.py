@@ -1,17 +1,40 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
                              QFrame, QMessageBox, QGridLayout, QScrollArea)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont, QShowEvent
 import os
 import logging
 from pathlib import Path
 import pandas as pd
-import re
-from datetime import datetime
 
 # Import billing tracker and path management
 from utils.billing_tracker import BillingTracker
 from utils.path_management import BackofficePathManager
+from utils.tumorboard_catalog import TumorboardCatalog
+from utils.category_workbook import flush_category_writes
+
+class CatalogRefreshThread(QThread):
+    """Refresh the tumorboard catalog off the GUI thread (stats every entity/date folder on the share)"""
+    refresh_complete = pyqtSignal(bool)  # True if the refresh completed
+
+    def __init__(self, tumorboards_path):
+        super().__init__()
+        self.tumorboards_path = tumorboards_path
+        self._should_stop = False
+
+    def stop_refresh(self):
+        self._should_stop = True
+
+    def run(self):
+        try:
+            # Incremental refresh only re-reads folders whose modification time changed
+            catalog = TumorboardCatalog(self.tumorboards_path)
+            completed = catalog.refresh(should_stop=lambda: self._should_stop)
+        except Exception as e:
+            logging.error(f"Error refreshing tumorboard catalog: {e}")
+            completed = False
+        self.refresh_complete.emit(completed)
+
 
 class BackofficePage(QWidget):
     def __init__(self, main_window):
@@ -19,6 +42,8 @@ class BackofficePage(QWidget):
         logging.info("Initializing BackofficePage Dashboard...")
         self.main_window = main_window
         self.billing_tracker = BillingTracker()
+        self.catalog_thread = None
+        self.category_statuses = None  # (Kat I, Kat II, Kat III) of the last refresh_status()
         self.setup_ui()
         logging.info("BackofficePage Dashboard initialization complete.")
 
@@ -28,6 +53,29 @@ class BackofficePage(QWidget):
         if event.isAccepted():
             logging.info("BackofficePage became visible, refreshing status...")
             self.refresh_status()
+            # Billing status is shown from the persisted catalog first, updated once the refresh is done
+            self.start_catalog_refresh()
+
+    def start_catalog_refresh(self):
+        """Refresh the tumorboard catalog in the background (no-op while a refresh is running)"""
+        if self.catalog_thread and self.catalog_thread.isRunning():
+            return
+        try:
+            tumorboards_path, using_network = BackofficePathManager.get_tumorboard_base_path()
+        except FileNotFoundError:
+            return
+        self.catalog_thread = CatalogRefreshThread(tumorboards_path)
+        self.catalog_thread.refresh_complete.connect(self.on_catalog_refresh_complete)
+        self.catalog_thread.start()
+
+    def on_catalog_refresh_complete(self, completed):
+        """Update the billing status from the refreshed catalog"""
+        if not completed or self.category_statuses is None:
+            return
+        try:
+            self.create_open_tasks_section_refresh(self.get_billing_status(), *self.category_statuses)
+        except Exception as e:
+            logging.error(f"Error updating billing status after catalog refresh: {e}")
 
     def refresh_status(self):
         """Refresh the status of all task categories"""
@@ -39,6 +87,7 @@ class BackofficePage(QWidget):
             kat_i_status = self.get_category_status("Kat_I.xlsx")
             kat_ii_status = self.get_category_status("Kat_II.xlsx")
             kat_iii_status = self.get_category_status("Kat_III.xlsx")
+            self.category_statuses = (kat_i_status, kat_ii_status, kat_iii_status)
             
             # Find and update the existing status buttons
             # We need to rebuild the open tasks section with fresh data
@@ -361,12 +410,14 @@ class BackofficePage(QWidget):
             # Get all finalized tumorboards
             finalized_tumorboards = self.get_finalized_tumorboards()
             
-            # Check billing status for each using the correct method
-            unbilled_tumorboards = []
-            for tb in finalized_tumorboards:
-                billing_status = self.billing_tracker.get_billing_status(tb['entity'], tb['date'])
-                if billing_status is None:  # Not billed yet
-                    unbilled_tumorboards.append(tb)
+            # Check billing status for all tumorboards in one batched lookup
+            billing_statuses = self.billing_tracker.get_billing_statuses(
+                (tb['entity'], tb['date']) for tb in finalized_tumorboards
+            )
+            unbilled_tumorboards = [
+                tb for tb in finalized_tumorboards
+                if billing_statuses.get((tb['entity'], tb['date'])) is None  # Not billed yet
+            ]
             
             if not unbilled_tumorboards:
                 return {
@@ -409,6 +460,9 @@ class BackofficePage(QWidget):
                     'color': '#FF6B6B'  # Light red for errors
                 }
             
+            # Status changes still queued by a Kat page must be in the file before counting
+            flush_category_writes(excel_path)
+            
             # Read Excel file
             df = pd.read_excel(excel_path, engine='openpyxl')
             
@@ -481,53 +535,26 @@ class BackofficePage(QWidget):
             }
 
     def get_finalized_tumorboards(self):
-        """Get all finalized tumorboards (same logic as leistungsabrechnungen page)"""
+        """Get all finalized tumorboards from the persisted tumorboard catalog (refreshed by CatalogRefreshThread)"""
         try:
             # Use centralized path management for tumorboard base path
             tumorboards_path, using_network = BackofficePathManager.get_tumorboard_base_path()
             if not tumorboards_path.exists():
                 return []
             
-            finalized_tumorboards = []
+            # Read only: the refresh walks the share and runs on CatalogRefreshThread
+            catalog = TumorboardCatalog(tumorboards_path)
             
-            # Get all entity folders
-            entity_folders = [f for f in tumorboards_path.iterdir() 
-                            if f.is_dir() and not f.name.startswith('_') and not f.name.startswith('__')]
-            
-            for entity_folder in entity_folders:
-                entity_name = entity_folder.name
-                
-                # Look for date folders in this entity
-                date_folders = [f for f in entity_folder.iterdir() if f.is_dir()]
-                
-                for date_folder in date_folders:
-                    # Check if folder name matches date format (dd.mm.yyyy)
-                    if self.is_valid_date_format(date_folder.name):
-                        # Check for timestamp file (finalized marker)
-                        timestamp_files = list(date_folder.glob("*timestamp*"))
-                        
-                        if timestamp_files:
-                            # Check for Excel file
-                            excel_file = date_folder / f"{date_folder.name}.xlsx"
-                            
-                            if excel_file.exists():
-                                finalized_tumorboards.append({
-                                    'entity': entity_name,
-                                    'date': date_folder.name,
-                                    'path': str(date_folder)
-                                })
-            
-            return finalized_tumorboards
+            return [{
+                'entity': tb['entity'],
+                'date': tb['date'],
+                'path': tb['path']
+            } for tb in catalog.get_finalized_tumorboards()]
             
         except Exception as e:
             logging.error(f"Error getting finalized tumorboards: {e}")
             return []
 
-    def is_valid_date_format(self, folder_name):
-        """Check if folder name matches dd.mm.yyyy format"""
-        pattern = r"^\d{2}\.\d{2}\.\d{4}$"
-        return bool(re.match(pattern, folder_name))
-
     def open_kategorie_i(self):
         """Open the Kategorie I page"""
         logging.info("Opening Kategorie I page...")
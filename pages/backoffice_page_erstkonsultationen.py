@@ -10,6 +10,7 @@ from pathlib import Path
 
 # Import centralized path management
 from utils.path_management import BackofficePathManager
+from utils.category_workbook import flush_category_writes
 
 class CategoryButton(QPushButton):
     """Custom button for category selection - similar to StaticTile styling"""
@@ -242,6 +243,9 @@ class BackofficePageErstkonsultationen(QWidget):
                 logging.warning(f"Category Excel file not found: {excel_path}")
                 return f"Keine Verbindung zu {excel_filename.replace('.xlsx', '')}"
             
+            # Status changes still queued by a Kat page must be in the file before counting
+            flush_category_writes(excel_path)
+            
             # Read Excel file
             df = pd.read_excel(excel_path, engine='openpyxl')
             
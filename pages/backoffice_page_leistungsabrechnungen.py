@@ -6,15 +6,13 @@ from PyQt6.QtCore import Qt, QThread, pyqtSignal, QDate, QTimer
 from PyQt6.QtGui import QFont
 import os
 import logging
-import re
 import subprocess
 from pathlib import Path
-from datetime import datetime, date
-import pandas as pd
 
 # Import our billing tracker and path management
 from utils.billing_tracker import BillingTracker
 from utils.path_management import BackofficePathManager
+from utils.tumorboard_catalog import TumorboardCatalog
 
 class KisimBillingDialog(QDialog):
     """Dialog for confirming KISIM billing automation"""
@@ -96,43 +94,13 @@ class TumorboardIndexingThread(QThread):
         self.billing_tracker = BillingTracker()
         self.completed_tumorboards = []
         self._should_stop = False
-        self._max_runtime = 300  # 5 minutes timeout
     
     def stop_indexing(self):
         """Stop the indexing process"""
         self._should_stop = True
 
-    def is_valid_date_format(self, folder_name):
-        """Check if folder name matches dd.mm.yyyy format"""
-        pattern = r"^\d{2}\.\d{2}\.\d{4}$"
-        return bool(re.match(pattern, folder_name))
-        
-    def get_excel_case_count(self, excel_path):
-        """Get number of cases from Excel file"""
-        try:
-            df = pd.read_excel(excel_path)
-            if df.empty:
-                return 0
-            
-            # Count all rows that contain patient data
-            # Look for rows that have patient number or name data
-            patient_count = 0
-            for _, row in df.iterrows():
-                # Check if row has meaningful patient data (not just empty cells)
-                non_empty_cells = [str(cell).strip() for cell in row if pd.notna(cell) and str(cell).strip()]
-                if len(non_empty_cells) > 0:
-                    patient_count += 1
-            
-            return patient_count
-        except Exception as e:
-            logging.warning(f"Could not read Excel file {excel_path}: {e}")
-            return 0
-
     def run(self):
-        """Run the indexing process"""
-        import time
-        start_time = time.time()
-        
+        """Refresh the tumorboard catalog and attach billing status to each completed tumorboard"""
         try:
             logging.info("Starting tumorboard indexing for billing...")
             self.progress_update.emit("Starte Indexing der abgeschlossenen Tumorboards...")
@@ -147,99 +115,31 @@ class TumorboardIndexingThread(QThread):
                 self.error_occurred.emit("Keine Verbindung zum Tumorboards-Verzeichnis verfügbar")
                 return
             
-            self.completed_tumorboards = []
-            
-            # Get all entity folders
-            try:
-                all_folders = list(self.tumorboards_path.iterdir())
-                entity_folders = [f for f in all_folders 
-                                if f.is_dir() and not f.name.startswith('_') and not f.name.startswith('__')]
-                
-            except Exception as e:
-                error_msg = f"Error getting entity folders: {e}"
-                logging.error(error_msg)
-                self.error_occurred.emit(f"Fehler beim Abrufen der Entitäts-Ordner: {str(e)}")
+            # Incremental refresh only re-reads folders whose modification time changed
+            catalog = TumorboardCatalog(self.tumorboards_path)
+            if not catalog.refresh(should_stop=lambda: self._should_stop, progress_callback=self.progress_update.emit):
                 return
             
-            total_entities = len(entity_folders)
-            logging.info(f"Indexing {total_entities} tumorboard entities for billing status")
+            finalized_tumorboards = catalog.get_finalized_tumorboards()
+            # Check billing status for all tumorboards in one batched lookup
+            billing_statuses = self.billing_tracker.get_billing_statuses(
+                (tb['entity'], tb['date']) for tb in finalized_tumorboards
+            )
             
-            for i, entity_folder in enumerate(entity_folders):
-                current_time = time.time()
-                if self._should_stop or current_time - start_time > self._max_runtime:
-                    return
-                
-                entity_name = entity_folder.name
-                self.progress_update.emit(f"Prüfe {entity_name} ({i+1}/{total_entities})...")
+            self.completed_tumorboards = []
+            for tb in finalized_tumorboards:
+                billing_status = billing_statuses.get((tb['entity'], tb['date']))
                 
-                try:
-                    if not entity_folder.exists() or not entity_folder.is_dir():
-                        continue
-                    
-                    # Look for date folders in this entity
-                    try:
-                        date_folder_items = list(entity_folder.iterdir())
-                        date_folders = [f for f in date_folder_items if f.is_dir()]
-                        
-                    except (PermissionError, Exception) as e:
-                        logging.warning(f"Error iterating {entity_folder}: {e}")
-                        continue
-                    
-                    for date_folder in date_folders:
-                        try:
-                            if not date_folder.exists() or not date_folder.is_dir():
-                                continue
-                                
-                            # Check if folder name matches date format
-                            if self.is_valid_date_format(date_folder.name):
-                                # Check for timestamp file
-                                try:
-                                    timestamp_files = list(date_folder.glob("*timestamp*"))
-                                    
-                                    if timestamp_files:
-                                        # Check for Excel file
-                                        excel_file = date_folder / f"{date_folder.name}.xlsx"
-                                        
-                                        if excel_file.exists() and excel_file.is_file():
-                                            # Get case count
-                                            case_count = self.get_excel_case_count(excel_file)
-                                            
-                                            # Check billing status
-                                            billing_status = self.billing_tracker.get_billing_status(
-                                                entity_name, date_folder.name)
-                                            
-                                            # This is a completed tumorboard
-                                            tumorboard_info = {
-                                                'tumorboard': entity_name,
-                                                'datum': date_folder.name,
-                                                'anzahl_faelle': case_count,
-                                                'date_folder_path': date_folder,
-                                                'excel_path': excel_file,
-                                                'timestamp_file': timestamp_files[0],
-                                                'billing_status': billing_status,
-                                                'is_billed': billing_status is not None
-                                            }
-                                            
-                                            self.completed_tumorboards.append(tumorboard_info)
-                                            logging.info(f"Found completed tumorboard: {entity_name} - {date_folder.name}")
-                                            
-                                except Exception as e:
-                                    logging.error(f"Error processing timestamp/excel files in {date_folder}: {e}")
-                                    continue
-                                    
-                        except Exception as e:
-                            logging.error(f"Error processing date folder {date_folder}: {e}")
-                            continue
-                            
-                        # Yield control to prevent UI freezing
-                        self.msleep(1)
-                        
-                except Exception as e:
-                    logging.error(f"Error processing entity folder {entity_folder}: {e}")
-                    continue
-            
-            # Sort by date (newest first)
-            self.completed_tumorboards.sort(key=lambda x: datetime.strptime(x['datum'], '%d.%m.%Y'), reverse=True)
+                self.completed_tumorboards.append({
+                    'tumorboard': tb['entity'],
+                    'datum': tb['date'],
+                    'anzahl_faelle': tb['case_count'],
+                    'date_folder_path': Path(tb['path']),
+                    'excel_path': tb['excel_path'],
+                    'timestamp_file': tb['timestamp_file'],
+                    'billing_status': billing_status,
+                    'is_billed': billing_status is not None
+                })
             
             logging.info(f"Indexing complete. Found {len(self.completed_tumorboards)} completed tumorboards")
             self.indexing_complete.emit(self.completed_tumorboards)
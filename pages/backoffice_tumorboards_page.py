@@ -5,23 +5,27 @@ from PyQt6.QtCore import Qt, QThread, pyqtSignal, QDate, QTimer
 from PyQt6.QtGui import QFont
 import os
 import logging
-import re
 from pathlib import Path
 from datetime import datetime, date
+from utils.path_management import BackofficePathManager
+from utils.tumorboard_catalog import TumorboardCatalog
 
 class TumorboardIndexingThread(QThread):
-    """Thread for detailed indexing of completed tumorboards"""
+    """Thread for refreshing the tumorboard catalog and loading completed tumorboards"""
     progress_update = pyqtSignal(str)  # Progress message
     indexing_complete = pyqtSignal(list)  # List of completed tumorboards
     error_occurred = pyqtSignal(str)  # Error message
 
     def __init__(self):
         super().__init__()
-        #self.tumorboards_path = Path("K:/RAO_Projekte/App/tumorboards")
-        self.tumorboards_path = Path("C:/Users/marku/tumorboards")
+        # Use centralized path management for tumorboard base path
+        try:
+            self.tumorboards_path, self.using_network = BackofficePathManager.get_tumorboard_base_path()
+        except FileNotFoundError:
+            self.tumorboards_path = None
+            self.using_network = False
         self.completed_tumorboards = []
         self._should_stop = False
-        self._max_runtime = 300  # 5 minutes timeout
     
     def stop_indexing(self):
         """Stop the indexing process"""
@@ -29,186 +33,29 @@ class TumorboardIndexingThread(QThread):
         self._should_stop = True
 
     def run(self):
-        """Run the detailed indexing process"""
-        import time
-        start_time = time.time()
-        
+        """Refresh the catalog incrementally and emit all completed tumorboards"""
         try:
-            print("DEBUG: Starting detailed indexing process...")
             self.progress_update.emit("Starte detailliertes Indexing...")
             logging.info("Starting detailed tumorboard indexing...")
             
-            # Check for stop signal
-            if self._should_stop:
-                print("DEBUG: Stop signal received before start")
-                return
-            
             # Check if the path is accessible
-            print(f"DEBUG: Checking path: {self.tumorboards_path}")
-            if not self.tumorboards_path.exists():
-                error_msg = f"Tumorboards path does not exist: {self.tumorboards_path}"
-                print(f"DEBUG ERROR: {error_msg}")
-                logging.error(error_msg)
+            if self.tumorboards_path is None or not self.tumorboards_path.exists():
+                logging.error(f"Tumorboards path does not exist: {self.tumorboards_path}")
                 self.error_occurred.emit("Keine Verbindung zum Laufwerk K:\\RAO_Daten verfügbar")
                 return
             
-            print(f"DEBUG: Path exists, continuing with indexing...")
-            self.completed_tumorboards = []
-            
-            # Get all entity folders (exclude _Backoffice and __SQLite_database)
-            try:
-                print(f"DEBUG: Getting entity folders from: {self.tumorboards_path}")
-                all_folders = list(self.tumorboards_path.iterdir())
-                print(f"DEBUG: Found {len(all_folders)} total items")
-                
-                entity_folders = [f for f in all_folders 
-                                if f.is_dir() and not f.name.startswith('_') and not f.name.startswith('__')]
-                
-                print(f"DEBUG: Filtered to {len(entity_folders)} entity folders")
-                for folder in entity_folders:
-                    print(f"DEBUG: Entity folder: {folder.name}")
-                    
-            except Exception as e:
-                error_msg = f"Error getting entity folders: {e}"
-                print(f"DEBUG ERROR: {error_msg}")
-                logging.error(error_msg)
-                self.error_occurred.emit(f"Fehler beim Abrufen der Entitäts-Ordner: {str(e)}")
+            catalog = TumorboardCatalog(self.tumorboards_path)
+            if not catalog.refresh(should_stop=lambda: self._should_stop, progress_callback=self.progress_update.emit):
                 return
             
-            total_entities = len(entity_folders)
-            logging.info(f"Indexing {total_entities} tumorboard entities for completed tumorboards")
-            
-            for i, entity_folder in enumerate(entity_folders):
-                # Check for stop signal and timeout
-                current_time = time.time()
-                if self._should_stop:
-                    print("DEBUG: Stop signal received during processing")
-                    return
-                    
-                if current_time - start_time > self._max_runtime:
-                    error_msg = f"Indexing timeout after {self._max_runtime} seconds"
-                    print(f"DEBUG: {error_msg}")
-                    logging.error(error_msg)
-                    self.error_occurred.emit("Indexing-Timeout: Der Vorgang dauerte zu lange.")
-                    return
-                
-                entity_name = entity_folder.name
-                print(f"DEBUG: Processing entity {i+1}/{total_entities}: {entity_name}")
-                self.progress_update.emit(f"Prüfe {entity_name} ({i+1}/{total_entities})...")
-                
-                try:
-                    # Check if entity folder still exists and is accessible
-                    print(f"DEBUG: Checking if entity folder exists: {entity_folder}")
-                    if not entity_folder.exists():
-                        print(f"DEBUG: Entity folder no longer exists: {entity_folder}")
-                        continue
-                    
-                    if not entity_folder.is_dir():
-                        print(f"DEBUG: Path is not a directory: {entity_folder}")
-                        continue
-                    
-                    # Look for date folders in this entity
-                    print(f"DEBUG: Getting date folders from: {entity_folder}")
-                    try:
-                        date_folder_items = list(entity_folder.iterdir())
-                        print(f"DEBUG: Found {len(date_folder_items)} items in {entity_name}")
-                        
-                        date_folders = [f for f in date_folder_items if f.is_dir()]
-                        print(f"DEBUG: Filtered to {len(date_folders)} directories in {entity_name}")
-                        
-                    except PermissionError as pe:
-                        print(f"DEBUG: Permission error iterating {entity_folder}: {pe}")
-                        logging.warning(f"Permission denied iterating {entity_folder}: {pe}")
-                        continue
-                    except Exception as e:
-                        print(f"DEBUG: Error iterating {entity_folder}: {e}")
-                        logging.error(f"Error iterating {entity_folder}: {e}")
-                        continue
-                    
-                    # Process each date folder with additional safety checks
-                    if len(date_folders) == 0:
-                        print(f"DEBUG: No date folders found in {entity_name}, skipping...")
-                        continue
-                        
-                    for j, date_folder in enumerate(date_folders):
-                        print(f"DEBUG: Processing date folder {j+1}/{len(date_folders)}: {date_folder.name}")
-                        
-                        try:
-                            # Additional safety check
-                            if not date_folder.exists() or not date_folder.is_dir():
-                                print(f"DEBUG: Date folder {date_folder} not valid, skipping...")
-                                continue
-                                
-                            # Check if folder name matches date format (dd.mm.yyyy)
-                            print(f"DEBUG: Checking date format for: {date_folder.name}")
-                            if self.is_valid_date_format(date_folder.name):
-                                print(f"DEBUG: Valid date format: {date_folder.name}")
-                                
-                                # Check for timestamp file in this date folder
-                                print(f"DEBUG: Looking for timestamp files in: {date_folder}")
-                                try:
-                                    # Use try-except for glob operation
-                                    timestamp_files = []
-                                    try:
-                                        timestamp_files = list(date_folder.glob("*timestamp*"))
-                                    except Exception as glob_e:
-                                        print(f"DEBUG: Error in glob operation for {date_folder}: {glob_e}")
-                                        continue
-                                        
-                                    print(f"DEBUG: Found {len(timestamp_files)} timestamp files")
-                                    
-                                    if timestamp_files:
-                                        print(f"DEBUG: Timestamp files found: {[f.name for f in timestamp_files]}")
-                                        
-                                        # Check for Excel file with matching date
-                                        excel_file = date_folder / f"{date_folder.name}.xlsx"
-                                        print(f"DEBUG: Checking for Excel file: {excel_file}")
-                                        
-                                        try:
-                                            if excel_file.exists() and excel_file.is_file():
-                                                print(f"DEBUG: Excel file exists, adding completed tumorboard: {entity_name} - {date_folder.name}")
-                                                # This is a completed tumorboard
-                                                self.completed_tumorboards.append({
-                                                    'date': date_folder.name,
-                                                    'entity': entity_name,
-                                                    'date_folder_path': date_folder,
-                                                    'excel_path': excel_file,
-                                                    'timestamp_file': timestamp_files[0]
-                                                })
-                                                logging.info(f"Found completed tumorboard: {entity_name} - {date_folder.name}")
-                                            else:
-                                                print(f"DEBUG: Excel file does not exist or is not a file: {excel_file}")
-                                        except Exception as excel_e:
-                                            print(f"DEBUG: Error checking Excel file {excel_file}: {excel_e}")
-                                            continue
-                                    else:
-                                        print(f"DEBUG: No timestamp files found in: {date_folder}")
-                                        
-                                except Exception as e:
-                                    print(f"DEBUG: Error processing timestamp/excel files in {date_folder}: {e}")
-                                    logging.error(f"Error processing timestamp/excel files in {date_folder}: {e}")
-                                    continue
-                            else:
-                                print(f"DEBUG: Invalid date format: {date_folder.name}")
-                                
-                        except Exception as e:
-                            print(f"DEBUG: Error processing date folder {date_folder}: {e}")
-                            logging.error(f"Error processing date folder {date_folder}: {e}")
-                            continue
-                            
-                        # Yield control to prevent UI freezing
-                        self.msleep(1)
-                
-                except PermissionError as pe:
-                    print(f"DEBUG: Permission denied accessing {entity_folder}: {pe}")
-                    logging.warning(f"Permission denied accessing {entity_folder}: {pe}")
-                    continue
-                except Exception as e:
-                    print(f"DEBUG: Error processing entity {entity_folder}: {e}")
-                    logging.error(f"Error processing entity {entity_folder}: {e}")
-                    continue
+            self.completed_tumorboards = [{
+                'date': tb['date'],
+                'entity': tb['entity'],
+                'date_folder_path': Path(tb['path']),
+                'excel_path': tb['excel_path'],
+                'timestamp_file': tb['timestamp_file']
+            } for tb in catalog.get_finalized_tumorboards()]
             
-            print(f"DEBUG: Indexing completed successfully. Found {len(self.completed_tumorboards)} completed tumorboards")
             self.progress_update.emit(f"Indexing abgeschlossen! {len(self.completed_tumorboards)} abgeschlossene Tumorboards gefunden.")
             self.indexing_complete.emit(self.completed_tumorboards)
             
@@ -218,17 +65,7 @@ class TumorboardIndexingThread(QThread):
             import traceback
             traceback.print_exc()
             self.error_occurred.emit(f"Fehler beim detaillierten Indexing: {str(e)}")
-    
-    def is_valid_date_format(self, folder_name):
-        """Check if folder name matches the date format dd.mm.yyyy"""
-        try:
-            date_pattern = r'^\d{2}\.\d{2}\.\d{4}$'
-            result = re.match(date_pattern, folder_name) is not None
-            print(f"DEBUG: Date format check for '{folder_name}': {result}")
-            return result
-        except Exception as e:
-            print(f"DEBUG: Error in date format check for '{folder_name}': {e}")
-            return False
+
 
 class BackofficeTumorboardsPage(QWidget):
     def __init__(self, main_window):
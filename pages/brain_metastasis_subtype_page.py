@@ -3,6 +3,7 @@ from PyQt6.QtGui import QFont, QIcon
 from PyQt6.QtCore import Qt, QSize
 import os # Added import os
 import logging # Import logging module
+from utils.asset_thumbnails import request_thumbnail, device_pixel_ratio
 
 # Assuming sop_page exists and can handle these subtypes, or will be updated
 from .tumor_page import TumorPage # Import TumorPage
@@ -106,8 +107,10 @@ class BrainMetastasisSubtypePage(QWidget):
         """)
         # Optional: Add an icon if desired
         if icon_path and os.path.exists(icon_path):
-            button.setIcon(QIcon(icon_path))
             button.setIconSize(QSize(225, 225)) # Decreased icon size by 25%
+            # Cached 225px thumbnail instead of the full-size PNG (decoded in the background on first use)
+            request_thumbnail(icon_path, 225, lambda pixmap, b=button: b.setIcon(QIcon(pixmap)),
+                              dpr=device_pixel_ratio(button))
             logging.debug(f"Set icon '{icon_path}' for button '{text}'")
             # Consider adjusting text position if icon makes it look crowded
             # button.setStyleSheet(button.styleSheet() + "QPushButton { text-align: center; padding-top: 10px; }") # Example
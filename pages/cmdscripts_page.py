@@ -1,6 +1,6 @@
 # pages/cmdscripts_page.py
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTextEdit, QLabel, QApplication, QPushButton, QHBoxLayout, QLineEdit
-from PyQt6.QtCore import Qt, QProcess, pyqtSignal, QProcessEnvironment, QMetaObject
+from PyQt6.QtCore import Qt, QProcess, pyqtSignal, QProcessEnvironment, QMetaObject, QTimer
 from PyQt6.QtGui import QFont, QColor, QPalette, QTextCursor, QTextCharFormat
 # --- Remove winpty --- 
 # import winpty 
@@ -17,9 +17,12 @@ import threading
 import queue
 import time
 import logging # Import logging module
+import codecs
+from collections import deque
 
 # Import the script definitions and key generator from kisim_page
 from .kisim_page import script_definitions, generate_script_key
+from scripts import script_host
 
 # --- Script Directory ---
 # Define the path to the scripts directory relative to this file's location
@@ -31,9 +34,24 @@ if not os.path.exists(scripts_dir):
     print(f"Warning: Scripts directory not found at expected location: {scripts_dir}")
 # -----------------------
 
+# --- Output rendering ---
+OUTPUT_FLUSH_INTERVAL_MS = 33       # Pending output is drawn at most ~30 times per second
+OUTPUT_MAX_LINES = 20000            # Scrollback cap of the output area (0 = unlimited)
+OUTPUT_MAX_PENDING_CHARS = 2000000  # Oldest pending output is dropped beyond this (UI starved)
+# ------------------------
+
+# --- Warm script host (development mode) ---
+# Scripts run in a persistent, pre-imported Python process instead of a fresh one per run
+USE_SCRIPT_HOST = True
+SCRIPT_HOST_STOP_GRACE_MS = 3000    # After STOP, the host is killed if the script does not react
+# -------------------------------------------
+
 class CmdScriptsPage(QWidget):
     """A QWidget page to display script execution output using QProcess."""
-    def __init__(self, main_window=None): # Optional main_window reference
+    # (text, bold) - emitted from any thread, rendered in the GUI thread by the flush timer
+    output_received = pyqtSignal(str, object)
+
+    def __init__(self, main_window=None, max_output_lines=OUTPUT_MAX_LINES): # Optional main_window reference
         super().__init__()
         logging.info("Initializing CmdScriptsPage...")
         self.main_window = main_window # Store if needed later
@@ -48,10 +66,35 @@ class CmdScriptsPage(QWidget):
         self.bundled_mode_active = False
         self.stop_requested = False  # Flag to signal script to stop
         self.script_thread = None   # Thread for script execution
+
+        # For the warm script host (development mode)
+        self.script_host = None # Persistent QProcess running scripts/script_host.py
+        self.script_host_buffer = ""
+        self.script_host_decoder = None
+        self.script_host_warmup_seconds = None # Import time paid once by the host
+        self.script_host_saved_seconds = 0.0 # Accumulated startup time saved by warm runs
+        self.host_run_active = False
+        self.host_run_serial = 0
+        self.host_run_requested_at = None
         
         self.default_text_color = QColor(248, 248, 242) # #f8f8f2
         self.prompt_text_color = QColor(80, 250, 123)  # #50fa7b (Dracula green)
+
+        # Output ring buffer: filled via output_received, drained by output_flush_timer
+        self.pending_output = deque()
+        self.pending_output_chars = 0
+        self.dropped_output_chars = 0
+        self.output_received.connect(self.enqueue_output)
+        self.output_flush_timer = QTimer(self)
+        self.output_flush_timer.setInterval(OUTPUT_FLUSH_INTERVAL_MS)
+        self.output_flush_timer.timeout.connect(self.flush_output)
+
         self.setup_ui()
+        self.set_scrollback_limit(max_output_lines)
+
+        if USE_SCRIPT_HOST and not getattr(sys, 'frozen', False):
+            # Start importing in the background so the first run is already warm
+            QTimer.singleShot(0, self.ensure_script_host)
         
     # Redirector classes for bundled mode
     class OutputRedirector:
@@ -221,8 +264,22 @@ class CmdScriptsPage(QWidget):
         self.base_font_size = 12
         base_font = QFont(self.base_font_family, self.base_font_size)
         self.output_area.setFont(base_font) # Apply default font
+        self.output_area.setUndoRedoEnabled(False) # Read-only log, no undo stack to grow
         logging.debug("CmdScriptsPage UI setup started.")
 
+        # Character formats are built once and reused for every flush
+        self.default_format = QTextCharFormat()
+        default_font = QFont(self.base_font_family, self.base_font_size)
+        default_font.setWeight(QFont.Weight.Normal)
+        self.default_format.setFont(default_font)
+        self.default_format.setForeground(self.default_text_color)
+
+        self.prompt_format = QTextCharFormat()
+        prompt_font = QFont(self.base_font_family, self.base_font_size)
+        prompt_font.setWeight(QFont.Weight.Bold)
+        self.prompt_format.setFont(prompt_font)
+        self.prompt_format.setForeground(self.prompt_text_color)
+
         # Dark theme for the terminal area
         palette = self.output_area.palette()
         palette.setColor(QPalette.ColorRole.Base, QColor(40, 42, 54)) # Dark background
@@ -372,9 +429,13 @@ class CmdScriptsPage(QWidget):
         # Store the current script key for breadcrumb tracking
         self.current_script_key = script_key
         # Stop any currently running script first
+        if self.host_run_active:
+            # Cannot wait for a cooperative stop here - replace the host process
+            self.reset_script_host()
+            self.script_finished(-9, force_ui_reset=True)
         self.stop_current_script()
         
-        self.output_area.clear()
+        self.clear_output()
         self.output_buffer = "" # Clear buffer on new run
         # Set a more user-friendly title
         if script_key == "database_manager":
@@ -682,6 +743,9 @@ class CmdScriptsPage(QWidget):
                 
                 # We don't do the try/except here anymore since it's handled in the thread
                 # Instead we'll rely on the thread to update the UI
+            elif USE_SCRIPT_HOST and self.ensure_script_host():
+                # Development mode: run inside the warm script host process
+                self.run_in_script_host(script_path, script_name)
             else:
                 # Normal execution with QProcess (for development environment)
                 self.process = QProcess(self) # Parent to widget for auto-cleanup
@@ -721,6 +785,161 @@ class CmdScriptsPage(QWidget):
             self.input_field.setEnabled(False)
             self.stop_button.setStyleSheet(self.stop_button_style_inactive) # Ensure button is gray
 
+    # --- Warm Script Host ---
+
+    def ensure_script_host(self):
+        """Starts the script host process if it is not running. Returns False if it cannot be started."""
+        if self.script_host and self.script_host.state() != QProcess.ProcessState.NotRunning:
+            return True
+        host_path = os.path.join(scripts_dir, "script_host.py")
+        if not os.path.exists(host_path):
+            logging.warning(f"Script host not found at {host_path}, using one process per run.")
+            return False
+
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        process.setWorkingDirectory(scripts_dir)
+        environment = QProcessEnvironment.systemEnvironment()
+        environment.insert("PYTHONIOENCODING", "utf-8")
+        process.setProcessEnvironment(environment)
+        process.readyReadStandardOutput.connect(self.handle_script_host_output)
+        process.finished.connect(self.handle_script_host_finished)
+
+        self.script_host = process
+        self.script_host_buffer = ""
+        self.script_host_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.script_host_warmup_seconds = None
+        process.start(sys.executable, ["-u", host_path])
+        if not process.waitForStarted(5000):
+            logging.error(f"Script host failed to start: {process.errorString()}")
+            self.script_host = None
+            process.deleteLater()
+            return False
+        logging.info("Script host started, importing modules in the background.")
+        return True
+
+    def run_in_script_host(self, script_path, script_name):
+        exec_line = f"Executing: {script_name} in warm script host\n"
+        self.append_formatted_output(exec_line, bold=False)
+        self.append_formatted_output("-" * 50 + "\n", bold=False)
+
+        self.host_run_serial += 1
+        self.host_run_active = True
+        self.stop_requested = False
+        self.host_run_requested_at = time.perf_counter()
+        command = {"cmd": "run", "path": script_path, "cwd": scripts_dir}
+        self.script_host.write(script_host.encode_control(command).encode('utf-8'))
+
+    def handle_script_host_output(self):
+        if not self.script_host:
+            return
+        data = self.script_host.readAllStandardOutput().data()
+        self.script_host_buffer += self.script_host_decoder.decode(data)
+
+        # Split script output from control lines (which may arrive in pieces)
+        while self.script_host_buffer:
+            control_pos = self.script_host_buffer.find(script_host.CONTROL_PREFIX)
+            if control_pos == -1:
+                self.handle_script_host_text(self.script_host_buffer)
+                self.script_host_buffer = ""
+                break
+            if control_pos > 0:
+                self.handle_script_host_text(self.script_host_buffer[:control_pos])
+                self.script_host_buffer = self.script_host_buffer[control_pos:]
+            line_end = self.script_host_buffer.find("\n")
+            if line_end == -1:
+                break # Incomplete control line, wait for more data
+            message = script_host.decode_control(self.script_host_buffer[:line_end])
+            self.script_host_buffer = self.script_host_buffer[line_end + 1:]
+            if message:
+                self.handle_script_host_event(message)
+
+    def handle_script_host_text(self, text):
+        if self.host_run_active:
+            self.append_formatted_output(text)
+        else:
+            # Output outside of a run (e.g. module imports during warm-up)
+            logging.debug(f"Script host: {text.rstrip()}")
+
+    def handle_script_host_event(self, message):
+        event = message.get("event")
+        if event == "ready":
+            self.script_host_warmup_seconds = message.get("warmup_seconds", 0.0)
+            logging.info(f"Script host ready after {self.script_host_warmup_seconds:.2f}s "
+                         f"(preloaded: {', '.join(message.get('modules', []))})")
+            for failure in message.get("failed", []):
+                logging.warning(f"Script host could not preload {failure}")
+        elif event == "started":
+            wait_seconds = time.perf_counter() - (self.host_run_requested_at or time.perf_counter())
+            # Import time a fresh process would have paid, minus what this run still waited
+            saved_seconds = max(0.0, (self.script_host_warmup_seconds or 0.0) - wait_seconds)
+            self.script_host_saved_seconds += saved_seconds
+            logging.info(f"Script host run {message.get('run')} ({message.get('script')}) started after "
+                         f"{wait_seconds * 1000:.0f} ms, {saved_seconds:.2f}s startup saved "
+                         f"({self.script_host_saved_seconds:.1f}s in total)")
+            self.input_field.setEnabled(True)
+            self.input_field.setFocus()
+        elif event == "finished":
+            if not self.host_run_active:
+                return
+            exit_code = message.get("exit_code", 1)
+            logging.info(f"Script host run {message.get('run')} finished with exit code {exit_code} "
+                         f"after {message.get('seconds', 0):.1f}s")
+            self.host_run_active = False
+            is_success = exit_code == 0
+            current_title = self.title_label.text().split(" (")[0]
+            status_indicator = "Finished OK" if is_success else f"Finished: Error Code {exit_code}"
+            self.title_label.setText(f"{current_title} ({status_indicator})")
+            self.script_finished(exit_code, force_ui_reset=True)
+
+    def handle_script_host_finished(self, exitCode, exitStatus):
+        logging.warning(f"Script host exited. Exit Code: {exitCode}, Exit Status: {exitStatus}")
+        host = self.sender()
+        if host is not self.script_host:
+            return # An old host that was replaced
+        self.script_host = None
+        host.deleteLater()
+        if self.host_run_active:
+            self.host_run_active = False
+            self.append_formatted_output("\n--- Script host exited unexpectedly ---\n", bold=False)
+            self.script_finished(exitCode or 1, QProcess.ExitStatus.CrashExit, force_ui_reset=True)
+
+    def kill_unresponsive_script_host(self, run_serial):
+        """STOP fallback: the script ignored the interrupt, so the host is killed like a normal script process."""
+        if not self.host_run_active or run_serial != self.host_run_serial:
+            return
+        logging.warning("Script did not react to STOP, killing script host.")
+        self.reset_script_host()
+        self.script_finished(-9, force_ui_reset=True)
+        # Warm up a new host for the next run
+        self.ensure_script_host()
+
+    def reset_script_host(self):
+        """Kills the host process immediately (the running script is lost)."""
+        self.host_run_active = False
+        host = self.script_host
+        self.script_host = None
+        if host:
+            try:
+                host.readyReadStandardOutput.disconnect(self.handle_script_host_output)
+                host.finished.disconnect(self.handle_script_host_finished)
+            except (TypeError, RuntimeError) as e:
+                logging.warning(f"Error disconnecting script host signals: {e}")
+            host.kill()
+            host.waitForFinished(1000)
+            host.deleteLater()
+
+    def shutdown_script_host(self):
+        """Asks the host to exit (it also exits when its stdin is closed)."""
+        if not self.script_host:
+            return
+        if not self.host_run_active:
+            self.script_host.write(script_host.encode_control({"cmd": "exit"}).encode('utf-8'))
+            self.script_host.closeWriteChannel()
+            if self.script_host and self.script_host.waitForFinished(1000):
+                return
+        self.reset_script_host()
+
     def stop_current_script(self):
         """Stops the currently running script process or thread in a gentle way.
         Instead of directly manipulating thread objects, this sets a flag and lets
@@ -772,6 +991,13 @@ class CmdScriptsPage(QWidget):
                 # Still make sure to clear the reference
                 self.process = None
 
+        # For the warm script host, ask the script to stop and kill the host if it does not react
+        if self.host_run_active and self.script_host:
+            logging.info("Sending stop command to script host.")
+            self.script_host.write(script_host.encode_control({"cmd": "stop"}).encode('utf-8'))
+            run_serial = self.host_run_serial
+            QTimer.singleShot(SCRIPT_HOST_STOP_GRACE_MS, lambda: self.kill_unresponsive_script_host(run_serial))
+
         # For bundled mode, we don't directly interact with the thread
         # We just set flags and let the readline or patched_sleep methods handle it
         if self.bundled_mode_active:
@@ -805,7 +1031,7 @@ class CmdScriptsPage(QWidget):
         
         # For any other case, just make sure the UI state is consistent
         # script_finished will be called by the script itself when it detects the stop flag
-        if not self.bundled_mode_active and not self.process:
+        if not self.bundled_mode_active and not self.process and not self.host_run_active:
             try:
                 # No active script, so clean up the UI right away
                 logging.info("No active script found, resetting UI only.")
@@ -842,86 +1068,111 @@ class CmdScriptsPage(QWidget):
         return False
 
     def append_formatted_output(self, text, bold=None):
-        """Appends text, applying prompt formatting only to the last line if auto-detecting.
-        This method is critical for UI updates and must never crash the application."""
+        """Queues text for display; safe to call from any thread.
+        bold=None auto-detects a prompt in the last line, True/False forces the format.
+        The text is drawn by flush_output on the next timer tick, so chatty scripts
+        no longer cost one layout pass (and processEvents) per write."""
         try:
             # Validate input first
             if text is None:
                 return
-                
             # Convert to string if not already
             if not isinstance(text, str):
                 text = str(text)
-                
+            if text:
+                self.output_received.emit(text, bold)
+        except Exception as e:
+            # Never propagate exceptions from output handling (called from script threads)
+            logging.critical(f"Critical error in append_formatted_output: {e}")
+
+    def enqueue_output(self, text, bold):
+        """GUI-thread slot for output_received: buffers the chunk and schedules a flush."""
+        self.pending_output.append((text, bold))
+        self.pending_output_chars += len(text)
+        # Drop the oldest chunks if the UI cannot keep up
+        while self.pending_output_chars > OUTPUT_MAX_PENDING_CHARS and len(self.pending_output) > 1:
+            dropped_text, _ = self.pending_output.popleft()
+            self.pending_output_chars -= len(dropped_text)
+            self.dropped_output_chars += len(dropped_text)
+
+        if bold is not None:
+            # Status messages of the page itself (stop, finished, user input) are shown at once
+            self.flush_output()
+        elif not self.output_flush_timer.isActive():
+            self.output_flush_timer.start()
+
+    def flush_output(self):
+        """Draws all pending output with one cursor and the cached formats.
+        Consecutive chunks with the same formatting are inserted together."""
+        if not self.pending_output:
+            self.output_flush_timer.stop()
+            return
+        chunks = self.pending_output
+        self.pending_output = deque()
+        self.pending_output_chars = 0
+
+        try:
             cursor = self.output_area.textCursor()
             cursor.movePosition(QTextCursor.MoveOperation.End)
-
-            # --- Format Definitions ---
-            # Default format
-            default_format = QTextCharFormat()
-            default_font = QFont(self.base_font_family, self.base_font_size)
-            default_font.setWeight(QFont.Weight.Normal)
-            default_format.setFont(default_font)
-            default_format.setForeground(self.default_text_color)
-
-            # Prompt format
-            prompt_format = QTextCharFormat()
-            prompt_font = QFont(self.base_font_family, self.base_font_size)
-            prompt_font.setWeight(QFont.Weight.Bold)
-            prompt_format.setFont(prompt_font)
-            prompt_format.setForeground(self.prompt_text_color)
-            # --- End Format Definitions ---
-
-            # Apply explicit formatting if requested
-            if bold is not None:
-                cursor.setCharFormat(prompt_format if bold else default_format)
-                cursor.insertText(text)
-            else:
-                # Auto-detect: Format last line based on prompt check
-                last_newline_pos = text.rfind('\n')
-                if last_newline_pos != -1:
-                    # Text contains newline(s)
-                    part1 = text[:last_newline_pos + 1] # Includes the newline
-                    part2 = text[last_newline_pos + 1:] # The part after the last newline
-
-                    # Append part1 with default format
-                    cursor.setCharFormat(default_format)
-                    cursor.insertText(part1)
-
-                    # Append part2 (last line) with detected format
-                    if part2: # Only if there's text after the last newline
-                        is_prompt = self.is_prompt_line(part2)
-                        cursor.setCharFormat(prompt_format if is_prompt else default_format)
-                        cursor.insertText(part2)
-                else:
-                    # No newline in the text, check the whole text
-                    is_prompt = self.is_prompt_line(text)
-                    cursor.setCharFormat(prompt_format if is_prompt else default_format)
-                    cursor.insertText(text)
-
-            # Reset format for subsequent typing or appends outside this method
-            cursor.setCharFormat(default_format)
+            cursor.beginEditBlock()
+
+            if self.dropped_output_chars:
+                cursor.setCharFormat(self.prompt_format)
+                cursor.insertText(f"\n*** {self.dropped_output_chars} Zeichen Ausgabe ausgelassen ***\n")
+                self.dropped_output_chars = 0
+
+            run_text = []
+            run_bold = None
+            for text, bold in chunks:
+                if run_text and bold != run_bold:
+                    self.insert_output_run(cursor, "".join(run_text), run_bold)
+                    run_text = []
+                run_text.append(text)
+                run_bold = bold
+            if run_text:
+                self.insert_output_run(cursor, "".join(run_text), run_bold)
+
+            # Reset format for subsequent appends
+            cursor.setCharFormat(self.default_format)
+            cursor.endEditBlock()
+            self.output_area.setTextCursor(cursor)
             self.output_area.ensureCursorVisible() # Scroll to the end
-            
-            # Process events to update UI immediately
-            try:
-                QApplication.processEvents()
-            except Exception:
-                # Ignore process events errors
-                pass
-                
         except Exception as e:
-            # Critical failure - do NOT propagate exceptions from this method
+            # Critical failure - do NOT propagate exceptions from the timer
             try:
-                logging.critical(f"Critical error in append_formatted_output: {e}")
-                # Try to append error message in simplest way possible
+                logging.critical(f"Critical error in flush_output: {e}")
                 cursor = self.output_area.textCursor()
                 cursor.movePosition(QTextCursor.MoveOperation.End)
                 cursor.insertText(f"\n*** ERROR DISPLAYING OUTPUT: {e} ***\n")
             except Exception as final_error:
-                # Absolutely last resort - log only
                 logging.critical(f"FATAL UI ERROR: {final_error}")
-                # At this point we've done everything we can do
+
+    def insert_output_run(self, cursor, text, bold):
+        """Inserts text; in auto mode only the last (unterminated) line is checked for a prompt."""
+        if bold is not None:
+            cursor.setCharFormat(self.prompt_format if bold else self.default_format)
+            cursor.insertText(text)
+            return
+        last_newline_pos = text.rfind('\n')
+        head, tail = text[:last_newline_pos + 1], text[last_newline_pos + 1:]
+        if head:
+            cursor.setCharFormat(self.default_format)
+            cursor.insertText(head)
+        if tail:
+            cursor.setCharFormat(self.prompt_format if self.is_prompt_line(tail) else self.default_format)
+            cursor.insertText(tail)
+
+    def clear_output(self):
+        """Clears the output area and discards output that was not drawn yet."""
+        self.pending_output.clear()
+        self.pending_output_chars = 0
+        self.dropped_output_chars = 0
+        self.output_flush_timer.stop()
+        self.output_area.clear()
+
+    def set_scrollback_limit(self, max_lines):
+        """Caps the output area to the last max_lines lines (0 = unlimited)."""
+        self.output_area.document().setMaximumBlockCount(max(0, int(max_lines or 0)))
 
     def script_finished(self, exit_code, exit_status=QProcess.ExitStatus.NormalExit, force_ui_reset=False):
         """Common cleanup actions when a script finishes or is stopped."""
@@ -997,7 +1248,7 @@ class CmdScriptsPage(QWidget):
     def set_initial_state(self):
         self.stop_current_script() # Ensure no process is running
         self.title_label.setText("Script Output")
-        self.output_area.clear() # Clear previous content
+        self.clear_output() # Clear previous content
         initial_msg = "Select a script tile from the KISIM page to run it.\n"
         self.append_formatted_output(initial_msg, bold=False)
         self.input_field.setEnabled(False)
@@ -1030,7 +1281,13 @@ class CmdScriptsPage(QWidget):
             # Use a different color/style for user input?
             input_display_text = f"> {input_text}\n"
             self.append_formatted_output(input_display_text, bold=True) # Maybe bold input?
-            
+
+        elif self.host_run_active and self.script_host:
+            logging.debug("Writing input to script host stdin.")
+            self.script_host.write((input_text + "\n").encode('utf-8'))
+            input_display_text = f"> {input_text}\n"
+            self.append_formatted_output(input_display_text, bold=True)
+
         elif self.process and self.process.state() == QProcess.ProcessState.Running:
             logging.debug("Writing input to QProcess stdin.")
             # Append newline as most command-line tools expect it
@@ -1051,6 +1308,7 @@ class CmdScriptsPage(QWidget):
         """Ensure script is stopped when the widget (or window) is closed."""
         logging.info("closeEvent triggered for CmdScriptsPage. Stopping script.")
         self.stop_current_script()
+        self.shutdown_script_host()
         super().closeEvent(event)
 
     def stdin_reader(self):
@@ -10,10 +10,11 @@ from PyQt6.QtGui import QAction, QIcon
 
 class PdfReaderPage(QWidget):
     """A widget to display a PDF file using QWebEngineView."""
-    def __init__(self, main_window, pdf_path, group_name, entity_name):
+    def __init__(self, main_window, pdf_path, group_name, entity_name, page=None):
         super().__init__()
         self.main_window = main_window
         self.pdf_path = pdf_path
+        self.page = page  # 1-based page to open (e.g. a full-text search hit), None = first page
         self.group_name = group_name
         self.entity_name = entity_name
         logging.info(f"Initializing PdfReaderPage (WebEngine) for: {pdf_path} (Group: {group_name}, Entity: {entity_name})")
@@ -86,6 +87,9 @@ class PdfReaderPage(QWidget):
                 logging.error(f"Could not create valid QUrl from path: {self.pdf_path}")
                 QMessageBox.warning(self, "Error", f"Could not load PDF: Invalid file path.\n{self.pdf_path}")
                 return
+            if self.page:
+                # The Chromium PDF viewer opens the page given in the URL fragment
+                pdf_url.setFragment(f"page={self.page}")
 
             self.web_view.setUrl(pdf_url)
             logging.info(f"Set URL for WebEngine: {pdf_url.toString()}")
@@ -6,6 +6,8 @@ import datetime
 import re
 import logging
 from pathlib import Path
+from utils.path_monitor import get_network_monitor, NETWORK_BASE_PATH, LOCAL_BASE_PATH
+from utils.path_management import BackofficePathManager
 
 class SpecificTumorboardPage(QWidget):
     def __init__(self, main_window, tumorboard_name):
@@ -27,6 +29,9 @@ class SpecificTumorboardPage(QWidget):
         self.tumorboard_base_path = None
         
         self.setup_ui()
+        
+        # Switch between K: and the local fallback while the page is open
+        BackofficePathManager.signals().network_availability_changed.connect(self._on_network_availability_changed)
         logging.info(f"SpecificTumorboardPage UI setup complete for {tumorboard_name}.")
 
     def setup_ui(self):
@@ -144,6 +149,12 @@ class SpecificTumorboardPage(QWidget):
         logging.info(f"Refreshing tumorboard data for: {self.tumorboard_name}")
         self._populate_content()
 
+    def _on_network_availability_changed(self, available):
+        """Reload the date list from the path that is valid now (only while the page is visible)"""
+        if self.isVisible():
+            logging.info(f"Network path {'available' if available else 'not available'}, reloading {self.tumorboard_name}")
+            self.refresh_data()
+
     def showEvent(self, event: QShowEvent):
         """Override showEvent to refresh data whenever the page is shown"""
         super().showEvent(event)
@@ -166,21 +177,18 @@ class SpecificTumorboardPage(QWidget):
             tuple: (Path object or None, bool indicating if using fallback)
         """
         # Primary path (Intranet)
-        primary_path = Path("K:/RAO_Projekte/App/tumorboards") / self.tumorboard_name
+        primary_path = NETWORK_BASE_PATH / self.tumorboard_name
         
         # Fallback path (Local)
-        fallback_path = Path.home() / "tumorboards" / self.tumorboard_name
+        fallback_path = LOCAL_BASE_PATH / self.tumorboard_name
         
         logging.info(f"Checking primary path: {primary_path}")
         
-        # Check if primary path exists and is accessible
-        try:
-            if primary_path.exists() and primary_path.is_dir():
-                logging.info("Primary path (Intranet) found and accessible")
-                self.tumorboard_base_path = Path("K:/RAO_Projekte/App/tumorboards")
-                return primary_path, False
-        except (OSError, PermissionError) as e:
-            logging.warning(f"Primary path not accessible: {e}")
+        # Cached share status + bounded check (never waits for the SMB timeout of a dead mount)
+        if get_network_monitor().is_dir(primary_path):
+            logging.info("Primary path (Intranet) found and accessible")
+            self.tumorboard_base_path = NETWORK_BASE_PATH
+            return primary_path, False
         
         logging.info(f"Checking fallback path: {fallback_path}")
         
@@ -188,7 +196,7 @@ class SpecificTumorboardPage(QWidget):
         try:
             if fallback_path.exists() and fallback_path.is_dir():
                 logging.info("Fallback path (Local) found and accessible")
-                self.tumorboard_base_path = Path.home() / "tumorboards"
+                self.tumorboard_base_path = LOCAL_BASE_PATH
                 return fallback_path, True
         except (OSError, PermissionError) as e:
             logging.warning(f"Fallback path not accessible: {e}")
@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QLabel, QPushButton, 
                              QScrollArea, QFrame, QComboBox, QTextEdit, QMessageBox, QDialog, QDialogButtonBox, QLineEdit, QFormLayout, QCheckBox)
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QObject, QEventLoop, QTimer
 from PyQt6.QtGui import QFont, QWheelEvent
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebEngineCore import QWebEngineSettings
@@ -10,9 +10,13 @@ import logging
 from pathlib import Path
 import pandas as pd
 from datetime import datetime
-from utils.excel_export_utils import export_tumorboard_to_collection
-import json
-import os
+from utils.excel_export_utils import find_collection_file, schedule_collection_export
+from utils.icd_index import get_icd_index, preload_icd_index
+from utils.session_workbook import (SessionWorkbook, SessionJournal, get_session_journal_path,
+                                    STATUS_PENDING, STATUS_SAVED, STATUS_ERROR)
+from utils.tumorboard_catalog import TumorboardCatalog
+from utils.session_pdf_cache import SessionPdfResolver
+from utils.sheet_normalization import normalize_patient_sheet, TEXT_COLUMNS
 
 class NoScrollComboBox(QComboBox):
     """Custom QComboBox that ignores wheel events when not focused"""
@@ -670,6 +674,15 @@ class AddPatientDialog(QDialog):
             'icd_code': self.icd_code_edit.text().strip()
         }
 
+# Number of following patients whose PDFs are prefetched into the local cache
+PDF_PREFETCH_COUNT = 3
+
+
+class SessionSaveNotifier(QObject):
+    """Forwards save status from the session workbook I/O thread to the GUI thread"""
+    status_changed = pyqtSignal(str, str)
+
+
 class TumorboardSessionPage(QWidget):
     def __init__(self, main_window, tumorboard_name, date_str, tumorboard_base_path=None):
         super().__init__()
@@ -694,6 +707,22 @@ class TumorboardSessionPage(QWidget):
         self.temp_excel_path = None
         self.source_excel_path = self.tumorboard_base_path / self.tumorboard_name / self.date_str / f"{self.date_str}.xlsx"
         self.has_unsaved_changes = False
+        # Temp file held in memory; edits patch cells and are written back in the background
+        self.session_workbook = None
+        # Local crash-safe journal of edits not yet written to the temp file
+        self.session_journal_path = get_session_journal_path(self.tumorboard_name, self.date_str)
+        self.save_notifier = SessionSaveNotifier()
+        self.save_notifier.status_changed.connect(self.on_save_status_changed)
+        
+        # PDFs are resolved from one listing of the date folder and prefetched into a local cache
+        self.pdf_resolver = SessionPdfResolver(
+            self.tumorboard_base_path / self.tumorboard_name / self.date_str,
+            cache_name=f"{self.tumorboard_name}_{self.date_str}"
+        )
+        self.pdf_resolver.preload()
+        
+        # Build the ICD search index in the background before the first ICD lookup
+        preload_icd_index()
         
         self.setup_ui()
         
@@ -716,7 +745,6 @@ class TumorboardSessionPage(QWidget):
         # Check if temporary file exists
         if temp_excel_path.exists():
             # Get modification time of temp file
-            import os
             import datetime
             mod_time = os.path.getmtime(temp_excel_path)
             mod_datetime = datetime.datetime.fromtimestamp(mod_time)
@@ -768,6 +796,7 @@ class TumorboardSessionPage(QWidget):
                 self.clear_and_reload_patient_data()
             else:
                 # Delete old temp file and create new one
+                self.discard_session_workbook()
                 try:
                     temp_excel_path.unlink()
                     logging.info(f"Deleted old temporary file: {temp_excel_path}")
@@ -816,7 +845,6 @@ class TumorboardSessionPage(QWidget):
         # Check if temporary file already exists
         if self.temp_excel_path.exists():
             # Get modification time of temp file
-            import os
             import datetime
             mod_time = os.path.getmtime(self.temp_excel_path)
             mod_datetime = datetime.datetime.fromtimestamp(mod_time)
@@ -890,6 +918,9 @@ class TumorboardSessionPage(QWidget):
                 self.show_excel_locked_error("Temporäre Session-Datei erstellen", self.source_excel_path)
                 return False
             
+            # Drop the in-memory copy so no pending write overwrites the fresh file
+            self.discard_session_workbook()
+            
             # Delete existing temp file if it exists
             if self.temp_excel_path and self.temp_excel_path.exists():
                 try:
@@ -910,8 +941,22 @@ class TumorboardSessionPage(QWidget):
             return False
 
     def copy_temp_to_source(self):
-        """Copy temporary Excel file to source file"""
+        """Copy temporary Excel file to source file (on the session I/O thread, GUI stays responsive)"""
+        if self.session_workbook is None:
+            return self._copy_temp_to_source_blocking()
+        
+        # Queued after all pending background writes of the session workbook
+        workbook = self.session_workbook
+        workbook.flush_async()
+        return self.wait_for_io(workbook.submit(self._copy_temp_to_source_blocking))
+
+    def _copy_temp_to_source_blocking(self):
+        """Copy temporary Excel file to source file, with retries (no GUI access)"""
         try:
+            # Write pending in-memory edits before copying (already on the I/O thread)
+            if self.session_workbook is not None:
+                self.session_workbook.write_now()
+            
             if self.temp_excel_path and self.temp_excel_path.exists():
                 import shutil
                 import time
@@ -953,8 +998,68 @@ class TumorboardSessionPage(QWidget):
             # Re-raise with the detailed error message
             raise e
 
+    def get_session_workbook(self):
+        """Return the in-memory temp workbook, loading it on first use (replays the local journal)"""
+        if self.session_workbook is None or self.session_workbook.excel_path != self.temp_excel_path:
+            self.discard_session_workbook()
+            self.session_workbook = SessionWorkbook(
+                self.temp_excel_path,
+                journal_path=self.session_journal_path,
+                status_callback=self.save_notifier.status_changed.emit
+            )
+        return self.session_workbook
+
+    def discard_session_workbook(self):
+        """Release the in-memory temp workbook and its journal without writing pending edits"""
+        try:
+            if self.session_workbook is not None:
+                self.session_workbook.discard()
+            else:
+                SessionJournal(self.session_journal_path).clear()
+        except Exception as e:
+            logging.error(f"Error discarding session workbook: {e}")
+        self.session_workbook = None
+
+    def on_save_status_changed(self, status, message):
+        """Show the background save status below the buttons"""
+        if status == STATUS_PENDING:
+            self.save_status_label.setStyleSheet("color: #8a9bb0; font-size: 12px;")
+            self.save_status_label.setText("Speichere Änderungen...")
+        elif status == STATUS_SAVED:
+            self.save_status_label.setStyleSheet("color: #8a9bb0; font-size: 12px;")
+            self.save_status_label.setText("Alle Änderungen gespeichert")
+        elif status == STATUS_ERROR:
+            self.save_status_label.setStyleSheet("color: #FF6B35; font-size: 12px; font-weight: bold;")
+            self.save_status_label.setText("Speichern verzögert – Änderungen lokal gesichert, neuer Versuch folgt")
+            logging.warning(f"Background save failed, retrying in 5 seconds: {message}")
+            # Edits are safe in the journal; retry the write later
+            QTimer.singleShot(5000, self.retry_background_save)
+
+    def retry_background_save(self):
+        """Retry writing pending edits after a failed background save"""
+        if self.session_workbook is not None:
+            self.session_workbook.flush_async()
+
+    def wait_for_io(self, future):
+        """Wait for an I/O thread job while keeping the GUI responsive; returns its result or raises"""
+        if not future.done():
+            self.setEnabled(False)
+            loop = QEventLoop()
+            timer = QTimer()
+            timer.timeout.connect(lambda: loop.quit() if future.done() else None)
+            timer.start(50)
+            try:
+                loop.exec()
+            finally:
+                timer.stop()
+                self.setEnabled(True)
+        return future.result()
+
     def cleanup_temp_file(self):
         """Clean up the temporary Excel file"""
+        self.discard_session_workbook()
+        # Cached patient PDFs are not needed after finalization
+        self.pdf_resolver.clear_cache()
         try:
             if self.temp_excel_path and self.temp_excel_path.exists():
                 self.temp_excel_path.unlink()
@@ -1521,6 +1626,12 @@ class TumorboardSessionPage(QWidget):
         self.finalize_button.clicked.connect(self.finalize_tumorboard)
         button_layout.addWidget(self.finalize_button)
         
+        # Background save status (session temp file)
+        self.save_status_label = QLabel("")
+        self.save_status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.save_status_label.setStyleSheet("color: #8a9bb0; font-size: 12px;")
+        button_layout.addWidget(self.save_status_label)
+        
         layout.addLayout(button_layout)
 
     def mark_unsaved_changes(self):
@@ -1601,7 +1712,11 @@ class TumorboardSessionPage(QWidget):
         excel_path = self.temp_excel_path if self.temp_excel_path and self.temp_excel_path.exists() else self.source_excel_path
         
         try:
-            df = pd.read_excel(excel_path, engine='openpyxl')
+            if excel_path == self.temp_excel_path:
+                # Parsed once; reloads after adding/deleting patients are served from memory
+                df = self.get_session_workbook().to_dataframe()
+            else:
+                df = pd.read_excel(excel_path, engine='openpyxl')
             
             if df.empty:
                 logging.warning(f"Excel file is empty: {excel_path}")
@@ -1611,60 +1726,32 @@ class TumorboardSessionPage(QWidget):
             self.patients_data = []
             self.patient_states = {}
             
+            # Clean the whole sheet in one vectorized pass
+            patients = normalize_patient_sheet(df)
+            
             # Extract patient data
-            for index, row in df.iterrows():
-                # Get patient name and check if it's valid
-                patient_name = str(row.get('Name', '')).strip()
-                
-                # Skip empty rows or rows with invalid names
-                if (patient_name == '' or patient_name == 'nan' or 
-                    patient_name.lower() == 'nan' or pd.isna(row.get('Name'))):
-                    continue
-                
-                # Clean patient number - remove .0 if present
-                patient_number_raw = str(row.get('Patientennummer', f'{index + 1}'))
-                if patient_number_raw.endswith('.0'):
-                    patient_number_clean = patient_number_raw[:-2]
-                else:
-                    patient_number_clean = patient_number_raw
-                
-                # Calculate age from birth date
-                birth_date_str = str(row.get('Geburtsdatum', '-'))
-                calculated_age = self.calculate_age(birth_date_str)
-                
-                # Handle ICD code with multiple possible column names and clean data
-                icd_code_raw = row.get('ICD-Code') or row.get('ICD-10') or row.get('ICD Code') or row.get('ICD10') or '-'
-                icd_code = str(icd_code_raw).strip()
-                if icd_code.lower() == 'nan' or pd.isna(icd_code_raw) or icd_code == '':
-                    icd_code = '-'
-                
-                # Get form data and clean it
-                radiotherapy_raw = str(row.get('Radiotherapie indiziert', ''))
-                aufgebot_raw = str(row.get('Art des Aufgebots', ''))
-                bemerkung_raw = str(row.get('Bemerkung/Procedere', ''))
-                studie_raw = str(row.get('Vormerken für Studie', ''))
-                teams_raw = str(row.get('Teams Priorisierung', ''))
-                
-                # Clean form data (handle NaN)
-                radiotherapy = radiotherapy_raw if radiotherapy_raw != 'nan' and not pd.isna(radiotherapy_raw) else ''
-                aufgebot = aufgebot_raw if aufgebot_raw != 'nan' and not pd.isna(aufgebot_raw) else ''
-                bemerkung = bemerkung_raw if bemerkung_raw != 'nan' and not pd.isna(bemerkung_raw) else ''
-                studie = studie_raw if studie_raw != 'nan' and not pd.isna(studie_raw) else ''
-                teams = teams_raw if teams_raw != 'nan' and not pd.isna(teams_raw) else ''
-                
+            text_fields = list(TEXT_COLUMNS) + ['icd_code']
+            display = patients[text_fields].astype(object).where(patients[text_fields].notna(), '')
+            for field in ('diagnosis', 'icd_code'):
+                display[field] = display[field].replace('', '-')
+            birth_dates = patients['birth_date_text'].astype(object).where(patients['birth_date_text'].notna(), '-')
+            ages = patients['age'].map(lambda age: f"{age} Jahre" if pd.notna(age) else "-")
+            
+            for index, values, birth_date_str, calculated_age in zip(
+                    patients.index, display.itertuples(index=False), birth_dates, ages):
                 patient_data = {
                     'index': index,
-                    'name': patient_name,
+                    'name': values.name,
                     'birth_date': birth_date_str,
                     'age': calculated_age,
-                    'diagnosis': str(row.get('Diagnose', '-')),
-                    'icd_code': icd_code,
-                    'patient_number': patient_number_clean,
-                    'radiotherapy': radiotherapy,
-                    'aufgebot': aufgebot,
-                    'teams': teams,
-                    'studie': studie,
-                    'bemerkung': bemerkung
+                    'diagnosis': values.diagnosis,
+                    'icd_code': values.icd_code,
+                    'patient_number': values.patient_number,
+                    'radiotherapy': values.radiotherapy,
+                    'aufgebot': values.aufgebot,
+                    'teams': values.teams,
+                    'studie': values.studie,
+                    'bemerkung': values.bemerkung
                 }
                 self.patients_data.append(patient_data)
                 
@@ -1888,40 +1975,31 @@ class TumorboardSessionPage(QWidget):
         logging.info(f"Loaded patient {patient_index + 1}: {patient['name']}")
 
     def get_current_excel_data_for_patient(self, patient_index):
-        """Get current form data for a patient from Excel file"""
-        # Use temporary Excel file during session
-        excel_path = self.temp_excel_path if self.temp_excel_path and self.temp_excel_path.exists() else self.source_excel_path
-        
+        """Get current form data for a patient from the in-memory session workbook"""
         try:
-            df = pd.read_excel(excel_path, engine='openpyxl')
             patient = self.patients_data[patient_index]
             row_index = patient['index']
             
-            # Get current Excel values
-            radiotherapy = str(df.at[row_index, 'Radiotherapie indiziert']) if 'Radiotherapie indiziert' in df.columns else ''
-            aufgebot = str(df.at[row_index, 'Art des Aufgebots']) if 'Art des Aufgebots' in df.columns else ''
-            teams = str(df.at[row_index, 'Teams Priorisierung']) if 'Teams Priorisierung' in df.columns else ''
-            studie = str(df.at[row_index, 'Vormerken für Studie']) if 'Vormerken für Studie' in df.columns else ''
-            bemerkung = str(df.at[row_index, 'Bemerkung/Procedere']) if 'Bemerkung/Procedere' in df.columns else ''
-            
-            # Clean values (handle NaN)
-            if radiotherapy == 'nan' or pd.isna(radiotherapy):
-                radiotherapy = ''
-            if aufgebot == 'nan' or pd.isna(aufgebot):
-                aufgebot = ''
-            if teams == 'nan' or pd.isna(teams):
-                teams = ''
-            if studie == 'nan' or pd.isna(studie):
-                studie = ''
-            if bemerkung == 'nan' or pd.isna(bemerkung):
-                bemerkung = ''
+            if self.temp_excel_path and self.temp_excel_path.exists():
+                values = self.get_session_workbook().get_row_values(row_index, [
+                    'Radiotherapie indiziert', 'Art des Aufgebots', 'Teams Priorisierung',
+                    'Vormerken für Studie', 'Bemerkung/Procedere'
+                ])
+                return {
+                    'radiotherapy': values['Radiotherapie indiziert'],
+                    'aufgebot': values['Art des Aufgebots'],
+                    'teams': values['Teams Priorisierung'],
+                    'studie': values['Vormerken für Studie'],
+                    'bemerkung': values['Bemerkung/Procedere']
+                }
             
+            # No session file yet - values as loaded from the source file
             return {
-                'radiotherapy': radiotherapy,
-                'aufgebot': aufgebot,
-                'teams': teams,
-                'studie': studie,
-                'bemerkung': bemerkung
+                'radiotherapy': patient.get('radiotherapy', ''),
+                'aufgebot': patient.get('aufgebot', ''),
+                'teams': patient.get('teams', ''),
+                'studie': patient.get('studie', ''),
+                'bemerkung': patient.get('bemerkung', '')
             }
         except Exception as e:
             logging.error(f"Error getting Excel data for patient: {e}")
@@ -1934,68 +2012,50 @@ class TumorboardSessionPage(QWidget):
             }
 
     def load_patient_pdf(self, patient):
-        """Load the PDF for the current patient"""
-        # Extract first word (surname) from patient name
-        patient_name = patient['name'].strip()
-        first_word = patient_name.split()[0] if patient_name else "Unknown"
-        
-        # New PDF naming: "Nachname - Patientennummer.pdf"
-        pdf_filename = f"{first_word} - {patient['patient_number']}.pdf"
-        pdf_path = self.tumorboard_base_path / self.tumorboard_name / self.date_str / pdf_filename
-        
+        """Load the PDF for the current patient (from the local prefetch cache when available)"""
         self.pdf_header_label.setText(f"TB-Anmeldung: {patient['name']}")
         
         if not hasattr(self, 'pdf_viewer'):
             return
         
-        logging.info(f"Attempting to load PDF: {pdf_path}")
+        patient_position = self.patients_data.index(patient) + 1  # Fallback for old naming
+        match = self.pdf_resolver.resolve(patient['name'], patient['patient_number'], patient_position)
         
-        if pdf_path.exists():
+        if match is None:
+            # New PDF naming: "Nachname - Patientennummer.pdf"
+            patient_name = patient['name'].strip()
+            first_word = patient_name.split()[0] if patient_name else "Unknown"
+            pdf_filename = f"{first_word} - {patient['patient_number']}.pdf"
+            logging.warning(f"PDF not found: {pdf_filename}")
+            self.show_pdf_error(f"PDF nicht gefunden: {pdf_filename}")
+        else:
+            pdf_path, zoom, size, mtime_ns = match
+            local_path = self.pdf_resolver.get_local_path(pdf_path, size, mtime_ns)
+            logging.info(f"Attempting to load PDF: {local_path}")
             try:
                 # Convert to absolute path and ensure proper URL format
-                absolute_path = pdf_path.resolve()
+                absolute_path = local_path.resolve()
                 # Use file:// protocol explicitly for better compatibility
                 pdf_url = QUrl.fromLocalFile(str(absolute_path))
                 logging.info(f"Loading PDF URL: {pdf_url.toString()}")
                 
-                # Load PDF with custom settings (no sidebar, 120% zoom)
-                pdf_url_with_params = f"{pdf_url.toString()}#toolbar=1&navpanes=0&scrollbar=1&page=1&zoom=120"
+                # Load PDF with custom settings (no sidebar, zoom depends on naming pattern)
+                pdf_url_with_params = f"{pdf_url.toString()}#toolbar=1&navpanes=0&scrollbar=1&page=1&zoom={zoom}"
                 self.pdf_viewer.setUrl(QUrl(pdf_url_with_params))
                 
-                logging.info(f"Successfully initiated PDF load: {pdf_path}")
+                logging.info(f"Successfully initiated PDF load: {local_path}")
             except Exception as e:
-                logging.error(f"Error loading PDF {pdf_path}: {e}")
+                logging.error(f"Error loading PDF {local_path}: {e}")
                 self.show_pdf_error(f"Error loading PDF: {e}")
-        else:
-            logging.warning(f"PDF not found: {pdf_path}")
-            # Also try alternative naming patterns
-            patient_position = self.patients_data.index(patient) + 1  # Fallback for old naming
-            alt_patterns = [
-                f"{first_word}-{patient['patient_number']}.pdf",  # Without spaces
-                f"{patient['patient_number']}.pdf",  # Just the patient number
-                f"{first_word}_{patient['patient_number']}.pdf",  # Underscore instead of dash
-                f"{first_word} _ {patient['patient_number']}.pdf",  # Spaces with underscore
-                f"{patient_position} - {patient['patient_number']}.pdf",  # Old position-based naming
-                f"{patient_position}-{patient['patient_number']}.pdf",  # Old position-based without spaces
-                f"Patient_{patient_position}.pdf"  # Generic pattern
-            ]
-            
-            for alt_pattern in alt_patterns:
-                alt_path = self.tumorboard_base_path / self.tumorboard_name / self.date_str / alt_pattern
-                if alt_path.exists():
-                    logging.info(f"Found alternative PDF: {alt_path}")
-                    try:
-                        absolute_path = alt_path.resolve()
-                        pdf_url = QUrl.fromLocalFile(str(absolute_path))
-                        # Load with same settings (no sidebar, 115% zoom)
-                        pdf_url_with_params = f"{pdf_url.toString()}#toolbar=1&navpanes=0&scrollbar=1&page=1&zoom=115"
-                        self.pdf_viewer.setUrl(QUrl(pdf_url_with_params))
-                        return
-                    except Exception as e:
-                        logging.error(f"Error loading alternative PDF {alt_path}: {e}")
-                        continue
-            
-            self.show_pdf_error(f"PDF nicht gefunden: {pdf_filename}")
+        
+        self.prefetch_upcoming_pdfs(patient_position)
+
+    def prefetch_upcoming_pdfs(self, patient_position):
+        """Copy the PDFs of the next patients into the local cache in the background"""
+        upcoming = self.patients_data[patient_position:patient_position + PDF_PREFETCH_COUNT]
+        self.pdf_resolver.prefetch(
+            (p['name'], p['patient_number'], self.patients_data.index(p) + 1) for p in upcoming
+        )
 
     def show_pdf_error(self, error_message):
         """Show error message in PDF viewer"""
@@ -2329,44 +2389,53 @@ class TumorboardSessionPage(QWidget):
             error_msg.exec()
             return
         
-        # Export to collection Excel file
-        try:
-            # Skip database sync if using fallback path (not K: drive)
-            skip_db_sync = self.is_using_fallback_path
-            export_success = export_tumorboard_to_collection(self.tumorboard_name, self.date_str, self.tumorboard_base_path, skip_database_sync=skip_db_sync)
-            if export_success:
-                logging.info(f"Successfully exported {self.tumorboard_name} {self.date_str} to collection Excel")
+        # Write the session straight to the central database (only if NOT using fallback path)
+        if not self.is_using_fallback_path:
+            try:
+                from utils.database_utils import TumorboardDatabase
                 
-                # Update database completion tracking (only if NOT using fallback path)
-                if not self.is_using_fallback_path:
-                    try:
-                        from utils.database_utils import TumorboardDatabase
-                        
-                        # Use correct database path based on tumorboard base path
-                        db_path = self.tumorboard_base_path / "__SQLite_database" / "master_tumorboard.db"
-                        db = TumorboardDatabase(db_path=db_path)
-                        
-                        # Use the previously determined finalization status
-                        is_edit = not is_first_time_finalization
-                        
-                        # Update session completion data
-                        success = db.update_session_completion_data(
-                            self.tumorboard_name, 
-                            self.date_str, 
-                            finalized_by=user_name,
-                            is_edit=is_edit
-                        )
-                        
-                        if success:
-                            logging.info(f"Successfully updated session completion tracking for {self.tumorboard_name} {self.date_str}")
-                        else:
-                            logging.warning(f"Failed to update session completion tracking for {self.tumorboard_name} {self.date_str}")
-                            
-                    except Exception as tracking_error:
-                        logging.error(f"Error updating session completion tracking: {tracking_error}")
-                        # Don't fail the entire operation if tracking fails
+                # Use correct database path based on tumorboard base path
+                db_path = self.tumorboard_base_path / "__SQLite_database" / "master_tumorboard.db"
+                db = TumorboardDatabase(db_path=db_path)
+                
+                written = db.upsert_session_patients(self.tumorboard_name, self.date_str, self.patients_data)
+                if written is None:
+                    logging.warning(f"Direct database write failed for {self.tumorboard_name} {self.date_str}")
+                
+                # Use the previously determined finalization status
+                is_edit = not is_first_time_finalization
+                
+                # Update session completion data
+                success = db.update_session_completion_data(
+                    self.tumorboard_name, 
+                    self.date_str, 
+                    finalized_by=user_name,
+                    is_edit=is_edit
+                )
+                
+                if success:
+                    logging.info(f"Successfully updated session completion tracking for {self.tumorboard_name} {self.date_str}")
                 else:
-                    logging.info(f"Skipping database completion tracking for {self.tumorboard_name} {self.date_str} - using fallback path")
+                    logging.warning(f"Failed to update session completion tracking for {self.tumorboard_name} {self.date_str}")
+                    
+            except Exception as tracking_error:
+                logging.error(f"Error writing session to database: {tracking_error}")
+                # Don't fail the entire operation if the database write fails
+        else:
+            logging.info(f"Skipping database write for {self.tumorboard_name} {self.date_str} - using fallback path")
+        
+        # Eagerly update the tumorboard catalog so backoffice pages pick up the session without a tree walk
+        try:
+            TumorboardCatalog(self.tumorboard_base_path).update_session(self.tumorboard_name, self.date_str)
+        except Exception as catalog_error:
+            logging.warning(f"Could not update tumorboard catalog: {catalog_error}")
+        
+        # Export to collection Excel file as deferred background job (off the critical path)
+        try:
+            tumorboard_dir = self.tumorboard_base_path / self.tumorboard_name
+            if find_collection_file(tumorboard_dir) is not None:
+                # Database is already up to date from the direct write above
+                schedule_collection_export(self.tumorboard_name, self.date_str, self.tumorboard_base_path, skip_database_sync=True)
                 
                 # Export patients by category to backoffice Excel files (only on first finalization)
                 if is_first_time_finalization:
@@ -2385,50 +2454,39 @@ class TumorboardSessionPage(QWidget):
             else:
                 logging.warning(f"Export to collection Excel failed for {self.tumorboard_name} {self.date_str}")
                 # Show error message to user if collection file doesn't exist
-                tumorboard_dir = self.tumorboard_base_path / self.tumorboard_name
-                collection_file_found = False
-                collection_file_name = "alle_tumorboards_*.xlsx"
-                
-                # Check if any collection file exists
-                for file in tumorboard_dir.glob("alle_tumorboards_*.xlsx"):
-                    collection_file_found = True
-                    collection_file_name = file.name
-                    break
-                
-                if not collection_file_found:
-                    error_msg = QMessageBox(self)
-                    error_msg.setWindowTitle("Export-Fehler")
-                    error_msg.setText(f"Die Sammel-Excel-Datei für {self.tumorboard_name} wurde nicht gefunden.\n\n"
-                                    f"Erwartet wird eine Datei mit dem Namen 'alle_tumorboards_*.xlsx' im Ordner:\n"
-                                    f"{tumorboard_dir}\n\n"
-                                    f"Das Tumorboard wurde erfolgreich abgeschlossen, aber der Export in die "
-                                    f"Sammel-Excel-Datei ist fehlgeschlagen.\n\n"
-                                    f"Bitte wenden Sie sich an Ihren Administrator.")
-                    error_msg.setIcon(QMessageBox.Icon.Warning)
-                    error_msg.setStandardButtons(QMessageBox.StandardButton.Ok)
-                    error_msg.setStyleSheet("""
-                        QMessageBox {
-                            background-color: #1a2633;
-                            color: white;
-                        }
-                        QMessageBox QLabel {
-                            color: white;
-                            font-size: 14px;
-                        }
-                        QPushButton {
-                            background-color: #114473;
-                            color: white;
-                            border: none;
-                            border-radius: 4px;
-                            padding: 8px 16px;
-                            font-weight: bold;
-                            min-width: 80px;
-                        }
-                        QPushButton:hover {
-                            background-color: #1a5a9e;
-                        }
-                    """)
-                    error_msg.exec()
+                error_msg = QMessageBox(self)
+                error_msg.setWindowTitle("Export-Fehler")
+                error_msg.setText(f"Die Sammel-Excel-Datei für {self.tumorboard_name} wurde nicht gefunden.\n\n"
+                                f"Erwartet wird eine Datei mit dem Namen 'alle_tumorboards_*.xlsx' im Ordner:\n"
+                                f"{tumorboard_dir}\n\n"
+                                f"Das Tumorboard wurde erfolgreich abgeschlossen, aber der Export in die "
+                                f"Sammel-Excel-Datei ist fehlgeschlagen.\n\n"
+                                f"Bitte wenden Sie sich an Ihren Administrator.")
+                error_msg.setIcon(QMessageBox.Icon.Warning)
+                error_msg.setStandardButtons(QMessageBox.StandardButton.Ok)
+                error_msg.setStyleSheet("""
+                    QMessageBox {
+                        background-color: #1a2633;
+                        color: white;
+                    }
+                    QMessageBox QLabel {
+                        color: white;
+                        font-size: 14px;
+                    }
+                    QPushButton {
+                        background-color: #114473;
+                        color: white;
+                        border: none;
+                        border-radius: 4px;
+                        padding: 8px 16px;
+                        font-weight: bold;
+                        min-width: 80px;
+                    }
+                    QPushButton:hover {
+                        background-color: #1a5a9e;
+                    }
+                """)
+                error_msg.exec()
         except Exception as e:
             logging.error(f"Error during collection Excel export: {e}")
             # Show generic error message to user
@@ -2571,76 +2629,39 @@ class TumorboardSessionPage(QWidget):
         logging.info("Tumorboard finalization completed")
 
     def save_to_excel(self, skip_edit_logging=False):
-        """Save all patient data back to Excel file"""
+        """Save all patient data to the session workbook (changed cells only, written in the background)"""
         # Ensure temp file exists for editing
         if not self.ensure_temp_file_exists():
             logging.error("Cannot save to Excel - failed to ensure temp file exists")
             raise Exception("Temporäre Datei konnte nicht erstellt werden")
         
-        # Use temporary Excel file during session, source file only during finalization
-        excel_path = self.temp_excel_path if self.temp_excel_path and self.temp_excel_path.exists() else self.source_excel_path
-        
-        # Check if file is accessible before attempting to save
-        is_accessible, access_error = self.check_excel_file_access(excel_path)
-        if not is_accessible:
-            logging.error(f"Excel file not accessible for writing: {access_error}")
-            self.show_excel_locked_error("Patientendaten speichern", excel_path)
-            raise Exception(f"Excel-Datei ist gesperrt: {access_error}")
+        # No lock check here: the file is written by the session I/O thread, which retries
+        # and reports failures via the save status (edits are kept in the local journal)
         
-        # Read current Excel file
-        df = pd.read_excel(excel_path, engine='openpyxl')
+        workbook = self.get_session_workbook()
         
         # Track which patients were changed (for edit logging)
         changed_patients = []
         
-        # Update the relevant columns using the original Excel index
+        # Patch only cells whose value differs, using the original Excel index
         for patient in self.patients_data:
-            row_index = patient['index']
-            
-            # Check if data changed from what's in Excel
-            current_radio = str(df.at[row_index, 'Radiotherapie indiziert']) if 'Radiotherapie indiziert' in df.columns else ''
-            current_aufgebot = str(df.at[row_index, 'Art des Aufgebots']) if 'Art des Aufgebots' in df.columns else ''
-            current_teams = str(df.at[row_index, 'Teams Priorisierung']) if 'Teams Priorisierung' in df.columns else ''
-            current_studie = str(df.at[row_index, 'Vormerken für Studie']) if 'Vormerken für Studie' in df.columns else ''
-            current_bemerkung = str(df.at[row_index, 'Bemerkung/Procedere']) if 'Bemerkung/Procedere' in df.columns else ''
-            
-            # Clean current values (handle NaN)
-            if current_radio == 'nan' or pd.isna(current_radio):
-                current_radio = ''
-            if current_aufgebot == 'nan' or pd.isna(current_aufgebot):
-                current_aufgebot = ''
-            if current_teams == 'nan' or pd.isna(current_teams):
-                current_teams = ''
-            if current_studie == 'nan' or pd.isna(current_studie):
-                current_studie = ''
-            if current_bemerkung == 'nan' or pd.isna(current_bemerkung):
-                current_bemerkung = ''
-            
-            # Get patient teams data (default to empty string if not present)
-            patient_teams = patient.get('teams', '')
-            
-            # Check if any field changed
-            if (patient['radiotherapy'] != current_radio or 
-                patient['aufgebot'] != current_aufgebot or 
-                patient_teams != current_teams or
-                patient['studie'] != current_studie or
-                patient['bemerkung'] != current_bemerkung):
+            changed = workbook.set_row_values(patient['index'], {
+                'Radiotherapie indiziert': patient['radiotherapy'],
+                'Art des Aufgebots': patient['aufgebot'],
+                'Teams Priorisierung': patient.get('teams', ''),
+                'Vormerken für Studie': patient['studie'],
+                'Bemerkung/Procedere': patient['bemerkung']
+            })
+            if changed:
                 changed_patients.append(patient['patient_number'])
-            
-            # Update the fields
-            df.at[row_index, 'Radiotherapie indiziert'] = patient['radiotherapy']
-            df.at[row_index, 'Art des Aufgebots'] = patient['aufgebot']
-            df.at[row_index, 'Teams Priorisierung'] = patient_teams
-            df.at[row_index, 'Vormerken für Studie'] = patient['studie']
-            df.at[row_index, 'Bemerkung/Procedere'] = patient['bemerkung']
         
-        # Save back to Excel
-        df.to_excel(excel_path, index=False, engine='openpyxl')
+        # Write back in the background; finalization flushes synchronously before copying
+        workbook.flush_async()
         
         # Note: Edit logging is now only done during finalization to avoid redundant entries
         # Individual saves during session do not create timestamp entries
         
-        logging.info(f"Saved patient data to Excel: {excel_path}")
+        logging.info(f"Saved patient data to session workbook ({len(changed_patients)} changed): {self.temp_excel_path}")
 
     @staticmethod
     def get_benutzerdaten():
@@ -2826,31 +2847,21 @@ class TumorboardSessionPage(QWidget):
 
     def delete_patient_from_excel(self, row_index):
         """Delete a patient row from the temporary Excel file"""
-        # Use temporary Excel file during session
-        excel_path = self.temp_excel_path if self.temp_excel_path and self.temp_excel_path.exists() else self.source_excel_path
+        # Ensure temp file exists for editing
+        if not self.ensure_temp_file_exists():
+            raise Exception("Temporäre Datei konnte nicht erstellt werden")
         
-        # Check if file is accessible before attempting to save
-        is_accessible, access_error = self.check_excel_file_access(excel_path)
-        if not is_accessible:
-            logging.error(f"Excel file not accessible for deleting patient: {access_error}")
-            self.show_excel_locked_error("Patienten löschen", excel_path)
-            raise Exception(f"Excel-Datei ist gesperrt: {access_error}")
+        # No lock check here: the file is written by the session I/O thread, which retries
+        # and reports failures via the save status (edits are kept in the local journal)
         
         try:
-            # Read current Excel file
-            df = pd.read_excel(excel_path, engine='openpyxl')
-            
-            # Check if row index is valid
-            if row_index < 0 or row_index >= len(df):
-                raise ValueError(f"Invalid row index {row_index}. Excel has {len(df)} rows.")
-            
-            # Drop the row at the specified index
-            df = df.drop(index=row_index).reset_index(drop=True)
+            workbook = self.get_session_workbook()
             
-            # Save back to Excel
-            df.to_excel(excel_path, index=False, engine='openpyxl')
+            # Following rows move up, like DataFrame.drop().reset_index()
+            workbook.delete_row(row_index)
+            workbook.flush_async()
             
-            logging.info(f"Successfully deleted row {row_index} from Excel file: {excel_path}")
+            logging.info(f"Successfully deleted row {row_index} from Excel file: {self.temp_excel_path}")
             
         except Exception as e:
             logging.error(f"Error deleting patient from Excel: {e}")
@@ -3025,27 +3036,18 @@ class TumorboardSessionPage(QWidget):
 
     def add_patient_to_excel(self, patient_data):
         """Add a new patient to the Excel file in the first available empty row"""
-        # Use temporary Excel file during session
-        excel_path = self.temp_excel_path if self.temp_excel_path and self.temp_excel_path.exists() else self.source_excel_path
+        # Ensure temp file exists for editing
+        if not self.ensure_temp_file_exists():
+            raise Exception("Temporäre Datei konnte nicht erstellt werden")
         
-        # Check if file is accessible before attempting to save
-        is_accessible, access_error = self.check_excel_file_access(excel_path)
-        if not is_accessible:
-            logging.error(f"Excel file not accessible for adding patient: {access_error}")
-            self.show_excel_locked_error("Neuen Patienten hinzufügen", excel_path)
-            raise Exception(f"Excel-Datei ist gesperrt: {access_error}")
+        # No lock check here: the file is written by the session I/O thread, which retries
+        # and reports failures via the save status (edits are kept in the local journal)
         
         try:
-            # Read current Excel file
-            df = pd.read_excel(excel_path, engine='openpyxl')
+            workbook = self.get_session_workbook()
             
             # Find the correct ICD column name (check multiple possibilities)
-            icd_column = None
-            possible_icd_columns = ['ICD-10', 'ICD-Code', 'ICD Code', 'ICD10']
-            for col in possible_icd_columns:
-                if col in df.columns:
-                    icd_column = col
-                    break
+            icd_column = workbook.find_column(['ICD-10', 'ICD-Code', 'ICD Code', 'ICD10'])
             
             # If no ICD column found, use the first one as default
             if icd_column is None:
@@ -3056,31 +3058,15 @@ class TumorboardSessionPage(QWidget):
             columns_to_check = ['Name', 'Geburtsdatum', 'Diagnose', icd_column, 'Patientennummer', 
                                'Radiotherapie indiziert', 'Art des Aufgebots', 'Teams Priorisierung', 'Vormerken für Studie', 'Bemerkung/Procedere']
             
-            # Find the first empty row by checking if all relevant columns are empty/NaN
-            insert_row_index = None
-            for index, row in df.iterrows():
-                is_empty_row = True
-                for col in columns_to_check:
-                    if col in df.columns:
-                        cell_value = row[col]
-                        # Check if cell is not empty (not NaN, not empty string, not just whitespace)
-                        if pd.notna(cell_value) and str(cell_value).strip() != '':
-                            is_empty_row = False
-                            break
-                
-                if is_empty_row:
-                    insert_row_index = index
-                    break
-            
-            # If no empty row found, append at the end
-            if insert_row_index is None:
-                insert_row_index = len(df)
+            # Find the first empty row, or append at the end
+            insert_row_index = workbook.find_empty_row([col for col in columns_to_check if col in workbook.columns])
+            if insert_row_index >= workbook.row_count():
                 logging.info(f"No empty row found, appending new patient at row {insert_row_index}")
             else:
                 logging.info(f"Found empty row at index {insert_row_index}, inserting new patient there")
             
-            # Prepare new patient data using correct column names
-            new_patient_data = {
+            # Patch the new patient's cells
+            workbook.set_row_values(insert_row_index, {
                 'Name': patient_data['name'],
                 'Geburtsdatum': patient_data['birth_date'],
                 'Diagnose': patient_data['diagnosis'],
@@ -3091,24 +3077,12 @@ class TumorboardSessionPage(QWidget):
                 'Teams Priorisierung': '',
                 'Vormerken für Studie': '',
                 'Bemerkung/Procedere': ''
-            }
-            
-            # If inserting at the end, add a new row
-            if insert_row_index >= len(df):
-                # Create a new row and append
-                new_row_df = pd.DataFrame([new_patient_data])
-                df = pd.concat([df, new_row_df], ignore_index=True)
-            else:
-                # Insert into existing empty row
-                for col_name, value in new_patient_data.items():
-                    if col_name in df.columns:
-                        df.at[insert_row_index, col_name] = value
+            })
             
             # Update the patient's index to the correct row
             patient_data['index'] = insert_row_index
             
-            # Save back to Excel
-            df.to_excel(excel_path, index=False, engine='openpyxl')
+            workbook.flush_async()
             
             logging.info(f"Successfully added patient {patient_data['name']} to Excel file at row {insert_row_index}")
             
@@ -3188,7 +3162,6 @@ class TumorboardSessionPage(QWidget):
     def get_file_lock_info(self, file_path):
         """Get basic information about file locking (simplified version without external dependencies)"""
         try:
-            import os
             import platform
             
             # Basic check - just try to detect if it's likely Excel
@@ -3268,6 +3241,10 @@ class TumorboardSessionPage(QWidget):
     def ensure_temp_file_exists(self):
         """Ensure temporary file exists for editing, create if necessary"""
         try:
+            # Loaded session workbook: the temp file is written by the I/O thread, no network check needed
+            if self.session_workbook is not None and self.session_workbook.excel_path == self.temp_excel_path:
+                return True
+            
             # If temp file doesn't exist, create it
             if not self.temp_excel_path or not self.temp_excel_path.exists():
                 # Create temporary file name
@@ -3409,27 +3386,15 @@ class TumorboardSessionPage(QWidget):
         if not self.ensure_temp_file_exists():
             raise Exception("Temporäre Datei konnte nicht erstellt werden")
         
-        # Use temporary Excel file
-        excel_path = self.temp_excel_path
-        
-        # Check if file is accessible before attempting to save
-        is_accessible, access_error = self.check_excel_file_access(excel_path)
-        if not is_accessible:
-            logging.error(f"Excel file not accessible for ICD change: {access_error}")
-            self.show_excel_locked_error("ICD-Code ändern", excel_path)
-            raise Exception(f"Excel-Datei ist gesperrt: {access_error}")
+        # No lock check here: the file is written by the session I/O thread, which retries
+        # and reports failures via the save status (edits are kept in the local journal)
         
         try:
-            # Read current Excel file
-            df = pd.read_excel(excel_path, engine='openpyxl')
+            workbook = self.get_session_workbook()
+            columns = workbook.columns
             
             # Find the correct ICD column name (check multiple possibilities)
-            icd_column = None
-            possible_icd_columns = ['ICD-10', 'ICD-Code', 'ICD Code', 'ICD10']
-            for col in possible_icd_columns:
-                if col in df.columns:
-                    icd_column = col
-                    break
+            icd_column = workbook.find_column(['ICD-10', 'ICD-Code', 'ICD Code', 'ICD10'])
             
             # If no ICD column found, use 'ICD-10' as default
             if icd_column is None:
@@ -3437,12 +3402,12 @@ class TumorboardSessionPage(QWidget):
                 logging.warning(f"No ICD column found, using default: {icd_column}")
             
             # Update the ICD code in the specified row
-            df.at[patient_row_index, icd_column] = new_icd_code
+            workbook.set_value(patient_row_index, icd_column, new_icd_code)
             
             # Find and update ICD description column if it exists and we have a new description
             if new_description and new_description not in ['-', '']:
                 # Log all available columns for debugging
-                logging.info(f"All available columns in Excel: {list(df.columns)}")
+                logging.info(f"All available columns in Excel: {columns}")
                 
                 # Look for possible description column names (expanded list)
                 description_column = None
@@ -3454,15 +3419,13 @@ class TumorboardSessionPage(QWidget):
                 ]
                 
                 # First try exact matches
-                for col in possible_description_columns:
-                    if col in df.columns:
-                        description_column = col
-                        logging.info(f"Found exact match for ICD description column: '{col}'")
-                        break
+                description_column = workbook.find_column(possible_description_columns)
+                if description_column:
+                    logging.info(f"Found exact match for ICD description column: '{description_column}'")
                 
                 # If no exact match, try partial matches (case-insensitive)
                 if not description_column:
-                    for col in df.columns:
+                    for col in columns:
                         col_lower = str(col).lower()
                         if ('beschreibung' in col_lower and 'icd' in col_lower) or \
                            ('description' in col_lower and 'icd' in col_lower) or \
@@ -3478,14 +3441,14 @@ class TumorboardSessionPage(QWidget):
                     if clean_description.startswith('ICD-Code: '):
                         clean_description = clean_description[10:]  # Remove "ICD-Code: " prefix
                     
-                    logging.info(f"Updating ICD description in column '{description_column}' from '{df.at[patient_row_index, description_column]}' to '{clean_description}'")
-                    df.at[patient_row_index, description_column] = clean_description
+                    logging.info(f"Updating ICD description in column '{description_column}' from '{workbook.get_value(patient_row_index, description_column)}' to '{clean_description}'")
+                    workbook.set_value(patient_row_index, description_column, clean_description)
                     logging.info(f"Successfully updated ICD description in column '{description_column}' with: {clean_description}")
                 else:
-                    logging.warning(f"No ICD description column found in Excel file. Available columns: {list(df.columns)}")
+                    logging.warning(f"No ICD description column found in Excel file. Available columns: {columns}")
             
-            # Save back to Excel
-            df.to_excel(excel_path, index=False, engine='openpyxl')
+            # Write back in the background
+            workbook.flush_async()
             
             logging.info(f"Successfully updated ICD code in Excel file at row {patient_row_index}")
             
@@ -3667,71 +3630,29 @@ class TumorboardSessionPage(QWidget):
 
 # ICD Database Helper Functions
 def load_icd_database():
-    """Load ICD database from JSON file"""
-    print("DEBUG: Starting to load ICD database...")
-    try:
-        # Get the path to the JSON file in utils folder
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        parent_dir = os.path.dirname(current_dir)
-        json_path = os.path.join(parent_dir, 'utils', 'icd_database.json')
-        
-        print(f"DEBUG: Looking for JSON file at: {json_path}")
-        print(f"DEBUG: JSON file exists: {os.path.exists(json_path)}")
-        
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            print(f"DEBUG: Successfully loaded ICD database with {len(data)} entries")
-            return data
-    except Exception as e:
-        print(f"ERROR: Failed to load ICD database: {e}")
-        logging.error(f"Error loading ICD database: {e}")
-        return {}
+    """Return the ICD database (code -> description) from the process-wide ICD index"""
+    return get_icd_index().entries
 
 def search_by_code(search_term):
-    """Search ICD codes by code pattern (prefix matching)"""
-    print(f"DEBUG: search_by_code called with term: '{search_term}'")
+    """Search ICD codes by code pattern (exact, prefix, then contains matches)"""
     try:
-        icd_database = load_icd_database()
-        if not icd_database:
-            print("ERROR: ICD database is empty or failed to load")
+        icd_index = get_icd_index()
+        if not len(icd_index):
             logging.warning("ICD database is empty or failed to load")
             return []
-            
-        search_term = search_term.upper().strip()
-        print(f"DEBUG: Normalized search term: '{search_term}'")
-        results = []
-        
-        for code, description in icd_database.items():
-            if search_term in code:  # Contains search (not just prefix)
-                results.append((code, description))
-        
-        print(f"DEBUG: Found {len(results)} results before sorting/limiting")
-        final_results = sorted(results)[:50]  # Limit to 50 results
-        print(f"DEBUG: Returning {len(final_results)} results")
-        return final_results
+        return icd_index.search_code(search_term)
     except Exception as e:
-        print(f"ERROR: Exception in search_by_code: {e}")
-        import traceback
-        print(f"ERROR: Traceback: {traceback.format_exc()}")
         logging.error(f"Error in search_by_code: {e}")
         return []
 
 def search_by_description(search_term):
-    """Search ICD codes by description (case-insensitive substring matching)"""
+    """Search ICD codes by description (ranked token-prefix matching, umlaut-insensitive)"""
     try:
-        icd_database = load_icd_database()
-        if not icd_database:
+        icd_index = get_icd_index()
+        if not len(icd_index):
             logging.warning("ICD database is empty or failed to load")
             return []
-            
-        search_term = search_term.lower().strip()
-        results = []
-        
-        for code, description in icd_database.items():
-            if search_term in description.lower():
-                results.append((code, description))
-        
-        return sorted(results)[:50]  # Limit to 50 results
+        return icd_index.search_description(search_term)
     except Exception as e:
         logging.error(f"Error in search_by_description: {e}")
         return []
@@ -3742,21 +3663,17 @@ def get_icd_description_from_database(icd_code):
         if not icd_code or str(icd_code).strip() in ['-', '', 'nan']:
             return '-'
         
-        icd_database = load_icd_database()
-        if not icd_database:
+        icd_index = get_icd_index()
+        if not len(icd_index):
             logging.warning("ICD database is empty or failed to load")
             return f"ICD-Code: {icd_code}"
             
         icd_code = str(icd_code).strip().upper()
         
-        # Try exact match first
-        if icd_code in icd_database:
-            return icd_database[icd_code]
-        
-        # Try to match first 3 characters (main category)
-        main_code = icd_code[:3]
-        if main_code in icd_database:
-            return icd_database[main_code]
+        # Exact match first, then the main category (first 3 characters)
+        description = icd_index.get_description(icd_code)
+        if description:
+            return description
         
         # If no match found, return the code itself
         return f"ICD-Code: {icd_code}"
@@ -3765,34 +3682,38 @@ def get_icd_description_from_database(icd_code):
         return f"ICD-Code: {icd_code}"
 
 
+# Pause in typing before the ICD editor searches (same idea as the SOP search field)
+ICD_SEARCH_DEBOUNCE_MS = 150
+
+
 class ICDEditorDialog(QDialog):
     """Dialog for searching and editing ICD codes"""
     
     def __init__(self, current_icd_code="", parent=None):
-        print(f"DEBUG: ICDEditorDialog.__init__ called with ICD: '{current_icd_code}'")
         try:
             super().__init__(parent)
-            print("DEBUG: Dialog parent class initialized")
             
             self.setWindowTitle("ICD-Code bearbeiten")
             self.setModal(True)
             self.setFixedSize(800, 600)
-            print("DEBUG: Dialog window properties set")
             
             self.current_icd_code = current_icd_code
             self.selected_icd_code = current_icd_code
             self.selected_description = ""
-            print("DEBUG: Dialog instance variables initialized")
+            
+            # Search while typing, once the input pauses (every search rebuilds up to 50 result buttons)
+            self.code_search_timer = QTimer(self)
+            self.code_search_timer.setSingleShot(True)
+            self.code_search_timer.timeout.connect(self.search_by_code)
+            self.desc_search_timer = QTimer(self)
+            self.desc_search_timer.setSingleShot(True)
+            self.desc_search_timer.timeout.connect(self.search_by_description)
             
             # Get current description
             if current_icd_code and current_icd_code != '-':
-                print("DEBUG: Getting description for current ICD code...")
                 self.selected_description = get_icd_description_from_database(current_icd_code)
-                print(f"DEBUG: Got description: '{self.selected_description}'")
             
-            print("DEBUG: Calling setup_ui...")
             self.setup_ui()
-            print("DEBUG: ICDEditorDialog initialization completed successfully")
         except Exception as e:
             print(f"ERROR: Exception in ICDEditorDialog.__init__: {e}")
             import traceback
@@ -3855,6 +3776,8 @@ class ICDEditorDialog(QDialog):
         """)
         # Prevent Enter from being passed to dialog and ensure it only triggers search
         self.code_search_input.returnPressed.connect(self.search_by_code)
+        # Live search from the in-memory ICD index (debounced)
+        self.code_search_input.textChanged.connect(self.on_code_search_text_changed)
         code_search_layout.addWidget(self.code_search_input)
         
         search_section.addLayout(code_search_layout)
@@ -3883,6 +3806,7 @@ class ICDEditorDialog(QDialog):
         """)
         # Prevent Enter from being passed to dialog and ensure it only triggers search
         self.desc_search_input.returnPressed.connect(self.search_by_description)
+        self.desc_search_input.textChanged.connect(self.on_desc_search_text_changed)
         desc_search_layout.addWidget(self.desc_search_input)
         
         search_section.addLayout(desc_search_layout)
@@ -4006,11 +3930,9 @@ class ICDEditorDialog(QDialog):
     
     def show_initial_message(self):
         """Show initial message in results area"""
-        print("DEBUG: show_initial_message called")
         
         # Clear existing results
         try:
-            print("DEBUG: Clearing existing results for initial message...")
             for i in reversed(range(self.results_layout.count())):
                 item = self.results_layout.itemAt(i)
                 if item is not None:
@@ -4020,43 +3942,46 @@ class ICDEditorDialog(QDialog):
                     else:
                         # Handle spacer items
                         self.results_layout.removeItem(item)
-            print("DEBUG: Layout cleared for initial message successfully")
         except Exception as e:
             print(f"ERROR: Error clearing initial message layout: {e}")
             logging.error(f"Error clearing initial message layout: {e}")
         
         try:
-            print("DEBUG: Creating initial message label...")
             message_label = QLabel("Geben Sie mindestens 2 Zeichen in eines der Suchfelder ein und drücken Sie Enter.")
             message_label.setStyleSheet("color: #888888; font-style: italic; padding: 20px;")
             message_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.results_layout.addWidget(message_label)
             self.results_layout.addStretch()
-            print("DEBUG: Initial message label created and added successfully")
         except Exception as e:
             print(f"ERROR: Error creating initial message label: {e}")
             import traceback
             print(f"ERROR: Traceback: {traceback.format_exc()}")
     
+    def on_code_search_text_changed(self, text):
+        """Live code search while typing"""
+        self.code_search_timer.stop()
+        if len(text.strip()) >= 2:
+            self.code_search_timer.start(ICD_SEARCH_DEBOUNCE_MS)
+    
+    def on_desc_search_text_changed(self, text):
+        """Live description search while typing"""
+        self.desc_search_timer.stop()
+        if len(text.strip()) >= 2:
+            self.desc_search_timer.start(ICD_SEARCH_DEBOUNCE_MS)
+    
     def search_by_code(self):
         """Search for ICD codes by code pattern"""
-        print("DEBUG: Dialog search_by_code method called")
+        self.code_search_timer.stop()  # Enter searches right away
         try:
             search_term = self.code_search_input.text().strip()
-            print(f"DEBUG: Search term from input field: '{search_term}'")
             
             if len(search_term) < 2:
-                print("DEBUG: Search term too short, showing message")
                 self.show_message("Bitte geben Sie mindestens 2 Zeichen ein.")
                 return
             
-            print("DEBUG: Calling global search_by_code function...")
             results = search_by_code(search_term)
-            print(f"DEBUG: Got {len(results)} results from search function")
             
-            print("DEBUG: Calling display_results...")
             self.display_results(results, f"Suchergebnisse für Code '{search_term}':")
-            print("DEBUG: display_results completed successfully")
         except Exception as e:
             print(f"ERROR: Exception in dialog search_by_code: {e}")
             import traceback
@@ -4066,6 +3991,7 @@ class ICDEditorDialog(QDialog):
     
     def search_by_description(self):
         """Search for ICD codes by description"""
+        self.desc_search_timer.stop()  # Enter searches right away
         try:
             search_term = self.desc_search_input.text().strip()
             
@@ -4081,11 +4007,9 @@ class ICDEditorDialog(QDialog):
     
     def display_results(self, results, title):
         """Display search results"""
-        print(f"DEBUG: display_results called with {len(results)} results, title: '{title}'")
         
         # Clear existing results
         try:
-            print("DEBUG: Clearing existing results layout...")
             for i in reversed(range(self.results_layout.count())):
                 item = self.results_layout.itemAt(i)
                 if item is not None:
@@ -4095,33 +4019,27 @@ class ICDEditorDialog(QDialog):
                     else:
                         # Handle spacer items
                         self.results_layout.removeItem(item)
-            print("DEBUG: Layout cleared successfully")
         except Exception as e:
             print(f"ERROR: Error clearing results layout: {e}")
             logging.error(f"Error clearing results layout: {e}")
         
         if not results:
-            print("DEBUG: No results, showing 'no results' message")
             self.show_message("Keine Treffer gefunden.")
             return
         
-        print("DEBUG: Creating title label...")
         # Title
         try:
             title_label = QLabel(title)
             title_label.setFont(QFont("Helvetica", 10, QFont.Weight.Bold))
             title_label.setStyleSheet("color: #4FC3F7; margin-bottom: 10px;")
             self.results_layout.addWidget(title_label)
-            print("DEBUG: Title label added successfully")
         except Exception as e:
             print(f"ERROR: Error creating title label: {e}")
             return
         
         # Results
-        print(f"DEBUG: Creating {len(results)} result buttons...")
         try:
             for i, (code, description) in enumerate(results):
-                print(f"DEBUG: Creating button {i+1}/{len(results)}: {code}")
                 result_button = QPushButton(f"{code} - {description}")
                 result_button.setAutoDefault(False)  # Prevent default button behavior
                 result_button.setStyleSheet("""
@@ -4144,8 +4062,6 @@ class ICDEditorDialog(QDialog):
                 """)
                 result_button.clicked.connect(lambda checked, c=code, d=description: self.select_result(c, d))
                 self.results_layout.addWidget(result_button)
-                print(f"DEBUG: Button {i+1} added successfully")
-            print("DEBUG: All result buttons created successfully")
         except Exception as e:
             print(f"ERROR: Error creating result buttons: {e}")
             import traceback
@@ -4153,30 +4069,24 @@ class ICDEditorDialog(QDialog):
             return
         
         if len(results) >= 50:
-            print("DEBUG: Adding info label for 50+ results...")
             try:
                 info_label = QLabel("Nur die ersten 50 Treffer werden angezeigt. Verfeinern Sie Ihre Suche für spezifischere Ergebnisse.")
                 info_label.setStyleSheet("color: #FFA500; font-style: italic; margin-top: 10px; font-size: 12px;")
                 info_label.setWordWrap(True)
                 self.results_layout.addWidget(info_label)
-                print("DEBUG: Info label added successfully")
             except Exception as e:
                 print(f"ERROR: Error adding info label: {e}")
         
-        print("DEBUG: Adding stretch to layout...")
         try:
             self.results_layout.addStretch()
-            print("DEBUG: display_results completed successfully")
         except Exception as e:
             print(f"ERROR: Error adding stretch: {e}")
     
     def show_message(self, message):
         """Show a message in the results area"""
-        print(f"DEBUG: show_message called with message: '{message}'")
         
         # Clear existing results
         try:
-            print("DEBUG: Clearing existing results for message...")
             for i in reversed(range(self.results_layout.count())):
                 item = self.results_layout.itemAt(i)
                 if item is not None:
@@ -4186,19 +4096,16 @@ class ICDEditorDialog(QDialog):
                     else:
                         # Handle spacer items
                         self.results_layout.removeItem(item)
-            print("DEBUG: Layout cleared for message successfully")
         except Exception as e:
             print(f"ERROR: Error clearing message layout: {e}")
             logging.error(f"Error clearing message layout: {e}")
         
         try:
-            print("DEBUG: Creating message label...")
             message_label = QLabel(message)
             message_label.setStyleSheet("color: #FFA500; font-style: italic; padding: 20px;")
             message_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.results_layout.addWidget(message_label)
             self.results_layout.addStretch()
-            print("DEBUG: Message label created and added successfully")
         except Exception as e:
             print(f"ERROR: Error creating message label: {e}")
             import traceback
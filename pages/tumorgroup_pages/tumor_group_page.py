@@ -3,19 +3,9 @@ from PyQt6.QtWidgets import QWidget, QGridLayout, QVBoxLayout, QScrollArea
 from PyQt6.QtCore import Qt
 import os
 import logging
-# Import existing group pages
-from pages.tumorgroup_pages.neuroonkologie_page import NeuroonkologiePage
-from pages.tumorgroup_pages.bindegewebstumore_page import BindegewebstumorePage
-# Import the NEW specific group pages
-from pages.tumorgroup_pages.KopfHalsTumorePage import KopfHalsTumorePage
-from pages.tumorgroup_pages.ThorakaleTumorePage import ThorakaleTumorePage
-from pages.tumorgroup_pages.GastrointestinaleTumorePage import GastrointestinaleTumorePage
-from pages.tumorgroup_pages.UrogenitaleTumorePage import UrogenitaleTumorePage
-from pages.tumorgroup_pages.GynPage import GynPage
-from pages.tumorgroup_pages.HauttumorePage import HauttumorePage
-from pages.tumorgroup_pages.LymphomePage import LymphomePage
-from pages.tumorgroup_pages.FernmetastasenPage import FernmetastasenPage
-from pages.tumorgroup_pages.GutartigeErkrankungenPage import GutartigeErkrankungenPage
+# Group pages are imported on first click (see utils/page_registry.py)
+from utils.page_registry import GROUP_PAGES, get_page_class
+from utils.asset_thumbnails import get_thumbnail_loader, device_pixel_ratio
 
 class TumorGroupPage(QWidget):
     def __init__(self, main_window):
@@ -112,25 +102,20 @@ class TumorGroupPage(QWidget):
         page_layout.setContentsMargins(0, 0, 0, 0) # No margins for the page layout itself
         page_layout.addWidget(scroll_area) # Add the scroll area to the page layout
 
+        # Render the entity tile images of the group pages in the background, so the first
+        # click on a group does not wait for PNG decoding (see utils/asset_thumbnails.py)
+        contours_dir = os.path.join(assets_dir, "contours_images")
+        if os.path.isdir(contours_dir):
+            contour_images = [os.path.join(contours_dir, name) for name in os.listdir(contours_dir)
+                              if name.lower().endswith(".png")]
+            get_thumbnail_loader().prefetch(contour_images, 200, radius=10, dpr=device_pixel_ratio(self))
+
     def open_group_page(self, group_name):
         logging.info(f"Opening page for tumor group: {group_name}")
         target_page_class = None
-        # Map group names to their specific page classes
-        group_page_map = {
-            "Neuroonkologie": NeuroonkologiePage,
-            "Kopf-Hals-Tumore": KopfHalsTumorePage,
-            "Thorakale Tumore": ThorakaleTumorePage,
-            "Gastrointestinale Tumore": GastrointestinaleTumorePage,
-            "Urogenitale Tumore": UrogenitaleTumorePage,
-            "Gynäkologische Tumore": GynPage,
-            "Bindegewebstumore": BindegewebstumorePage,
-            "Hauttumore": HauttumorePage,
-            "Lymphome": LymphomePage,
-            "Fernmetastasen": FernmetastasenPage,
-            "Gutartige Erkrankungen": GutartigeErkrankungenPage,
-        }
-        
-        target_page_class = group_page_map.get(group_name)
+        page_class_name = GROUP_PAGES.get(group_name)
+        if page_class_name:
+            target_page_class = get_page_class(page_class_name)
         
         if target_page_class:
             # Check if a page of this specific type already exists
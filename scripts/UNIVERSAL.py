@@ -32,6 +32,19 @@ if not _universal_initialized:
 import traceback
 if not _universal_initialized:
     print("import logging - done")
+try:
+    import template_matcher
+except ImportError:
+    # Import als Paket (z.B. aus der App: from scripts.UNIVERSAL import ...)
+    from scripts import template_matcher
+if not _universal_initialized:
+    print("import template_matcher - done")
+try:
+    import ocr_service
+except ImportError:
+    from scripts import ocr_service
+if not _universal_initialized:
+    print("import ocr_service - done")
 
 
 # --- Define Paths ---
@@ -64,12 +77,34 @@ _universal_initialized = True
 reader_easyocr = None
 pytesseract = None
 
+# Vorverarbeitete OCR-Bilder zusätzlich als PNG ablegen (nur zur Fehlersuche; OCR läuft aus dem Speicher)
+SAVE_OCR_DEBUG_IMAGES = False
+
 
 ######################################################
 ######################################################
 
 
-def PIL_image_preprocessing_Zoom_Contrast_Sharpen(image):
+def save_ocr_debug_image(image, filename, subfolder='image_preprocessing'):
+    """Speichert ein OCR-Bild unter screenshots_dir/UNIVERSAL/<subfolder>, falls SAVE_OCR_DEBUG_IMAGES aktiv ist"""
+    if not SAVE_OCR_DEBUG_IMAGES:
+        return None
+    save_dir = os.path.join(screenshots_dir, 'UNIVERSAL', subfolder)
+    os.makedirs(save_dir, exist_ok=True)
+    save_path = os.path.join(save_dir, filename)
+    image.save(save_path)
+    print(f"OCR-Debugbild gespeichert: {save_path}")
+    return save_path
+
+
+def PIL_image_preprocessing_Zoom_Contrast_Sharpen(image, save=None):
+    """
+    Zoom 3x, Graustufen, Kontrast und Schärfen für die OCR.
+
+    Args:
+        image (PIL.Image): Screenshot.
+        save (bool): Ergebnis als PNG ablegen; Standard ist SAVE_OCR_DEBUG_IMAGES.
+    """
     print(f"\nStart PIL_image_prepocessing aus UNIVERSAL.py")
 
     # Abhängigkeiten laden
@@ -86,14 +121,14 @@ def PIL_image_preprocessing_Zoom_Contrast_Sharpen(image):
     image_preprocessed = image_preprocessed.convert('L')  # Graustufen
     image_preprocessed = PIL_ImageEnhance.Contrast(image_preprocessed).enhance(2)  # Kontrast erhöhen
     image_preprocessed = image_preprocessed.filter(PIL_ImageFilter.SHARPEN)  # Schärfen
-
-    # Save path using screenshots_dir
-    save_dir = os.path.join(screenshots_dir, 'UNIVERSAL', 'image_preprocessing')
-    os.makedirs(save_dir, exist_ok=True) # Ensure directory exists
-    save_path = os.path.join(save_dir, 'image_preprocessed_from_function_PIL_image_preprocessing_Zoom_Contrast_Sharpen().png')
-
-    image_preprocessed.save(save_path)
-    print(rf"PIL.Enhance und PIL.SHARPEN done, screenshot.png unter {save_path} abgespeichert. ")
+    print("PIL.Enhance und PIL.SHARPEN done")
+
+    if save or (save is None and SAVE_OCR_DEBUG_IMAGES):
+        save_dir = os.path.join(screenshots_dir, 'UNIVERSAL', 'image_preprocessing')
+        os.makedirs(save_dir, exist_ok=True) # Ensure directory exists
+        save_path = os.path.join(save_dir, 'image_preprocessed_from_function_PIL_image_preprocessing_Zoom_Contrast_Sharpen().png')
+        image_preprocessed.save(save_path)
+        print(rf"screenshot.png unter {save_path} abgespeichert. ")
     return image_preprocessed
 
 ######################################################
@@ -102,111 +137,31 @@ def PIL_image_preprocessing_Zoom_Contrast_Sharpen(image):
 
 def run_tesseract_ocr_deutsch(screenshot_path):
     """
-    Führt Tesseract OCR auf Deutsch für eine Bilddatei durch (All-in-One-Funktion).
+    Führt Tesseract OCR auf Deutsch durch.
 
-    Prüft, ob als Bundle ausgeführt, findet tesseract.exe und tessdata,
-    lädt pytesseract bei Bedarf, führt OCR aus und gibt Text zurück.
+    Läuft über den OCR-Dienst (ocr_service.py, Tesseract bereits initialisiert), ohne Dienst
+    im eigenen Prozess. tesseract.exe und tessdata werden im App-Pfad bzw. im lokalen
+    Fallback gesucht.
 
     Args:
-        screenshot_path (str): Der vollständige Pfad zur Bilddatei.
+        screenshot_path (str | PIL.Image): Pfad zur Bilddatei oder Bild im Speicher.
 
     Returns:
         str: Der erkannte Text (bereinigt).
         None: Wenn ein Fehler auftritt (Initialisierung, Datei nicht gefunden, OCR-Fehler).
     """
-    print(f"Starte run_tesseract_ocr_deutsch (All-in-One) für: {screenshot_path}")
-    global pytesseract
-
-    # --- 1. Pytesseract laden und Pfad setzen (unverändert) ---
-    if pytesseract is None:
-        print("Pytesseract Modul noch nicht geladen oder initialisiert. Versuche Initialisierung...")
-        try:
-            if "pytesseract" not in sys.modules:
-                pytesseract_module = importlib.import_module("pytesseract")
-                print("Modul 'pytesseract' erfolgreich importiert.")
-            else:
-                pytesseract_module = sys.modules["pytesseract"]
-                print("Modul 'pytesseract' war bereits importiert.")
-
-            if getattr(sys, 'frozen', False):
-                app_path = sys._MEIPASS
-                print(f"Anwendung läuft als Bundle. Basispfad: {app_path}")
-            else:
-                app_path = app_dir
-                print(f"Anwendung läuft als Skript. Basispfad: {app_path}")
-
-            tesseract_exe_path_bundle = os.path.join(app_path, 'offline_packages', 'tesseract', 'tesseract.exe')
-            local_tesseract_fallback = 'C:\\Program Files\\Tesseract-OCR\\tesseract.exe'
-
-            tesseract_cmd_to_set = None
-            if os.path.exists(tesseract_exe_path_bundle):
-                tesseract_cmd_to_set = tesseract_exe_path_bundle
-                print(f"Tesseract executable im App-Pfad gefunden: {tesseract_cmd_to_set}")
-            elif os.path.exists(local_tesseract_fallback):
-                tesseract_cmd_to_set = local_tesseract_fallback
-                print(f"WARNUNG: Tesseract executable nicht im App-Pfad gefunden. Verwende lokalen Fallback: {tesseract_cmd_to_set}")
-            else:
-                print(f"FEHLER: Tesseract executable weder im App-Pfad ({tesseract_exe_path_bundle}) noch im lokalen Fallback ({local_tesseract_fallback}) gefunden.")
-                return None
-
-            pytesseract_module.pytesseract.tesseract_cmd = tesseract_cmd_to_set
-            pytesseract = pytesseract_module
-            print("Pytesseract initialisiert und tesseract_cmd gesetzt.")
-
-        except ImportError:
-            print("FEHLER: Das Modul 'pytesseract' konnte nicht importiert werden.")
-            return None
-        except Exception as e:
-            print(f"FEHLER bei der Initialisierung von Pytesseract: {e}")
-            return None
-
-    # --- 2. Tessdata-Pfad bestimmen und als Umgebungsvariable setzen ---
-    tessdata_dir_to_use = None
-    try:
-        if getattr(sys, 'frozen', False):
-            app_path = sys._MEIPASS
-        else:
-            app_path = app_dir
-
-        tessdata_path_bundle = os.path.join(app_path, 'offline_packages', 'tesseract', 'tessdata')
-        local_tessdata_fallback = 'C:\\Program Files\\Tesseract-OCR\\tessdata'
-        
-        if os.path.isdir(tessdata_path_bundle):
-            tessdata_dir_to_use = tessdata_path_bundle
-        elif os.path.isdir(local_tessdata_fallback):
-            tessdata_dir_to_use = local_tessdata_fallback
-            print(f"WARNUNG: Tessdata Verzeichnis nicht im App-Pfad gefunden. Verwende lokalen Fallback: {tessdata_dir_to_use}")
-        else:
-            print(f"FEHLER: Tessdata Verzeichnis weder im App-Pfad ({tessdata_path_bundle}) noch im lokalen Fallback ({local_tessdata_fallback}) gefunden.")
-            return None
-
-        # === FINALE KORREKTUR HIER ===
-        # Setze die Umgebungsvariable direkt auf den 'tessdata'-Ordner.
-        os.environ['TESSDATA_PREFIX'] = tessdata_dir_to_use
-        print(f"INFO: TESSDATA_PREFIX Umgebungsvariable gesetzt auf: {os.environ['TESSDATA_PREFIX']}")
-
-    except Exception as e:
-        print(f"FEHLER beim Bestimmen des Tessdata-Pfades: {e}")
-        return None
-
-    # --- 3. Eingabedatei prüfen ---
-    if not os.path.exists(screenshot_path):
+    source = screenshot_path if isinstance(screenshot_path, str) else "Bild im Speicher"
+    print(f"Starte run_tesseract_ocr_deutsch für: {source}")
+    if isinstance(screenshot_path, str) and not os.path.exists(screenshot_path):
         print(f"FEHLER: Bilddatei nicht gefunden unter: {screenshot_path}")
         return None
 
-    # --- 4. OCR durchführen (ohne 'config' Parameter) ---
-    try:
-        print(f"Führe Tesseract OCR aus (via TESSDATA_PREFIX), lang='deu' für Datei: {screenshot_path}")
-        text = pytesseract.image_to_string(screenshot_path, lang='deu')
-        print("Tesseract OCR abgeschlossen.")
-        cleaned_text = text.strip()
-        return cleaned_text
-    except Exception as e:
-        if pytesseract and hasattr(pytesseract, 'TesseractNotFoundError') and isinstance(e, pytesseract.TesseractNotFoundError):
-            print("FEHLER: Tesseract executable nicht gefunden während OCR (unerwartet).")
-        else:
-            print(f"FEHLER während pytesseract.image_to_string für {screenshot_path}: {e}")
+    result = ocr_service.recognize(screenshot_path, engine="tesseract", lang='deu')
+    if not result.get("ok"):
+        print(f"FEHLER während Tesseract OCR für {source}: {result.get('error')}")
         return None
+    print(f"Tesseract OCR abgeschlossen ({result.get('seconds')} s, {'OCR-Dienst' if result.get('service') else 'lokal'}).")
+    return result["text"]
     
 
 ###################################
@@ -214,84 +169,61 @@ def run_tesseract_ocr_deutsch(screenshot_path):
 
 def get_reader_easyocr():
     """
-    Initialisiert und gibt die EasyOCR Reader Instanz zurück.
+    Initialisiert und gibt die EasyOCR Reader Instanz im eigenen Prozess zurück.
     Stellt sicher, dass Modelle aus dem korrekten lokalen Verzeichnis geladen werden,
-    sowohl im Skript- als auch im Bundle-Modus.
+    sowohl im Skript- als auch im Bundle-Modus (siehe ocr_service.OcrEngines).
+
+    Für neue Aufrufe easyocr_texte() bzw. ocr_service.recognize() verwenden, die den
+    bereits geladenen Reader des OCR-Dienstes nutzen.
     """
-    logging.critical("!!! UNIVERSAL.get_reader_easyocr WURDE AUFGERUFEN !!!") 
     global reader_easyocr
     if reader_easyocr is None:
-        logging.info("Attempting to initialize EasyOCR Reader...") # Use logging
         print("Initialisiere EasyOCR Reader...")
         try:
-            # Dynamischer Import von easyocr
-            if "easyocr" not in sys.modules:
-                logging.info("Importing easyocr module...") # Use logging
-                print("Importiere easyocr Modul...")
-                importlib.import_module("easyocr")
-                logging.info("easyocr module imported.") # Use logging
-                print("easyocr Modul importiert.")
-            easyocr = sys.modules["easyocr"]
-
-            # Bestimme den Modellpfad basierend auf dem Ausführungskontext
-            model_dir = None # Initialize model_dir
-            if getattr(sys, 'frozen', False):
-                # Anwendung läuft als PyInstaller-Bundle
-                if hasattr(sys, '_MEIPASS'):
-                    bundle_root = sys._MEIPASS
-                else: # Fallback, falls _MEIPASS nicht existiert (sollte nicht vorkommen)
-                    bundle_root = os.path.dirname(sys.executable) # Versuche den Pfad der Exe zu bekommen
-
-                model_dir = os.path.join(bundle_root, 'easyocr_models')
-                logging.info(f"EasyOCR Bundle-Mode: Looking for models in: {model_dir} (relative to {bundle_root})") # Use logging
-                print(f"EasyOCR Bundle-Modus: Suche Modelle in: {model_dir} (relativ zu {bundle_root})")
-
-            else:
-                # Anwendung läuft als normales Skript
-                model_dir = os.path.join(app_dir, 'offline_packages', 'easyocr_models')
-                logging.info(f"EasyOCR Script-Mode: Looking for models in: {model_dir}") # Use logging
-                print(f"EasyOCR Skript-Modus: Suche Modelle in: {model_dir}")
-
-            # Überprüfe, ob das Verzeichnis existiert (wichtig für Debugging)
-            if not os.path.isdir(model_dir):
-                 logging.error(f"EasyOCR model directory NOT FOUND: {model_dir}") # Use logging.error
-                 print(f"FEHLER: EasyOCR Modellverzeichnis nicht gefunden: {model_dir}")
-                 return None # Wichtig: Fehler signalisieren
-
-            # Initialisiere den Reader mit dem spezifischen Modellverzeichnis
-            # und expliziter GPU-Deaktivierung (oft stabiler in Bundles)
-            logging.info(f"Initializing easyocr.Reader with model_storage_directory='{model_dir}', gpu=False") # Use logging
-            print(f"Initialisiere easyocr.Reader mit model_storage_directory='{model_dir}', gpu=False")
-            # Verwende die Sprachen, die du tatsächlich brauchst ('de', 'en' sind üblich)
-            reader_easyocr = easyocr.Reader(['de', 'en'], gpu=False, model_storage_directory=model_dir)
-            logging.info("EasyOCR Reader initialized successfully.") # Use logging
-            print("EasyOCR Reader erfolgreich initialisiert.")
-
+            reader_easyocr = ocr_service.local_engines().easyocr_reader()
         except ImportError as ie:
-             logging.error(f"Failed to import EasyOCR or a dependency: {ie}", exc_info=True) # Log with traceback
-             print(f"FEHLER: EasyOCR oder eine Abhängigkeit konnte nicht importiert werden: {ie}")
-             reader_easyocr = None # Sicherstellen, dass Reader None bleibt
+            logging.error(f"Failed to import EasyOCR or a dependency: {ie}", exc_info=True)
+            print(f"FEHLER: EasyOCR oder eine Abhängigkeit konnte nicht importiert werden: {ie}")
+            reader_easyocr = None
         except Exception as e:
-            # Logge den Fehler detailliert
-            logging.error(f"Error during EasyOCR Reader initialization: {e}", exc_info=True) # Log with traceback
+            logging.error(f"Error during EasyOCR Reader initialization: {e}", exc_info=True)
             print(f"FEHLER bei der Initialisierung des EasyOCR Readers: {e}")
-            # Gib auch den Traceback im Terminal aus, falls sichtbar
-            import traceback
             traceback.print_exc()
-            reader_easyocr = None # Sicherstellen, dass Reader None bleibt
-    # Gib den (möglicherweise neu initialisierten oder bereits existierenden) Reader zurück
+            reader_easyocr = None
     return reader_easyocr
 
 
+###################################
+###################################
+def easyocr_texte(image, paragraph=False):
+    """
+    Texterkennung mit EasyOCR über den OCR-Dienst (ohne Dienst im eigenen Prozess).
+
+    Args:
+        image: PIL-Bild, numpy-Array oder Pfad zur Bilddatei.
+        paragraph (bool): Zusammenhängende Zeilen als einen Eintrag zurückgeben.
+
+    Returns:
+        list[str]: Erkannte Textblöcke ([] wenn kein Text erkannt wurde).
+        None: Wenn ein Fehler auftritt.
+    """
+    result = ocr_service.recognize(image, engine="easyocr", paragraph=paragraph)
+    if not result.get("ok"):
+        logging.error(f"EasyOCR failed: {result.get('error')}")
+        print(f"FEHLER während der Texterkennung (EasyOCR): {result.get('error')}")
+        return None
+    print(f"EasyOCR abgeschlossen ({result.get('seconds')} s, {'OCR-Dienst' if result.get('service') else 'lokal'}).")
+    return [block["text"] for block in result["blocks"]]
+
+
 ###################################
 ###################################
 def ocr_mit_easyocr(image_path):
     """
-    Liest Text aus der angegebenen Bilddatei mittels EasyOCR.
-    Enthält erweitertes Logging für Fehlersuche.
+    Liest Text aus dem angegebenen Bild mittels EasyOCR (paragraph=True).
 
     Args:
-        image_path (str): Der vollständige Pfad zur Bilddatei (z.B. .png, .jpg).
+        image_path (str | PIL.Image): Pfad zur Bilddatei (z.B. .png, .jpg) oder Bild im Speicher.
 
     Returns:
         list[str]: Eine Liste der von EasyOCR erkannten Textblöcke/Paragraphen (paragraph=True).
@@ -299,109 +231,25 @@ def ocr_mit_easyocr(image_path):
         None: Wenn ein Fehler auftritt.
     """
     function_name = "ocr_mit_easyocr"
-    logging.info(f"--- Starting {function_name} for image: {image_path} ---")
     print(f"\n--- Start {function_name}() ---")
-    ocr_result_text = None # Standard-Rückgabewert bei Fehlern
-
-    # --- 1. Dynamische Imports ---
-    try:
-        # Module für Bildverarbeitung und OCR-Vorbereitung
-        logging.debug(f"[{function_name}] Importing required modules (PIL, numpy)...")
-        PIL_Image = importlib.import_module("PIL.Image") if "PIL.Image" not in sys.modules else sys.modules["PIL.Image"]
-        numpy = importlib.import_module("numpy") if "numpy" not in sys.modules else sys.modules["numpy"]
-        logging.debug(f"[{function_name}] Modules imported successfully.")
-        # os ist global verfügbar
-    except ImportError as e:
-        logging.error(f"[{function_name}] Failed to import required module: {e}", exc_info=True)
-        print(f"FEHLER [{function_name}]: Import eines benötigten Moduls fehlgeschlagen: {e}")
-        return None # Kann ohne Module nicht arbeiten
-
-    # --- 2. Eingabepfad prüfen ---
-    if not isinstance(image_path, str) or not image_path:
-        logging.error(f"[{function_name}] Invalid image path provided (not a string or empty). Path: {image_path}")
-        print(f"FEHLER [{function_name}]: Ungültiger Pfad übergeben (kein String oder leer).")
-        return None
-    logging.debug(f"[{function_name}] Target file for OCR: {image_path}")
-    print(f"[{function_name}] Zieldatei für OCR: {image_path}")
-
-    # --- 3. Dateiexistenz prüfen ---
-    # Use os.path.isfile for better clarity that we expect a file
-    if not os.path.isfile(image_path):
-        logging.error(f"[{function_name}] Image file not found or is not a file: {image_path}")
-        print(f"FEHLER [{function_name}]: Bilddatei nicht gefunden oder ist kein File: {image_path}")
-        return None
-
-    # --- 4. Bild laden und vorbereiten ---
-    try:
-        logging.info(f"[{function_name}] Loading image file...")
-        print(f"[{function_name}] Lade Bilddatei...")
-        image = PIL_Image.open(image_path)
-        logging.info(f"[{function_name}] Image loaded successfully.")
-        print(f"[{function_name}] Bild erfolgreich geladen.")
-
-        logging.info(f"[{function_name}] Converting image to RGB NumPy Array for EasyOCR...")
-        print(f"[{function_name}] Konvertiere Bild zu RGB NumPy Array für EasyOCR...")
-        image_rgb = image.convert('RGB') # Stelle sicher, dass es RGB ist
-        image_np = numpy.array(image_rgb)
-        logging.info(f"[{function_name}] Conversion to NumPy array complete.")
-        print(f"[{function_name}] Konvertierung abgeschlossen.")
-
-    except FileNotFoundError:
-        # Sollte durch os.path.isfile abgefangen sein, aber zur Sicherheit
-        logging.error(f"[{function_name}] Image file not found after check (race condition?): {image_path}", exc_info=True)
-        print(f"FEHLER [{function_name}]: Bilddatei wurde nach Prüfung nicht gefunden: {image_path}")
-        return None
-    except Exception as img_err: # Catch more specific PIL/IO errors if possible
-        logging.error(f"[{function_name}] Error loading or preparing image '{os.path.basename(image_path)}': {img_err}", exc_info=True)
-        print(f"FEHLER [{function_name}] beim Laden oder Vorbereiten von Bild '{os.path.basename(image_path)}': {img_err}")
-        return None
 
-    # --- 5. EasyOCR Reader holen ---
-    try:
-        logging.info(f"[{function_name}] Getting EasyOCR Reader instance...")
-        print(f"[{function_name}] Hole EasyOCR Reader...")
-        # Rufe die andere Funktion auf, die bereits Logging enthält
-        reader = get_reader_easyocr()
-        if reader is None:
-            # get_reader_easyocr sollte bereits geloggt haben, warum es fehlschlug
-            logging.error(f"[{function_name}] EasyOCR Reader is not available (initialization failed?). Aborting OCR.")
-            print(f"FEHLER [{function_name}]: EasyOCR Reader ist nicht verfügbar (Initialisierung fehlgeschlagen?).")
-            return None # Reader konnte nicht geholt werden
-        logging.info(f"[{function_name}] EasyOCR Reader obtained successfully.")
-        print(f"[{function_name}] EasyOCR Reader erhalten.")
-    except Exception as reader_err:
-        logging.error(f"[{function_name}] Unexpected error while getting EasyOCR Reader: {reader_err}", exc_info=True)
-        print(f"FEHLER [{function_name}] beim Holen des EasyOCR Readers: {reader_err}")
+    if isinstance(image_path, str):
+        if not image_path or not os.path.isfile(image_path):
+            logging.error(f"[{function_name}] Image file not found or is not a file: {image_path}")
+            print(f"FEHLER [{function_name}]: Bilddatei nicht gefunden oder ist kein File: {image_path}")
+            return None
+        print(f"[{function_name}] Zieldatei für OCR: {image_path}")
+    elif image_path is None:
+        print(f"FEHLER [{function_name}]: Kein Bild übergeben.")
         return None
 
-    # --- 6. OCR durchführen ---
-    try:
-        logging.info(f"[{function_name}] Performing OCR with EasyOCR for '{os.path.basename(image_path)}' (paragraph=True)...")
-        print(f"[{function_name}] Führe OCR mit EasyOCR durch für '{os.path.basename(image_path)}'...")
-        # detail=0: Gibt nur den Text zurück (Liste von Strings)
-        # paragraph=True: Versucht, zusammenhängende Zeilen als einen Eintrag zu erkennen
-        raw_results = reader.readtext(image_np, detail=0, paragraph=True)
-        logging.info(f"[{function_name}] EasyOCR raw result: {raw_results}")
-        print(f"[{function_name}] EasyOCR Roh-Ergebnis:", raw_results)
-
-    except Exception as ocr_err:
-        # Fängt Fehler von reader.readtext() ab
-        logging.error(f"[{function_name}] Error during OCR text recognition for '{os.path.basename(image_path)}': {ocr_err}", exc_info=True)
-        print(f"FEHLER [{function_name}] während der Texterkennung (OCR) für '{os.path.basename(image_path)}': {ocr_err}")
-        return None # Bei OCR-Fehler None zurückgeben
-
-    # --- 7. Abschluss und Rückgabe ---
-    if raw_results is not None:
-        # Ensure it returns a list, even if empty
-        final_result = raw_results if isinstance(raw_results, list) else []
-        logging.info(f"--- {function_name}() completed successfully. Returning {len(final_result)} text blocks. ---")
-        print(f"--- {function_name}() erfolgreich abgeschlossen. Ergebnis (Anzahl Blöcke: {len(final_result)}) wird zurückgegeben. ---")
-        return final_result
-    else:
-        # Der 'None'-Fall wird bereits durch die return-Statements in den except-Blöcken behandelt
-        logging.warning(f"--- {function_name}() likely finished with errors (raw_results is None). Returning None. ---")
+    final_result = easyocr_texte(image_path, paragraph=True)
+    if final_result is None:
         print(f"--- {function_name}() mit Fehlern abgeschlossen. Gibt None zurück. ---")
-        return None # Explicitly return None on error path
+        return None
+    print(f"[{function_name}] EasyOCR Roh-Ergebnis:", final_result)
+    print(f"--- {function_name}() erfolgreich abgeschlossen. Ergebnis (Anzahl Blöcke: {len(final_result)}) wird zurückgegeben. ---")
+    return final_result
 
 ###################################
 ###################################
@@ -574,24 +422,12 @@ def find_button(image_name, base_path = None, max_attempts=80, interval=0.05, co
         return False
 
     print(f"Suche nach... Pfad: {image_path}")
-    attempts = 0
-    while attempts < max_attempts:
-        try:
-            location = pyautogui.locateOnScreen(image_path, confidence=confidence)
-
-            if location:
-                print(f"'{image_path}' gefunden bei {location}.")
-                return True 
-
-        except pyautogui.ImageNotFoundException:
-            pass
-        except Exception as e:
-            print(f"Ein unerwarteter Fehler ist bei der Suche nach '{image_path}' aufgetreten (Versuch {attempts + 1}): {e}")
-            pass
-
-        # Zähler erhöhen und kurz warten
-        attempts += 1
-        time.sleep(interval)
+    # Template aus dem Cache, ein Screenshot pro Versuch
+    location = template_matcher.wait_for(image_path, confidence=confidence, max_attempts=max_attempts,
+                                         interval=interval, description=image_path)
+    if location:
+        print(f"'{image_path}' gefunden bei {location}.")
+        return True
 
     # Schleife beendet, ohne das Bild zu finden
     print(f"FEHLER: '{image_path}' konnte nach {max_attempts} Versuchen nicht gefunden werden. Pfad: '{image_path}'.")
@@ -600,64 +436,6 @@ def find_button(image_name, base_path = None, max_attempts=80, interval=0.05, co
 ###################################
 ###################################
 
-def find_and_click_button(image_name, description="Button", base_path=None, max_attempts= 100, interval=0.05, confidence=0.8):
-    # Check if pyautogui is loaded, handle import error if necessary
-    try:
-        pyautogui = importlib.import_module("pyautogui") if "pyautogui" not in sys.modules else sys.modules["pyautogui"]
-    except ImportError:
-        print(f"FEHLER ({description}): Modul 'pyautogui' konnte nicht geladen werden.")
-        return False
-    """
-    Sucht wiederholt nach einem Bild auf dem Bildschirm und klickt darauf, wenn gefunden.
-    Angepasste Version für UNIVERSAL.py, die einen Basispfad akzeptiert.
-
-    Args:
-        image_name (str): Der Dateiname des Bildes (ohne Pfad).
-        description (str): Eine Beschreibung des Buttons für Log-Meldungen.
-        base_path (str): Der Basispfad zum Screenshot-Verzeichnis. Mandatory.
-        max_attempts (int): Maximale Anzahl von Suchversuchen.
-        interval (float): Wartezeit zwischen den Versuchen in Sekunden.
-        confidence (float): Genauigkeitsschwelle für die Bilderkennung.
-
-    Returns:
-        bool: True, wenn der Button gefunden und geklickt wurde, sonst False.
-    """
-    if not base_path or not os.path.isdir(base_path): # Added check if base_path is a directory
-        print(f"FEHLER ({description}): Ungültiger oder fehlender Screenshot-Basispfad angegeben: '{base_path}'")
-        return False
-
-    image_path = os.path.join(base_path, image_name)
-    # Check if the image file itself exists before starting the loop
-    if not os.path.isfile(image_path):
-        print(f"FEHLER ({description}): Bilddatei nicht gefunden unter: '{image_path}'")
-        return False
-
-    print(f"Suche nach '{description}' ({image_name})... Pfad: {image_path}")
-    attempts = 0
-    while attempts < max_attempts:
-        try:
-            # Verwende locateCenterOnScreen für direkte Koordinaten zum Klicken
-            location = pyautogui.locateCenterOnScreen(image_path, confidence=confidence)
-            if location:
-                print(f"'{description}' gefunden bei {location}. Klicke...")
-                pyautogui.click(location) # Click the identified center
-                print(f"'{description}' geklickt.")
-                return True
-        except pyautogui.ImageNotFoundException:
-            # Fehler wird nur am Ende gemeldet, wenn alle Versuche fehlschlagen
-            pass
-        except Exception as e:
-            print(f"Ein unerwarteter Fehler ist bei der Suche/Klick nach '{description}' aufgetreten (Versuch {attempts + 1}): {e}")
-            pass # Continue trying for now
-
-        attempts += 1
-        time.sleep(interval) # Kurze Pause zwischen den Suchversuchen bleibt
-
-    print(f"Fehler: '{description}' ({image_name}) konnte nach {max_attempts} Versuchen nicht gefunden werden unter '{image_path}'.")
-    return False
-
-###################################
-###################################
 
 
 def find_and_click_button_offset(
@@ -721,46 +499,33 @@ def find_and_click_button_offset(
          print(f"FEHLER (find_and_click_offset): Initialisierung fehlgeschlagen - {e}")
          return False
 
-    attempts = 0
-    while attempts < max_attempts:
+    # Template aus dem Cache, ein Screenshot pro Versuch
+    box = template_matcher.wait_for(image_path, confidence=confidence, max_attempts=max_attempts,
+                                    interval=interval, description=image_filename)
+    if box:
         try:
-            # Finde das Zentrum des Bildes mit dem direkten Pfad
-            location = pyautogui.locateCenterOnScreen(image_path, confidence=confidence)
-
-            if location:
-                # Berechne die Zielkoordinaten für den Klick
-                target_x = location.x + x_offset
-                target_y = location.y + y_offset
-
-                print(f"'{image_filename}' gefunden bei {location}.")
-                print(f"Führe {click_desc} aus bei Offset-Position ({target_x}, {target_y})...")
+            # Berechne die Zielkoordinaten für den Klick ausgehend vom Zentrum des Bildes
+            location = template_matcher.center(box)
+            target_x = location.x + x_offset
+            target_y = location.y + y_offset
 
-                # Führe die Klicks aus
-                if rightclick:
-                    pyautogui.rightClick(x=target_x, y=target_y, interval=0.1)
-                else:
-                    # Standard-Linksklick
-                    pyautogui.click(x=target_x, y=target_y, clicks=clicks, interval=0.1)
-
-                print(f"'{image_filename}' -> Offset-{click_desc} ausgeführt.")
-                return True # Erfolg
+            print(f"'{image_filename}' gefunden bei {location}.")
+            print(f"Führe {click_desc} aus bei Offset-Position ({target_x}, {target_y})...")
 
-            # Wenn nicht gefunden, warte kurz und versuche es erneut
-            attempts += 1
-            if attempts < max_attempts:
-                 time.sleep(interval)
+            # Führe die Klicks aus
+            if rightclick:
+                pyautogui.rightClick(x=target_x, y=target_y, interval=0.1)
+            else:
+                # Standard-Linksklick
+                pyautogui.click(x=target_x, y=target_y, clicks=clicks, interval=0.1)
 
-        except pyautogui.ImageNotFoundException:
-            attempts += 1
-            if attempts < max_attempts:
-                time.sleep(interval)
+            print(f"'{image_filename}' -> Offset-{click_desc} ausgeführt.")
+            return True # Erfolg
         except Exception as e:
-            print(f"FEHLER (find_and_click_offset): Unerwarteter Fehler bei Versuch {attempts + 1} bei Suche/Klick auf '{image_filename}': {e}")
-            attempts += 1
-            if attempts < max_attempts:
-                 time.sleep(interval)
+            print(f"FEHLER (find_and_click_offset): Unerwarteter Fehler beim Klick auf '{image_filename}': {e}")
+            return False
 
-    # Wenn die Schleife ohne Erfolg endet
+    # Wenn das Bild nicht gefunden wurde
     print(f"FEHLER (find_and_click_offset): '{image_filename}' konnte nach {max_attempts} Versuchen nicht gefunden werden. Offset-{click_desc} nicht ausgeführt.")
     return False
 
@@ -821,7 +586,7 @@ def _navigiere_bereich_template(bereich_name):
     # ---- 1. Prüfen, ob bereits im Zielbereich ----
     try:
         print(f"Prüfe, ob bereits im Bereich '{bereich_name}'...")
-        if pyautogui.locateOnScreen(confirm_image_path, confidence=0.8):
+        if template_matcher.locate_on_screen(confirm_image_path, confidence=0.8):
             print(f"Bereits im Bereich '{bereich_name}'. Navigation erfolgreich.")
             return True
         else:
@@ -833,61 +598,29 @@ def _navigiere_bereich_template(bereich_name):
          return False # Kritischer Fehler schon bei der Prüfung
 
     # ---- 2. Navigation initiieren (falls nicht schon im Zielbereich) ----
-    nav_button_found_and_clicked = False
     print(f"Suche Navigationsbutton '{nav_image_filename}'...")
-    for attempt in range(1, max_attempts + 1):
-        try:
-            nav_button_location = pyautogui.locateOnScreen(nav_image_path, confidence=0.8)
-            if nav_button_location:
-                button_center = pyautogui.center(nav_button_location)
-                pyautogui.click(button_center)
-                print(f"Navigationsbutton '{nav_image_filename}' gefunden und geklickt (Versuch {attempt}/{max_attempts}).")
-                nav_button_found_and_clicked = True
-                time.sleep(0.2) # Kurze Pause, damit UI nach Klick reagieren kann
-                break # Erfolgreich geklickt, Navigationsschleife verlassen
-
-        except pyautogui.PyAutoGUIException as e:
-            # Check if it's specifically ImageNotFound; only log other errors verbosely
-            if not isinstance(e, pyautogui.ImageNotFoundException):
-                print(f"WARNUNG [navigiere_bereich_{bereich_name.lower()}]: Fehler bei Suche/Klick auf '{nav_image_filename}' (Versuch {attempt}): {e}")
-            # Bei Fehler trotzdem weitermachen mit nächstem Versuch / sleep
-        except Exception as e:
-             print(f"FEHLER [navigiere_bereich_{bereich_name.lower()}]: Kritischer Fehler bei Navigation (Versuch {attempt}): {e}")
-             return False # Bei unerwartetem Fehler abbrechen
-
-        time.sleep(sleep_interval) # Warte kurz vor dem nächsten Versuch
-    else:
-        # Diese 'else'-Klausel gehört zum 'for'-Loop und wird ausgeführt, wenn die Schleife ohne 'break' endet
+    nav_button_location = template_matcher.wait_for(nav_image_path, confidence=0.8, max_attempts=max_attempts,
+                                                    interval=sleep_interval, description=nav_image_filename)
+    if not nav_button_location:
         print(f"FEHLER [navigiere_bereich_{bereich_name.lower()}]: Navigationsbutton '{nav_image_filename}' nach {max_attempts} Versuchen nicht gefunden (Timeout).")
         return False # Timeout bei der Suche nach dem Navigationsbutton
-
-    # Sicherstellen, dass der Button wirklich geklickt wurde (sollte durch obige Logik abgedeckt sein)
-    if not nav_button_found_and_clicked:
-         print(f"FEHLER [navigiere_bereich_{bereich_name.lower()}]: Unerwarteter Zustand - Navigationsschleife beendet, ohne Button zu klicken.")
-         return False
+    try:
+        pyautogui.click(template_matcher.center(nav_button_location))
+        print(f"Navigationsbutton '{nav_image_filename}' gefunden und geklickt.")
+        time.sleep(0.2) # Kurze Pause, damit UI nach Klick reagieren kann
+    except Exception as e:
+        print(f"FEHLER [navigiere_bereich_{bereich_name.lower()}]: Kritischer Fehler bei Navigation: {e}")
+        return False # Bei unerwartetem Fehler abbrechen
 
     # ---- 3. Bestätigen, dass Zielbereich geladen wurde ----
     print(f"Bestätige Erreichen des Bereichs '{bereich_name}' (Suche '{confirm_image_filename}')...")
-    for attempt in range(1, max_attempts + 1):
-        try:
-            if pyautogui.locateOnScreen(confirm_image_path, confidence=0.8):
-                print(f"Bereich '{bereich_name}' erfolgreich erreicht und bestätigt (Versuch {attempt}/{max_attempts}). Navigation erfolgreich.")
-                return True 
-
-        except pyautogui.PyAutoGUIException as e:
-            # Check if it's specifically ImageNotFound; only log other errors verbosely
-             if not isinstance(e, pyautogui.ImageNotFoundException):
-                print(f"WARNUNG [navigiere_bereich_{bereich_name.lower()}]: Fehler bei Suche nach Bestätigung '{confirm_image_filename}' (Versuch {attempt}): {e}")
-            # Weitermachen mit nächstem Versuch / sleep
-        except Exception as e:
-             print(f"FEHLER [navigiere_bereich_{bereich_name.lower()}]: Kritischer Fehler bei Bestätigung (Versuch {attempt}): {e}")
-             return False # Bei unerwartetem Fehler abbrechen
+    if template_matcher.wait_for(confirm_image_path, confidence=0.8, max_attempts=max_attempts,
+                                 interval=sleep_interval, description=confirm_image_filename):
+        print(f"Bereich '{bereich_name}' erfolgreich erreicht und bestätigt. Navigation erfolgreich.")
+        return True
 
-        time.sleep(sleep_interval) # Warte kurz vor nächstem Versuch
-    else:
-        # Diese 'else'-Klausel gehört zum 'for'-Loop
-        print(f"FEHLER [navigiere_bereich_{bereich_name.lower()}]: Bestätigungsbild '{confirm_image_filename}' nach {max_attempts} Versuchen nicht gefunden (Timeout). Navigation fehlgeschlagen.")
-        return False # Timeout bei der Suche nach dem Bestätigungsbild
+    print(f"FEHLER [navigiere_bereich_{bereich_name.lower()}]: Bestätigungsbild '{confirm_image_filename}' nach {max_attempts} Versuchen nicht gefunden (Timeout). Navigation fehlgeschlagen.")
+    return False # Timeout bei der Suche nach dem Bestätigungsbild
 
 
 # --- Konkrete Navigationsfunktionen rufen das Template auf ---
@@ -945,37 +678,23 @@ def auslesen_spi():
 
     print("\nStart auslesen_spi()")
 
-    base_path = os.path.join(screenshots_dir, "UNIVERSAL", "image_preprocessing")
-    screenshot_filename = "screenshot_spi.png"
-    preprocessed_filename = "screenshot_spi_preprocessed.png"
-    screenshot_fullpath = os.path.join(base_path, screenshot_filename)
-    preprocessed_fullpath = os.path.join(base_path, preprocessed_filename)
-
     #Zuerst Navigation in Pflegeleistung
     if not navigiere_bereich_pflegeprozess(): print('Navigation in Bereich pflegeprozess nach 100 Versuchen fehlgeschlagen. Bitte sicherstellen, dass KISIM im Vollbildmodus auf dem Hauptbildschirmoffen ist und erneut versuchen. Programm abgebrochen.'); sys.exit()
-    # ---- Screenshot aufnehmen und speichern ----
+    # ---- Screenshot aufnehmen (bleibt im Speicher) ----
     try:
         ausschnitt_spi = (113, 119, 20, 13) # Feste Koordinaten
         screenshot_spi = pyautogui.screenshot(region=ausschnitt_spi)
-
-        # Stelle sicher, dass das Verzeichnis existiert
-        os.makedirs(base_path, exist_ok=True)
-
-        screenshot_spi.save(screenshot_fullpath)
-        print(rf"Screenshot für SPI gespeichert unter: {screenshot_fullpath}")
+        save_ocr_debug_image(screenshot_spi, "screenshot_spi.png")
 
     except (pyautogui.PyAutoGUIException, OSError, IOError, Exception) as e:
-        # Fange PyAutoGUI-Fehler, OS/IO-Fehler (Speichern/Verzeichnis) und andere Ausnahmen ab
-        print(f"FEHLER beim Erstellen/Speichern des Screenshots: {e}")
+        # Fange PyAutoGUI-Fehler, OS/IO-Fehler (Debugbild) und andere Ausnahmen ab
+        print(f"FEHLER beim Erstellen des Screenshots: {e}")
         return spi_default_error # Rückgabe Fehlerstatus
 
-    # ---- Bild laden und Vorverarbeitung ----
+    # ---- Vorverarbeitung ----
     try:
-        # Lade das gerade gespeicherte Bild
-        img_to_process = PIL_Image.open(screenshot_fullpath)
-
         # Konvertierungen und Verbesserungen
-        screenshot_spi_preprocessed = img_to_process.convert('L')
+        screenshot_spi_preprocessed = screenshot_spi.convert('L')
         screenshot_spi_preprocessed = PIL_ImageEnhance.Contrast(screenshot_spi_preprocessed).enhance(2.0)
         screenshot_spi_preprocessed = screenshot_spi_preprocessed.point(lambda x: 0 if x < 150 else 255, 'L')
 
@@ -990,31 +709,24 @@ def auslesen_spi():
         # Zurück zu RGB für EasyOCR
         screenshot_spi_preprocessed = screenshot_spi_preprocessed.convert('RGB')
 
-        # Speichern des vorverarbeiteten Bildes (optional, gut für Debugging)
-        screenshot_spi_preprocessed.save(preprocessed_fullpath)
-        print(rf"Vorverarbeitetes Bild gespeichert unter: {preprocessed_fullpath}. Verarbeite mit numpy.")
+        # Vorverarbeitetes Bild nur zur Fehlersuche ablegen
+        save_ocr_debug_image(screenshot_spi_preprocessed, "screenshot_spi_preprocessed.png")
 
         # Konvertiere zu NumPy Array für EasyOCR
         screenshot_spi_preprocessed_numpy = numpy.array(screenshot_spi_preprocessed)
 
-    except FileNotFoundError:
-        print(f"FEHLER: Screenshot-Datei '{screenshot_fullpath}' nicht gefunden zum Laden.")
-        return spi_default_error
-    except (PIL_Image.UnidentifiedImageError, IOError, OSError, ValueError, Exception) as e:
-        # Fange Pillow-Fehler (Öffnen, Verarbeiten), OS/IO (Speichern preprocessed) und andere Ausnahmen ab
+    except (IOError, OSError, ValueError, Exception) as e:
+        # Fange Pillow-Fehler (Verarbeiten), OS/IO (Debugbild) und andere Ausnahmen ab
         print(f"FEHLER bei der Bildverarbeitung: {e}")
         return spi_default_error
 
     # ---- OCR und Extraktion ----
     try:
-        # Hole EasyOCR Reader (angenommen, get_reader_easyocr behandelt Fehler intern oder gibt None/Exception)
-        reader = get_reader_easyocr()
-        if reader is None:
-             print("FEHLER: Konnte EasyOCR Reader nicht initialisieren.")
+        # Führe OCR durch (OCR-Dienst, Reader bereits geladen)
+        easyocr_results = easyocr_texte(screenshot_spi_preprocessed_numpy)
+        if easyocr_results is None:
+             print("FEHLER: EasyOCR fehlgeschlagen.")
              return spi_default_error
-
-        # Führe OCR durch
-        easyocr_results = reader.readtext(screenshot_spi_preprocessed_numpy, detail=0)
         print(rf"EasyOCR Ergebnis: {easyocr_results}")
 
         # --- Extraktion (nur wenn OCR erfolgreich war) ---
@@ -1032,7 +744,7 @@ def auslesen_spi():
                      print(f"Ungültiger Treffer (keine Zahl nach Regex-Match) übersprungen: {result}")
 
     except Exception as e:
-        # Fange alle möglichen Fehler von get_reader_easyocr() oder reader.readtext() ab
+        # Fange alle möglichen Fehler der OCR oder der Extraktion ab
         print(f"FEHLER während OCR oder Extraktion: {e}")
         spi = spi_default_error # Setze zurück auf Fehlerstatus
 
@@ -1093,30 +805,19 @@ def auslesen_reaips():
     if not navigiere_bereich_kurve(): print('Navigation in Bereich kurve nach 100 Versuchen fehlgeschlagen. Bitte sicherstellen, dass KISIM im Vollbildmodus auf dem Hauptbildschirmoffen ist und erneut versuchen. Programm abgebrochen.'); sys.exit()
 
 
-    # Pfade definieren (konsistent mit auslesen_spi) - Verwende screenshots_dir
-    base_path = os.path.join(screenshots_dir, "UNIVERSAL", "image_preprocessing")
-    screenshot_filename = "screenshot_reaips.png"
-    preprocessed_filename = "screenshot_reaips_preprocessed.png"
-    screenshot_fullpath = os.path.join(base_path, screenshot_filename)
-    preprocessed_fullpath = os.path.join(base_path, preprocessed_filename)
-
-
     # ---- Gesamtablauf in einem try-Block für generelle Fehler ----
     try:
-        # ---- Screenshot aufnehmen und speichern ----
+        # ---- Screenshot aufnehmen (bleibt im Speicher) ----
         try:
             ausschnitt_reaips = (45, 142, 155, 20) # Feste Koordinaten
-            screenshot = pyautogui.screenshot(region=ausschnitt_reaips)
-            os.makedirs(base_path, exist_ok=True) # Verzeichnis sicherstellen
-            screenshot.save(screenshot_fullpath)
-            print(f"Screenshot für REA/IPS gespeichert unter: {screenshot_fullpath}")
+            image = pyautogui.screenshot(region=ausschnitt_reaips)
+            save_ocr_debug_image(image, "screenshot_reaips.png")
         except (pyautogui.PyAutoGUIException, OSError, IOError, Exception) as e:
-            print(f"FEHLER [auslesen_reaips]: Erstellen/Speichern des Screenshots fehlgeschlagen: {e}")
+            print(f"FEHLER [auslesen_reaips]: Erstellen des Screenshots fehlgeschlagen: {e}")
             raise RuntimeError("Screenshot-Fehler") from e # Fehler nach außen geben für Haupt-try-Block
 
-        # ---- Bild laden und Vorverarbeitung ----
+        # ---- Vorverarbeitung ----
         try:
-            image = PIL_Image.open(screenshot_fullpath)
             # Dieselbe Vorverarbeitung wie im Original (und ähnlich zu auslesen_spi)
             image_proc = image.convert('L')
             image_proc = PIL_ImageEnhance.Contrast(image_proc).enhance(2.0)
@@ -1128,28 +829,22 @@ def auslesen_reaips():
                 PIL_Image.Resampling.LANCZOS # Verwende Resampling Enum
             )
             image_proc = image_proc.convert('RGB') # Für EasyOCR
-            image_proc.save(preprocessed_fullpath) # Speichere vorverarbeitetes Bild
-            print(f"Vorverarbeitetes Bild gespeichert unter: {preprocessed_fullpath}")
+            save_ocr_debug_image(image_proc, "screenshot_reaips_preprocessed.png") # Nur zur Fehlersuche
 
             # Konvertiere zu NumPy Array
             image_np = numpy.array(image_proc)
 
-        except FileNotFoundError:
-            print(f"FEHLER [auslesen_reaips]: Screenshot-Datei '{screenshot_fullpath}' nicht gefunden zum Laden.")
-            raise RuntimeError("Bildlade-Fehler")
-        except (PIL_Image.UnidentifiedImageError, IOError, OSError, ValueError, Exception) as e:
+        except (IOError, OSError, ValueError, Exception) as e:
             print(f"FEHLER [auslesen_reaips]: Bildverarbeitung fehlgeschlagen: {e}")
             raise RuntimeError("Bildverarbeitungs-Fehler") from e
 
         # ---- OCR und Extraktion ----
         try:
-            reader = get_reader_easyocr() # Hole den Reader
-            if reader is None:
-                print("FEHLER [auslesen_reaips]: Konnte EasyOCR Reader nicht initialisieren.")
-                raise RuntimeError("EasyOCR Reader Fehler")
-
-            # Führe OCR durch ('de' wird von get_reader_easyocr angenommen)
-            results = reader.readtext(image_np, detail=0)
+            # Führe OCR durch (OCR-Dienst, Reader bereits geladen)
+            results = easyocr_texte(image_np)
+            if results is None:
+                print("FEHLER [auslesen_reaips]: EasyOCR fehlgeschlagen.")
+                raise RuntimeError("EasyOCR Fehler")
             print(f"EasyOCR Ergebnis für REA/IPS: {results}")
 
             text = " ".join(results) # Füge alle erkannten Teile zusammen
@@ -1170,7 +865,7 @@ def auslesen_reaips():
                 print(f"IPS Status gefunden: {ips}")
 
         except Exception as e:
-            # Fange Fehler von get_reader_easyocr(), readtext() oder der Regex-Verarbeitung ab
+            # Fange Fehler der OCR oder der Regex-Verarbeitung ab
             print(f"FEHLER [auslesen_reaips]: OCR oder Extraktion fehlgeschlagen: {e}")
             return False, False
 
@@ -1204,7 +899,7 @@ def auslesen_rt_start_ende():
     button_extras_path = os.path.join(screenshots_dir, 'UNIVERSAL', 'bereich_berichte', 'button_extras.png')
     while True:
         try:
-            button_extras = pyautogui.locateOnScreen(button_extras_path, confidence=0.8)
+            button_extras = template_matcher.locate_on_screen(button_extras_path, confidence=0.8, raise_not_found=True)
             if button_extras is not None:
                 button_center = pyautogui.center(button_extras)
                 pyautogui.click(button_center)
@@ -1240,7 +935,7 @@ def bereich_berichte_click_in_OE():
     button_oe_path = os.path.join(screenshots_dir, 'UNIVERSAL', 'bereich_berichte', 'button_oe.png')
     while True:
         try:
-            button_oe = pyautogui.locateOnScreen(button_oe_path, confidence=0.8)
+            button_oe = template_matcher.locate_on_screen(button_oe_path, confidence=0.8, raise_not_found=True)
             if button_oe is not None:
                 button_center = pyautogui.center(button_oe)
                 pyautogui.click(button_center)
@@ -1422,7 +1117,7 @@ def laborhadh_ausfuellen(datum_labor):
     location = None # Initialisieren
     while attempts < max_attempts_right_click:
         try:
-            location = pyautogui.locateCenterOnScreen(button_blau_had_path, confidence=0.8)
+            location = template_matcher.locate_center_on_screen(button_blau_had_path, confidence=0.8, raise_not_found=True)
             if location:
                 print(f"'Button Blau HAD' gefunden bei {location}. Führe Rechtsklick aus...")
                 pyautogui.rightClick(location)
@@ -1515,7 +1210,7 @@ def KG_oeffnen_via_fallnummer(fallnummer):
              print(f"ERROR: Loop 1 timed out looking for {button_lupe_path}")
              return
         try:
-            button_lupe = pyautogui.locateOnScreen(button_lupe_path, confidence=0.8)
+            button_lupe = template_matcher.locate_on_screen(button_lupe_path, confidence=0.8, raise_not_found=True)
             # If found without exception:
             print(f'button_lupe.png found at {button_lupe}. Clicking...')
             button_center = pyautogui.center(button_lupe)
@@ -1546,7 +1241,7 @@ def KG_oeffnen_via_fallnummer(fallnummer):
         try:
             # --- Try finding CONFIRM button FIRST ---
             print(f"Attempting to find CONFIRM button: {confirm_path}")
-            button_globale_suche_confirm = pyautogui.locateOnScreen(confirm_path, confidence=0.9)
+            button_globale_suche_confirm = template_matcher.locate_on_screen(confirm_path, confidence=0.9, raise_not_found=True)
             # If the above line succeeds without exception, the button was found
             print(f'button_globale_suche_confirm.png FOUND at {button_globale_suche_confirm}. Loop 2 finished.')
             break # Success, exit Loop 2
@@ -1556,7 +1251,7 @@ def KG_oeffnen_via_fallnummer(fallnummer):
             print(f"CONFIRM button not found ({confirm_path}).")
             print(f"Attempting to find SEARCH button: {suche_path}")
             try:
-                button_globale_suche = pyautogui.locateOnScreen(suche_path, confidence=0.9)
+                button_globale_suche = template_matcher.locate_on_screen(suche_path, confidence=0.9, raise_not_found=True)
                 # If this succeeds without exception, the second button was found
                 print(f'button_globale_suche.png FOUND at {button_globale_suche}. Clicking...')
                 button_center = pyautogui.center(button_globale_suche)
@@ -1594,7 +1289,7 @@ def KG_oeffnen_via_fallnummer(fallnummer):
     while True:
         try:
             # Use the defined path variable
-            button_bereich_stammdaten_confirm = pyautogui.locateOnScreen(button_stammdaten_confirm_path, confidence=0.8)
+            button_bereich_stammdaten_confirm = template_matcher.locate_on_screen(button_stammdaten_confirm_path, confidence=0.8, raise_not_found=True)
             if button_bereich_stammdaten_confirm is not None:
                 print(f'button_bereich_stammdaten_confirm.png ({button_stammdaten_confirm_path}) gefunden, Fall geöffnet')
                 break
@@ -1602,7 +1297,7 @@ def KG_oeffnen_via_fallnummer(fallnummer):
             print(f'button_bereich_stammdaten_confirm ({button_stammdaten_confirm_path}) not found. Try clicking button_KG_oeffnen')
             try:
                 # Use the defined path variable
-                button_KG_oeffnen = pyautogui.locateOnScreen(button_kg_oeffnen_path, confidence=0.8)
+                button_KG_oeffnen = template_matcher.locate_on_screen(button_kg_oeffnen_path, confidence=0.8, raise_not_found=True)
                 if button_KG_oeffnen is not None:
                     button_center = pyautogui.center(button_KG_oeffnen)
                     pyautogui.click(button_center)
@@ -1653,7 +1348,7 @@ def KG_oeffnen_via_patientennummer(patientennummer):
              print(f"ERROR: Loop 1 timed out looking for {button_lupe_path}")
              return
         try:
-            button_lupe = pyautogui.locateOnScreen(button_lupe_path, confidence=0.8)
+            button_lupe = template_matcher.locate_on_screen(button_lupe_path, confidence=0.8, raise_not_found=True)
             # If found without exception:
             print(f'button_lupe.png found at {button_lupe}. Clicking...')
             button_center = pyautogui.center(button_lupe)
@@ -1684,7 +1379,7 @@ def KG_oeffnen_via_patientennummer(patientennummer):
         try:
             # --- Try finding CONFIRM button FIRST ---
             print(f"Attempting to find CONFIRM button: {confirm_path}")
-            button_globale_suche_confirm = pyautogui.locateOnScreen(confirm_path, confidence=0.9)
+            button_globale_suche_confirm = template_matcher.locate_on_screen(confirm_path, confidence=0.9, raise_not_found=True)
             # If the above line succeeds without exception, the button was found
             print(f'button_globale_suche_confirm.png FOUND at {button_globale_suche_confirm}. Loop 2 finished.')
             break # Success, exit Loop 2
@@ -1694,7 +1389,7 @@ def KG_oeffnen_via_patientennummer(patientennummer):
             print(f"CONFIRM button not found ({confirm_path}).")
             print(f"Attempting to find SEARCH button: {suche_path}")
             try:
-                button_globale_suche = pyautogui.locateOnScreen(suche_path, confidence=0.9)
+                button_globale_suche = template_matcher.locate_on_screen(suche_path, confidence=0.9, raise_not_found=True)
                 # If this succeeds without exception, the second button was found
                 print(f'button_globale_suche.png FOUND at {button_globale_suche}. Clicking...')
                 button_center = pyautogui.center(button_globale_suche)
@@ -1732,7 +1427,7 @@ def KG_oeffnen_via_patientennummer(patientennummer):
     while True:
         try:
             # Use the defined path variable
-            button_bereich_stammdaten_confirm = pyautogui.locateOnScreen(button_stammdaten_confirm_path, confidence=0.8)
+            button_bereich_stammdaten_confirm = template_matcher.locate_on_screen(button_stammdaten_confirm_path, confidence=0.8, raise_not_found=True)
             if button_bereich_stammdaten_confirm is not None:
                 print(f'button_bereich_stammdaten_confirm.png ({button_stammdaten_confirm_path}) gefunden, Fall geöffnet')
                 break
@@ -1740,7 +1435,7 @@ def KG_oeffnen_via_patientennummer(patientennummer):
             print(f'button_bereich_stammdaten_confirm ({button_stammdaten_confirm_path}) not found. Try clicking button_KG_oeffnen')
             try:
                 # Use the defined path variable
-                button_KG_oeffnen = pyautogui.locateOnScreen(button_kg_oeffnen_path, confidence=0.8)
+                button_KG_oeffnen = template_matcher.locate_on_screen(button_kg_oeffnen_path, confidence=0.8, raise_not_found=True)
                 if button_KG_oeffnen is not None:
                     button_center = pyautogui.center(button_KG_oeffnen)
                     pyautogui.click(button_center)
@@ -1775,7 +1470,7 @@ def KG_schliessen():
     # button_kgschliessen
     while True:
         try:
-            button_kgschliessen = pyautogui.locateOnScreen(button_kgschliessen_path, confidence=0.8)
+            button_kgschliessen = template_matcher.locate_on_screen(button_kgschliessen_path, confidence=0.8, raise_not_found=True)
             if button_kgschliessen is not None:
                 button_center = pyautogui.center(button_kgschliessen)
                 pyautogui.click(button_center)
@@ -1794,7 +1489,7 @@ def KG_schliessen():
     # button_keinekgoffen
     while True:
         try:
-            button_keinekgoffen = pyautogui.locateOnScreen(button_keinekgoffen_path, confidence=0.8)
+            button_keinekgoffen = template_matcher.locate_on_screen(button_keinekgoffen_path, confidence=0.8, raise_not_found=True)
             if button_keinekgoffen is not None:
                 print(f'alle KGs geschlossen (Bestätigung: {button_keinekgoffen_path} gefunden)')
                 break
@@ -1832,14 +1527,6 @@ def auslesen_patdata_KISIMzeile():
         # Rückgabe von None-Werten für alle erwarteten Variablen (jetzt 7)
         return None, None, None, None, None, None, None
 
-    # Pfade definieren - Verwende screenshots_dir
-    # Specific directories for screenshots related to patient data reading
-    screenshot_patdata_dir = os.path.join(screenshots_dir, "patdata") # Dir to save the raw screenshot
-    screenshot_preprocessing_dir = os.path.join(screenshots_dir, "UNIVERSAL", "image_preprocessing") # Dir to save the processed screenshot
-    screenshot_path = os.path.join(screenshot_patdata_dir, "screenshot_patdata.png")
-    preprocessed_path = os.path.join(screenshot_preprocessing_dir, "screenshot_patdata_preprocessed_from_function_patdata_KISIMzeile.png")
-
-
     # Initialisiere alle Rückgabewerte mit None
     nachname = None
     vorname = None
@@ -1853,16 +1540,9 @@ def auslesen_patdata_KISIMzeile():
         print("Starte Auslesen der KISIM-Basisdaten (obere Zeile)")
         ausschnitt = (46, 60, 1000, 20)
 
-        # Verzeichnisse sicherstellen - Use the new directory variables
-        os.makedirs(screenshot_patdata_dir, exist_ok=True)
-        os.makedirs(screenshot_preprocessing_dir, exist_ok=True)
-
-
-        screenshot_patdata = pyautogui.screenshot(region=ausschnitt)
-        screenshot_patdata.save(screenshot_path)
-        print(f"Screenshot gespeichert: {screenshot_path}")
-
-        screenshot_patdata_img = PIL_Image.open(screenshot_path)
+        # Screenshot und Vorverarbeitung bleiben im Speicher (Dateien nur als OCR-Debugbilder)
+        screenshot_patdata_img = pyautogui.screenshot(region=ausschnitt)
+        save_ocr_debug_image(screenshot_patdata_img, "screenshot_patdata.png")
 
         # --- Bildverarbeitung ---
         width, height = screenshot_patdata_img.size
@@ -1870,8 +1550,7 @@ def auslesen_patdata_KISIMzeile():
         screenshot_patdata_preprocessed_pil = screenshot_patdata_preprocessed_pil.convert('L')
         screenshot_patdata_preprocessed_pil = PIL_ImageEnhance.Contrast(screenshot_patdata_preprocessed_pil).enhance(2)
         screenshot_patdata_preprocessed_pil = screenshot_patdata_preprocessed_pil.filter(PIL_ImageFilter.SHARPEN)
-        screenshot_patdata_preprocessed_pil.save(preprocessed_path)
-        print(f"Vorverarbeitetes Bild (Zoom 3x, Contrast, Sharpen) gespeichert: {preprocessed_path}")
+        save_ocr_debug_image(screenshot_patdata_preprocessed_pil, "screenshot_patdata_preprocessed_from_function_patdata_KISIMzeile.png")
 
         screenshot_patdata_preprocessed_rgb = screenshot_patdata_preprocessed_pil.convert('RGB')
         # Verwende die dynamisch importierte numpy Variable
@@ -1879,11 +1558,9 @@ def auslesen_patdata_KISIMzeile():
 
         # --- OCR mit EasyOCR ---
         print("Starte OCR mit EasyOCR...")
-        reader = get_reader_easyocr()
-        if reader is None:
-             raise RuntimeError("EasyOCR Reader konnte nicht initialisiert werden.")
-
-        easyocr_results = reader.readtext(screenshot_patdata_preprocessed_numpy, detail=0, paragraph=False)
+        easyocr_results = easyocr_texte(screenshot_patdata_preprocessed_numpy, paragraph=False)
+        if easyocr_results is None:
+             raise RuntimeError("EasyOCR fehlgeschlagen.")
         print("OCR Output via EasyOCR:", easyocr_results)
 
         # --- Extraktion --- (Keine Pfadänderungen hier nötig)
@@ -2035,13 +1712,6 @@ def auslesen_patdata_KISIMzeile_tesseract():
         print(f"FEHLER [auslesen_patdata_KISIMzeile_tesseract]: Import fehlgeschlagen: {e}")
         return None, None, None, None, None, None, None
 
-    # Pfade definieren - Verwende screenshots_dir
-    screenshot_patdata_dir = os.path.join(screenshots_dir, "patdata")
-    screenshot_preprocessing_dir = os.path.join(screenshots_dir, "UNIVERSAL", "image_preprocessing")
-    # Eindeutige Dateinamen für die Tesseract-Version, um Konflikte zu vermeiden
-    screenshot_path = os.path.join(screenshot_patdata_dir, "screenshot_patdata_tesseract.png")
-    preprocessed_path = os.path.join(screenshot_preprocessing_dir, "screenshot_patdata_preprocessed_from_function_patdata_KISIMzeile_tesseract.png")
-
     # Initialisiere alle Rückgabewerte mit None
     nachname, vorname, geburtsdatum, alter, geschlecht, patientennummer, eintrittsdatum = (None,) * 7
 
@@ -2049,28 +1719,21 @@ def auslesen_patdata_KISIMzeile_tesseract():
         print("Starte Auslesen der KISIM-Basisdaten (obere Zeile) mit Tesseract.")
         ausschnitt = (46, 60, 1000, 20) # Derselbe Ausschnitt wie in der EasyOCR-Version
 
-        # Verzeichnisse sicherstellen
-        os.makedirs(screenshot_patdata_dir, exist_ok=True)
-        os.makedirs(screenshot_preprocessing_dir, exist_ok=True)
-
-        # --- Screenshot und Bildvorverarbeitung (identisch zur Originalfunktion) ---
-        screenshot_patdata = pyautogui.screenshot(region=ausschnitt)
-        screenshot_patdata.save(screenshot_path)
-        print(f"Screenshot gespeichert: {screenshot_path}")
-
-        screenshot_patdata_img = PIL_Image.open(screenshot_path)
+        # --- Screenshot und Bildvorverarbeitung (identisch zur Originalfunktion, im Speicher) ---
+        screenshot_patdata_img = pyautogui.screenshot(region=ausschnitt)
+        # Eindeutige Dateinamen für die Tesseract-Version, um Konflikte zu vermeiden
+        save_ocr_debug_image(screenshot_patdata_img, "screenshot_patdata_tesseract.png")
         width, height = screenshot_patdata_img.size
         screenshot_patdata_preprocessed_pil = screenshot_patdata_img.resize((width * 3, height * 3), PIL_Image.Resampling.LANCZOS)
         screenshot_patdata_preprocessed_pil = screenshot_patdata_preprocessed_pil.convert('L')
         screenshot_patdata_preprocessed_pil = PIL_ImageEnhance.Contrast(screenshot_patdata_preprocessed_pil).enhance(2)
         screenshot_patdata_preprocessed_pil = screenshot_patdata_preprocessed_pil.filter(PIL_ImageFilter.SHARPEN)
-        screenshot_patdata_preprocessed_pil.save(preprocessed_path)
-        print(f"Vorverarbeitetes Bild (Zoom 3x, Contrast, Sharpen) gespeichert: {preprocessed_path}")
+        save_ocr_debug_image(screenshot_patdata_preprocessed_pil, "screenshot_patdata_preprocessed_from_function_patdata_KISIMzeile_tesseract.png")
 
         # --- OCR mit Tesseract ---
         print("Starte OCR mit Tesseract...")
-        # Rufe die bestehende Helper-Funktion auf, die den Pfad zum Bild benötigt
-        ocr_text = run_tesseract_ocr_deutsch(preprocessed_path)
+        # Das vorverarbeitete Bild geht direkt aus dem Speicher an den OCR-Dienst
+        ocr_text = run_tesseract_ocr_deutsch(screenshot_patdata_preprocessed_pil)
 
         if ocr_text is None:
             print("FEHLER: Tesseract OCR hat keinen Text zurückgegeben oder ist fehlgeschlagen.")
@@ -2721,34 +2384,19 @@ def find_and_click_button(image_name, description="Button", base_path=None, max_
         return False
 
     print(f"Suche nach '{description}' ({image_name})... Pfad: {image_path}")
-    attempts = 0
-    while attempts < max_attempts:
+    # Template aus dem Cache, ein Screenshot pro Versuch
+    box = template_matcher.wait_for(image_path, confidence=confidence, max_attempts=max_attempts,
+                                    interval=interval, description=description)
+    if box:
+        location = template_matcher.center(box)
         try:
-            # Verwende locateCenterOnScreen für direkte Koordinaten zum Klicken
-            location = pyautogui.locateCenterOnScreen(image_path, confidence=confidence)
-            if location:
-                # Add a small random offset to the click location? Optional.
-                # x_offset = random.randint(-2, 2)
-                # y_offset = random.randint(-2, 2)
-                # click_location = (location.x + x_offset, location.y + y_offset)
-                print(f"'{description}' gefunden bei {location}. Klicke...")
-                pyautogui.click(location) # Click the identified center
-                # KEIN time.sleep() hier hinzufügen, wie gewünscht
-                print(f"'{description}' geklickt.")
-                return True
-            # Kein else-Block für "nicht gefunden" für weniger Konsolenausgabe
-        except pyautogui.ImageNotFoundException:
-            # Fehler wird nur am Ende gemeldet, wenn alle Versuche fehlschlagen
-            pass
+            print(f"'{description}' gefunden bei {location}. Klicke...")
+            pyautogui.click(location) # Click the identified center
+            print(f"'{description}' geklickt.")
+            return True
         except Exception as e:
-            # Log unexpected errors during search/click
-            print(f"Ein unerwarteter Fehler ist bei der Suche/Klick nach '{description}' aufgetreten (Versuch {attempts + 1}): {e}")
-            # Consider if returning False immediately is better on unexpected errors
-            # return False
-            pass # Continue trying for now
-
-        attempts += 1
-        time.sleep(interval) # Kurze Pause zwischen den Suchversuchen bleibt
+            print(f"Ein unerwarteter Fehler ist beim Klick auf '{description}' aufgetreten: {e}")
+            return False
 
     print(f"Fehler: '{description}' ({image_name}) konnte nach {max_attempts} Versuchen nicht gefunden werden unter '{image_path}'.")
     return False
@@ -2868,17 +2516,21 @@ def leistung_eintragen(bericht_typ, icd_code=None, secondary_icd_code=None):
         icd_fehlt_location = None
         icd_komplett_location = None
 
-        # Suche nach "ICD fehlt"
-        try:
-            icd_fehlt_location = pyautogui.locateCenterOnScreen(icd_fehlt_path, confidence=0.85)
-        except pyautogui.ImageNotFoundException: pass
-        except Exception as e: print(f"WARNUNG: Fehler bei Suche nach 'ICD fehlt': {e}")
-
-        # Suche nach "ICD komplett"
+        # Suche nach "ICD fehlt" und "ICD komplett" im selben Screenshot
         try:
-            icd_komplett_location = pyautogui.locateCenterOnScreen(icd_komplett_path, confidence=0.85)
-        except pyautogui.ImageNotFoundException: pass
-        except Exception as e: print(f"WARNUNG: Fehler bei Suche nach 'ICD komplett': {e}")
+            screen = template_matcher.ScreenGrab.capture()
+        except Exception as e:
+            screen = None
+            print(f"WARNUNG: Fehler beim Erstellen des Screenshots: {e}")
+        if screen is not None:
+            try:
+                box = template_matcher.locate(icd_fehlt_path, screen, confidence=0.85)
+                icd_fehlt_location = template_matcher.center(box) if box else None
+            except Exception as e: print(f"WARNUNG: Fehler bei Suche nach 'ICD fehlt': {e}")
+            try:
+                box = template_matcher.locate(icd_komplett_path, screen, confidence=0.85)
+                icd_komplett_location = template_matcher.center(box) if box else None
+            except Exception as e: print(f"WARNUNG: Fehler bei Suche nach 'ICD komplett': {e}")
 
         # --- Logik basierend auf gefundenen Buttons ---
         if icd_fehlt_location:
@@ -2986,17 +2638,17 @@ def leistung_eintragen(bericht_typ, icd_code=None, secondary_icd_code=None):
 def icd_check(icd_code=None):
     local_screenshot_base_path = os.path.join(screenshots_dir, "UNIVERSAL", "bereich_leistungen")
     anker_icd = None
-    for i in range(50):
-        if find_button("button_icd_komplett.png", base_path=local_screenshot_base_path, max_attempts=1):
-            print("button_icd_komplett.png gefunden, ICD bereits eingetragen")
-            anker_icd = True
-            break
-        elif find_button("button_icd_fehlt.png", base_path=local_screenshot_base_path, max_attempts=1):
-            print("button_icd_fehlt.png gefunden, ICD muss eingetragen werden")
-            anker_icd = False
-            break
-        else:
-            print(f"Nach Versuch {i}:Weder ICD komplett noch ICD fehlt gefunden, versuche erneut.")
+    # Beide Anker werden pro Versuch im selben Screenshot gesucht
+    icd_komplett_path = os.path.join(local_screenshot_base_path, "button_icd_komplett.png")
+    icd_fehlt_path = os.path.join(local_screenshot_base_path, "button_icd_fehlt.png")
+    found_path, _ = template_matcher.wait_for_any([icd_komplett_path, icd_fehlt_path], confidence=0.8,
+                                                  max_attempts=50, interval=0.1, description="ICD Anker")
+    if found_path == icd_komplett_path:
+        print("button_icd_komplett.png gefunden, ICD bereits eingetragen")
+        anker_icd = True
+    elif found_path == icd_fehlt_path:
+        print("button_icd_fehlt.png gefunden, ICD muss eingetragen werden")
+        anker_icd = False
 
     if anker_icd == None:
         print("nach 50 Versuchen kein ICD anker gefunden")
@@ -0,0 +1,154 @@
+"""
+Offline-Benchmark für template_matcher.py mit gespeicherten Screenshots.
+
+Vergleicht für jeden Screenshot die Suche nach allen Templates eines Ordners:
+- bisher: pyscreeze.locate pro Template (PNG wird jedes Mal neu gelesen, der Screenshot
+  jedes Mal neu geladen und konvertiert, wie bei pyautogui.locateOnScreen pro Versuch)
+- neu: ein Screenshot für alle Templates, Templates aus dem TemplateCache
+- neu mit ROI: wie oben, aber zuerst im gelernten Bereich (LocationHistory in einer
+  temporären Datei, der erste Screenshot dient zum Lernen)
+
+Die gefundenen Positionen der ersten beiden Varianten werden auf Gleichheit geprüft.
+Ohne Screenshot-Ordner werden synthetische Desktops (1920x1080) erzeugt, auf denen die
+Templates wie in KISIM an fast gleichen Positionen liegen (wenige Pixel Versatz).
+
+Benötigt opencv-python und pyscreeze (wird mit pyautogui installiert), aber keinen Bildschirm.
+
+Usage:
+    python benchmark_template_matcher.py [screenshot_ordner] [template_ordner]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from PIL import Image
+
+import template_matcher
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TEMPLATE_DIR = os.path.join(script_dir, 'screenshots pyautogui', 'UNIVERSAL', 'bereiche')
+CONFIDENCE = 0.8
+
+
+def list_images(folder):
+    return sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.lower().endswith('.png'))
+
+
+def make_synthetic_screenshots(template_paths, target_dir, count=5, seed=0):
+    """Graue Desktops mit einem Teil der Templates an ihrer (leicht versetzten) Stammposition"""
+    rng = random.Random(seed)
+    templates = {}
+    for template_path in template_paths:
+        with Image.open(template_path) as template:
+            template = template.convert('RGB')
+        home = (rng.randint(5, 1915 - template.width), rng.randint(5, 1075 - template.height))
+        templates[template_path] = (template, home)
+
+    paths = []
+    for i in range(count):
+        desktop = Image.new('RGB', (1920, 1080), (rng.randint(200, 240),) * 3)
+        for template_path in rng.sample(template_paths, k=max(1, len(template_paths) // 2)):
+            template, (left, top) = templates[template_path]
+            desktop.paste(template, (left + rng.randint(-3, 3), top + rng.randint(-3, 3)))
+        path = os.path.join(target_dir, f"desktop_{i}.png")
+        desktop.save(path)
+        paths.append(path)
+    return paths
+
+
+def search_pyscreeze(screenshot_path, template_paths):
+    pyscreeze = template_matcher._load_module("pyscreeze")
+    found = {}
+    for template_path in template_paths:
+        # Pro Suche neuer "Screenshot" und neu gelesenes Template wie bei locateOnScreen
+        with Image.open(screenshot_path) as screenshot:
+            screenshot.load()
+            try:
+                box = pyscreeze.locate(template_path, screenshot, confidence=CONFIDENCE)
+            except pyscreeze.ImageNotFoundException:
+                box = None
+        found[template_path] = tuple(int(v) for v in box) if box else None
+    return found
+
+
+def search_template_matcher(screenshot_path, template_paths):
+    found = {}
+    with Image.open(screenshot_path) as screenshot:
+        screenshot.load()
+        screen = template_matcher.ScreenGrab(screenshot)
+        for template_path in template_paths:
+            box = template_matcher.locate(template_path, screen, confidence=CONFIDENCE)
+            found[template_path] = tuple(box) if box else None
+    return found
+
+
+def search_template_matcher_roi(screenshot_path, template_paths):
+    found = {}
+    with Image.open(screenshot_path) as screenshot:
+        screenshot.load()
+        screen = template_matcher.ScreenGrab(screenshot)
+        for template_path in template_paths:
+            box = template_matcher.search(template_path, screen, confidence=CONFIDENCE)
+            found[template_path] = tuple(box) if box else None
+    return found
+
+
+def main():
+    if not template_matcher.opencv_available():
+        print("FEHLER: opencv-python ist nicht installiert.")
+        sys.exit(1)
+
+    screenshot_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    template_dir = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_TEMPLATE_DIR
+    template_paths = list_images(template_dir)
+    if not template_paths:
+        print(f"FEHLER: Keine Templates gefunden in '{template_dir}'")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if screenshot_dir:
+            screenshot_paths = list_images(screenshot_dir)
+        else:
+            print("Kein Screenshot-Ordner angegeben, erzeuge synthetische Desktops...")
+            screenshot_paths = make_synthetic_screenshots(template_paths, temp_dir)
+
+        print(f"{len(screenshot_paths)} Screenshots, {len(template_paths)} Templates")
+        pyscreeze_time = matcher_time = roi_time = 0.0
+        differences = 0
+        # Gelernte Positionen nur in einer temporären Datei, nicht in ~/patdata
+        template_matcher.location_history = template_matcher.LocationHistory(os.path.join(temp_dir, "locations.json"))
+        for screenshot_path in screenshot_paths:
+            start = time.perf_counter()
+            expected = search_pyscreeze(screenshot_path, template_paths)
+            pyscreeze_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            actual = search_template_matcher(screenshot_path, template_paths)
+            matcher_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            search_template_matcher_roi(screenshot_path, template_paths)
+            roi_time += time.perf_counter() - start
+
+            for template_path in template_paths:
+                if expected[template_path] != actual[template_path]:
+                    differences += 1
+                    print(f"ABWEICHUNG {os.path.basename(screenshot_path)} / {os.path.basename(template_path)}: "
+                          f"pyscreeze {expected[template_path]}, template_matcher {actual[template_path]}")
+
+    searches = len(screenshot_paths) * len(template_paths)
+    print(f"pyscreeze.locate:  {pyscreeze_time:7.3f} s ({pyscreeze_time / searches * 1000:6.1f} ms pro Suche)")
+    print(f"template_matcher:  {matcher_time:7.3f} s ({matcher_time / searches * 1000:6.1f} ms pro Suche)")
+    # Die Trefferquote der ROI-Suche wird beim Beenden von template_matcher ausgegeben
+    print(f"mit ROI:           {roi_time:7.3f} s ({roi_time / searches * 1000:6.1f} ms pro Suche)")
+    print(f"Faktor {pyscreeze_time / matcher_time:5.1f}x (ohne ROI), {pyscreeze_time / roi_time:5.1f}x (mit ROI) | "
+          f"Cache {len(template_matcher.template_cache)} Templates | "
+          f"Ergebnis {'identisch' if differences == 0 else f'{differences} Abweichungen'}")
+    sys.exit(0 if differences == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
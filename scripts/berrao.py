@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 print("Starte Skript berrao.py (inkl. Woko)...")
 import UNIVERSAL # Import UNIVERSAL first
+import template_matcher # Button-Suche mit Template-Cache und gelernten Suchbereichen
 import json
 import pyautogui
 import os
@@ -344,31 +345,26 @@ def check_daten_komplett():
 def find_and_click_berrao(image_name, clicks=1, button='left', custom_offset=None, confidence=None, max_attempts=80): # Neuer Parameter 'max_attempts' mit Standardwert 80
     image_path = os.path.join(image_base_path, image_name)
     if not os.path.exists(image_path): print(f"FEHLER: Bild nicht gefunden: {image_path}"); return False
-    conf_to_use = confidence if confidence is not None else CONFIDENCE_LEVEL; attempts = 0
-    while attempts < max_attempts:
+    conf_to_use = confidence if confidence is not None else CONFIDENCE_LEVEL
+    # Sucht zuerst im gelernten Bereich des Buttons, ein Screenshot pro Versuch
+    location = template_matcher.wait_for(image_path, confidence=conf_to_use, max_attempts=max_attempts,
+                                         interval=SEARCH_INTERVAL, description=image_name)
+    if location:
         try:
-            location = pyautogui.locateOnScreen(image_path, confidence=conf_to_use)
-            if location:
-                click_point = pyautogui.center(location);
-                if custom_offset:
-                    click_point = (click_point[0] + custom_offset[0], click_point[1] + custom_offset[1])
-                pyautogui.click(click_point, clicks=clicks, button=button, duration=0.05); time.sleep(ACTION_DELAY); return True
-        except pyautogui.ImageNotFoundException: pass
-        except Exception as e: print(f"Fehler Suche/Klick {image_name}: {e}")
-        attempts += 1; time.sleep(SEARCH_INTERVAL)
+            click_point = template_matcher.center(location)
+            if custom_offset:
+                click_point = (click_point[0] + custom_offset[0], click_point[1] + custom_offset[1])
+            pyautogui.click(click_point, clicks=clicks, button=button, duration=0.05); time.sleep(ACTION_DELAY); return True
+        except Exception as e: print(f"Fehler Klick {image_name}: {e}"); return False
     print(f"FEHLER: '{image_name}' nach {max_attempts} Versuchen n. gef. Pfad: {image_path}"); return False
 
 def find_image(image_name, confidence=None):
     image_path = os.path.join(image_base_path, image_name)
     if not os.path.exists(image_path): print(f"FEHLER: Bild nicht gefunden: {image_path}"); return False
-    conf_to_use = confidence if confidence is not None else CONFIDENCE_LEVEL; attempts = 0
-    while attempts < MAX_SEARCH_ATTEMPTS:
-        try:
-            location = pyautogui.locateOnScreen(image_path, confidence=conf_to_use)
-            if location:
-                time.sleep(ACTION_DELAY); return True
-        except Exception as e: print(f"Fehler Suche {image_name}: {e}")
-        attempts += 1; time.sleep(SEARCH_INTERVAL)
+    conf_to_use = confidence if confidence is not None else CONFIDENCE_LEVEL
+    if template_matcher.wait_for(image_path, confidence=conf_to_use, max_attempts=MAX_SEARCH_ATTEMPTS,
+                                 interval=SEARCH_INTERVAL, description=image_name):
+        time.sleep(ACTION_DELAY); return True
     print(f"FEHLER: '{image_name}' n. {MAX_SEARCH_ATTEMPTS} Versuchen n. gef. Pfad: {image_path}"); return False
 
 
@@ -2,6 +2,7 @@
 
 # --- Imports (wie zuvor) ---
 import UNIVERSAL
+import ocr_service
 import os
 import sys
 import pyautogui
@@ -27,6 +28,8 @@ patdata_dir = os.path.join(user_home, "patdata")
 screenshots_dir = os.path.join(script_dir, 'screenshots pyautogui')
 local_screenshots_dir = os.path.join(screenshots_dir, 'UNIVERSAL', 'bereich_laborkumulativ')
 screenshot_path_preprocessed = os.path.join(screenshots_dir, 'UNIVERSAL', 'image_preprocessing', 'screenshot_labor_preprocessed.png')
+# Vorverarbeiteter Labor-Screenshot (PIL), wird direkt aus dem Speicher gelesen
+screenshot_labor_preprocessed = None
 
 print(f"Script directory (test.py): {script_dir}")
 print(f"Screenshots base directory: {screenshots_dir}")
@@ -43,7 +46,7 @@ def ocr_mit_easyocr_detailed(image_path_or_pil_image):
     # ... (Code aus vorherigem Block ohne Änderungen) ...
     """
     Führt OCR mit EasyOCR durch und gibt die detaillierten Ergebnisse zurück.
-    Verwendet den gecachten Reader aus UNIVERSAL.get_reader_easyocr().
+    Läuft über den OCR-Dienst (ocr_service.py), ohne Dienst mit einem Reader im eigenen Prozess.
     OHNE logging-Modul. Jetzt Teil von test.py.
 
     Args:
@@ -58,65 +61,27 @@ def ocr_mit_easyocr_detailed(image_path_or_pil_image):
     function_name = "ocr_mit_easyocr_detailed (local)" # Markiert als lokal
     print(f"\n--- Start {function_name} ---")
 
-    # --- 1. EasyOCR Reader holen (aus UNIVERSAL) ---
-    try:
-        print(f"[{function_name}] Hole EasyOCR Reader via UNIVERSAL...")
-        # WICHTIG: Ruft die Funktion aus UNIVERSAL auf
-        reader = UNIVERSAL.get_reader_easyocr()
-        if reader is None:
-            print(f"FEHLER [{function_name}]: EasyOCR Reader ist nicht verfügbar (via UNIVERSAL). Aborting OCR.")
-            return None
-        print(f"[{function_name}] EasyOCR Reader erhalten.")
-    except Exception as reader_err:
-        print(f"FEHLER [{function_name}] beim Holen des EasyOCR Readers via UNIVERSAL: {reader_err}")
-        traceback.print_exc()
+    # --- 1. Eingabe prüfen ---
+    if isinstance(image_path_or_pil_image, str):
+        print(f"[{function_name}] Eingabe ist Dateipfad: {image_path_or_pil_image}")
+        if not os.path.isfile(image_path_or_pil_image):
+             print(f"FEHLER [{function_name}]: Bilddatei nicht gefunden: {image_path_or_pil_image}")
+             return None
+    elif not isinstance(image_path_or_pil_image, PIL_Image.Image):
+        print(f"FEHLER [{function_name}]: Ungültiger Eingabetyp: {type(image_path_or_pil_image)}. Erwartet String oder PIL Image.")
         return None
 
-    # --- 2. Bild vorbereiten (falls Pfad übergeben wurde) ---
-    image_input = None
-    input_type = "Unknown"
-    try:
-        # PIL ist bereits oben importiert
-        if isinstance(image_path_or_pil_image, str):
-            input_type = "File Path"
-            print(f"[{function_name}] Eingabe ist Dateipfad: {image_path_or_pil_image}")
-            if not os.path.isfile(image_path_or_pil_image):
-                 print(f"FEHLER [{function_name}]: Bilddatei nicht gefunden: {image_path_or_pil_image}")
-                 return None
-            print(f"[{function_name}] Lade Bild...")
-            image_pil = PIL_Image.open(image_path_or_pil_image)
-            image_input = np.array(image_pil.convert('RGB')) # Konvertiere zu NumPy Array
-            print(f"[{function_name}] Bild geladen und zu NumPy konvertiert.")
-
-        elif isinstance(image_path_or_pil_image, PIL_Image.Image):
-            input_type = "PIL Image"
-            print(f"[{function_name}] Eingabe ist PIL Image Objekt.")
-            image_input = np.array(image_path_or_pil_image.convert('RGB'))
-            print(f"[{function_name}] PIL Image zu NumPy konvertiert.")
-        else:
-            print(f"FEHLER [{function_name}]: Ungültiger Eingabetyp: {type(image_path_or_pil_image)}. Erwartet String oder PIL Image.")
-            return None
-
-    except FileNotFoundError:
-        print(f"FEHLER [{function_name}]: Bilddatei wurde nach Prüfung nicht gefunden: {image_path_or_pil_image}")
-        return None
-    except Exception as img_err:
-        print(f"FEHLER [{function_name}] beim Laden/Vorbereiten des Bildes (Typ: {input_type}): {img_err}")
-        traceback.print_exc()
+    # --- 2. OCR durchführen (OCR-Dienst mit geladenem Reader, sonst lokal) ---
+    print(f"[{function_name}] Führe OCR mit EasyOCR durch (detail=1, paragraph=False)...")
+    result = ocr_service.recognize(image_path_or_pil_image, engine="easyocr", paragraph=False)
+    if not result.get("ok"):
+        print(f"FEHLER [{function_name}] während der Texterkennung (OCR): {result.get('error')}")
         return None
 
-    # --- 3. OCR durchführen ---
-    try:
-        print(f"[{function_name}] Führe OCR mit EasyOCR durch (detail=1, paragraph=False)...")
-
-        detailed_results = reader.readtext(image_input, detail=1, paragraph=False)
-
-        print(f"[{function_name}] EasyOCR Detail-Ergebnis (Anzahl Blöcke): {len(detailed_results)}")
-
-    except Exception as ocr_err:
-        print(f"FEHLER [{function_name}] während der Texterkennung (OCR): {ocr_err}")
-        traceback.print_exc()
-        return None # Bei OCR-Fehler None zurückgeben
+    # --- 3. In das Format von reader.readtext(detail=1) bringen ---
+    detailed_results = [(block["box"], block["text"], block["confidence"]) for block in result["blocks"]]
+    print(f"[{function_name}] EasyOCR Detail-Ergebnis (Anzahl Blöcke): {len(detailed_results)}, "
+          f"{result.get('seconds')} s ({'OCR-Dienst' if result.get('service') else 'lokal'})")
 
     # --- 4. Abschluss und Rückgabe ---
     print(f"--- {function_name} erfolgreich abgeschlossen. Gibt {len(detailed_results)} detaillierte Blöcke zurück. ---")
@@ -321,26 +286,21 @@ def laborwerte_unbestimmt_anzeigen():
 # screenshot_labor() bleibt wie zuvor
 def screenshot_labor():
     # ... (Code aus vorherigem Block mit Korrektur des Speicherpfads) ...
-    """Erstellt einen Screenshot des Laborbereichs und verarbeitet ihn vor."""
+    """Erstellt einen Screenshot des Laborbereichs und verarbeitet ihn vor (Ergebnis in screenshot_labor_preprocessed)."""
+    global screenshot_labor_preprocessed
     print("\nStarte screenshot_labor()...")
     try:
         ausschnitt_labor = (40, 205, 695, 765)
         print(f"INFO: Screenshot-Region definiert: {ausschnitt_labor}")
         screenshot_labor_pil = pyautogui.screenshot(region=ausschnitt_labor)
         print("INFO: Screenshot erstellt.")
-        original_save_dir = os.path.join(screenshots_dir, 'UNIVERSAL', 'image_preprocessing')
-        os.makedirs(original_save_dir, exist_ok=True)
-        original_save_path = os.path.join(original_save_dir, 'screenshot_labor_original.png')
-        screenshot_labor_pil.save(original_save_path)
-        print(f"INFO: Original Screenshot gespeichert unter: {original_save_path}")
+        UNIVERSAL.save_ocr_debug_image(screenshot_labor_pil, 'screenshot_labor_original.png')
         print("INFO: Starte Bildvorverarbeitung via UNIVERSAL...")
         screenshot_labor_preprocessed_object = UNIVERSAL.PIL_image_preprocessing_Zoom_Contrast_Sharpen(screenshot_labor_pil)
 
         if screenshot_labor_preprocessed_object:
-            expected_save_path = screenshot_path_preprocessed
-            os.makedirs(os.path.dirname(expected_save_path), exist_ok=True)
-            screenshot_labor_preprocessed_object.save(expected_save_path)
-            print(f"INFO: Vorverarbeitetes Bild ERFOLGREICH gespeichert unter dem erwarteten Pfad: {expected_save_path}")
+            screenshot_labor_preprocessed = screenshot_labor_preprocessed_object
+            UNIVERSAL.save_ocr_debug_image(screenshot_labor_preprocessed_object, os.path.basename(screenshot_path_preprocessed))
             print("INFO: screenshot_labor() erfolgreich abgeschlossen.")
             return True
         else:
@@ -365,13 +325,12 @@ def easyocr_screenshot_labor_structured():
     # global structured_text_lines # Keine globale Variable mehr nötig
 
     print("\nStarte easyocr_screenshot_labor_structured()...")
-    if not os.path.exists(screenshot_path_preprocessed):
-        print(f"FEHLER: Vorverarbeitete Screenshot-Datei nicht gefunden: {screenshot_path_preprocessed}")
+    if screenshot_labor_preprocessed is None:
+        print("FEHLER: Kein vorverarbeiteter Labor-Screenshot vorhanden (screenshot_labor() zuerst ausführen).")
         return None # Geändert: Gibt None bei Fehler zurück
 
-    print(f"INFO: Lade vorverarbeitetes Bild: {screenshot_path_preprocessed}")
     try:
-        results_easyocr_detailed = ocr_mit_easyocr_detailed(screenshot_path_preprocessed)
+        results_easyocr_detailed = ocr_mit_easyocr_detailed(screenshot_labor_preprocessed)
 
         if results_easyocr_detailed is None:
              print("FEHLER: OCR (detailliert) ist fehlgeschlagen (Rückgabewert None).")
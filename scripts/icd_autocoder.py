@@ -0,0 +1,363 @@
+"""
+Offline-ICD-10-Kodierung der Tumorboard-Diagnosen (Spalte E der Tumorboard-Excel).
+
+Ersetzt die frühere LLM-Anfrage in createtumorboardpdf.icd(): kein Proxy, kein Netzwerk,
+gleiche Eingabe ergibt immer denselben Code. Reihenfolge der Regeln:
+
+1. Code im Text    - die Diagnose enthält bereits einen ICD-Code ("... (C34.1)")
+2. Verlauf         - gleiche oder sehr ähnliche Diagnose wurde früher schon kodiert
+                     (Tabelle patients in master_tumorboard.db, häufigster Code gewinnt)
+3. Entität         - Keyword-Tabellen aus entities.py (wie bei patdata), danach Verfeinerung
+                     auf den passendsten Subcode derselben Familie (z.B. "Oberlappen" -> C34.1)
+4. Ähnlichkeit     - Trigramm-Ähnlichkeit (IDF-gewichtet) gegen alle Beschreibungen in
+                     utils/icd_database.json; Tumordiagnosen nur gegen C- und D-Codes
+
+Findet keine Regel einen Code, bleibt die Zeile leer und wird zur manuellen Prüfung gemeldet.
+
+Usage:
+    python icd_autocoder.py "Adenokarzinom der Lunge, Oberlappen rechts" ["weitere Diagnose" ...]
+"""
+
+import importlib
+import importlib.util
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter, defaultdict, namedtuple
+from pathlib import Path
+
+import entities
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+app_dir = os.path.dirname(script_dir)
+# Im Bundle liegen utils/ und icd_database.json unter _MEIPASS
+resource_dir = getattr(sys, '_MEIPASS', app_dir) if getattr(sys, 'frozen', False) else app_dir
+ICD_DATABASE_PATH = os.path.join(resource_dir, 'utils', 'icd_database.json')
+MASTER_DB_PATHS = [
+    Path("K:/RAO_Projekte/App/tumorboards/__SQLite_database/master_tumorboard.db"),
+    Path.home() / "tumorboards" / "__SQLite_database" / "master_tumorboard.db",
+]
+
+# Ab dieser Ähnlichkeit (0-1) wird der Code einer früheren Diagnose übernommen
+MIN_HISTORY_SIMILARITY = 0.85
+# Mindest-Ähnlichkeit für einen Treffer aus dem ICD-Katalog
+MIN_CATALOGUE_SIMILARITY = 0.3
+# Ein Subcode ersetzt den Code der Entität nur mit so viel mehr Ähnlichkeit
+SUBSITE_MARGIN = 0.08
+
+# Diagnosen, die createtumorboardpdf nicht auslesen konnte
+UNCODABLE = {"MANUELLE PRÜFUNG ERFORDERLICH", "EXTRAKTIONSFEHLER"}
+
+IcdSuggestion = namedtuple('IcdSuggestion', 'icd_code icd_beschreibung quelle score')
+NO_SUGGESTION = IcdSuggestion("", "", None, 0.0)
+
+ICD_CODE_PATTERN = re.compile(r"\b([A-TV-Z]\d{2}(?:\.\d{1,2})?)\b")
+# TNM, Grading, Resektionsstatus usw. tragen nichts zur Lokalisation bei
+STAGING_PATTERN = re.compile(r"\b(?:[cpyrau]{0,3}[tnm][0-4x][a-d]?(?:\(\w+\))?|g[1-4x]|r[0-2x]|l[01]|v[0-2]|pn[01]|ecog\s*\d)\b")
+STOPWORDS = {
+    "des", "der", "die", "das", "dem", "den", "und", "oder", "mit", "bei", "im", "in", "am", "an", "auf",
+    "von", "vom", "zur", "zum", "nach", "unter", "st", "status", "bds", "beidseits", "rechts", "links",
+    "re", "li", "initial", "erstdiagnose", "ed", "diagnose", "vs", "v", "a", "mm", "cm", "stadium",
+    "uicc", "figo", "who", "grad", "typ",
+    # Allgemeine Tumorbegriffe: die Tumorart steuert TUMOR_HINTS, verglichen wird die Lokalisation
+    "karzinom", "adenokarzinom", "plattenepithelkarzinom", "ca", "tumor", "raumforderung", "rf",
+    "neoplasie", "malignom", "suspekte", "hochsuspekte", "verdacht", "dringender",
+}
+# Schreibweisen der Anmeldungen -> Wortlaut des ICD-Katalogs
+SYNONYMS = {
+    "mamma": "brustdruse", "mammakarzinom": "brustdruse", "brust": "brustdruse",
+    "lungenkarzinom": "lunge", "bronchialkarzinom": "bronchus lunge", "nsclc": "lunge", "sclc": "lunge",
+    "pulmonal": "lunge", "ol": "oberlappen", "ml": "mittellappen", "ul": "unterlappen",
+    "kolon": "colon", "kolonkarzinom": "colon", "rektumkarzinom": "rektums", "rektum": "rektums",
+    "zervix": "cervix", "zervixkarzinom": "cervix uteri", "endometrium": "endometrium corpus uteri",
+    "hirn": "gehirn", "zerebral": "gehirn", "oesophagus": "osophagus", "magenkarzinom": "magens",
+    "pankreaskarzinom": "pankreas", "prostatakarzinom": "prostata", "hcc": "leberzellkarzinom",
+    "ccc": "gallengange", "blasenkarzinom": "harnblase", "nierenzellkarzinom": "niere",
+    "sigma": "colon sigmoideum", "sigmakarzinom": "colon sigmoideum", "zoekum": "zakum",
+    "analkarzinom": "anus analkanal", "parotis": "parotis",
+}
+# Hinweise auf eine Tumordiagnose (dann nur C- und D-Codes)
+TUMOR_HINTS = (
+    "karzinom", "carcinom", "ca ", "tumor", "neoplas", "neubildung", "raumforderung", "rf ", "metasta",
+    "lymphom", "sarkom", "melanom", "malign", "adenom", "gliom", "blastom", "leukam", "myelom",
+    "plasmozytom", "mesotheliom", "nsclc", "sclc", "cup", "meningeom", "schwannom", "thymom",
+)
+
+
+def _load_utils_module(name):
+    """
+    Lädt utils/<name>.py ohne das Paket utils (dessen __init__ importiert PyQt6, pandas und matplotlib).
+    In der App (Bundle) ist utils bereits geladen und wird direkt importiert.
+    """
+    if f"utils.{name}" in sys.modules:
+        return sys.modules[f"utils.{name}"]
+    module_name = f"_utils_{name}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    path = os.path.join(app_dir, 'utils', f'{name}.py')
+    if not os.path.exists(path):
+        return importlib.import_module(f"utils.{name}")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[module_name] = module
+    return module
+
+
+icd_index = _load_utils_module("icd_index")
+icd10_mapping = _load_utils_module("icd10_mapping")
+
+
+def normalize_diagnosis(text):
+    """Kleinschreibung, Umlaute gefaltet, ohne Staging, Stoppwörter und Zahlen; Synonyme ergänzt"""
+    folded = icd_index.fold_text(text)
+    folded = STAGING_PATTERN.sub(" ", folded)
+    tokens = []
+    for token in re.findall(r"[a-z]+", folded):
+        if token in STOPWORDS or len(token) < 2 and token not in SYNONYMS:
+            continue
+        tokens.append(token)
+        if token in SYNONYMS:
+            tokens.extend(SYNONYMS[token].split())
+    return " ".join(tokens)
+
+
+def is_terminal_code(icd_code):
+    """Codes mit '-' (z.B. "C90.3-") sind im Katalog nur Gruppen und werden nicht vergeben"""
+    return not icd_code.endswith('-')
+
+
+def mentions_remission(text):
+    """Remissions-Subcodes (z.B. C90.01) nur, wenn die Diagnose selbst von Remission spricht"""
+    return "remission" in icd_index.fold_text(text)
+
+
+def is_tumor_diagnosis(text):
+    folded = f" {icd_index.fold_text(text)} "
+    return any(hint in folded for hint in TUMOR_HINTS)
+
+
+def _trigrams(text):
+    grams = set()
+    for token in text.split():
+        padded = f" {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """IDF-gewichtete Trigramm-Kosinus-Ähnlichkeit über normalisierte Texte"""
+
+    def __init__(self, documents):
+        """
+        Args:
+            documents (dict): Schlüssel -> normalisierter Text
+        """
+        self.grams = {key: _trigrams(text) for key, text in documents.items()}
+        document_frequency = Counter(gram for grams in self.grams.values() for gram in grams)
+        count = max(1, len(self.grams))
+        self.idf = {gram: math.log((count + 1) / (df + 0.5)) for gram, df in document_frequency.items()}
+        self.postings = defaultdict(list)
+        self.norms = {}
+        for key, grams in self.grams.items():
+            for gram in grams:
+                self.postings[gram].append(key)
+            self.norms[key] = math.sqrt(sum(self.idf[gram] ** 2 for gram in grams)) or 1.0
+
+    def rank(self, text, limit=5, accept=None):
+        """
+        Returns:
+            list[tuple]: [(Schlüssel, Ähnlichkeit 0-1), ...] absteigend
+        """
+        query = _trigrams(text)
+        query_norm = math.sqrt(sum(self.idf.get(gram, 0.0) ** 2 for gram in query))
+        if not query_norm:
+            return []
+        scores = defaultdict(float)
+        for gram in query:
+            weight = self.idf.get(gram)
+            if not weight:
+                continue
+            for key in self.postings[gram]:
+                scores[key] += weight * weight
+        ranked = ((key, score / (query_norm * self.norms[key])) for key, score in scores.items()
+                  if accept is None or accept(key))
+        return sorted(ranked, key=lambda item: (-item[1], item[0]))[:limit]
+
+    def similarity(self, text, key):
+        query = _trigrams(text)
+        grams = self.grams.get(key, set())
+        query_norm = math.sqrt(sum(self.idf.get(gram, 0.0) ** 2 for gram in query))
+        if not query_norm or not grams:
+            return 0.0
+        shared = sum(self.idf[gram] ** 2 for gram in query & grams)
+        return shared / (query_norm * self.norms[key])
+
+
+def load_history(db_path=None):
+    """
+    Bisherige Kodierungen aus master_tumorboard.db (nur lesend).
+
+    Returns:
+        dict: normalisierte Diagnose -> Counter(ICD-Code)
+    """
+    candidates = [Path(db_path)] if db_path else MASTER_DB_PATHS
+    history = defaultdict(Counter)
+    for path in candidates:
+        if not path.exists():
+            continue
+        try:
+            with sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True) as conn:
+                rows = conn.execute(
+                    "SELECT diagnosis, icd_code FROM patients "
+                    "WHERE diagnosis IS NOT NULL AND icd_code IS NOT NULL AND TRIM(icd_code) != ''"
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"WARNUNG: Verlauf aus {path} konnte nicht gelesen werden: {e}")
+            continue
+        for diagnosis, icd_code in rows:
+            icd_code = str(icd_code).strip().upper()
+            if str(diagnosis).strip() in UNCODABLE or not ICD_CODE_PATTERN.fullmatch(icd_code):
+                continue
+            normalized = normalize_diagnosis(diagnosis)
+            if normalized:
+                history[normalized][icd_code] += 1
+        print(f"{len(rows)} frühere Kodierungen aus {path} geladen.")
+        break
+    return history
+
+
+class IcdAutoCoder:
+    """Deterministische ICD-10-Kodierung für Diagnose-Freitexte"""
+
+    def __init__(self, catalogue, history=None):
+        """
+        Args:
+            catalogue (dict): ICD-Code -> Beschreibung (utils/icd_database.json)
+            history (dict): normalisierte Diagnose -> Counter(ICD-Code), siehe load_history()
+        """
+        self.catalogue = catalogue
+        self.catalogue_index = TrigramIndex({code: normalize_diagnosis(description)
+                                             for code, description in catalogue.items()})
+        self.history = history or {}
+        self.history_index = TrigramIndex({text: text for text in self.history})
+        self._memo = {}
+
+    @classmethod
+    def load(cls, db_path=None, catalogue_path=ICD_DATABASE_PATH):
+        start = time.perf_counter()
+        with open(catalogue_path, 'r', encoding='utf-8') as f:
+            catalogue = json.load(f)
+        coder = cls(catalogue, load_history(db_path))
+        print(f"ICD-Autokodierung bereit: {len(catalogue)} Katalog-Codes, {len(coder.history)} frühere Diagnosen "
+              f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+        return coder
+
+    def is_remission_code(self, icd_code):
+        """Subcodes "...: In kompletter Remission" der Leukämien, Lymphome und Myelome"""
+        return "kompletter remission" in self.catalogue.get(icd_code, "").lower()
+
+    def describe(self, icd_code, fallback=""):
+        description = self.catalogue.get(icd_code) or self.catalogue.get(icd_code[:3])
+        if description:
+            return description
+        family_description = icd10_mapping.get_icd_family_description(icd_code[:3])
+        return fallback if family_description.startswith("Unbekannt") else family_description
+
+    def code(self, diagnosis):
+        """
+        Returns:
+            IcdSuggestion: icd_code, icd_beschreibung, quelle ("code", "verlauf", "entität",
+                           "ähnlichkeit" oder None), score (0-1)
+        """
+        diagnosis = str(diagnosis or "").strip()
+        if not diagnosis or diagnosis in UNCODABLE:
+            return NO_SUGGESTION
+        normalized = normalize_diagnosis(diagnosis)
+        if normalized in self._memo:
+            return self._memo[normalized]
+        suggestion = self._code(diagnosis, normalized)
+        self._memo[normalized] = suggestion
+        return suggestion
+
+    def code_many(self, diagnoses):
+        return [self.code(diagnosis) for diagnosis in diagnoses]
+
+    def _code(self, diagnosis, normalized):
+        # 1. Code steht bereits in der Diagnose
+        for match in ICD_CODE_PATTERN.finditer(diagnosis.upper()):
+            icd_code = match.group(1)
+            if icd_code in self.catalogue or icd_code[:3] in self.catalogue:
+                return IcdSuggestion(icd_code, self.describe(icd_code), "code", 1.0)
+
+        # 2. Frühere Kodierung derselben oder einer sehr ähnlichen Diagnose
+        if normalized in self.history:
+            icd_code = self.history[normalized].most_common(1)[0][0]
+            return IcdSuggestion(icd_code, self.describe(icd_code), "verlauf", 1.0)
+        best = self.history_index.rank(normalized, limit=1)
+        if best and best[0][1] >= MIN_HISTORY_SIMILARITY:
+            text, score = best[0]
+            icd_code = self.history[text].most_common(1)[0][0]
+            return IcdSuggestion(icd_code, self.describe(icd_code), "verlauf", round(score, 3))
+
+        tumor = is_tumor_diagnosis(diagnosis)
+        # Neue Diagnosen sind nicht in Remission: "Ohne Angabe einer kompletten Remission" ist
+        # länger und wäre bei der Ähnlichkeit sonst immer der schlechtere Subcode
+        allow_remission = mentions_remission(diagnosis)
+
+        def usable(code):
+            return is_terminal_code(code) and (allow_remission or not self.is_remission_code(code))
+
+        # 3. Entität aus den Keyword-Tabellen, verfeinert auf den passendsten Subcode
+        entity_name, entity_code = self._match_entity(diagnosis)
+        if entity_code:
+            family = entity_code[:3]
+            default_score = self.catalogue_index.similarity(normalized, entity_code)
+            best = self.catalogue_index.rank(normalized, limit=1,
+                                             accept=lambda code: code.startswith(family) and usable(code))
+            if best and best[0][0] != entity_code and best[0][1] - default_score >= SUBSITE_MARGIN:
+                icd_code, score = best[0]
+            else:
+                # Kuratierte Zuordnung: mindestens mittlere Sicherheit, auch ohne Textähnlichkeit
+                icd_code, score = entity_code, max(default_score, 0.5)
+            return IcdSuggestion(icd_code, self.describe(icd_code, fallback=entity_name), "entität", round(score, 3))
+
+        # 4. Ähnlichste Beschreibung im Katalog
+        if tumor:
+            accept = lambda code: icd10_mapping.is_neoplasm_code(code) and usable(code)
+        else:
+            accept = usable
+        best = self.catalogue_index.rank(normalized, limit=1, accept=accept)
+        if best and best[0][1] >= MIN_CATALOGUE_SIMILARITY:
+            icd_code, score = best[0]
+            return IcdSuggestion(icd_code, self.describe(icd_code), "ähnlichkeit", round(score, 3))
+        return NO_SUGGESTION
+
+    @staticmethod
+    def _match_entity(diagnosis):
+        """
+        Wie entities.find_matching_entity (erste passende Entität in Tabellenreihenfolge), ohne Ausgaben.
+
+        Returns:
+            tuple: (Entität, ICD-Code) oder (None, None)
+        """
+        text_lower = diagnosis.lower()
+        for entity_name, keywords in entities.entity_keywords.items():
+            if any(keyword.lower() in text_lower for keyword in keywords):
+                icd_code = entities.get_icd_code(entity_name)
+                if icd_code:
+                    return entity_name, icd_code
+        return None, None
+
+
+if __name__ == "__main__":
+    coder = IcdAutoCoder.load()
+    start = time.perf_counter()
+    for diagnosis, suggestion in zip(sys.argv[1:], coder.code_many(sys.argv[1:])):
+        print(f"{diagnosis!r}: {suggestion.icd_code or '-'} {suggestion.icd_beschreibung} "
+              f"[{suggestion.quelle}, {suggestion.score}]")
+    print(f"{len(sys.argv) - 1} Diagnosen in {(time.perf_counter() - start) * 1000:.1f} ms kodiert.")
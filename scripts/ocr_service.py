@@ -0,0 +1,529 @@
+"""
+OCR-Dienst für die KISIM-Skripte.
+
+Bisher hat jedes Skript (patdata.py, ctcaeauslesen.py, createtumorboardpdf.py) EasyOCR bzw.
+Tesseract im eigenen Prozess initialisiert (mehrere Sekunden pro Start) und jeden Screenshot
+als PNG in 'screenshots pyautogui/' geschrieben, um ihn anschliessend wieder einzulesen.
+
+Dieser Dienst läuft als eigener, langlebiger Prozess, der von der App beim Start gestartet
+wird (main.py). Er lädt die Modelle einmal und nimmt Bilder direkt aus dem Speicher entgegen
+(Rohdaten, keine Dateien). Kommunikation über multiprocessing.connection auf 127.0.0.1 mit
+zufälligem Port und Schlüssel; beides steht in ~/patdata/ocr_service.json.
+
+Skripte verwenden recognize(image, engine): läuft der Dienst nicht (z.B. Skript direkt aus
+der Konsole gestartet), wird die OCR im eigenen Prozess ausgeführt. Das Ergebnis hat in beiden
+Fällen dieselbe Struktur:
+
+    {"ok": True, "engine": "easyocr", "text": "...", "seconds": 0.4,
+     "blocks": [{"text": "...", "box": [[x, y], ...], "confidence": 0.93}, ...]}
+    {"ok": False, "error": "..."}
+
+Start von Hand: python ocr_service.py [--parent-pid PID] | --status | --stop
+(im PyInstaller-Bundle: <App>.exe --ocr-service)
+"""
+
+import argparse
+import importlib
+import json
+import os
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+# Kommandozeilen-Flag, mit dem sich die gebundelte App als OCR-Dienst startet (siehe main.py)
+SERVICE_FLAG = "--ocr-service"
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+app_dir = os.path.dirname(script_dir)
+patdata_dir = os.path.join(os.path.expanduser("~"), "patdata")
+STATE_FILE = os.path.join(patdata_dir, "ocr_service.json")
+LOG_FILE = os.path.join(patdata_dir, "ocr_service.log")
+
+# Maximale Wartezeit auf ein OCR-Ergebnis (Sekunden)
+REQUEST_TIMEOUT = 120
+# Der Dienst beendet sich, wenn die App nicht mehr läuft oder so lange keine Anfrage kam
+PARENT_CHECK_INTERVAL = 5
+IDLE_TIMEOUT = 12 * 3600
+# Nach einem Verbindungsfehler wird der Dienst so lange nicht gefragt (ausser er wurde neu gestartet)
+SERVICE_RETRY_INTERVAL = 30
+
+EASYOCR_LANGUAGES = ['de', 'en']
+
+
+def _load_module(name):
+    return importlib.import_module(name) if name not in sys.modules else sys.modules[name]
+
+
+def resource_root():
+    """Basisverzeichnis für offline_packages bzw. easyocr_models (Bundle oder Quellcode)"""
+    if getattr(sys, 'frozen', False):
+        return getattr(sys, '_MEIPASS', os.path.dirname(sys.executable))
+    return app_dir
+
+
+# --- Bilder im Speicher übertragen ---
+
+def encode_image(image):
+    """
+    Bild als Rohdaten für die Übertragung (keine PNG-Kodierung).
+
+    Args:
+        image: PIL-Bild, numpy-Array (RGB oder Graustufen) oder Pfad zu einer Bilddatei.
+    """
+    PIL_Image = _load_module("PIL.Image")
+    if isinstance(image, (str, os.PathLike)):
+        with PIL_Image.open(image) as opened:
+            image = opened.copy()
+    elif not isinstance(image, PIL_Image.Image):
+        image = PIL_Image.fromarray(image)
+    if image.mode not in ("L", "RGB"):
+        image = image.convert("RGB")
+    return {"mode": image.mode, "size": image.size, "data": image.tobytes()}
+
+
+def decode_image(payload):
+    PIL_Image = _load_module("PIL.Image")
+    return PIL_Image.frombytes(payload["mode"], tuple(payload["size"]), payload["data"])
+
+
+# --- OCR-Engines ---
+
+class OcrEngines:
+    """EasyOCR-Reader und Tesseract; werden beim ersten Gebrauch geladen und danach gehalten"""
+
+    def __init__(self):
+        self._easyocr_reader = None
+        self._tesseract = None
+        self._load_lock = threading.Lock()
+
+    def easyocr_reader(self):
+        """
+        Raises:
+            RuntimeError: Wenn das Modellverzeichnis fehlt.
+            ImportError: Wenn easyocr nicht installiert ist.
+        """
+        with self._load_lock:
+            if self._easyocr_reader is None:
+                if getattr(sys, 'frozen', False):
+                    model_dir = os.path.join(resource_root(), 'easyocr_models')
+                else:
+                    model_dir = os.path.join(app_dir, 'offline_packages', 'easyocr_models')
+                if not os.path.isdir(model_dir):
+                    raise RuntimeError(f"EasyOCR Modellverzeichnis nicht gefunden: {model_dir}")
+                print(f"Initialisiere easyocr.Reader mit model_storage_directory='{model_dir}', gpu=False")
+                start = time.perf_counter()
+                easyocr = _load_module("easyocr")
+                self._easyocr_reader = easyocr.Reader(EASYOCR_LANGUAGES, gpu=False, model_storage_directory=model_dir)
+                print(f"EasyOCR Reader initialisiert ({time.perf_counter() - start:.1f} s).")
+            return self._easyocr_reader
+
+    def tesseract(self):
+        """
+        pytesseract mit gesetztem tesseract_cmd und TESSDATA_PREFIX.
+
+        Raises:
+            RuntimeError: Wenn tesseract.exe oder tessdata nicht gefunden werden.
+            ImportError: Wenn pytesseract nicht installiert ist.
+        """
+        with self._load_lock:
+            if self._tesseract is None:
+                pytesseract = _load_module("pytesseract")
+                tesseract_dir = os.path.join(resource_root(), 'offline_packages', 'tesseract')
+                local_fallback_dir = 'C:\\Program Files\\Tesseract-OCR'
+
+                tesseract_cmd = os.path.join(tesseract_dir, 'tesseract.exe')
+                if not os.path.exists(tesseract_cmd):
+                    tesseract_cmd = os.path.join(local_fallback_dir, 'tesseract.exe')
+                    if not os.path.exists(tesseract_cmd):
+                        raise RuntimeError(f"Tesseract executable weder in '{tesseract_dir}' noch in '{local_fallback_dir}' gefunden.")
+                    print(f"WARNUNG: Tesseract executable nicht im App-Pfad gefunden. Verwende lokalen Fallback: {tesseract_cmd}")
+
+                tessdata_dir = os.path.join(tesseract_dir, 'tessdata')
+                if not os.path.isdir(tessdata_dir):
+                    tessdata_dir = os.path.join(local_fallback_dir, 'tessdata')
+                    if not os.path.isdir(tessdata_dir):
+                        raise RuntimeError(f"Tessdata Verzeichnis weder in '{tesseract_dir}' noch in '{local_fallback_dir}' gefunden.")
+                    print(f"WARNUNG: Tessdata Verzeichnis nicht im App-Pfad gefunden. Verwende lokalen Fallback: {tessdata_dir}")
+
+                pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+                os.environ['TESSDATA_PREFIX'] = tessdata_dir
+                print(f"Pytesseract initialisiert: {tesseract_cmd} (TESSDATA_PREFIX={tessdata_dir})")
+                self._tesseract = pytesseract
+            return self._tesseract
+
+    def warm_up(self):
+        """Lädt beide Engines vorab, damit die erste Anfrage nicht warten muss"""
+        for name, loader in (("EasyOCR", self.easyocr_reader), ("Tesseract", self.tesseract)):
+            try:
+                loader()
+            except Exception as e:
+                print(f"WARNUNG: {name} konnte nicht vorgeladen werden: {e}")
+
+    def status(self):
+        return {"easyocr": self._easyocr_reader is not None, "tesseract": self._tesseract is not None}
+
+    def run(self, engine, image, options=None):
+        """
+        Führt die OCR aus.
+
+        Args:
+            engine (str): "easyocr" oder "tesseract"
+            image (PIL.Image): Bild
+            options (dict): easyocr: paragraph (bool, Standard True); tesseract: lang (Standard 'deu')
+
+        Returns:
+            dict: Strukturiertes Ergebnis (siehe Moduldokumentation)
+        """
+        options = options or {}
+        start = time.perf_counter()
+        try:
+            if engine == "easyocr":
+                numpy = _load_module("numpy")
+                paragraph = options.get("paragraph", True)
+                results = self.easyocr_reader().readtext(numpy.array(image.convert('RGB')), detail=1, paragraph=paragraph)
+                blocks = []
+                for result in results:
+                    # paragraph=True liefert (box, text), sonst (box, text, confidence)
+                    box = [[float(x), float(y)] for x, y in result[0]]
+                    confidence = float(result[2]) if len(result) > 2 else None
+                    blocks.append({"text": result[1], "box": box, "confidence": confidence})
+                text = "\n".join(block["text"] for block in blocks)
+            elif engine == "tesseract":
+                text = self.tesseract().image_to_string(image, lang=options.get("lang", 'deu')).strip()
+                blocks = [{"text": line, "box": None, "confidence": None} for line in text.splitlines() if line.strip()]
+            else:
+                return {"ok": False, "error": f"Unbekannte OCR-Engine: {engine}"}
+        except Exception as e:
+            return {"ok": False, "engine": engine, "error": f"{type(e).__name__}: {e}"}
+        return {"ok": True, "engine": engine, "text": text, "blocks": blocks,
+                "seconds": round(time.perf_counter() - start, 3)}
+
+
+# --- Dienst ---
+
+def _process_alive(pid):
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = wintypes.DWORD()
+            return bool(kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))) and exit_code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def read_state():
+    """Adresse und Schlüssel des laufenden Dienstes oder None"""
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class OcrServer:
+    """Nimmt Anfragen auf 127.0.0.1 entgegen; EasyOCR läuft nacheinander (ein Modell im Speicher), Tesseract parallel"""
+
+    def __init__(self, parent_pid=None, idle_timeout=IDLE_TIMEOUT):
+        self.parent_pid = parent_pid
+        self.idle_timeout = idle_timeout
+        self.engines = OcrEngines()
+        self._ocr_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._last_activity = time.monotonic()
+        self._authkey = secrets.token_bytes(32)
+        self.listener = None
+        self.requests = 0
+
+    def serve_forever(self):
+        self.listener = Listener(('127.0.0.1', 0), authkey=self._authkey)
+        host, port = self.listener.address
+        self._write_state(host, port)
+        print(f"OCR-Dienst läuft auf {host}:{port} (PID {os.getpid()}, App-PID {self.parent_pid})")
+
+        threading.Thread(target=self.engines.warm_up, daemon=True).start()
+        threading.Thread(target=self._watchdog, daemon=True).start()
+        try:
+            while not self._stop.is_set():
+                try:
+                    connection = self.listener.accept()
+                except Exception as e:
+                    # Verbindung mit falschem Schlüssel oder abgebrochenem Handshake
+                    if not self._stop.is_set():
+                        print(f"WARNUNG: Verbindung abgelehnt: {e}")
+                    continue
+                if self._stop.is_set():
+                    connection.close()
+                    break
+                threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+        finally:
+            self.listener.close()
+            self._remove_state()
+            print(f"OCR-Dienst beendet ({self.requests} Anfragen).")
+
+    def stop(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        # accept() blockiert; eine eigene Verbindung weckt die Schleife auf
+        try:
+            Client(self.listener.address, authkey=self._authkey).close()
+        except Exception:
+            pass
+
+    def dispatch(self, request):
+        op = request.get("op")
+        if op == "ping":
+            if request.get("parent_pid"):
+                # Neu gestartete App übernimmt den laufenden Dienst
+                self.parent_pid = request["parent_pid"]
+            return {"ok": True, "pid": os.getpid(), "engines": self.engines.status(), "requests": self.requests}
+        if op == "shutdown":
+            return {"ok": True}
+        if op in ("easyocr", "tesseract"):
+            try:
+                image = decode_image(request["image"])
+            except Exception as e:
+                return {"ok": False, "engine": op, "error": f"Ungültige Bilddaten: {e}"}
+            self.requests += 1
+            if op == "tesseract":
+                # tesseract.exe läuft pro Aufruf als eigener Prozess, parallele Anfragen sind unkritisch
+                return self.engines.run(op, image, request.get("options"))
+            with self._ocr_lock:
+                return self.engines.run(op, image, request.get("options"))
+        return {"ok": False, "error": f"Unbekannte Anfrage: {op}"}
+
+    def _handle(self, connection):
+        with connection:
+            while not self._stop.is_set():
+                try:
+                    request = connection.recv()
+                except (EOFError, OSError):
+                    return
+                self._last_activity = time.monotonic()
+                connection.send(self.dispatch(request))
+                self._last_activity = time.monotonic()
+                if request.get("op") == "shutdown":
+                    self.stop()
+                    return
+
+    def _watchdog(self):
+        while not self._stop.wait(PARENT_CHECK_INTERVAL):
+            if self.parent_pid and not _process_alive(self.parent_pid):
+                print(f"App (PID {self.parent_pid}) läuft nicht mehr, beende OCR-Dienst.")
+                self.stop()
+            elif time.monotonic() - self._last_activity > self.idle_timeout:
+                print("Keine Anfragen mehr, beende OCR-Dienst.")
+                self.stop()
+
+    def _write_state(self, host, port):
+        os.makedirs(patdata_dir, exist_ok=True)
+        state = {"host": host, "port": port, "authkey": self._authkey.hex(), "pid": os.getpid(),
+                 "started": time.strftime("%Y-%m-%d %H:%M:%S")}
+        temp_path = f"{STATE_FILE}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, STATE_FILE)
+
+    def _remove_state(self):
+        state = read_state()
+        if state and state.get("pid") == os.getpid():
+            try:
+                os.remove(STATE_FILE)
+            except OSError:
+                pass
+
+
+# --- Client ---
+
+_connection = None
+_connection_lock = threading.Lock()
+# Nach einem Verbindungsfehler: frühester nächster Versuch und Inhalt von STATE_FILE zu dem Zeitpunkt
+_service_retry_at = 0.0
+_service_failed_state = None
+_local_engines = None
+
+
+def _connect():
+    state = read_state()
+    if not state:
+        return None
+    try:
+        return Client((state["host"], state["port"]), authkey=bytes.fromhex(state["authkey"]))
+    except Exception:
+        return None
+
+
+def _service_worth_trying():
+    """True wenn die Wartezeit nach dem letzten Fehler abgelaufen ist oder der Dienst neu gestartet wurde"""
+    if time.monotonic() >= _service_retry_at:
+        return True
+    return read_state() not in (None, _service_failed_state)
+
+
+def request(message, timeout=REQUEST_TIMEOUT):
+    """
+    Sendet eine Anfrage an den Dienst.
+
+    Returns:
+        dict: Antwort des Dienstes oder None, wenn er nicht erreichbar ist oder nicht innerhalb
+        von timeout Sekunden antwortet.
+    """
+    global _connection
+    with _connection_lock:
+        # Ein zweiter Versuch nur bei abgebrochener Verbindung (z.B. Dienst neu gestartet); eine
+        # Zeitüberschreitung wird nicht wiederholt, sonst wartet das Skript zweimal REQUEST_TIMEOUT
+        for _ in range(2):
+            if _connection is None:
+                _connection = _connect()
+                if _connection is None:
+                    return None
+            try:
+                _connection.send(message)
+                if not _connection.poll(timeout):
+                    raise TimeoutError(f"Keine Antwort vom OCR-Dienst nach {timeout} s")
+                return _connection.recv()
+            except (ConnectionRefusedError, ConnectionResetError, BrokenPipeError, EOFError) as e:
+                print(f"WARNUNG: Verbindung zum OCR-Dienst unterbrochen: {e}")
+                _close_connection()
+            except (OSError, TimeoutError) as e:
+                print(f"WARNUNG: OCR-Dienst nicht erreichbar: {e}")
+                _close_connection()
+                return None
+        return None
+
+
+def _close_connection():
+    global _connection
+    try:
+        _connection.close()
+    except Exception:
+        pass
+    _connection = None
+
+
+def recognize(image, engine="easyocr", use_service=True, **options):
+    """
+    Texterkennung über den OCR-Dienst, ohne Dienst im eigenen Prozess.
+
+    Args:
+        image: PIL-Bild, numpy-Array oder Pfad zu einer Bilddatei.
+        engine (str): "easyocr" oder "tesseract".
+        use_service (bool): False = immer im eigenen Prozess.
+        **options: easyocr: paragraph=True/False; tesseract: lang='deu'.
+
+    Returns:
+        dict: Strukturiertes Ergebnis, "ok" ist False bei Fehlern (siehe Moduldokumentation).
+    """
+    global _service_retry_at, _service_failed_state, _local_engines
+    try:
+        payload = encode_image(image)
+    except Exception as e:
+        return {"ok": False, "engine": engine, "error": f"Bild konnte nicht gelesen werden: {e}"}
+
+    if use_service and _service_worth_trying():
+        response = request({"op": engine, "image": payload, "options": options})
+        if response is not None:
+            response["service"] = True
+            return response
+        _service_retry_at = time.monotonic() + SERVICE_RETRY_INTERVAL
+        _service_failed_state = read_state()
+        print(f"INFO: OCR-Dienst läuft nicht, OCR wird im Skript-Prozess ausgeführt "
+              f"(neuer Versuch in {SERVICE_RETRY_INTERVAL} s).")
+
+    if _local_engines is None:
+        _local_engines = OcrEngines()
+    result = _local_engines.run(engine, decode_image(payload), options)
+    result["service"] = False
+    return result
+
+
+def local_engines():
+    """OCR-Engines im eigenen Prozess (z.B. für UNIVERSAL.get_reader_easyocr)"""
+    global _local_engines
+    if _local_engines is None:
+        _local_engines = OcrEngines()
+    return _local_engines
+
+
+# --- Start und Stopp durch die App ---
+
+def service_command(parent_pid=None):
+    """Befehl zum Starten des Dienstes (im Bundle startet sich die App-Exe mit SERVICE_FLAG)"""
+    if getattr(sys, 'frozen', False):
+        command = [sys.executable, SERVICE_FLAG]
+    else:
+        command = [sys.executable, os.path.abspath(__file__)]
+    if parent_pid:
+        command += ["--parent-pid", str(parent_pid)]
+    return command
+
+
+def ensure_service(parent_pid=None):
+    """
+    Startet den Dienst, falls er nicht schon läuft. Ein laufender Dienst wird von der
+    App mit parent_pid übernommen.
+
+    Returns:
+        str: "running" oder "started"
+    """
+    response = request({"op": "ping", "parent_pid": parent_pid}, timeout=5)
+    if response and response.get("ok"):
+        return "running"
+
+    os.makedirs(patdata_dir, exist_ok=True)
+    creationflags = 0
+    if sys.platform == 'win32':
+        creationflags = subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP
+    with open(LOG_FILE, 'a', encoding='utf-8') as log:
+        subprocess.Popen(service_command(parent_pid), stdin=subprocess.DEVNULL, stdout=log,
+                         stderr=subprocess.STDOUT, cwd=script_dir, creationflags=creationflags)
+    return "started"
+
+
+def stop_service():
+    """Returns: True, wenn ein laufender Dienst beendet wurde"""
+    response = request({"op": "shutdown"}, timeout=5)
+    return bool(response and response.get("ok"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OCR-Dienst für die KISIM-Skripte")
+    parser.add_argument("--parent-pid", type=int, default=None, help="Beenden, sobald dieser Prozess nicht mehr läuft")
+    parser.add_argument("--idle-timeout", type=int, default=IDLE_TIMEOUT, help="Beenden nach so vielen Sekunden ohne Anfrage")
+    parser.add_argument("--status", action="store_true", help="Status des laufenden Dienstes anzeigen")
+    parser.add_argument("--stop", action="store_true", help="Laufenden Dienst beenden")
+    args, _ = parser.parse_known_args(argv)
+
+    if args.status:
+        response = request({"op": "ping"}, timeout=5)
+        print(f"OCR-Dienst: {response}" if response else "OCR-Dienst läuft nicht.")
+        return 0 if response else 1
+    if args.stop:
+        print("OCR-Dienst beendet." if stop_service() else "OCR-Dienst läuft nicht.")
+        return 0
+
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=True)
+    OcrServer(parent_pid=args.parent_pid, idle_timeout=args.idle_timeout).serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
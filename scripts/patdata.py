@@ -68,6 +68,8 @@ behandlungskonzept_serie4 = None
 datum_erste_rt = None
 datum_letzte_rt = None
 full_text = ""
+# Vorverarbeiteter Screenshot (PIL) für die folgende OCR, bleibt im Speicher
+screenshot_preprocessed = None
 ecog = None
 zimmer = None
 aufnahmegrund = None
@@ -92,17 +94,13 @@ ips = None
 # bleiben unverändert, da sie nicht direkt von den neuen Änderungen betroffen sind)
 
 def screenshot_rtkonzept():
+    global screenshot_preprocessed
     print("Versuche Screenshot vom RT Konzept...")
     try:
         ausschnitt_rtkonzept = (630, 200, 665, 300)
         screenshot_rtkonzept = pyautogui.screenshot(region=ausschnitt_rtkonzept)
-        screenshot_rtkonzept_preprocessed = UNIVERSAL.PIL_image_preprocessing_Zoom_Contrast_Sharpen(screenshot_rtkonzept)
-        save_dir = os.path.join(screenshots_dir, 'UNIVERSAL', 'image_preprocessing')
-        save_path = os.path.join(save_dir, 'screenshot_rtkonzept_original_from_patdata.png')
-        os.makedirs(save_dir, exist_ok=True)
-        screenshot_rtkonzept.save(save_path)
-        print(f"Original Screenshot gespeichert unter {save_path}")
-        print("(Vorverarbeiteter Screenshot wird von UNIVERSAL-Funktion gespeichert)")
+        screenshot_preprocessed = UNIVERSAL.PIL_image_preprocessing_Zoom_Contrast_Sharpen(screenshot_rtkonzept)
+        UNIVERSAL.save_ocr_debug_image(screenshot_rtkonzept, 'screenshot_rtkonzept_original_from_patdata.png')
         return True
     except Exception as e:
         print(f"Fehler beim Erstellen/Speichern des Screenshots: {e}")
@@ -111,6 +109,7 @@ def screenshot_rtkonzept():
         return False
     
 def screenshot_diagnose():
+    global screenshot_preprocessed
     print("Versuche Screenshot der Diagnose...")
     try:
         # Pfad zum button_mit_codierung.png
@@ -154,18 +153,8 @@ def screenshot_diagnose():
             screenshot_diagnose = pyautogui.screenshot(region=screenshot_region)
             
             # Verwende die vorverarbeitete Version wie in screenshot_rtkonzept
-            screenshot_diagnose_preprocessed = UNIVERSAL.PIL_image_preprocessing_Zoom_Contrast_Sharpen(screenshot_diagnose)
-            
-            # Speichere die Screenshots
-            save_dir = os.path.join(screenshots_dir, 'UNIVERSAL', 'image_preprocessing')
-            os.makedirs(save_dir, exist_ok=True)
-            
-            # Speichere den originalen Screenshot
-            original_save_path = os.path.join(save_dir, 'screenshot_diagnose_original.png')
-            screenshot_diagnose.save(original_save_path)
-            print(f"Original Screenshot gespeichert unter {original_save_path}")
-            
-            print("(Vorverarbeiteter Screenshot wird von UNIVERSAL-Funktion gespeichert)")
+            screenshot_preprocessed = UNIVERSAL.PIL_image_preprocessing_Zoom_Contrast_Sharpen(screenshot_diagnose)
+            UNIVERSAL.save_ocr_debug_image(screenshot_diagnose, 'screenshot_diagnose_original.png')
             return True
             
         else:
@@ -182,18 +171,15 @@ def screenshot_diagnose():
 def easyocr_screenshot_diagnose():
     print("Führe EasyOCR für Diagnose-Screenshot durch...")
     
-    # Pfad zum vorverarbeiteten Screenshot
-    screenshot_path = os.path.join(screenshots_dir, 'UNIVERSAL', 'image_preprocessing', 'image_preprocessed_from_function_PIL_image_preprocessing_Zoom_Contrast_Sharpen().png')
-    
-    # Prüfe ob die Datei existiert
-    if not os.path.exists(screenshot_path):
-        print(f"Vorverarbeitete Screenshot-Datei nicht gefunden: {screenshot_path}")
-        logging.error(f"easyocr_screenshot_diagnose: Preprocessed screenshot not found at {screenshot_path}")
+    # Vorverarbeiteter Screenshot aus screenshot_diagnose() (im Speicher)
+    if screenshot_preprocessed is None:
+        print("Kein vorverarbeiteter Screenshot vorhanden.")
+        logging.error("easyocr_screenshot_diagnose: No preprocessed screenshot available")
         return None
     
     try:
         # Führe OCR mit der UNIVERSAL-Funktion durch
-        results_easyocr = UNIVERSAL.ocr_mit_easyocr(screenshot_path)
+        results_easyocr = UNIVERSAL.ocr_mit_easyocr(screenshot_preprocessed)
         
         if results_easyocr:
             # Verbinde alle erkannten Texte zu einem String
@@ -246,14 +232,13 @@ def easyocr_screenshot_rtkonzept():
 
     global full_text
     full_text = ""
-    screenshot_path = os.path.join(screenshots_dir, 'UNIVERSAL', 'image_preprocessing', 'image_preprocessed_from_function_PIL_image_preprocessing_Zoom_Contrast_Sharpen().png')
-    if not os.path.exists(screenshot_path):
-        print(f"Vorverarbeitete Screenshot-Datei nicht gefunden: {screenshot_path}")
-        logging.error(f"easyocr_screenshot_rtkonzept: Preprocessed screenshot not found at {screenshot_path}")
+    if screenshot_preprocessed is None:
+        print("Kein vorverarbeiteter Screenshot vorhanden.")
+        logging.error("easyocr_screenshot_rtkonzept: No preprocessed screenshot available")
         return False
     print("Führe EasyOCR für RT Konzept durch...")
     try:
-        results_easyocr = UNIVERSAL.ocr_mit_easyocr(screenshot_path)
+        results_easyocr = UNIVERSAL.ocr_mit_easyocr(screenshot_preprocessed)
         if results_easyocr:
             full_text = "\n".join(results_easyocr)
             print("EasyOCR erfolgreich, erkannter Text:")
@@ -397,15 +382,10 @@ def therapieintention_auslesen():
 
         # Nimm den Screenshot des definierten Bereichs auf
         screenshot_rtkonzept_intention = pyautogui.screenshot(region=screenshot_region)
-        save_path = os.path.join(screenshots_dir, 'UNIVERSAL', 'image_preprocessing', 'screenshot_rtkonzept_intention.png')
-        # Speichere den Screenshot
-        screenshot_rtkonzept_intention.save(save_path)
-
-        print(f"Screenshot erfolgreich gespeichert als {save_path}")
+        UNIVERSAL.save_ocr_debug_image(screenshot_rtkonzept_intention, 'screenshot_rtkonzept_intention.png')
 
         screenshot_rtkonzept_intention_preprocessed = UNIVERSAL.PIL_image_preprocessing_Zoom_Contrast_Sharpen(screenshot_rtkonzept_intention)
-        screenshot_rtkonzept_intention_preprocessed_path = os.path.join(screenshots_dir, 'UNIVERSAL', 'image_preprocessing', 'image_preprocessed_from_function_PIL_image_preprocessing_Zoom_Contrast_Sharpen().png')
-        ocr_aus_screenshot_rtkonzept_intention = UNIVERSAL.ocr_mit_easyocr(screenshot_rtkonzept_intention_preprocessed_path)
+        ocr_aus_screenshot_rtkonzept_intention = UNIVERSAL.ocr_mit_easyocr(screenshot_rtkonzept_intention_preprocessed)
         print(f"OCR aus Intention-Scrrenshot: {ocr_aus_screenshot_rtkonzept_intention}")
 
         #Bestimmen der Intention
@@ -491,15 +471,10 @@ def fraktionen_woche_auslesen():
 
         # Nimm den Screenshot des definierten Bereichs auf
         screenshot_fraktionen_woche = pyautogui.screenshot(region=screenshot_region)
-        save_path = os.path.join(screenshots_dir, 'UNIVERSAL', 'image_preprocessing', 'button_fraktionen_woche.png')
-        # Speichere den Screenshot
-        screenshot_fraktionen_woche.save(save_path)
-
-        print(f"Screenshot erfolgreich gespeichert als {save_path}")
+        UNIVERSAL.save_ocr_debug_image(screenshot_fraktionen_woche, 'button_fraktionen_woche.png')
 
         screenshot_fraktionen_woche_preprocessed = UNIVERSAL.PIL_image_preprocessing_Zoom_Contrast_Sharpen(screenshot_fraktionen_woche)
-        screenshot_fraktionen_woche_preprocessed_path = os.path.join(screenshots_dir, 'UNIVERSAL', 'image_preprocessing', 'image_preprocessed_from_function_PIL_image_preprocessing_Zoom_Contrast_Sharpen().png')
-        ocr_aus_screenshot_fraktionen_woche = UNIVERSAL.ocr_mit_easyocr(screenshot_fraktionen_woche_preprocessed_path)
+        ocr_aus_screenshot_fraktionen_woche = UNIVERSAL.ocr_mit_easyocr(screenshot_fraktionen_woche_preprocessed)
         print(f"OCR aus Intention-Scrrenshot: {ocr_aus_screenshot_fraktionen_woche}")
 
         #Bestimmen der Intention
@@ -0,0 +1,270 @@
+"""
+Einlesen der Tumorboard-Anmeldungen (PDF) für createtumorboardpdf.py.
+
+Jede PDF wird genau einmal geöffnet: Patientennummer, Name, Geschlecht/Geburtsdatum und
+Diagnose werden in einem Durchgang aus dem Text gelesen. Nur wenn die Diagnose im Text
+nicht brauchbar ist, werden die Seiten (noch im selben Dokument) mit 300 dpi gerendert und
+direkt aus dem Speicher per Tesseract gelesen.
+
+ingest_pdfs() verteilt die Dateien auf mehrere Prozesse und liefert die Ergebnisse in der
+Reihenfolge, in der sie fertig werden. Im PyInstaller-Bundle laufen die Skripte im App-Prozess:
+dort liest und rendert ein einziger Thread die PDFs (PyMuPDF ist nicht threadsicher), parallel
+laufen nur die OCR-Anfragen (ohnehin in tesseract.exe bzw. im OCR-Dienst).
+
+Das Modul importiert bewusst nur fitz, PIL und ocr_service, damit die Worker-Prozesse
+schnell starten (kein pyautogui / UNIVERSAL).
+"""
+
+import os
+import re
+import sys
+import time
+from concurrent.futures import (ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed, wait)
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+try:
+    import ocr_service
+except ImportError:
+    from scripts import ocr_service
+
+# Anzahl paralleler Worker (OCR-Fallback ist CPU-lastig)
+INGEST_WORKERS = max(2, min(8, os.cpu_count() or 2))
+OCR_DPI = 300
+# Ab so vielen Buchstaben gilt eine Diagnose als sinnvoll
+DIAGNOSE_MIN_LETTERS = 15
+
+MANUELLE_PRUEFUNG = "MANUELLE PRÜFUNG ERFORDERLICH"
+EXTRAKTIONSFEHLER = "EXTRAKTIONSFEHLER"
+
+ANCHOR_INFO = "Patienteninformationen"
+# Ankertext, nach dem die Diagnose im Anmeldeformular steht
+ANCHOR_DIAGNOSE = "werden nicht automatisch in die Tumordokumentation"
+
+patient_num_re = re.compile(r"\b\d{5,10}\b")
+geschlecht_geb_re = re.compile(r"\b([MW])\s*/\s*(\d{2}\.\d{2}\.\d{4})")
+
+
+def letter_count(text):
+    return len(re.sub(r'[^a-zA-Z]', '', str(text)))
+
+
+def stammdaten_aus_text(text):
+    """
+    Returns:
+        tuple: (patientennummer, name, geschlecht, geburtsdatum), fehlende Werte als ""
+    """
+    patientennummer = name = geschlecht = geburtsdatum = ""
+    idx_info = text.find(ANCHOR_INFO)
+    if idx_info != -1:
+        after_info = text[idx_info + len(ANCHOR_INFO):].lstrip()
+        match_num = patient_num_re.search(after_info)
+        if match_num:
+            patientennummer = match_num.group()
+            lines = after_info[match_num.end():].lstrip().splitlines()
+            if lines:
+                name = lines[0].strip()
+        match_geschlecht = geschlecht_geb_re.search(after_info)
+        if match_geschlecht:
+            geschlecht = match_geschlecht.group(1)
+            geburtsdatum = match_geschlecht.group(2)
+    return patientennummer, name, geschlecht, geburtsdatum
+
+
+def diagnose_aus_text(text, ocr=False):
+    """
+    Erste nicht-leere Zeile nach der Zeile "Diagnose" (nach dem Ankertext) plus die Zeile danach.
+
+    Args:
+        ocr (bool): OCR-Text; Tesseract liest Aufzählungspunkte als 'e ', die zurück in '• ' gewandelt werden.
+    """
+    idx_anchor = text.find(ANCHOR_DIAGNOSE)
+    if idx_anchor == -1:
+        return ""
+    lines = text[idx_anchor + len(ANCHOR_DIAGNOSE):].splitlines()
+
+    def clean(line):
+        line = line.strip()
+        return line.replace('e ', '• ') if ocr else line
+
+    diagnose_line_idx = next((i for i, line in enumerate(lines) if line.strip().lower() == "diagnose"), -1)
+    if diagnose_line_idx == -1:
+        return ""
+    first_line_idx = next((i for i in range(diagnose_line_idx + 1, len(lines)) if clean(lines[i])), -1)
+    if first_line_idx == -1:
+        return ""
+
+    diagnose_parts = [clean(lines[first_line_idx])]
+    if first_line_idx + 1 < len(lines):
+        next_line = clean(lines[first_line_idx + 1])
+        if next_line:
+            diagnose_parts.append(next_line)
+    return ' '.join(diagnose_parts)
+
+
+def seiten_rendern(doc):
+    """Rendert alle Seiten mit OCR_DPI als PIL-Bilder (fitz, nur von einem Thread aus aufrufen)"""
+    images = []
+    for page in doc:
+        pix = page.get_pixmap(dpi=OCR_DPI, alpha=False)
+        images.append(Image.frombytes("RGB", (pix.width, pix.height), pix.samples))
+    return images
+
+
+def ocr_text_aus_bildern(images, filename, log):
+    """Liest gerenderte Seiten per Tesseract, ohne Zwischendateien (ohne fitz, threadsicher)"""
+    ocr_text = ""
+    for number, image in enumerate(images, start=1):
+        result = ocr_service.recognize(image, engine="tesseract", lang='deu')
+        if not result.get("ok"):
+            log.append(f"[{filename}] FEHLER während Tesseract OCR (Seite {number}): {result.get('error')}")
+        elif result["text"]:
+            ocr_text += result["text"] + "\n"
+    return ocr_text
+
+
+def _leeres_ergebnis(pdf_path):
+    return {"path": pdf_path, "patientennummer": "", "name": "", "geschlecht": "", "geburtsdatum": "",
+            "diagnose": "", "methode": None, "log": [], "seconds": 0}
+
+
+def pdf_lesen(pdf_path, ocr_fallback=True):
+    """
+    fitz-Teil des Einlesens: Text lesen und, falls die Diagnose darin nicht brauchbar ist, die
+    Seiten für die OCR rendern. PyMuPDF ist nicht threadsicher, im Bundle läuft dieser Teil
+    deshalb nur im aufrufenden Thread.
+
+    Returns:
+        tuple: (Ergebnis wie bei extract_registration_pdf(), gerenderte Seiten oder None wenn keine OCR nötig)
+    """
+    start = time.perf_counter()
+    filename = os.path.basename(pdf_path)
+    result = _leeres_ergebnis(pdf_path)
+    log = result["log"]
+    images = None
+    try:
+        with fitz.open(pdf_path) as doc:
+            text = "".join(page.get_text() for page in doc)
+            (result["patientennummer"], result["name"],
+             result["geschlecht"], result["geburtsdatum"]) = stammdaten_aus_text(text)
+
+            # --- VERSUCH 1: Schnelle Text-Extraktion für Diagnose ---
+            diagnose = diagnose_aus_text(text)
+            if letter_count(diagnose) >= DIAGNOSE_MIN_LETTERS:
+                result["methode"] = "text"
+                log.append(f"[{filename}] Erfolg mit schneller Extraktion. Diagnose: '{diagnose}'")
+            elif ocr_fallback:
+                log.append(f"[{filename}] Schnelle Extraktion lieferte keine sinnvolle Diagnose ('{diagnose}'). "
+                           f"Anzahl Buchstaben: {letter_count(diagnose)}. VERSUCH 2: Fall-back auf OCR...")
+                # --- VERSUCH 2: Seiten rendern, solange das Dokument noch offen ist ---
+                images = seiten_rendern(doc)
+            else:
+                diagnose = MANUELLE_PRUEFUNG
+        result["diagnose"] = diagnose
+    except Exception as e:
+        log.append(f"[{filename}] Ein unerwarteter Fehler ist bei der Extraktion aufgetreten: {e}")
+        result["diagnose"] = EXTRAKTIONSFEHLER
+        images = None
+    result["seconds"] = round(time.perf_counter() - start, 2)
+    return result, images
+
+
+def ocr_abschliessen(result, images):
+    """OCR-Teil des Einlesens: Diagnose aus den gerenderten Seiten (ohne fitz, threadsicher)"""
+    start = time.perf_counter()
+    filename = os.path.basename(result["path"])
+    log = result["log"]
+    try:
+        diagnose = diagnose_aus_text(ocr_text_aus_bildern(images, filename, log), ocr=True)
+        if letter_count(diagnose) >= DIAGNOSE_MIN_LETTERS:
+            result["methode"] = "ocr"
+            log.append(f"[{filename}] Erfolg mit OCR. Diagnose: '{diagnose}'")
+        else:
+            log.append(f"[{filename}] FEHLER: Auch OCR lieferte keine sinnvolle Diagnose ('{diagnose}'). "
+                       f"Anzahl Buchstaben: {letter_count(diagnose)}.")
+            diagnose = MANUELLE_PRUEFUNG
+        result["diagnose"] = diagnose
+    except Exception as e:
+        log.append(f"[{filename}] Ein unerwarteter Fehler ist bei der OCR aufgetreten: {e}")
+        result["diagnose"] = EXTRAKTIONSFEHLER
+    result["seconds"] = round(result["seconds"] + time.perf_counter() - start, 2)
+    return result
+
+
+def extract_registration_pdf(pdf_path, ocr_fallback=True):
+    """
+    Liest eine Anmeldungs-PDF in einem Durchgang (läuft im Worker-Prozess).
+
+    Returns:
+        dict: path, patientennummer, name, geschlecht, geburtsdatum, diagnose,
+              methode ("text", "ocr" oder None), log (Meldungen für die Ausgabe im Hauptprozess),
+              seconds
+    """
+    result, images = pdf_lesen(pdf_path, ocr_fallback)
+    if images is not None:
+        ocr_abschliessen(result, images)
+    return result
+
+
+def _worker_fehler(path, e):
+    result = _leeres_ergebnis(path)
+    result["diagnose"] = EXTRAKTIONSFEHLER
+    result["log"].append(f"[{os.path.basename(path)}] Worker-Fehler: {e}")
+    return result
+
+
+def ingest_pdfs(pdf_paths, workers=INGEST_WORKERS, ocr_fallback=True):
+    """
+    Liest mehrere PDFs parallel ein.
+
+    Yields:
+        dict: Ergebnis von extract_registration_pdf(), in der Reihenfolge der Fertigstellung.
+    """
+    pdf_paths = list(pdf_paths)
+    if not pdf_paths:
+        return
+    workers = max(1, min(workers, len(pdf_paths)))
+    if getattr(sys, 'frozen', False):
+        # Im Bundle laufen die Skripte im App-Prozess; neue Prozesse würden die ganze App starten
+        yield from _ingest_in_threads(pdf_paths, workers, ocr_fallback)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(extract_registration_pdf, path, ocr_fallback): path for path in pdf_paths}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # Worker-Prozess abgestürzt (z.B. BrokenProcessPool)
+                yield _worker_fehler(futures[future], e)
+
+
+def _ingest_in_threads(pdf_paths, workers, ocr_fallback):
+    """
+    Variante für das Bundle: fitz (Text, Rendern) nur im aufrufenden Thread, parallel laufen
+    nur die OCR-Anfragen. Höchstens 'workers' Dokumente warten gerendert auf die OCR, damit
+    die 300-dpi-Seiten nicht alle gleichzeitig im Speicher liegen.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+
+        def finished(block):
+            done, _ = wait(pending, return_when=FIRST_COMPLETED if block else ALL_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield _worker_fehler(path, e)
+
+        for path in pdf_paths:
+            result, images = pdf_lesen(path, ocr_fallback)
+            if images is None:
+                yield result
+                continue
+            pending[executor.submit(ocr_abschliessen, result, images)] = path
+            if len(pending) >= workers:
+                yield from finished(block=True)
+        if pending:
+            yield from finished(block=False)
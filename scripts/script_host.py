@@ -0,0 +1,264 @@
+"""
+Warmer Skript-Host für die KISIM-Skripte.
+
+Bisher startete CmdScriptsPage für jeden Lauf einen neuen Python-Prozess. Jeder Lauf hat
+dadurch UNIVERSAL, pyautogui, pandas, PIL und die Tabellen aus entities/fliesstexte neu
+importiert (mehrere Sekunden, bevor die erste Zeile des Skripts läuft).
+
+Der Host ist ein langlebiger Prozess (von CmdScriptsPage per QProcess gestartet), der diese
+Module einmal lädt und danach Skripte auf Anfrage ausführt:
+
+- jedes Skript läuft mit runpy.run_path() als __main__ in frischen Globals; Projektmodule,
+  die ein Skript importiert hat (z.B. 'import patdata'), werden nach dem Lauf wieder
+  entfernt, nur die vorgeladenen Module bleiben erhalten
+- cwd, sys.path und sys.argv werden pro Lauf gesetzt und danach zurückgesetzt
+- input() im Skript liest die Zeilen, die die App auf stdin schreibt (wie bisher)
+- STOP unterbricht das Skript mit KeyboardInterrupt (Exit-Code -9); reagiert es nicht,
+  beendet die App den Host-Prozess wie bisher hart und startet einen neuen
+
+Protokoll (Zeilen auf stdin/stdout, Steuerzeilen beginnen mit CONTROL_PREFIX und enthalten JSON):
+
+    App  -> Host:  {"cmd": "run", "path": "...", "cwd": "..."} | {"cmd": "stop"} | {"cmd": "exit"}
+                   alle anderen Zeilen sind Eingaben für das laufende Skript
+    Host -> App:   {"event": "ready", "warmup_seconds": 3.2, "modules": [...], "failed": [...]}
+                   {"event": "started", "run": 1, "script": "...", "setup_ms": 4.1}
+                   {"event": "finished", "run": 1, "exit_code": 0, "seconds": 12.3}
+                   alle anderen Ausgaben sind Ausgaben des Skripts
+
+Start von Hand (zum Testen): python -u script_host.py
+"""
+
+import importlib
+import json
+import os
+import queue
+import runpy
+import sys
+import threading
+import time
+import traceback
+import _thread
+
+# Steuerzeilen beginnen mit diesem Zeichen (ASCII Record Separator)
+CONTROL_PREFIX = "\x1e"
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+app_dir = os.path.dirname(script_dir)
+PROJECT_MODULE_DIRS = (script_dir + os.sep, os.path.join(app_dir, "utils") + os.sep)
+
+# Werden beim Start einmal geladen (fehlende Module werden übersprungen)
+WARM_MODULES = [
+    "pandas",
+    "PIL.Image",
+    "openpyxl",
+    "pyautogui",
+    "UNIVERSAL",
+    "entities",
+    "fliesstexte",
+]
+
+# Exit-Code bei Abbruch durch STOP (wie CmdScriptsPage im Bundle-Modus)
+EXIT_CODE_STOPPED = -9
+
+_STOP = object()
+
+
+def encode_control(message):
+    """Steuerzeile (ohne Zeilenumbruch am Ende wird einer angehängt)"""
+    return CONTROL_PREFIX + json.dumps(message, ensure_ascii=False) + "\n"
+
+
+def decode_control(line):
+    """
+    Returns:
+        dict | None: Inhalt einer Steuerzeile, None bei normalen Zeilen oder ungültigem JSON
+    """
+    if not line.startswith(CONTROL_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(CONTROL_PREFIX):])
+    except ValueError:
+        return None
+
+
+def warm_up(modules=WARM_MODULES):
+    """
+    Importiert die Module, die fast jedes Skript braucht.
+
+    Returns:
+        tuple: (geladene Module, fehlgeschlagene Module, Sekunden)
+    """
+    start = time.perf_counter()
+    loaded, failed = [], []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except BaseException as e:  # SyntaxError, SystemExit beim Import usw.
+            failed.append(f"{name}: {type(e).__name__}: {e}")
+    return loaded, failed, round(time.perf_counter() - start, 3)
+
+
+class QueueStdin:
+    """Ersetzt sys.stdin während eines Laufs: liefert die Eingabezeilen der App"""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def readline(self, size=-1):
+        line = self.lines.get()
+        if line is _STOP:
+            raise KeyboardInterrupt("Script execution interrupted by user")
+        return line
+
+    def read(self, size=-1):
+        return self.readline()
+
+    def isatty(self):
+        return False
+
+    def fileno(self):
+        raise OSError("stdin des Skript-Hosts hat keinen Dateideskriptor")
+
+
+class ScriptHost:
+    def __init__(self, stdin=None, stdout=None):
+        self.stdin = stdin or sys.stdin
+        self.stdout = stdout or sys.stdout
+        self.commands = queue.Queue()
+        self.input_lines = queue.Queue()
+        self.running = threading.Event()
+        self.run_count = 0
+        self.protected_modules = set()
+
+    def send(self, message):
+        self.stdout.write(encode_control(message))
+        self.stdout.flush()
+
+    # --- stdin (eigener Thread) ---
+
+    def read_stdin(self):
+        """Verteilt stdin: Steuerzeilen an die Befehlsschlange, alles andere an das Skript"""
+        for line in self.stdin:
+            message = decode_control(line)
+            if message is None:
+                self.input_lines.put(line)
+            elif message.get("cmd") == "stop":
+                self.stop_script()
+            else:
+                if message.get("cmd") == "exit":
+                    self.stop_script()
+                self.commands.put(message)
+        # stdin geschlossen: App beendet
+        self.stop_script()
+        self.commands.put({"cmd": "exit"})
+
+    def stop_script(self):
+        if self.running.is_set():
+            self.input_lines.put(_STOP)  # falls das Skript auf input() wartet
+            _thread.interrupt_main()
+
+    # --- Ausführung (Hauptthread) ---
+
+    def serve(self):
+        loaded, failed, seconds = warm_up()
+        # Bereits geladene Projektmodule bleiben für alle Läufe erhalten
+        self.protected_modules = set(sys.modules)
+        self.send({"event": "ready", "warmup_seconds": seconds, "modules": loaded, "failed": failed})
+        threading.Thread(target=self.read_stdin, daemon=True).start()
+
+        while True:
+            message = self.commands.get()
+            if message.get("cmd") == "exit":
+                return 0
+            if message.get("cmd") == "run" and message.get("path"):
+                try:
+                    self.run_script(message["path"], message.get("cwd"))
+                except KeyboardInterrupt:
+                    # STOP kam genau zwischen zwei Läufen an
+                    pass
+
+    def run_script(self, path, cwd=None):
+        received = time.perf_counter()
+        self.run_count += 1
+        run_id = self.run_count
+
+        # Eingaben aus früheren Läufen verwerfen
+        while not self.input_lines.empty():
+            self.input_lines.get_nowait()
+
+        old_cwd = os.getcwd()
+        old_path = sys.path.copy()
+        old_argv = sys.argv
+        old_stdin = sys.stdin
+        modules_before = set(sys.modules)
+
+        exit_code = 0
+        start = None
+        try:
+            script_folder = os.path.dirname(os.path.abspath(path))
+            # Wie 'python skript.py': Skriptordner zuerst, dazu scripts/ und App-Ordner
+            for folder in (app_dir, script_dir, script_folder):
+                if folder in sys.path:
+                    sys.path.remove(folder)
+                sys.path.insert(0, folder)
+            sys.argv = [path]
+            sys.stdin = QueueStdin(self.input_lines)
+            os.chdir(cwd or script_folder)
+
+            self.running.set()
+            start = time.perf_counter()
+            self.send({"event": "started", "run": run_id, "script": os.path.basename(path),
+                       "setup_ms": round((start - received) * 1000, 1)})
+            runpy.run_path(path, run_name="__main__")
+        except KeyboardInterrupt:
+            print("\nScript execution interrupted by user.")
+            exit_code = EXIT_CODE_STOPPED
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                print(e.code)
+                exit_code = 1
+        except BaseException:
+            traceback.print_exc(file=sys.stdout)
+            exit_code = 1
+        finally:
+            self.running.clear()
+            sys.stdout.flush()
+            sys.stdin = old_stdin
+            sys.argv = old_argv
+            sys.path[:] = old_path
+            try:
+                os.chdir(old_cwd)
+            except OSError:
+                pass
+            self.unload_project_modules(modules_before)
+
+        seconds = round(time.perf_counter() - start, 3) if start else 0
+        self.send({"event": "finished", "run": run_id, "exit_code": exit_code, "seconds": seconds})
+
+    def unload_project_modules(self, modules_before):
+        """Entfernt Projektmodule, die der Lauf importiert hat, damit der nächste Lauf frische Globals hat"""
+        for name in set(sys.modules) - modules_before - self.protected_modules:
+            module_file = getattr(sys.modules.get(name), "__file__", None) or ""
+            # Nur scripts/ und utils/ (eine .venv im App-Ordner bleibt unberührt)
+            if os.path.abspath(module_file).startswith(PROJECT_MODULE_DIRS):
+                sys.modules.pop(name, None)
+
+
+def main():
+    # Ausgaben des Skripts zeilenweise an die App (auch ohne 'python -u')
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=True)
+    for folder in (app_dir, script_dir):
+        if folder not in sys.path:
+            sys.path.insert(0, folder)
+    os.chdir(script_dir)
+    return ScriptHost().serve()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
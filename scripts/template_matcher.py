@@ -0,0 +1,454 @@
+"""
+Template-Matcher für die Bildschirmautomatisierung in KISIM (UNIVERSAL.py).
+
+pyautogui.locateOnScreen liest bei jedem Aufruf die PNG-Datei neu von der Festplatte,
+erstellt einen neuen Screenshot und sucht darin genau ein Bild. In den Suchschleifen
+von UNIVERSAL.py (bis zu 200 Versuche pro Button) summiert sich das zu einem grossen
+Teil der Laufzeit von berrao.py, nachsorgeformular_anlegen usw.
+
+Dieses Modul ersetzt die Suchschleifen durch:
+- TemplateCache: die Templates werden einmal dekodiert (Graustufen bzw. BGR) und in
+  einem LRU-Cache gehalten; geänderte Dateien werden anhand der mtime neu geladen.
+- ScreenGrab: ein Screenshot pro Suchversuch, der für alle gesuchten Templates
+  verwendet wird.
+- wait_for_any: Warten auf "eines von N Templates" (z.B. 'ICD fehlt' / 'ICD komplett').
+- LocationHistory: KISIM-Buttons erscheinen fast immer an denselben Koordinaten. Die
+  letzten Trefferpositionen jedes Templates werden in ~/patdata/template_locations.json
+  gespeichert; gesucht wird zuerst nur im daraus gelernten Bereich (ROI) und erst bei
+  einem Fehlschlag im ganzen Screenshot. Trefferquoten: python template_matcher.py
+
+Die Trefferlogik entspricht pyscreeze (cv2.TM_CCOEFF_NORMED, erster Treffer mit
+Wert > confidence in Zeilenreihenfolge, Graustufen als Standard). Gefundene Positionen
+sind daher identisch mit denen von pyautogui.locateOnScreen.
+
+Offline-Benchmark mit gespeicherten Screenshots: benchmark_template_matcher.py
+"""
+
+import atexit
+import importlib
+import json
+import os
+import sys
+import time
+from collections import OrderedDict, namedtuple
+
+# Gleiche Felder wie pyscreeze.Box / pyscreeze.Point, damit Log-Ausgaben und
+# pyautogui.click(...) / pyautogui.center(...) unverändert funktionieren
+Box = namedtuple('Box', 'left top width height')
+Point = namedtuple('Point', 'x y')
+
+# Wie pyscreeze.GRAYSCALE_DEFAULT
+GRAYSCALE_DEFAULT = True
+
+# Maximale Anzahl dekodierter Templates im Cache (ein Button-Screenshot hat wenige kB)
+TEMPLATE_CACHE_SIZE = 256
+
+# --- Gelernte Suchbereiche (ROI) ---
+ROI_ENABLED = True
+LOCATION_HISTORY_FILE = os.path.join(os.path.expanduser("~"), "patdata", "template_locations.json")
+# Anzahl gespeicherter Trefferpositionen pro Template
+LOCATION_HISTORY_SIZE = 10
+# Rand in Pixeln rund um die bisherigen Treffer
+ROI_MARGIN = 40
+# Die ersten Versuche von wait_for_any suchen nur im gelernten Bereich
+ROI_ONLY_ATTEMPTS = 3
+# Templates unterhalb dieses Ordners werden relativ dazu gespeichert (unabhängig vom Installationsort)
+SCREENSHOTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'screenshots pyautogui')
+
+
+def _load_module(name):
+    return importlib.import_module(name) if name not in sys.modules else sys.modules[name]
+
+
+def opencv_available():
+    """True, wenn OpenCV und numpy verfügbar sind (sonst wird über pyautogui.locate gesucht)"""
+    try:
+        _load_module("cv2")
+        _load_module("numpy")
+        return True
+    except ImportError:
+        return False
+
+
+def center(box):
+    """Zentrum eines gefundenen Bereichs (wie pyautogui.center)"""
+    return Point(box.left + int(box.width / 2), box.top + int(box.height / 2))
+
+
+def _decode_template(path, grayscale):
+    if not opencv_available():
+        # Ohne OpenCV übernimmt pyautogui.locate die Suche, es akzeptiert PIL-Bilder
+        PIL_Image = _load_module("PIL.Image")
+        with PIL_Image.open(path) as image:
+            return image.convert('RGB')
+
+    cv2 = _load_module("cv2")
+    np = _load_module("numpy")
+    # imdecode statt imread: funktioniert auch mit Umlauten im Pfad (Windows)
+    data = np.fromfile(path, dtype=np.uint8)
+    image = cv2.imdecode(data, cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR)
+    if image is None:
+        raise IOError(f"Bilddatei konnte nicht gelesen werden (ungültiges Format?): '{path}'")
+    return image
+
+
+class TemplateCache:
+    """LRU-Cache für dekodierte Template-Bilder, Schlüssel: (Pfad, Graustufen)"""
+
+    def __init__(self, max_size=TEMPLATE_CACHE_SIZE):
+        self.max_size = max_size
+        self._templates = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, grayscale=GRAYSCALE_DEFAULT):
+        """
+        Gibt das dekodierte Template zurück und lädt es beim ersten Zugriff bzw. nach einer
+        Änderung der Datei.
+
+        Raises:
+            OSError: Wenn die Datei fehlt oder nicht gelesen werden kann.
+        """
+        path = os.path.abspath(path)
+        mtime = os.path.getmtime(path)
+        key = (path, bool(grayscale))
+
+        entry = self._templates.get(key)
+        if entry is not None and entry[0] == mtime:
+            self._templates.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        image = _decode_template(path, grayscale)
+        self._templates[key] = (mtime, image)
+        self._templates.move_to_end(key)
+        self.misses += 1
+        while len(self._templates) > self.max_size:
+            self._templates.popitem(last=False)
+        return image
+
+    def preload(self, paths, grayscale=GRAYSCALE_DEFAULT):
+        """Lädt mehrere Templates vorab (z.B. alle Buttons eines Workflows)"""
+        for path in paths:
+            self.get(path, grayscale)
+
+    def clear(self):
+        self._templates.clear()
+
+    def __len__(self):
+        return len(self._templates)
+
+
+# Gemeinsamer Cache für alle Suchfunktionen eines Prozesses
+template_cache = TemplateCache()
+
+
+class ScreenGrab:
+    """Ein Screenshot, in dem alle Templates eines Suchversuchs gesucht werden"""
+
+    def __init__(self, image):
+        self.image = image  # PIL.Image
+        self._arrays = {}
+
+    @classmethod
+    def capture(cls):
+        """Screenshot des Hauptbildschirms (gleicher Bereich wie pyautogui.locateOnScreen)"""
+        pyautogui = _load_module("pyautogui")
+        return cls(pyautogui.screenshot())
+
+    @property
+    def size(self):
+        return self.image.size
+
+    def array(self, grayscale=GRAYSCALE_DEFAULT):
+        """Screenshot als OpenCV-Array (BGR bzw. Graustufen), wird pro Screenshot nur einmal konvertiert"""
+        grayscale = bool(grayscale)
+        if grayscale not in self._arrays:
+            cv2 = _load_module("cv2")
+            np = _load_module("numpy")
+            if False not in self._arrays:
+                self._arrays[False] = np.array(self.image.convert('RGB'))[:, :, ::-1].copy()  # RGB -> BGR
+            if grayscale:
+                self._arrays[True] = cv2.cvtColor(self._arrays[False], cv2.COLOR_BGR2GRAY)
+        return self._arrays[grayscale]
+
+
+def locate(template_path, screen, confidence=0.8, grayscale=GRAYSCALE_DEFAULT, cache=None, region=None):
+    """
+    Sucht ein Template in einem Screenshot.
+
+    Args:
+        template_path (str): Pfad zur .png-Datei des Templates.
+        screen (ScreenGrab): Screenshot, in dem gesucht wird.
+        confidence (float): Genauigkeitsschwelle (0.0 bis 1.0).
+        grayscale (bool): Suche in Graustufen (Standard wie pyautogui).
+        cache (TemplateCache, optional): Standard: gemeinsamer template_cache.
+        region (tuple, optional): Suchbereich (links, oben, Breite, Höhe), Standard: ganzer Screenshot.
+
+    Returns:
+        Box: Position des ersten Treffers in Bildschirmkoordinaten (links, oben, Breite, Höhe) oder None.
+    """
+    cache = cache if cache is not None else template_cache
+    needle = cache.get(template_path, grayscale)
+
+    if not opencv_available():
+        pyautogui = _load_module("pyautogui")
+        try:
+            return pyautogui.locate(needle, screen.image, confidence=confidence, grayscale=grayscale, region=region)
+        except pyautogui.ImageNotFoundException:
+            return None
+
+    cv2 = _load_module("cv2")
+    np = _load_module("numpy")
+    haystack = screen.array(grayscale)
+    offset_left, offset_top = 0, 0
+    if region:
+        offset_left, offset_top, width, height = region
+        haystack = haystack[offset_top:offset_top + height, offset_left:offset_left + width]
+    needle_height, needle_width = needle.shape[:2]
+    if haystack.shape[0] < needle_height or haystack.shape[1] < needle_width:
+        raise ValueError(f"Template ist grösser als der Suchbereich: '{template_path}'")
+
+    result = cv2.matchTemplate(haystack, needle, cv2.TM_CCOEFF_NORMED)
+    matches = np.flatnonzero(result > confidence)
+    if matches.size == 0:
+        return None
+    # Erster Treffer in Zeilenreihenfolge, wie bei pyscreeze
+    top, left = divmod(int(matches[0]), result.shape[1])
+    return Box(left + offset_left, top + offset_top, needle_width, needle_height)
+
+
+class LocationHistory:
+    """
+    Gespeicherte Trefferpositionen pro Template und Bildschirmgrösse, daraus gelernte Suchbereiche
+    und Trefferquoten.
+
+    Einträge in der JSON-Datei: "<Template>@<Breite>x<Höhe>" -> {"hits": [[links, oben, Breite, Höhe], ...],
+    "roi_hits": Treffer im gelernten Bereich, "roi_misses": Treffer erst im ganzen Screenshot,
+    "unlearned_hits": Treffer ohne gelernten Bereich}
+    """
+
+    # Gespeichert wird bei neuen Positionen sofort, sonst spätestens nach so vielen Treffern
+    SAVE_EVERY_HITS = 20
+
+    def __init__(self, path=LOCATION_HISTORY_FILE):
+        self.path = path
+        self._entries = None
+        self._unsaved_hits = 0
+        # Zähler nur für den laufenden Prozess
+        self.session = {"roi_hits": 0, "roi_misses": 0, "unlearned_hits": 0}
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            self._entries = {}
+            try:
+                if os.path.exists(self.path):
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._entries = json.load(f).get("templates", {})
+            except Exception as e:
+                print(f"WARNUNG: Gespeicherte Template-Positionen konnten nicht gelesen werden: {e}")
+        return self._entries
+
+    @staticmethod
+    def _key(template_path, screen_size):
+        path = os.path.abspath(template_path)
+        if os.path.normcase(path).startswith(os.path.normcase(SCREENSHOTS_DIR) + os.sep):
+            path = os.path.relpath(path, SCREENSHOTS_DIR)
+        return f"{path.replace(os.sep, '/')}@{screen_size[0]}x{screen_size[1]}"
+
+    def region(self, template_path, screen_size):
+        """Gelernter Suchbereich (links, oben, Breite, Höhe) oder None, wenn noch keine Treffer bekannt sind"""
+        entry = self.entries.get(self._key(template_path, screen_size))
+        if not entry or not entry.get("hits"):
+            return None
+        hits = entry["hits"]
+        left = max(min(hit[0] for hit in hits) - ROI_MARGIN, 0)
+        top = max(min(hit[1] for hit in hits) - ROI_MARGIN, 0)
+        right = min(max(hit[0] + hit[2] for hit in hits) + ROI_MARGIN, screen_size[0])
+        bottom = min(max(hit[1] + hit[3] for hit in hits) + ROI_MARGIN, screen_size[1])
+        return left, top, right - left, bottom - top
+
+    def record_hit(self, template_path, box, screen_size, counter):
+        """
+        Speichert eine Trefferposition.
+
+        Args:
+            counter (str): "roi_hits", "roi_misses" oder "unlearned_hits"
+        """
+        entry = self.entries.setdefault(self._key(template_path, screen_size),
+                                        {"hits": [], "roi_hits": 0, "roi_misses": 0, "unlearned_hits": 0})
+        entry[counter] = entry.get(counter, 0) + 1
+        self.session[counter] += 1
+        self._unsaved_hits += 1
+
+        hit = [int(box[0]), int(box[1]), int(box[2]), int(box[3])]
+        if hit not in entry["hits"]:
+            entry["hits"] = (entry["hits"] + [hit])[-LOCATION_HISTORY_SIZE:]
+            self.save()
+        elif self._unsaved_hits >= self.SAVE_EVERY_HITS:
+            self.save()
+
+    def save(self):
+        if self._entries is None or self._unsaved_hits == 0:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": 1, "templates": self._entries}, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+            self._unsaved_hits = 0
+        except Exception as e:
+            print(f"WARNUNG: Template-Positionen konnten nicht gespeichert werden: {e}")
+
+    def clear(self, template_path=None):
+        """Vergisst die gelernten Positionen (aller Templates oder eines Templates)"""
+        if template_path is None:
+            self.entries.clear()
+        else:
+            prefix = self._key(template_path, (0, 0)).rsplit('@', 1)[0] + '@'
+            for key in [key for key in self.entries if key.startswith(prefix)]:
+                del self.entries[key]
+        self._unsaved_hits += 1
+        self.save()
+
+    def session_summary(self):
+        """Einzeilige Trefferquote des laufenden Prozesses oder None, wenn nichts gesucht wurde"""
+        learned = self.session["roi_hits"] + self.session["roi_misses"]
+        if learned + self.session["unlearned_hits"] == 0:
+            return None
+        rate = f"{self.session['roi_hits'] / learned * 100:.0f}%" if learned else "-"
+        return (f"ROI-Suche: {self.session['roi_hits']} von {learned} Treffern im gelernten Bereich ({rate}), "
+                f"{self.session['unlearned_hits']} Treffer ohne gelernten Bereich")
+
+    def print_statistics(self):
+        """Trefferquoten aller gespeicherten Templates"""
+        if not self.entries:
+            print(f"Keine gespeicherten Template-Positionen in '{self.path}'.")
+            return
+        print(f"{'Template':<70} {'ROI':>6} {'Vollbild':>8} {'neu':>5} {'Quote':>6}")
+        for key, entry in sorted(self.entries.items()):
+            roi_hits, roi_misses = entry.get("roi_hits", 0), entry.get("roi_misses", 0)
+            rate = f"{roi_hits / (roi_hits + roi_misses) * 100:.0f}%" if roi_hits + roi_misses else "-"
+            print(f"{key:<70} {roi_hits:>6} {roi_misses:>8} {entry.get('unlearned_hits', 0):>5} {rate:>6}")
+
+
+location_history = LocationHistory()
+
+
+def _report_location_history():
+    location_history.save()
+    summary = location_history.session_summary()
+    if summary:
+        print(summary)
+
+
+atexit.register(_report_location_history)
+
+
+def search(template_path, screen, confidence=0.8, grayscale=GRAYSCALE_DEFAULT, full_screen=True):
+    """
+    Sucht ein Template zuerst im gelernten Bereich und nur bei einem Fehlschlag im ganzen Screenshot.
+    Treffer werden in location_history gespeichert.
+
+    Args:
+        full_screen (bool): False = bei bekanntem Suchbereich nur dort suchen.
+
+    Returns:
+        Box oder None
+    """
+    if not ROI_ENABLED:
+        return locate(template_path, screen, confidence, grayscale)
+
+    region = location_history.region(template_path, screen.size)
+    if region:
+        location = locate(template_path, screen, confidence, grayscale, region=region)
+        if location:
+            location_history.record_hit(template_path, location, screen.size, "roi_hits")
+            return location
+        if not full_screen:
+            return None
+
+    location = locate(template_path, screen, confidence, grayscale)
+    if location:
+        location_history.record_hit(template_path, location, screen.size, "roi_misses" if region else "unlearned_hits")
+    return location
+
+
+def locate_on_screen(template_path, confidence=0.8, grayscale=GRAYSCALE_DEFAULT, raise_not_found=False):
+    """
+    Einmalige Suche (ein Screenshot), Ersatz für pyautogui.locateOnScreen.
+
+    Args:
+        raise_not_found (bool): Wie pyautogui pyautogui.ImageNotFoundException auslösen statt None zurückzugeben.
+
+    Returns:
+        Box oder None
+    """
+    location = search(template_path, ScreenGrab.capture(), confidence, grayscale)
+    if location is None and raise_not_found:
+        pyautogui = _load_module("pyautogui")
+        raise pyautogui.ImageNotFoundException(f"Bild nicht gefunden: '{template_path}'")
+    return location
+
+
+def locate_center_on_screen(template_path, confidence=0.8, grayscale=GRAYSCALE_DEFAULT, raise_not_found=False):
+    """Wie locate_on_screen, gibt aber das Zentrum zurück (Ersatz für pyautogui.locateCenterOnScreen)"""
+    location = locate_on_screen(template_path, confidence, grayscale, raise_not_found)
+    return center(location) if location else None
+
+
+def wait_for_any(template_paths, confidence=0.8, max_attempts=100, interval=0.05,
+                 grayscale=GRAYSCALE_DEFAULT, description=None):
+    """
+    Wartet, bis eines von mehreren Templates auf dem Bildschirm erscheint.
+
+    Pro Versuch wird genau ein Screenshot erstellt und alle Templates darin gesucht.
+    Werden mehrere gleichzeitig gefunden, gewinnt das erste in template_paths. In den ersten
+    ROI_ONLY_ATTEMPTS Versuchen wird bei Templates mit gelerntem Bereich nur dort gesucht.
+
+    Args:
+        template_paths (list): Pfade zu den .png-Dateien der Templates.
+        confidence (float): Genauigkeitsschwelle für die Bilderkennung.
+        max_attempts (int): Maximale Anzahl von Suchversuchen.
+        interval (float): Wartezeit zwischen den Versuchen in Sekunden.
+        grayscale (bool): Suche in Graustufen (Standard wie pyautogui).
+        description (str, optional): Beschreibung für Fehlermeldungen.
+
+    Returns:
+        tuple: (template_path, Box) des gefundenen Templates, sonst (None, None).
+    """
+    description = description or ", ".join(os.path.basename(path) for path in template_paths)
+    try:
+        template_cache.preload(template_paths, grayscale)
+    except Exception as e:
+        print(f"FEHLER: Template für '{description}' konnte nicht geladen werden: {e}")
+        return None, None
+
+    # Der letzte Versuch sucht immer im ganzen Screenshot
+    roi_only_attempts = min(ROI_ONLY_ATTEMPTS, max_attempts - 1)
+    for attempt in range(1, max_attempts + 1):
+        try:
+            screen = ScreenGrab.capture()
+            for template_path in template_paths:
+                location = search(template_path, screen, confidence, grayscale,
+                                  full_screen=attempt > roi_only_attempts)
+                if location:
+                    return template_path, location
+        except Exception as e:
+            print(f"Ein unerwarteter Fehler ist bei der Suche nach '{description}' aufgetreten (Versuch {attempt}): {e}")
+
+        if attempt < max_attempts:
+            time.sleep(interval)
+    return None, None
+
+
+def wait_for(template_path, confidence=0.8, max_attempts=100, interval=0.05,
+             grayscale=GRAYSCALE_DEFAULT, description=None):
+    """Wartet auf ein einzelnes Template (siehe wait_for_any). Returns: Box oder None"""
+    return wait_for_any([template_path], confidence, max_attempts, interval, grayscale, description)[1]
+
+
+if __name__ == "__main__":
+    location_history.print_statistics()
@@ -1,6 +1,9 @@
 import fitz  # PyMuPDF
 import re
 import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 def clean_and_format_text_block(text_block):
     """
@@ -173,115 +176,145 @@ def format_patient_text_to_markdown(name_dob, full_id_str, text_content_after_he
     return output_string.strip() # final strip für den gesamten Block
 
 
-def create_markdown_files(pdf_path, output_dir_markdown):
-    if not os.path.exists(output_dir_markdown):
-        os.makedirs(output_dir_markdown)
+# Header eines Patienten: "Name Vorname 01.02.1950 12345678-12345"
+detailed_header_regex = re.compile(
+    r"((?:.*?)\s+(?:\d{2}\.\d{2}\.\d{4}))\s+(((\d{5,9})-\d{5,9}))"
+)
+text_block_end_marker = "Beilagen"
+beilagen_regex = re.compile(r"\b" + re.escape(text_block_end_marker) + r"\b", re.IGNORECASE)
 
-    try:
-        doc = fitz.open(pdf_path)
-    except Exception as e:
-        print(f"Fehler beim Öffnen der PDF-Datei '{pdf_path}': {e}")
-        return
+# Markdown-Dateien werden parallel geschrieben; höchstens so viele Blöcke warten im Speicher
+MARKDOWN_WORKERS = 4
+MAX_PENDING_BLOCKS = 2 * MARKDOWN_WORKERS
 
-    num_pages = len(doc)
-    if num_pages == 0:
-        print("Die PDF-Datei ist leer.")
-        return
 
-    detailed_header_regex = re.compile(
-        r"((?:.*?)\s+(?:\d{2}\.\d{2}\.\d{4}))\s+(((\d{5,9})-\d{5,9}))"
-    )
-    text_block_end_marker = "Beilagen"
+def iter_patient_blocks(doc):
+    """
+    Liest jede Seite genau einmal und liefert die Textblöcke der Patienten in Reihenfolge.
+
+    Die Seitentexte werden an einen Puffer angehängt; die Header-Treffer einer Seite ergeben
+    über den Seiten-Offset die Position im Puffer. Ein Patientenblock reicht vom eigenen Header
+    bis vor den nächsten Header und wird per Slice ausgeschnitten. Danach wird der Puffer bis
+    zum neuen Header gekürzt, d.h. im Speicher liegt nie mehr als ein Patient plus eine Seite.
 
-    patient_markers = []
-    for page_index in range(num_pages):
+    Yields:
+        tuple: (marker, raw_text) - marker wie bisher (page_index, full_header_text_matched,
+               name_and_dob, full_id_with_hyphen, id_for_filename), raw_text beginnt mit dem Header
+    """
+    buffer = ""
+    current_marker = None
+    for page_index in range(len(doc)):
         page_text = doc[page_index].get_text("text")
+        page_offset = len(buffer)
+        buffer += page_text
         for match in detailed_header_regex.finditer(page_text):
-            patient_markers.append({
+            header_offset = page_offset + match.start()
+            if current_marker is not None:
+                yield current_marker, buffer[:header_offset]
+            # Text vor dem neuen Header wird nicht mehr gebraucht
+            buffer = buffer[header_offset:]
+            page_offset -= header_offset
+            current_marker = {
                 "page_index": page_index,
                 "match_start_pos_on_page": match.start(),
                 "full_header_text_matched": match.group(0).strip(),
                 "name_and_dob": match.group(1).strip(),
                 "full_id_with_hyphen": match.group(3).strip(),
                 "id_for_filename": match.group(4).strip()
-            })
+            }
+        if current_marker is None:
+            buffer = ""  # Seiten vor dem ersten Patienten
+    if current_marker is not None:
+        yield current_marker, buffer
+
+
+def write_patient_markdown(patient_sequence_num, marker, raw_text_for_patient, output_dir_markdown):
+    """
+    Formatiert einen Patientenblock und schreibt die Markdown-Datei (läuft im Worker-Thread).
+
+    Returns:
+        str: Meldung für die Ausgabe
+    """
+    actual_content_start_index_in_raw = raw_text_for_patient.find(marker["full_header_text_matched"])
+    if actual_content_start_index_in_raw == -1:
+        return f"Warnung: Konnte Header für Pat. {patient_sequence_num:02d} ({marker['id_for_filename']}) nicht im extrahierten Block finden. Überspringe."
+
+    text_from_header_onwards = raw_text_for_patient[actual_content_start_index_in_raw:]
+
+    match_beilage = beilagen_regex.search(text_from_header_onwards)
+    if match_beilage:
+        relevant_text_block_with_header = text_from_header_onwards[:match_beilage.start()]
+    else:
+        relevant_text_block_with_header = text_from_header_onwards
+
+    text_content_for_formatting = relevant_text_block_with_header[len(marker["full_header_text_matched"]):].strip()
+
+    markdown_content = format_patient_text_to_markdown(
+        marker["name_and_dob"],
+        marker["full_id_with_hyphen"],
+        text_content_for_formatting
+    )
+
+    if not markdown_content:
+        return f"Kein Markdown-Inhalt für Pat. {patient_sequence_num:02d} ({marker['id_for_filename']}) generiert."
 
-    patient_markers.sort(key=lambda m: (m['page_index'], m['match_start_pos_on_page']))
+    md_filename = os.path.join(output_dir_markdown, f"{patient_sequence_num:02d}_{marker['id_for_filename']}.md")
+    try:
+        with open(md_filename, "w", encoding="utf-8") as f_md:
+            f_md.write(markdown_content)
+        return f"MD gespeichert: {md_filename}"
+    except Exception as e:
+        return f"Fehler beim Speichern von {md_filename}: {e}"
+
+
+def create_markdown_files(pdf_path, output_dir_markdown):
+    if not os.path.exists(output_dir_markdown):
+        os.makedirs(output_dir_markdown)
+
+    try:
+        doc = fitz.open(pdf_path)
+    except Exception as e:
+        print(f"Fehler beim Öffnen der PDF-Datei '{pdf_path}': {e}")
+        return
 
-    if not patient_markers:
+    with doc:
+        if len(doc) == 0:
+            print("Die PDF-Datei ist leer.")
+            return
+
+        start = time.perf_counter()
+        patient_count = 0
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=MARKDOWN_WORKERS) as executor:
+            for marker, raw_text_for_patient in iter_patient_blocks(doc):
+                patient_count += 1
+                pending.append(executor.submit(write_patient_markdown, patient_count, marker,
+                                               raw_text_for_patient, output_dir_markdown))
+                # Meldungen in Patientenreihenfolge ausgeben; begrenzt zugleich die wartenden Blöcke
+                while len(pending) >= MAX_PENDING_BLOCKS or (pending and pending[0].done()):
+                    print(pending.popleft().result())
+            while pending:
+                print(pending.popleft().result())
+
+    if not patient_count:
         print("Keine Patienten-Header im Dokument gefunden.")
-        doc.close()
         return
+    print(f"{patient_count} Patienten aus {pdf_path} in {time.perf_counter() - start:.1f}s aufgeteilt.")
 
-    for i in range(len(patient_markers)):
-        current_marker = patient_markers[i]
-        patient_sequence_num = i + 1
-        
-        start_page_patient = current_marker["page_index"]
-        
-        end_page_for_text_collection_exclusive = num_pages
-        next_header_start_pos_if_same_page = -1 # Default: Kein nächster Header auf derselben Seite
-
-        if i + 1 < len(patient_markers):
-            next_marker = patient_markers[i+1]
-            end_page_for_text_collection_exclusive = next_marker["page_index"] + 1 
-            if next_marker["page_index"] == start_page_patient:
-                next_header_start_pos_if_same_page = next_marker["match_start_pos_on_page"]
-
-        raw_text_for_patient = ""
-        for p_idx in range(start_page_patient, end_page_for_text_collection_exclusive):
-            page_content = doc[p_idx].get_text("text")
-            
-            # Wenn der nächste Patient auf DIESER aktuellen Seite (p_idx) beginnt
-            if i + 1 < len(patient_markers) and patient_markers[i+1]["page_index"] == p_idx and next_header_start_pos_if_same_page != -1:
-                 raw_text_for_patient += page_content[:next_header_start_pos_if_same_page]
-                 break # Text für diesen Patientenblock endet hier
-            else:
-                 raw_text_for_patient += page_content
-        
-        actual_content_start_index_in_raw = raw_text_for_patient.find(current_marker["full_header_text_matched"])
-        
-        if actual_content_start_index_in_raw == -1:
-            print(f"Warnung: Konnte Header für Pat. {patient_sequence_num:02d} ({current_marker['id_for_filename']}) nicht im extrahierten Block finden. Überspringe.")
-            continue
-        
-        text_from_header_onwards = raw_text_for_patient[actual_content_start_index_in_raw:]
 
-        match_beilage = re.search(r"\b" + re.escape(text_block_end_marker) + r"\b", text_from_header_onwards, re.IGNORECASE)
-        if match_beilage:
-            relevant_text_block_with_header = text_from_header_onwards[:match_beilage.start()]
-        else:
-            relevant_text_block_with_header = text_from_header_onwards
-        
-        text_content_for_formatting = relevant_text_block_with_header[len(current_marker["full_header_text_matched"]):].strip()
-        
-        markdown_content = format_patient_text_to_markdown(
-            current_marker["name_and_dob"],
-            current_marker["full_id_with_hyphen"],
-            text_content_for_formatting
-        )
-
-        if markdown_content:
-            md_filename = os.path.join(output_dir_markdown, f"{patient_sequence_num:02d}_{current_marker['id_for_filename']}.md")
-            try:
-                with open(md_filename, "w", encoding="utf-8") as f_md:
-                    f_md.write(markdown_content)
-                print(f"MD gespeichert: {md_filename}")
-            except Exception as e:
-                print(f"Fehler beim Speichern von {md_filename}: {e}")
-        else:
-            print(f"Kein Markdown-Inhalt für Pat. {patient_sequence_num:02d} ({current_marker['id_for_filename']}) generiert.")
+def main():
+    user_home = os.path.expanduser("~")
+    tumorboards_dir = os.path.join(user_home, "tumorboards")
+    pdf_file_path = os.path.join(tumorboards_dir, "Thorax", "Tumorboard_Thorax.pdf")
+    base_output_path = os.path.dirname(pdf_file_path)
+    output_directory_markdown = os.path.join(base_output_path, "entries_splitted_markdown")
+
+    if os.path.exists(pdf_file_path):
+        create_markdown_files(pdf_file_path, output_directory_markdown)
+    else:
+        print(f"Datei nicht gefunden: {pdf_file_path}")
 
-    doc.close()
 
 # --- Anwendung ---
-user_home = os.path.expanduser("~") 
-tumorboards_dir = os.path.join(user_home, "tumorboards")
-pdf_file_path = os.path.join(tumorboards_dir, "Thorax", "Tumorboard_Thorax.pdf")
-base_output_path = os.path.dirname(pdf_file_path) 
-output_directory_markdown = os.path.join(base_output_path, "entries_splitted_markdown")
-
-if os.path.exists(pdf_file_path):
-    create_markdown_files(pdf_file_path, output_directory_markdown)
-else:
-    print(f"Datei nicht gefunden: {pdf_file_path}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
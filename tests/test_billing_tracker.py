@@ -0,0 +1,70 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from utils.billing_tracker import BillingTracker
+from utils.path_management import BackofficePathManager
+
+
+@pytest.fixture
+def backoffice(tmp_path, monkeypatch):
+    monkeypatch.setattr(BackofficePathManager, "get_backoffice_path",
+                        staticmethod(lambda show_warnings=True: (tmp_path, False)))
+    monkeypatch.setattr(BillingTracker, "_get_current_windows_user", lambda self: "tester")
+    BillingTracker._cache.clear()
+    return tmp_path
+
+
+def write_status_json(path, entries):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"abgerechnete_tumorboards": entries}), encoding='utf-8')
+
+
+def test_mark_as_billed_is_visible_to_other_instances(backoffice):
+    first = BillingTracker()
+    second = BillingTracker()
+    assert second.get_billing_statuses([("Thorax", "05.03.2024")]) == {("Thorax", "05.03.2024"): None}
+
+    first.mark_as_billed("Thorax", "05.03.2024", "user")
+    status = second.get_billing_status("Thorax", "05.03.2024")
+    assert (status["benutzer"], status["art_der_abrechnung"]) == ("tester", "user")
+    assert second.is_billed("Thorax", "05.03.2024")
+    assert list((backoffice / "backup" / "db_abrechnungen").glob("abrechnung_status_*.db"))
+
+
+def test_cache_picks_up_writes_from_other_workstations(backoffice):
+    tracker = BillingTracker()
+    assert tracker.get_all_billed_tumorboards() == []
+
+    # Written by another workstation directly into the shared database
+    with sqlite3.connect(tracker.db_file) as conn:
+        conn.execute("INSERT INTO abgerechnete_tumorboards VALUES ('ZNS', '01.04.2024', '01.04.2024 12:00:00', 'x', 'script')")
+    assert tracker.is_billed("ZNS", "01.04.2024")
+
+
+def test_json_is_migrated_once_without_overwriting_database_entries(backoffice):
+    status_file = backoffice / "log_abrechnungen" / "abrechnung_status.json"
+    write_status_json(status_file, [
+        {"tumorboard": "Thorax", "datum": "05.03.2024", "benutzer": "alt", "art_der_abrechnung": "script"},
+    ])
+    write_status_json(backoffice / "backup" / "json_abrechnungen" / "abrechnung_status_2024-01-01_1200.json", [
+        {"tumorboard": "ZNS", "datum": "01.04.2024", "benutzer": "alt", "art_der_abrechnung": "user"},
+        {"tumorboard": "", "datum": "01.04.2024"},
+    ])
+    tracker = BillingTracker()
+    assert {(e["tumorboard"], e["datum"]) for e in tracker.get_all_billed_tumorboards()} == {
+        ("Thorax", "05.03.2024"), ("ZNS", "01.04.2024")
+    }
+
+    # Entries written in the database take precedence over a later JSON import
+    tracker.mark_as_billed("Thorax", "05.03.2024", "user")
+    write_status_json(status_file, [
+        {"tumorboard": "Thorax", "datum": "05.03.2024", "benutzer": "alt", "art_der_abrechnung": "script"},
+        {"tumorboard": "Thorax", "datum": "12.03.2024", "benutzer": "alt", "art_der_abrechnung": "script"},
+    ])
+    os.utime(status_file, (1_700_000_000, 1_700_000_000))
+    reopened = BillingTracker()
+    assert reopened.get_billing_status("Thorax", "05.03.2024")["benutzer"] == "tester"
+    assert reopened.is_billed("Thorax", "12.03.2024")
@@ -0,0 +1,95 @@
+import os
+import sqlite3
+
+import pytest
+from openpyxl import Workbook
+
+from utils import dashboard_aggregates
+from utils.database_utils import TumorboardDatabase
+
+HEADER = ["Name", "Geburtsdatum", "Patientennummer", "Diagnose", "ICD-Code",
+          "Radiotherapie indiziert", "Art des Aufgebots", "Vormerken für Studie", "Bemerkung/Procedere"]
+
+
+def write_collection(path, sheets, mtime):
+    wb = Workbook()
+    wb.remove(wb.active)
+    for sheet_name, rows in sheets.items():
+        ws = wb.create_sheet(sheet_name)
+        ws.append(HEADER)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+    os.utime(path, (mtime, mtime))
+
+
+def row(number, icd_code='C34.1', radiotherapy='Ja'):
+    return [f"Patient {number}", "01.02.1960", number, "NSCLC", icd_code, radiotherapy, "Kat I", "Nein", ""]
+
+
+def patients(db):
+    with sqlite3.connect(db.db_path) as conn:
+        return sorted(conn.execute('SELECT unique_key, icd_code, radiotherapy_indicated FROM patients').fetchall())
+
+
+@pytest.fixture
+def db(tmp_path):
+    return TumorboardDatabase(tmp_path / "master_tumorboard.db")
+
+
+def test_incremental_import_reads_only_changed_sheets(db, tmp_path, monkeypatch):
+    collection = tmp_path / "alle_tumorboards_Thorax.xlsx"
+    sheets = {"05_03_2024": [row(1001), row(1002)], "12_03_2024": [row(1003)]}
+    write_collection(collection, sheets, mtime=1_700_000_000)
+    assert db.import_collection_excel("Thorax", collection, create_backup=False, incremental=True)
+    assert len(patients(db)) == 3
+
+    # Unchanged file: not opened at all
+    def fail_read(path):
+        raise AssertionError("unchanged collection file was read")
+    with monkeypatch.context() as patched:
+        patched.setattr(TumorboardDatabase, "_read_collection_sheets", staticmethod(fail_read))
+        assert db.import_collection_excel("Thorax", collection, create_backup=False, incremental=True)
+
+    # One sheet changed: only that sheet is rebuilt
+    built_sessions = []
+    build_patient_rows = TumorboardDatabase._build_patient_rows
+
+    def counting_build(self, sheet_df, tumorboard_name, date_obj, session_id):
+        built_sessions.append(date_obj.strftime("%d.%m.%Y"))
+        return build_patient_rows(self, sheet_df, tumorboard_name, date_obj, session_id)
+    monkeypatch.setattr(TumorboardDatabase, "_build_patient_rows", counting_build)
+
+    sheets["12_03_2024"] = [row(1003, radiotherapy='Nein')]
+    write_collection(collection, sheets, mtime=1_700_000_100)
+    assert db.import_collection_excel("Thorax", collection, create_backup=False, incremental=True)
+    assert built_sessions == ["12.03.2024"]
+    assert ("12-03-2024_1003_Thorax", "C34.1", "Nein") in patients(db)
+
+
+def test_sync_state_records_every_sheet(db, tmp_path):
+    collection = tmp_path / "alle_tumorboards_Thorax.xlsx"
+    write_collection(collection, {"05_03_2024": [row(1001)], "Übersicht": [], "12_03_2024": []}, mtime=1_700_000_000)
+    assert db.import_collection_excel("Thorax", collection, create_backup=False, incremental=True)
+
+    entity_id = db.get_or_create_entity("Thorax")
+    state = db._get_sheet_sync_state(entity_id)
+    assert set(state) == {"05_03_2024", "12_03_2024"}
+    assert all(mtime == 1_700_000_000 and size == collection.stat().st_size for _, mtime, size in state.values())
+
+
+def test_import_keeps_aggregates_consistent(db, tmp_path):
+    collection = tmp_path / "alle_tumorboards_Thorax.xlsx"
+    sheets = {"05_03_2024": [row(1001), row(1002)], "12_03_2024": [row(1001, icd_code='C34.3')]}
+    write_collection(collection, sheets, mtime=1_700_000_000)
+    db.import_collection_excel("Thorax", collection, create_backup=False, incremental=True)
+    sheets["05_03_2024"] = [row(1001, icd_code='C34.9'), row(1002)]
+    write_collection(collection, sheets, mtime=1_700_000_100)
+    db.import_collection_excel("Thorax", collection, create_backup=False, incremental=True)
+
+    with sqlite3.connect(db.db_path) as conn:
+        cursor = conn.cursor()
+        incremental = cursor.execute('SELECT * FROM agg_icd ORDER BY entity_id, level, icd').fetchall()
+        assert dashboard_aggregates.get_totals(cursor) == (2, 3, 2)
+        dashboard_aggregates.rebuild_aggregates(cursor)
+        assert cursor.execute('SELECT * FROM agg_icd ORDER BY entity_id, level, icd').fetchall() == incremental
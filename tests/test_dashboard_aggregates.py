@@ -0,0 +1,86 @@
+import sqlite3
+
+from utils import dashboard_aggregates
+from utils.database_utils import TumorboardDatabase
+
+AGGREGATE_TABLES = ['agg_entity_month', 'agg_icd', 'agg_patient_status', 'agg_patient_refs', 'agg_session_refs']
+
+
+def patient(number, icd_code='C34.1', radiotherapy='Ja', aufgebot='Kat I: In 1-3 Tagen ohne Konsil'):
+    return {
+        'name': f"Patient {number}", 'birth_date': '01.02.1960', 'patient_number': number,
+        'diagnosis': 'NSCLC', 'icd_code': icd_code, 'radiotherapy': radiotherapy,
+        'aufgebot': aufgebot, 'studie': 'Nein', 'bemerkung': ''
+    }
+
+
+def snapshot(db):
+    with sqlite3.connect(db.db_path) as conn:
+        return {table: sorted(conn.execute(f'SELECT * FROM {table}').fetchall()) for table in AGGREGATE_TABLES}
+
+
+def rebuilt_snapshot(db):
+    with sqlite3.connect(db.db_path) as conn:
+        dashboard_aggregates.rebuild_aggregates(conn.cursor())
+        conn.commit()
+    return snapshot(db)
+
+
+def totals(db, entity_name=None):
+    with sqlite3.connect(db.db_path) as conn:
+        cursor = conn.cursor()
+        entity_id = dashboard_aggregates.ALL_ENTITIES
+        if entity_name:
+            entity_id = cursor.execute('SELECT id FROM tumorboard_entities WHERE name = ?', (entity_name,)).fetchone()[0]
+        return tuple(dashboard_aggregates.get_totals(cursor, entity_id))
+
+
+def test_upserts_match_full_rebuild(tmp_path):
+    db = TumorboardDatabase(tmp_path / "master_tumorboard.db")
+    db.upsert_session_patients("Thorax", "05.03.2024", [patient('1001'), patient('1002', icd_code='C34.3')])
+    db.upsert_session_patients("Thorax", "12.03.2024", [patient('1001', radiotherapy='Nein')])
+    db.upsert_session_patients("ZNS", "05.04.2024", [patient('1001', icd_code='C71.0'), patient('2001', icd_code='D32.9')])
+    # Replace a session: one patient removed, one ICD code changed, one patient added
+    db.upsert_session_patients("Thorax", "05.03.2024", [patient('1002', icd_code='C34.1'), patient('1003')])
+
+    incremental = snapshot(db)
+    assert incremental == rebuilt_snapshot(db)
+
+    # (sessions, cases, unique_patients)
+    assert totals(db, "Thorax") == (2, 3, 3)
+    assert totals(db, "ZNS") == (1, 2, 2)
+    assert totals(db) == (3, 5, 4)
+
+
+def test_unique_patients_are_reference_counted_across_replaced_sessions(tmp_path):
+    db = TumorboardDatabase(tmp_path / "master_tumorboard.db")
+    db.upsert_session_patients("Thorax", "05.03.2024", [patient('1001'), patient('1002')])
+    db.upsert_session_patients("Thorax", "12.03.2024", [patient('1001')])
+    assert totals(db, "Thorax") == (2, 3, 2)
+
+    # 1001 is still counted through the second session
+    db.upsert_session_patients("Thorax", "05.03.2024", [patient('1002')])
+    assert totals(db, "Thorax") == (2, 2, 2)
+
+    # Now 1001 is gone from every session
+    db.upsert_session_patients("Thorax", "12.03.2024", [])
+    assert totals(db, "Thorax") == (2, 1, 1)
+
+    with sqlite3.connect(db.db_path) as conn:
+        icd_counts = dashboard_aggregates.get_icd_counts(conn.cursor(), 'family')
+    assert icd_counts == [('C34', 1, 1)]
+    assert snapshot(db) == rebuilt_snapshot(db)
+
+
+def test_status_counts_follow_replaced_values(tmp_path):
+    db = TumorboardDatabase(tmp_path / "master_tumorboard.db")
+    db.upsert_session_patients("Thorax", "05.03.2024", [patient('1001'), patient('1002', radiotherapy='-')])
+    db.upsert_session_patients("Thorax", "05.03.2024", [
+        patient('1001', aufgebot='Kat II: In 5-7 Tagen ohne Konsil'), patient('1002', radiotherapy='Ja', aufgebot='-')
+    ])
+
+    with sqlite3.connect(db.db_path) as conn:
+        cursor = conn.cursor()
+        assert dashboard_aggregates.get_status_counts(cursor, 'radiotherapy') == [('Ja', 2)]
+        assert sorted(dashboard_aggregates.get_status_counts(cursor, 'aufgebot')) == [('', 1), ('Kat II', 1)]
+    assert snapshot(db) == rebuilt_snapshot(db)
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from icd_autocoder import IcdAutoCoder
+
+
+@pytest.fixture(scope="module")
+def coder(tmp_path_factory):
+    # Without history: only the catalogue and entity rules decide
+    return IcdAutoCoder.load(db_path=tmp_path_factory.mktemp("db") / "missing.db")
+
+
+@pytest.mark.parametrize("diagnosis, expected", [
+    ("Multiples Myelom", "C90.00"),
+    ("Plasmozytom", "C90.30"),
+    ("Chronische lymphatische Leukämie", "C91.10"),
+    ("Leukämie", "C95.90"),
+])
+def test_new_diagnoses_are_not_coded_in_remission(coder, diagnosis, expected):
+    suggestion = coder.code(diagnosis)
+    assert suggestion.icd_code == expected
+    assert "kompletter Remission" not in suggestion.icd_beschreibung
+
+
+def test_remission_code_when_the_diagnosis_mentions_remission(coder):
+    assert coder.code("Multiples Myelom in kompletter Remission").icd_code == "C90.01"
+    assert coder.code("CLL in Remission").icd_code == "C91.11"
+
+
+def test_subsite_refinement(coder):
+    assert coder.code("Adenokarzinom der Lunge, Oberlappen rechts").icd_code == "C34.1"
@@ -0,0 +1,24 @@
+from utils.icd_index import ICDIndex, tokenize
+
+ENTRIES = {
+    "C50.9": "Bösartige Neubildung: Brustdrüse, nicht näher bezeichnet",
+    "C34.1": "Bösartige Neubildung: Oberlappen (-Bronchus)",
+    "C34.10": "Bösartige Neubildung: Oberlappen, rechts",
+    "G37.5": "Konzentrische Sklerose [Baló-Krankheit]",
+}
+
+
+def test_query_and_descriptions_share_one_tokenizer():
+    assert tokenize("Brustdrüse Baló-Krankheit") == ["brustdruse", "baló", "krankheit"]
+
+
+def test_description_search_with_umlauts_and_accents():
+    index = ICDIndex(ENTRIES)
+    for query in ("Brustdrüse", "brustdruse", "Brustdruese", "brust"):
+        assert [code for code, _ in index.search_description(query)] == ["C50.9"], query
+    assert [code for code, _ in index.search_description("Baló")] == ["G37.5"]
+
+
+def test_code_search_exact_match_first():
+    index = ICDIndex(ENTRIES)
+    assert [code for code, _ in index.search_code("c34.1")] == ["C34.1", "C34.10"]
@@ -0,0 +1,84 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+fitz = pytest.importorskip("fitz")
+pytest.importorskip("PIL")
+
+import pdf_ingest
+
+ANMELDUNG = """Tumorboard Anmeldung
+Patienteninformationen
+12345678
+Muster Hans
+M / 01.02.1960
+Angaben werden nicht automatisch in die Tumordokumentation übernommen
+Diagnose
+
+Adenokarzinom der Lunge, Oberlappen rechts
+cT2a cN1 cM0
+Fragestellung
+"""
+
+
+def test_stammdaten_aus_text():
+    assert pdf_ingest.stammdaten_aus_text(ANMELDUNG) == ("12345678", "Muster Hans", "M", "01.02.1960")
+
+
+def test_stammdaten_ohne_anker():
+    assert pdf_ingest.stammdaten_aus_text("Muster Hans 12345678") == ("", "", "", "")
+
+
+def test_diagnose_aus_text_erste_zeile_und_folgezeile():
+    assert pdf_ingest.diagnose_aus_text(ANMELDUNG) == "Adenokarzinom der Lunge, Oberlappen rechts cT2a cN1 cM0"
+
+
+def test_diagnose_aus_text_ohne_anker_oder_diagnose_zeile():
+    assert pdf_ingest.diagnose_aus_text("Diagnose\nMammakarzinom") == ""
+    assert pdf_ingest.diagnose_aus_text(f"{pdf_ingest.ANCHOR_DIAGNOSE}\nBefund\nText") == ""
+
+
+def test_diagnose_aus_ocr_text_wandelt_aufzaehlungspunkte():
+    text = f"{pdf_ingest.ANCHOR_DIAGNOSE}\ndiagnose\ne Mammakarzinom links\n"
+    assert pdf_ingest.diagnose_aus_text(text, ocr=True) == "• Mammakarzinom links"
+
+
+def _write_pdf(path, text):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((40, 60), text, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def test_bundle_liest_pdfs_in_einem_thread(tmp_path, monkeypatch):
+    text_pdf = str(tmp_path / "1.pdf")
+    ocr_pdf = str(tmp_path / "2.pdf")
+    _write_pdf(text_pdf, ANMELDUNG)
+    _write_pdf(ocr_pdf, ANMELDUNG.replace("Adenokarzinom der Lunge, Oberlappen rechts\ncT2a cN1 cM0", "-"))
+
+    fitz_threads = set()
+    original_open = pdf_ingest.fitz.open
+
+    def tracking_open(*args, **kwargs):
+        fitz_threads.add(threading.get_ident())
+        return original_open(*args, **kwargs)
+
+    def fake_recognize(image, engine, **options):
+        return {"ok": True, "text": f"{pdf_ingest.ANCHOR_DIAGNOSE}\nDiagnose\nPlattenepithelkarzinom Oesophagus\n"}
+
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    monkeypatch.setattr(pdf_ingest.fitz, "open", tracking_open)
+    monkeypatch.setattr(pdf_ingest.ocr_service, "recognize", fake_recognize)
+
+    results = {os.path.basename(r["path"]): r for r in pdf_ingest.ingest_pdfs([text_pdf, ocr_pdf], workers=2)}
+
+    assert fitz_threads == {threading.get_ident()}
+    assert results["1.pdf"]["methode"] == "text"
+    assert results["1.pdf"]["patientennummer"] == "12345678"
+    assert results["2.pdf"]["methode"] == "ocr"
+    assert results["2.pdf"]["diagnose"] == "Plattenepithelkarzinom Oesophagus"
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from openpyxl import Workbook
+
+from utils.session_workbook import SessionWorkbook
+
+
+def make_session_file(path):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Name", "Patientennummer", "Radiotherapie indiziert"])
+    ws.append(["Muster", "1001", None])
+    ws.append(["Beispiel", "1002", None])
+    wb.save(path)
+
+
+def write_journal(path, entries):
+    with open(path, 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+def test_edits_after_replay_survive_a_second_crash(tmp_path, monkeypatch):
+    excel_path = tmp_path / "session.xlsx"
+    journal_path = tmp_path / "session.jsonl"
+    make_session_file(excel_path)
+    # First crash: v1-v3 reached the file (commit v3, temp file gone), v4 did not
+    write_journal(journal_path, [
+        {'op': 'set', 'row': 0, 'column': 'Radiotherapie indiziert', 'value': 'Ja', 'v': 1},
+        {'op': 'set', 'row': 1, 'column': 'Radiotherapie indiziert', 'value': 'Nein', 'v': 2},
+        {'op': 'set', 'row': 0, 'column': 'Name', 'value': 'Muster', 'v': 3},
+        {'op': 'commit', 'v': 3},
+        {'op': 'set', 'row': 1, 'column': 'Name', 'value': 'Beispiel-Neu', 'v': 4},
+    ])
+
+    # Share offline: every write fails
+    def fail_write(self, data, version):
+        raise OSError("share offline")
+    monkeypatch.setattr(SessionWorkbook, "_write_once", fail_write)
+
+    workbook = SessionWorkbook(excel_path, journal_path=journal_path, retries=1, retry_delay=0)
+    assert workbook.get_value(1, 'Name') == 'Beispiel-Neu'
+    workbook.set_value(0, 'Radiotherapie indiziert', 'Nein')
+    with pytest.raises(OSError):
+        workbook.flush()
+    # Second crash: the workbook is abandoned without a successful write
+    workbook._executor.shutdown(wait=True)
+
+    recovered = SessionWorkbook(excel_path, journal_path=journal_path, retries=1, retry_delay=0)
+    assert recovered.get_value(1, 'Name') == 'Beispiel-Neu'
+    assert recovered.get_value(0, 'Radiotherapie indiziert') == 'Nein'
+    recovered._executor.shutdown(wait=True)
+
+
+def test_replay_compacts_journal(tmp_path, monkeypatch):
+    excel_path = tmp_path / "session.xlsx"
+    journal_path = tmp_path / "session.jsonl"
+    make_session_file(excel_path)
+    write_journal(journal_path, [
+        {'op': 'set', 'row': 0, 'column': 'Name', 'value': 'Alt', 'v': 1},
+        {'op': 'commit', 'v': 1},
+        {'op': 'set', 'row': 1, 'column': 'Name', 'value': 'Neu', 'v': 2},
+    ])
+    monkeypatch.setattr(SessionWorkbook, "_write_once", lambda self, data, version: (_ for _ in ()).throw(OSError("offline")))
+
+    workbook = SessionWorkbook(excel_path, journal_path=journal_path, retries=1, retry_delay=0)
+    workbook._executor.shutdown(wait=True)
+
+    entries = [json.loads(line) for line in journal_path.read_text(encoding='utf-8').splitlines()]
+    assert [e['op'] for e in entries] == ['set']
+    assert entries[0]['v'] > 2
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import pandas as pd
+
+from utils.benchmark_sheet_normalization import make_sheet, rowwise_patient_rows
+from utils.database_utils import TumorboardDatabase
+from utils.sheet_normalization import normalize_aufgebot_type, normalize_patient_sheet
+
+SESSION_DATE = datetime(2024, 6, 15)
+
+
+def test_database_rows_match_former_rowwise_import(tmp_path):
+    db = TumorboardDatabase(tmp_path / "master_tumorboard.db")
+    for seed in range(3):
+        df = make_sheet(400, seed=seed)
+        expected = rowwise_patient_rows(df, "Thorax", SESSION_DATE, 7)
+        assert db._build_patient_rows(df, "Thorax", SESSION_DATE, 7) == expected
+
+
+def test_edge_values_match_former_rowwise_import(tmp_path):
+    db = TumorboardDatabase(tmp_path / "master_tumorboard.db")
+    df = pd.DataFrame([
+        # Float patient number, birthday on the session date, lower case ICD code
+        {'Name': ' Muster ', 'Geburtsdatum': '15.06.1960', 'Patientennummer': 1001.0, 'ICD-Code': ' c34.1 '},
+        # Birthday one day after the session date, ICD only in the legacy column
+        {'Name': 'Beispiel', 'Geburtsdatum': '16/06/1960', 'Patientennummer': '1002', 'ICD-Code': '', 'ICD-10': 'D32.9'},
+        # No patient number: skipped
+        {'Name': 'Ohne Nummer', 'Geburtsdatum': None, 'Patientennummer': None, 'ICD-Code': 'C71.0'},
+        # No name: skipped
+        {'Name': '  ', 'Geburtsdatum': None, 'Patientennummer': '1004', 'ICD-Code': None},
+        # Implausible birth date and a non-numeric ".0" suffix that must be kept
+        {'Name': 'Alt', 'Geburtsdatum': '1800-01-01', 'Patientennummer': 'A1.0', 'ICD-Code': 'nan'},
+    ])
+    expected = rowwise_patient_rows(df, "Thorax", SESSION_DATE, 7)
+    assert db._build_patient_rows(df, "Thorax", SESSION_DATE, 7) == expected
+    assert [row[2] for row in expected] == ['1001', '1002', 'A1.0']
+    assert [row[5] for row in expected] == [64, 63, None]
+
+
+def test_normalized_sheet_columns():
+    df = pd.DataFrame([
+        {'Name': 'Muster', 'Geburtsdatum': datetime(1960, 2, 1), 'Patientennummer': '1001',
+         'ICD Code': 'C50.9', 'Art des Aufgebots': 'Kat III: Nach Eingang des Konsils'},
+        {'Name': None, 'Patientennummer': '1002'},
+    ])
+    patients = normalize_patient_sheet(df, reference_date=SESSION_DATE)
+    assert list(patients.index) == [0]
+    first = patients.iloc[0]
+    assert first['birth_date_text'] == '01.02.1960'
+    assert first['age'] == 64
+    assert (first['icd_code'], first['icd_family']) == ('C50.9', 'C50')
+    assert first['aufgebot_type'] == 'Kat III'
+
+
+def test_aufgebot_values():
+    assert normalize_aufgebot_type("Kat I: In 1-3 Tagen ohne Konsil") == "Kat I"
+    assert normalize_aufgebot_type("in 5-7 Tagen") == "Kat II"
+    assert normalize_aufgebot_type("Kat II") == "Kat II"
+    assert normalize_aufgebot_type("-") is None
+    assert normalize_aufgebot_type(None) is None
@@ -0,0 +1,94 @@
+import logging
+
+import pytest
+
+from utils import sop_search_index
+from utils.sop_search_index import SopSearchIndex
+
+pytestmark = pytest.mark.skipif(not sop_search_index.fts5_available(), reason="SQLite without FTS5")
+
+
+@pytest.fixture
+def text_pdfs(monkeypatch):
+    """Index plain text files named *.pdf: pages separated by form feeds"""
+    def extract_pages(pdf_path, fitz):
+        return pdf_path.read_text(encoding='utf-8').split("\f")
+    monkeypatch.setattr(sop_search_index, "load_pymupdf", lambda: object())
+    monkeypatch.setattr(sop_search_index, "extract_pages", extract_pages)
+
+
+def write_pdf(assets, rel_path, *pages):
+    path = assets / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\f".join(pages), encoding='utf-8')
+    return path
+
+
+def hits(index, query):
+    return [(hit['title'], hit['page']) for hit in index.search(query)]
+
+
+def test_update_indexes_changed_and_drops_removed_files(tmp_path, text_pdfs):
+    assets = tmp_path / "assets"
+    write_pdf(assets, "sop/Mamma/RT_Mamma.pdf", "Indikation", "Boost 16 Gy in 8 Fraktionen")
+    write_pdf(assets, "sop/ZNS/RT_Glioblastom.pdf", "Temozolomid konkomitant")
+    write_pdf(assets, "guidelines/Contouring_Prostata.pdf", "Samenblasen")
+    index = SopSearchIndex(tmp_path / "index.db", assets)
+
+    assert index.update() == (3, 0)
+    assert hits(index, "fraktion boost") == [("RT Mamma", 2)]
+    assert index.search("samenblasen")[0]['kind'] == "Guideline"
+
+    # Unchanged files are not extracted again
+    assert index.update() == (0, 0)
+
+    # Same size, different content: detected by the content hash
+    write_pdf(assets, "sop/Mamma/RT_Mamma.pdf", "Indikation", "Boost 16 Gy in 8 Sitzungen.")
+    write_pdf(assets, "sop/ZNS/RT_Glioblastom.pdf", "Temozolomid adjuvant")
+    (assets / "guidelines/Contouring_Prostata.pdf").unlink()
+    assert index.update() == (2, 1)
+    assert hits(index, "fraktion") == []
+    assert hits(index, "sitzungen") == [("RT Mamma", 2)]
+    assert hits(index, "adjuvant") == [("RT Glioblastom", 1)]
+    assert hits(index, "konkomitant") == []
+    assert hits(index, "samenblasen") == []
+    assert index.file_count() == 2
+
+
+def test_search_folds_umlauts_and_matches_titles(tmp_path, text_pdfs):
+    assets = tmp_path / "assets"
+    write_pdf(assets, "sop/RT_Körperstamm.pdf", "Stereotaxie der Wirbelsäule")
+    index = SopSearchIndex(tmp_path / "index.db", assets)
+    index.update()
+
+    assert hits(index, "wirbelsaule") == [("RT Körperstamm", 1)]
+    # File name match without text match: one hit on the first page without snippet
+    result = index.search("korperstamm")
+    assert [(hit['page'], hit['snippet']) for hit in result] == [(1, "")]
+    assert index.search("  ") == []
+
+
+def test_without_pymupdf_files_are_retried_and_warned_once(tmp_path, monkeypatch, caplog):
+    assets = tmp_path / "assets"
+    write_pdf(assets, "sop/RT_Mamma.pdf", "Boost")
+    write_pdf(assets, "sop/RT_Lunge.pdf", "SBRT")
+    monkeypatch.setattr(sop_search_index, "load_pymupdf", lambda: None)
+    index = SopSearchIndex(tmp_path / "index.db", assets)
+
+    with caplog.at_level(logging.WARNING):
+        assert index.update() == (2, 0)
+    assert sum("PyMuPDF is not installed" in record.message for record in caplog.records) == 1
+    assert hits(index, "mamma") == [("RT Mamma", 1)]
+    # No text extracted: indexed again on the next update
+    assert index.update() == (2, 0)
+
+
+def test_extract_pages_from_pdf(tmp_path):
+    fitz = pytest.importorskip("fitz")
+    pdf_path = tmp_path / "sop.pdf"
+    with fitz.open() as doc:
+        for text in ("Erste   Seite", "Zweite Seite"):
+            doc.new_page().insert_text((72, 72), text)
+        doc.save(pdf_path)
+    assert sop_search_index.extract_pages(pdf_path, fitz) == ["Erste Seite", "Zweite Seite"]
+    assert sop_search_index.extract_pages(tmp_path / "fehlt.pdf", fitz) == []
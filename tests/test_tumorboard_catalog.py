@@ -0,0 +1,108 @@
+import os
+import shutil
+
+import pytest
+from openpyxl import Workbook
+
+from utils import tumorboard_catalog
+from utils.tumorboard_catalog import TumorboardCatalog
+
+
+def touch(path, mtime):
+    os.utime(path, (mtime, mtime))
+
+
+def make_session(base, entity, date_str, cases, finalized=True, mtime=1_700_000_000):
+    folder = base / entity / date_str
+    folder.mkdir(parents=True, exist_ok=True)
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Name", "Patientennummer"])
+    for i in range(cases):
+        ws.append([f"Patient {i}", str(1000 + i)])
+    excel = folder / f"{date_str}.xlsx"
+    wb.save(excel)
+    touch(excel, mtime)
+    if finalized:
+        (folder / "timestamp_finalized.txt").write_text("ok")
+    touch(folder, mtime)
+    touch(folder.parent, mtime)
+    return folder
+
+
+def finalized(catalog):
+    return [(tb['entity'], tb['date'], tb['case_count']) for tb in catalog.get_finalized_tumorboards()]
+
+
+@pytest.fixture
+def read_counter(monkeypatch):
+    reads = []
+    count_cases = tumorboard_catalog.get_excel_case_count
+
+    def counting(excel_path):
+        reads.append(excel_path.name)
+        return count_cases(excel_path)
+    monkeypatch.setattr(tumorboard_catalog, "get_excel_case_count", counting)
+    return reads
+
+
+def test_refresh_lists_finalized_sessions_newest_first(tmp_path, read_counter):
+    make_session(tmp_path, "Thorax", "05.03.2024", cases=2)
+    make_session(tmp_path, "Thorax", "12.03.2024", cases=0, finalized=False)
+    make_session(tmp_path, "ZNS", "01.04.2024", cases=3)
+    (tmp_path / "Thorax" / "kein_datum").mkdir()
+
+    catalog = TumorboardCatalog(tmp_path)
+    assert catalog.refresh()
+    assert finalized(catalog) == [("ZNS", "01.04.2024", 3), ("Thorax", "05.03.2024", 2)]
+    # Case counts are only read for finalized sessions
+    assert sorted(read_counter) == ["01.04.2024.xlsx", "05.03.2024.xlsx"]
+
+
+def test_refresh_rereads_only_changed_sessions(tmp_path, read_counter):
+    make_session(tmp_path, "Thorax", "05.03.2024", cases=2)
+    make_session(tmp_path, "ZNS", "01.04.2024", cases=3)
+    catalog = TumorboardCatalog(tmp_path)
+    catalog.refresh()
+    read_counter.clear()
+
+    # Nothing changed: no Excel file is opened
+    assert catalog.refresh()
+    assert read_counter == []
+
+    # One session Excel rewritten (entity folder mtime unchanged)
+    make_session(tmp_path, "Thorax", "05.03.2024", cases=5, mtime=1_700_000_100)
+    touch(tmp_path / "Thorax", 1_700_000_000)
+    assert catalog.refresh()
+    assert read_counter == ["05.03.2024.xlsx"]
+    assert finalized(catalog) == [("ZNS", "01.04.2024", 3), ("Thorax", "05.03.2024", 5)]
+
+
+def test_refresh_picks_up_added_and_removed_folders(tmp_path):
+    make_session(tmp_path, "Thorax", "05.03.2024", cases=2)
+    make_session(tmp_path, "ZNS", "01.04.2024", cases=3)
+    catalog = TumorboardCatalog(tmp_path)
+    catalog.refresh()
+
+    make_session(tmp_path, "Thorax", "19.03.2024", cases=1, mtime=1_700_000_200)
+    shutil.rmtree(tmp_path / "ZNS")
+    assert catalog.refresh()
+    assert finalized(catalog) == [("Thorax", "19.03.2024", 1), ("Thorax", "05.03.2024", 2)]
+
+    # A session folder deleted while the entity folder mtime looks unchanged
+    shutil.rmtree(tmp_path / "Thorax" / "05.03.2024")
+    touch(tmp_path / "Thorax", 1_700_000_200)
+    assert catalog.refresh()
+    assert finalized(catalog) == [("Thorax", "19.03.2024", 1)]
+
+
+def test_update_session_after_finalization(tmp_path):
+    folder = make_session(tmp_path, "Thorax", "05.03.2024", cases=2, finalized=False)
+    catalog = TumorboardCatalog(tmp_path)
+    catalog.refresh()
+    assert finalized(catalog) == []
+
+    (folder / "timestamp_finalized.txt").write_text("ok")
+    touch(folder, 1_700_000_000)
+    assert catalog.update_session("Thorax", "05.03.2024")
+    assert finalized(catalog) == [("Thorax", "05.03.2024", 2)]
@@ -0,0 +1,265 @@
+"""
+Downscaled, cached image assets for the tumor navigator tiles.
+
+The tile images in assets/ (tumorgroup_*.png, contours_images/*.PNG, bm_*.png,
+home_button.png) are 1024px PNGs of up to 2 MB, but are shown 60-225px high. Every page
+construction (and every breadcrumb update for the home button) decoded them at full
+resolution into a QPixmap and scaled them on the GUI thread.
+
+Thumbnails now go through three layers:
+
+- QPixmapCache: the rendered pixmap per (source, target size), shared by all pages
+- disk cache (~/patdata/thumbnail_cache): the scaled (and optionally rounded) thumbnail
+  as a small PNG, keyed by a hash of the source file (path below assets/, size, content)
+  and the target size in device pixels, so HiDPI screens get sharp images and later runs
+  only read the original PNG once to hash it. Neither the absolute path nor the mtime is
+  part of the key: the one-file build extracts assets/ to a new _MEIxxxx folder with fresh
+  mtimes on every launch
+- background decoding: on a miss in both caches, request_thumbnail() renders the
+  thumbnail as a QImage on a worker thread and delivers the pixmap via callback on the
+  GUI thread; the tile shows up without its image for that first frame only
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QRectF, Qt, pyqtSignal
+from PyQt6.QtGui import QGuiApplication, QImage, QPainter, QPainterPath, QPixmap, QPixmapCache
+
+THUMBNAIL_CACHE_DIR = Path.home() / "patdata" / "thumbnail_cache"
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+
+# Bumped when the rendering changes (old thumbnails are not reused)
+RENDER_VERSION = 1
+
+# Room for all navigator thumbnails (default QPixmapCache limit is 10 MB)
+PIXMAP_CACHE_LIMIT_KB = 64 * 1024
+
+DECODE_WORKERS = 2
+
+_loader = None
+_content_hashes = {}  # absolute source path -> content hash (assets do not change while the app runs)
+
+
+def device_pixel_ratio(widget=None):
+    """Device pixel ratio of the widget's screen (primary screen if no widget is given)"""
+    if widget is not None:
+        return widget.devicePixelRatioF()
+    app = QGuiApplication.instance()
+    screen = app.primaryScreen() if app is not None else None
+    return screen.devicePixelRatio() if screen is not None else 1.0
+
+
+def content_hash(image_path):
+    """Hash of the file content, computed once per process and path (about 1 ms per navigator PNG)"""
+    abs_path = os.path.abspath(image_path)
+    digest = _content_hashes.get(abs_path)
+    if digest is None:
+        with open(abs_path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        _content_hashes[abs_path] = digest
+    return digest
+
+
+def thumbnail_key(image_path, height, radius=0, dpr=1.0):
+    """
+    Cache key of a thumbnail.
+
+    Returns:
+        str | None: Key for the source file in its current version and the target size,
+                    None if the source does not exist
+    """
+    try:
+        size = os.path.getsize(image_path)
+        digest = content_hash(image_path)
+    except OSError:
+        return None
+    rel_path = Path(os.path.relpath(os.path.abspath(image_path), ASSETS_DIR)).as_posix()
+    source = f"{rel_path}|{size}|{digest}|{RENDER_VERSION}"
+    source_hash = hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+    pixel_height = round(height * dpr)
+    return f"{Path(image_path).stem}_{source_hash}_h{pixel_height}_r{round(radius * dpr)}"
+
+
+def render_thumbnail(image_path, height, radius=0, dpr=1.0):
+    """
+    Decode and scale an image to the target height (thread-safe, uses QImage only).
+
+    Returns:
+        QImage: Thumbnail with the device pixel ratio set (null image if the source is unreadable)
+    """
+    image = QImage(str(image_path))
+    if image.isNull():
+        logging.warning(f"Could not decode image: {image_path}")
+        return image
+    image = image.scaledToHeight(round(height * dpr), Qt.TransformationMode.SmoothTransformation)
+    if radius:
+        image = round_corners(image, radius * dpr)
+    image.setDevicePixelRatio(dpr)
+    return image
+
+
+def round_corners(image, radius):
+    """Copy of the image with transparent rounded corners"""
+    rounded = QImage(image.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    rounded.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(rounded)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    path = QPainterPath()
+    path.addRoundedRect(QRectF(rounded.rect()), radius, radius)
+    painter.setClipPath(path)
+    painter.drawImage(0, 0, image)
+    painter.end()
+    return rounded
+
+
+class ThumbnailLoader(QObject):
+    """Disk cache + background decoding; results are delivered on the GUI thread"""
+
+    # (cache key, rendered image) - emitted from the worker thread, handled on the GUI thread
+    image_ready = pyqtSignal(str, QImage)
+
+    def __init__(self, cache_dir=THUMBNAIL_CACHE_DIR, parent=None):
+        super().__init__(parent)
+        self.cache_dir = Path(cache_dir)
+        self._executor = ThreadPoolExecutor(max_workers=DECODE_WORKERS, thread_name_prefix="ThumbnailDecode")
+        self._waiting = {}  # cache key -> callbacks of requests in flight
+        self.image_ready.connect(self._on_image_ready)
+        QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), PIXMAP_CACHE_LIMIT_KB))
+
+    def cache_path(self, key):
+        return self.cache_dir / f"{key}.png"
+
+    def cached_pixmap(self, key, dpr):
+        """Pixmap from memory or the disk cache (small PNG), None on a miss"""
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None and not pixmap.isNull():
+            return pixmap
+        cache_path = self.cache_path(key)
+        if cache_path.exists():
+            image = QImage(str(cache_path))
+            if not image.isNull():
+                image.setDevicePixelRatio(dpr)
+                pixmap = QPixmap.fromImage(image)
+                QPixmapCache.insert(key, pixmap)
+                return pixmap
+        return None
+
+    def load(self, image_path, height, radius=0, dpr=None):
+        """
+        Thumbnail right away (decodes on the calling thread on a cache miss).
+
+        Returns:
+            QPixmap | None: None if the source does not exist or cannot be decoded
+        """
+        dpr = dpr or device_pixel_ratio()
+        key = thumbnail_key(image_path, height, radius, dpr)
+        if key is None:
+            return None
+        pixmap = self.cached_pixmap(key, dpr)
+        if pixmap is None:
+            image = self._render_and_store(key, image_path, height, radius, dpr)
+            if image.isNull():
+                return None
+            pixmap = QPixmap.fromImage(image)
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def request(self, image_path, height, callback, radius=0, dpr=None):
+        """
+        Deliver the thumbnail to callback(pixmap) on the GUI thread.
+
+        Cache hits are delivered before this returns; misses are rendered in the background.
+
+        Returns:
+            bool: True if the callback was already called
+        """
+        dpr = dpr or device_pixel_ratio()
+        key = thumbnail_key(image_path, height, radius, dpr)
+        if key is None:
+            return False
+        pixmap = self.cached_pixmap(key, dpr)
+        if pixmap is not None:
+            callback(pixmap)
+            return True
+        if key in self._waiting:
+            self._waiting[key].append(callback)
+        else:
+            self._waiting[key] = [callback]
+            self._executor.submit(self._render_in_background, key, image_path, height, radius, dpr)
+        return False
+
+    def prefetch(self, image_paths, height, radius=0, dpr=None):
+        """Render thumbnails that are not cached yet in the background (e.g. for pages shown next)"""
+        for image_path in image_paths:
+            self.request(image_path, height, lambda pixmap: None, radius, dpr)
+
+    def _render_in_background(self, key, image_path, height, radius, dpr):
+        try:
+            image = self._render_and_store(key, image_path, height, radius, dpr)
+        except Exception as e:
+            logging.error(f"Error rendering thumbnail for {image_path}: {e}")
+            image = QImage()
+        self.image_ready.emit(key, image)
+
+    def _render_and_store(self, key, image_path, height, radius, dpr):
+        image = render_thumbnail(image_path, height, radius, dpr)
+        if not image.isNull():
+            self._store(key, image)
+        return image
+
+    def _store(self, key, image):
+        """Write the thumbnail to the disk cache (temp file + replace, concurrent readers never see a partial file)"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".png.tmp")
+            os.close(fd)
+            if image.save(tmp_path, "PNG"):
+                os.replace(tmp_path, self.cache_path(key))
+            else:
+                os.remove(tmp_path)
+                return
+            # Thumbnails of older versions of the same source and size are no longer used
+            stem, _source_hash, size_part, radius_part = key.rsplit('_', 3)
+            for stale in self.cache_dir.glob(f"{stem}_*_{size_part}_{radius_part}.png"):
+                # The pattern also matches stems that start with this one ("bm" / "bm_after_wbrt")
+                if stale.stem != key and stale.stem.rsplit('_', 3)[0] == stem:
+                    stale.unlink(missing_ok=True)
+        except OSError as e:
+            logging.warning(f"Could not write thumbnail cache {self.cache_path(key)}: {e}")
+
+    def _on_image_ready(self, key, image):
+        callbacks = self._waiting.pop(key, [])
+        if image.isNull():
+            return
+        pixmap = QPixmap.fromImage(image)
+        QPixmapCache.insert(key, pixmap)
+        for callback in callbacks:
+            try:
+                callback(pixmap)
+            except RuntimeError:
+                pass  # Widget was deleted before the image was ready
+            except Exception as e:
+                logging.error(f"Error in thumbnail callback: {e}")
+
+
+def get_thumbnail_loader():
+    """Shared loader (create on the GUI thread, after the QApplication)"""
+    global _loader
+    if _loader is None:
+        _loader = ThumbnailLoader()
+    return _loader
+
+
+def load_thumbnail(image_path, height, radius=0, dpr=None):
+    """Synchronous thumbnail (for small icons that must be there immediately, e.g. the home button)"""
+    return get_thumbnail_loader().load(image_path, height, radius, dpr)
+
+
+def request_thumbnail(image_path, height, callback, radius=0, dpr=None):
+    """Thumbnail via callback(pixmap); decodes in the background on a cache miss"""
+    return get_thumbnail_loader().request(image_path, height, callback, radius, dpr)
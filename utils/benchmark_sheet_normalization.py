@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the vectorized patient sheet normalization (utils/sheet_normalization.py)
+
+Generates synthetic tumorboard sheets with several thousand rows and compares the throughput
+of normalize_patient_sheet with the former row-wise implementation (df.iterrows() with a
+per-row clean/parse/regex chain). The database rows of both are checked for equality.
+
+Usage:
+    python utils/benchmark_sheet_normalization.py [rows ...]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+# Add parent directory to Python path for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from utils.sheet_normalization import normalize_patient_sheet, to_python_values
+
+AUFGEBOT_VALUES = [
+    "Kat I: In 1-3 Tagen ohne Konsil", "Kat II: In 5-7 Tagen ohne Konsil",
+    "Kat III: Nach Eingang des Konsils", "Kat I", "-", None
+]
+
+
+def make_sheet(rows, seed=0):
+    """Synthetic sheet with the columns and value mix of a tumorboard Excel file"""
+    rng = random.Random(seed)
+    data = []
+    for i in range(rows):
+        birth = datetime(rng.randint(1930, 2005), rng.randint(1, 12), rng.randint(1, 28))
+        birth_str = birth.strftime(rng.choice(["%d.%m.%Y", "%d/%m/%Y", "%Y-%m-%d"]))
+        data.append({
+            'Name': None if rng.random() < 0.02 else f"Nachname{i} Vorname",
+            'Geburtsdatum': None if rng.random() < 0.05 else birth_str,
+            'Patientennummer': float(10000000 + i) if rng.random() < 0.5 else str(10000000 + i),
+            'Diagnose': rng.choice(["NSCLC", "Glioblastom", None]),
+            'ICD-Code': rng.choice(["C34.1", "D32.9", " c71.0 ", "", None]),
+            'Radiotherapie indiziert': rng.choice(["Ja", "Nein", None]),
+            'Art des Aufgebots': rng.choice(AUFGEBOT_VALUES),
+            'Vormerken für Studie': rng.choice(["Ja", "Nein", "nan"]),
+            'Bemerkung/Procedere': rng.choice(["Procedere gemäss Board", None]),
+            'Teams Priorisierung': None,
+        })
+    return pd.DataFrame(data)
+
+
+# --- Former row-wise implementation (baseline) ---
+
+def _clean_value(value):
+    if pd.isna(value) or value == '' or str(value).lower() == 'nan':
+        return None
+    cleaned = str(value).strip()
+    if cleaned.endswith('.0') and cleaned[:-2].isdigit():
+        cleaned = cleaned[:-2]
+    return cleaned if cleaned != '' else None
+
+
+def _clean_date(date_value):
+    if pd.isna(date_value) or date_value == '' or str(date_value).lower() == 'nan':
+        return None
+    date_str = str(date_value).strip()
+    for fmt in ["%d.%m.%Y", "%d/%m/%Y", "%Y-%m-%d"]:
+        try:
+            return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def _normalize_aufgebot_type(value):
+    if not value or str(value).strip() in ['-', '', 'nan']:
+        return None
+    value_str = str(value).strip()
+    if "Kat I:" in value_str or "1-3 Tagen" in value_str:
+        return "Kat I"
+    elif "Kat II:" in value_str or "5-7 Tagen" in value_str:
+        return "Kat II"
+    elif "Kat III:" in value_str or "Nach Eingang des Konsils" in value_str:
+        return "Kat III"
+    return value_str
+
+
+def rowwise_patient_rows(df, tumorboard_name, date_obj, session_id):
+    patient_rows = []
+    date_for_key = date_obj.strftime("%d-%m-%Y")
+    for _, row in df.iterrows():
+        if pd.isna(row.get('Name', '')) or str(row.get('Name', '')).strip() == '':
+            continue
+        patient_number = _clean_value(row.get('Patientennummer', ''))
+        if not patient_number:
+            continue
+        birth_date = _clean_date(row.get('Geburtsdatum', ''))
+        raw_icd_code = _clean_value(row.get('ICD-Code', '') or row.get('ICD-10', '') or row.get('ICD Code', ''))
+        calculated_age = None
+        if birth_date:
+            birth_date_obj = datetime.strptime(birth_date, "%Y-%m-%d")
+            age_years = date_obj.year - birth_date_obj.year - ((date_obj.month, date_obj.day) < (birth_date_obj.month, birth_date_obj.day))
+            if 0 <= age_years <= 150:
+                calculated_age = age_years
+        icd_family = None
+        if raw_icd_code:
+            match = re.match(r'^([A-Z]\d{1,2})', raw_icd_code.upper().replace('.', '').replace(' ', ''))
+            if match:
+                icd_family = match.group(1)
+        patient_rows.append((
+            f"{date_for_key}_{patient_number}_{tumorboard_name}", session_id, patient_number,
+            _clean_value(row.get('Name', '')), birth_date, calculated_age,
+            _clean_value(row.get('Diagnose', '')), raw_icd_code, icd_family,
+            _clean_value(row.get('Radiotherapie indiziert', '')),
+            _normalize_aufgebot_type(row.get('Art des Aufgebots', '')),
+            _clean_value(row.get('Vormerken für Studie', '')),
+            _clean_value(row.get('Bemerkung/Procedere', ''))
+        ))
+    return patient_rows
+
+
+def vectorized_patient_rows(df, tumorboard_name, date_obj, session_id):
+    """Same as TumorboardDatabase._build_patient_rows"""
+    patients = normalize_patient_sheet(df, reference_date=date_obj)
+    patients = patients[patients['patient_number'].notna()]
+    unique_keys = date_obj.strftime("%d-%m-%Y") + "_" + patients['patient_number'] + "_" + tumorboard_name
+    columns = [
+        unique_keys, pd.Series(session_id, index=patients.index), patients['patient_number'],
+        patients['name'], patients['birth_date'].dt.strftime("%Y-%m-%d"), patients['age'],
+        patients['diagnosis'], patients['icd_code'], patients['icd_family'],
+        patients['radiotherapy'], patients['aufgebot_type'], patients['studie'], patients['bemerkung']
+    ]
+    return list(zip(*(to_python_values(column) for column in columns)))
+
+
+def run(rows):
+    df = make_sheet(rows)
+    session_date = datetime(2024, 6, 15)
+
+    start = time.perf_counter()
+    expected = rowwise_patient_rows(df, "Benchmark", session_date, 1)
+    rowwise_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = vectorized_patient_rows(df, "Benchmark", session_date, 1)
+    vectorized_time = time.perf_counter() - start
+
+    status = "identisch" if actual == expected else "ABWEICHUNG"
+    print(f"{rows:>7} Zeilen | zeilenweise {rowwise_time:7.3f} s ({rows / rowwise_time:>9,.0f} Zeilen/s)"
+          f" | vektorisiert {vectorized_time:7.3f} s ({rows / vectorized_time:>9,.0f} Zeilen/s)"
+          f" | Faktor {rowwise_time / vectorized_time:5.1f}x | Ergebnis {status}")
+    return actual == expected
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [2000, 5000, 20000]
+    results = [run(rows) for rows in sizes]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
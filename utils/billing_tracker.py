@@ -1,13 +1,29 @@
 import json
 import os
 import logging
+import sqlite3
+import threading
 from datetime import datetime
 from pathlib import Path
-import shutil
 
 class BillingTracker:
-    """Handles billing status tracking for completed tumorboards"""
-    
+    """
+    Handles billing status tracking for completed tumorboards
+
+    Billing entries are stored in a SQLite database (abrechnung_status.db) keyed by
+    (tumorboard, datum). Reads are served from an in-memory cache that is shared by all
+    instances and revalidated against the database file's modification stamp, so other
+    workstations' writes are picked up. The former abrechnung_status.json (and its
+    backups) is migrated into the database once.
+    """
+
+    # Shared cache: db path -> (file stamp, {(tumorboard, datum): entry})
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    # Seconds to wait for a lock held by another workstation
+    DB_TIMEOUT = 30
+
     def __init__(self):
         # Use centralized path management for backoffice path
         from utils.path_management import BackofficePathManager
@@ -18,23 +34,116 @@ class BillingTracker:
             logging.warning("BillingTracker: No backoffice path available, using fallback")
             self.backoffice_path = Path.home() / "tumorboards" / "_Backoffice"
             self.using_network = False
-            
+
         self.log_path = self.backoffice_path / "log_abrechnungen"
         self.backup_path = self.backoffice_path / "backup" / "json_abrechnungen"
+        self.db_backup_path = self.backoffice_path / "backup" / "db_abrechnungen"
         self.status_file = self.log_path / "abrechnung_status.json"
-        
+        self.db_file = self.log_path / "abrechnung_status.db"
+
         # Ensure directories exist
         self._ensure_directories()
-        
+        self._init_database()
+        self._migrate_json()
+
     def _ensure_directories(self):
         """Create necessary directories if they don't exist"""
         try:
             self.log_path.mkdir(parents=True, exist_ok=True)
             self.backup_path.mkdir(parents=True, exist_ok=True)
+            self.db_backup_path.mkdir(parents=True, exist_ok=True)
             logging.info(f"Billing tracker directories ensured: {self.log_path}")
         except Exception as e:
             logging.error(f"Error creating billing tracker directories: {e}")
-            
+
+    def _connect(self):
+        """Open a connection that waits for locks held by other workstations"""
+        return sqlite3.connect(self.db_file, timeout=self.DB_TIMEOUT)
+
+    def _init_database(self):
+        """Create billing tables if they don't exist"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS abgerechnete_tumorboards (
+                        tumorboard TEXT NOT NULL,
+                        datum TEXT NOT NULL,
+                        abgerechnet_am TEXT,
+                        benutzer TEXT,
+                        art_der_abrechnung TEXT,
+                        PRIMARY KEY (tumorboard, datum)
+                    )
+                ''')
+                # Tracks which JSON files were migrated (and their mtime at that point)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS json_migration (
+                        file_name TEXT PRIMARY KEY,
+                        file_mtime REAL,
+                        migrated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                conn.commit()
+        except Exception as e:
+            logging.error(f"Error initializing billing database: {e}")
+
+    def _migrate_json(self):
+        """
+        Import the legacy JSON status file and its backups into the database
+
+        Runs once per file; the current JSON file is imported again if it was modified
+        afterwards (e.g. by an older app version on another workstation). Existing
+        database entries always take precedence.
+        """
+        json_files = []
+        if self.status_file.exists():
+            json_files.append(self.status_file)
+        # Newest backups first so the most recent state of an entry wins
+        json_files.extend(sorted(self.backup_path.glob("abrechnung_status_*.json"), reverse=True))
+
+        if not json_files:
+            return
+
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT file_name, file_mtime FROM json_migration')
+                migrated = dict(cursor.fetchall())
+
+                pending = [f for f in json_files if migrated.get(f.name) != f.stat().st_mtime]
+                if not pending:
+                    return
+
+                cursor.execute('BEGIN IMMEDIATE')
+                imported = 0
+                for json_file in pending:
+                    try:
+                        with open(json_file, 'r', encoding='utf-8') as f:
+                            entries = json.load(f).get("abgerechnete_tumorboards", [])
+                    except Exception as e:
+                        logging.warning(f"Skipping unreadable billing JSON {json_file}: {e}")
+                        continue
+
+                    rows = [
+                        (entry["tumorboard"], entry["datum"], entry.get("abgerechnet_am"),
+                         entry.get("benutzer"), entry.get("art_der_abrechnung"))
+                        for entry in entries if entry.get("tumorboard") and entry.get("datum")
+                    ]
+                    cursor.executemany('''
+                        INSERT OR IGNORE INTO abgerechnete_tumorboards
+                        (tumorboard, datum, abgerechnet_am, benutzer, art_der_abrechnung)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', rows)
+                    imported += cursor.rowcount if cursor.rowcount > 0 else 0
+                    cursor.execute(
+                        'INSERT OR REPLACE INTO json_migration (file_name, file_mtime) VALUES (?, ?)',
+                        (json_file.name, json_file.stat().st_mtime)
+                    )
+                conn.commit()
+                logging.info(f"Migrated {imported} billing entries from {len(pending)} JSON files")
+        except Exception as e:
+            logging.error(f"Error migrating billing JSON to database: {e}")
+
     def _get_current_windows_user(self):
         """Get current Windows username"""
         try:
@@ -42,151 +151,175 @@ class BillingTracker:
         except Exception as e:
             logging.warning(f"Could not get Windows username: {e}")
             return "unknown"
-            
+
     def _get_timestamp(self):
         """Get current timestamp in German format"""
         return datetime.now().strftime("%d.%m.%Y %H:%M:%S")
-        
+
     def _create_backup(self):
-        """Create backup of current JSON file before modification"""
-        if not self.status_file.exists():
+        """Create backup of the billing database before modification (at most one per minute)"""
+        if not self.db_file.exists():
             return  # No file to backup
-            
+
         try:
             timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
-            backup_filename = f"abrechnung_status_{timestamp}.json"
-            backup_file = self.backup_path / backup_filename
-            
-            shutil.copy2(self.status_file, backup_file)
+            backup_file = self.db_backup_path / f"abrechnung_status_{timestamp}.db"
+            if backup_file.exists():
+                return
+
+            # SQLite online backup is consistent even while other workstations write
+            with self._connect() as source:
+                backup_conn = sqlite3.connect(backup_file)
+                try:
+                    source.backup(backup_conn)
+                finally:
+                    backup_conn.close()
             logging.info(f"Created backup: {backup_file}")
-            
+
         except Exception as e:
             logging.error(f"Error creating backup: {e}")
-            
+
+    def _get_file_stamp(self):
+        """
+        Modification stamp used to validate the cache
+
+        Besides mtime and size, the SQLite header's file change counter (bytes 24-27) is
+        included, since network shares may report mtimes with coarse granularity.
+        """
+        try:
+            stat = self.db_file.stat()
+            with open(self.db_file, 'rb') as f:
+                f.seek(24)
+                change_counter = f.read(4)
+            return (stat.st_mtime_ns, stat.st_size, change_counter)
+        except OSError:
+            return None
+
     def _load_status_data(self):
-        """Load billing status data from JSON file"""
-        if not self.status_file.exists():
-            return {"abgerechnete_tumorboards": []}
-            
+        """Return {(tumorboard, datum): entry}, reloaded only if the database file changed"""
+        stamp = self._get_file_stamp()
+        cache_key = str(self.db_file)
+
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None and stamp is not None and cached[0] == stamp:
+                return cached[1]
+
         try:
-            with open(self.status_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT tumorboard, datum, abgerechnet_am, benutzer, art_der_abrechnung
+                    FROM abgerechnete_tumorboards
+                ''')
+                entries = {
+                    (tumorboard, datum): {
+                        "tumorboard": tumorboard,
+                        "datum": datum,
+                        "abgerechnet_am": abgerechnet_am,
+                        "benutzer": benutzer,
+                        "art_der_abrechnung": art_der_abrechnung
+                    }
+                    for tumorboard, datum, abgerechnet_am, benutzer, art_der_abrechnung in cursor.fetchall()
+                }
         except Exception as e:
             logging.error(f"Error loading billing status: {e}")
-            return {"abgerechnete_tumorboards": []}
-            
-    def _save_status_data(self, data):
-        """Save billing status data to JSON file"""
-        try:
-            self._create_backup()  # Backup before saving
-            
-            with open(self.status_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            logging.info("Billing status data saved successfully")
-            
-        except Exception as e:
-            logging.error(f"Error saving billing status: {e}")
-            raise
-            
+            return {}
+
+        with self._cache_lock:
+            self._cache[cache_key] = (stamp, entries)
+        return entries
+
     def mark_as_billed(self, tumorboard, datum, art_der_abrechnung):
         """
         Mark a tumorboard as billed
-        
+
         Args:
             tumorboard (str): Name of tumorboard entity
             datum (str): Date in format dd.mm.yyyy
             art_der_abrechnung (str): "script" or "user"
         """
         try:
-            data = self._load_status_data()
-            
-            # Check if already exists
-            for entry in data["abgerechnete_tumorboards"]:
-                if entry["tumorboard"] == tumorboard and entry["datum"] == datum:
-                    # Update existing entry
-                    entry["abgerechnet_am"] = self._get_timestamp()
-                    entry["benutzer"] = self._get_current_windows_user()
-                    entry["art_der_abrechnung"] = art_der_abrechnung
-                    self._save_status_data(data)
-                    logging.info(f"Updated billing status: {tumorboard} {datum} ({art_der_abrechnung})")
-                    return
-            
-            # Add new entry
-            new_entry = {
-                "tumorboard": tumorboard,
-                "datum": datum,
-                "abgerechnet_am": self._get_timestamp(),
-                "benutzer": self._get_current_windows_user(),
-                "art_der_abrechnung": art_der_abrechnung
-            }
-            
-            data["abgerechnete_tumorboards"].append(new_entry)
-            self._save_status_data(data)
+            self._create_backup()  # Backup before saving
+
+            with self._connect() as conn:
+                # Upsert in a single transaction (atomic, locked against concurrent writers)
+                conn.execute('''
+                    INSERT OR REPLACE INTO abgerechnete_tumorboards
+                    (tumorboard, datum, abgerechnet_am, benutzer, art_der_abrechnung)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (tumorboard, datum, self._get_timestamp(), self._get_current_windows_user(), art_der_abrechnung))
+                conn.commit()
+
+            # Invalidate cache so the next read sees the new entry
+            with self._cache_lock:
+                self._cache.pop(str(self.db_file), None)
+
             logging.info(f"Marked as billed: {tumorboard} {datum} ({art_der_abrechnung})")
-            
+
         except Exception as e:
             logging.error(f"Error marking as billed: {e}")
             raise
-            
+
     def is_billed(self, tumorboard, datum):
         """
         Check if a tumorboard is already billed
-        
+
         Args:
             tumorboard (str): Name of tumorboard entity
             datum (str): Date in format dd.mm.yyyy
-            
+
         Returns:
             bool: True if billed, False otherwise
         """
-        try:
-            data = self._load_status_data()
-            
-            for entry in data["abgerechnete_tumorboards"]:
-                if entry["tumorboard"] == tumorboard and entry["datum"] == datum:
-                    return True
-                    
-            return False
-            
-        except Exception as e:
-            logging.error(f"Error checking billing status: {e}")
-            return False
-            
+        return self.get_billing_status(tumorboard, datum) is not None
+
     def get_billing_status(self, tumorboard, datum):
         """
         Get complete billing information for a tumorboard
-        
+
         Args:
             tumorboard (str): Name of tumorboard entity
             datum (str): Date in format dd.mm.yyyy
-            
+
         Returns:
             dict or None: Billing information or None if not billed
         """
         try:
-            data = self._load_status_data()
-            
-            for entry in data["abgerechnete_tumorboards"]:
-                if entry["tumorboard"] == tumorboard and entry["datum"] == datum:
-                    return entry
-                    
-            return None
-            
+            return self._load_status_data().get((tumorboard, datum))
+
         except Exception as e:
             logging.error(f"Error getting billing status: {e}")
             return None
-            
+
+    def get_billing_statuses(self, sessions):
+        """
+        Get billing information for many tumorboards with a single (cached) lookup
+
+        Args:
+            sessions (iterable): (tumorboard, datum) tuples
+
+        Returns:
+            dict: {(tumorboard, datum): entry or None}
+        """
+        try:
+            entries = self._load_status_data()
+            return {key: entries.get(key) for key in map(tuple, sessions)}
+
+        except Exception as e:
+            logging.error(f"Error getting billing statuses: {e}")
+            return {tuple(key): None for key in sessions}
+
     def get_all_billed_tumorboards(self):
         """
         Get all billed tumorboards
-        
+
         Returns:
             list: List of all billing entries
         """
         try:
-            data = self._load_status_data()
-            return data.get("abgerechnete_tumorboards", [])
-            
+            return list(self._load_status_data().values())
+
         except Exception as e:
             logging.error(f"Error getting all billed tumorboards: {e}")
-            return [] 
\ No newline at end of file
+            return []
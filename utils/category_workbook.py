@@ -0,0 +1,324 @@
+"""
+Batched status writes for the category workbooks (Kat_I.xlsx, Kat_II.xlsx, Kat_III.xlsx).
+
+The Kat pages used to load and save the whole workbook on the share for every Ja/Nein
+change. CategoryStatusWriter queues the status/timestamp cell updates of one workbook
+and applies all of them in a single load/save cycle on a dedicated I/O thread (the page
+flushes when idle, when it is left, or on demand).
+
+Conflicting writers (another workstation, or the session export appending new patients)
+are detected through the file's modification stamp: if the file changed since the page
+loaded it, every queued change is verified against the row it targets (same patient,
+status still the one the user saw). Rows that moved are located by patient; changes
+whose status was changed by someone else are dropped and reported as conflicts.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+# Excel columns (1-based)
+NAME_COLUMN = 3
+PATIENT_NUMBER_COLUMN = 5
+TIMESTAMP_COLUMN = 13
+STATUS_COLUMN = 14
+HEADER_ROW = 1
+
+# Save states reported to the status callback
+STATUS_PENDING = 'pending'
+STATUS_SAVING = 'saving'
+STATUS_SAVED = 'saved'
+STATUS_ERROR = 'error'
+STATUS_CONFLICT = 'conflict'
+
+# Marker for "leave the timestamp cell unchanged"
+KEEP = object()
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def file_stamp(path):
+    """
+    Returns:
+        tuple | None: (mtime_ns, size) of the file, None if it does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def normalize_cell(value):
+    """Compare cells read by openpyxl with values read by pandas (1234.0 == 1234, None == nan)"""
+    if value is None:
+        return ''
+    text = str(value).strip()
+    if text.lower() == 'nan':
+        return ''
+    if text.endswith('.0') and text[:-2].isdigit():
+        text = text[:-2]
+    return text
+
+
+def get_category_writer(excel_path):
+    """Shared writer per category workbook (pages and status counters use the same queue)"""
+    key = str(Path(excel_path))
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = CategoryStatusWriter(excel_path)
+            _writers[key] = writer
+        return writer
+
+
+def flush_category_writes(excel_path):
+    """Write pending changes of a workbook before it is read elsewhere (no-op without a writer)"""
+    with _writers_lock:
+        writer = _writers.get(str(Path(excel_path)))
+    if writer is not None:
+        try:
+            writer.flush()
+        except Exception as e:
+            logging.error(f"Error flushing pending changes of {excel_path}: {e}")
+
+
+def flush_all_category_writes():
+    """Write pending changes of all category workbooks (e.g. when the app quits)"""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        try:
+            writer.flush()
+        except Exception as e:
+            logging.error(f"Error flushing pending changes of {writer.excel_path}: {e}")
+
+
+class CategoryStatusWriter:
+    """Queue of status/timestamp changes for one category workbook, written in one load/save cycle"""
+
+    def __init__(self, excel_path, retries=3, retry_delay=1.0):
+        self.excel_path = Path(excel_path)
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.status_callbacks = []
+        self._lock = threading.RLock()
+        # Single dedicated I/O thread: flushes run one after another
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="CategoryWorkbookIO")
+        self._pending = {}       # Excel row -> change
+        self._pending_flush = None
+        self._sequence = 0
+        # Stamp of the file as last read by the page or written by us (None = unknown)
+        self.known_stamp = None
+        self.last_error = None
+        self.last_conflicts = []
+
+    @property
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def add_status_callback(self, callback):
+        """callback(status, message); called from the I/O thread"""
+        if callback not in self.status_callbacks:
+            self.status_callbacks.append(callback)
+
+    def remove_status_callback(self, callback):
+        if callback in self.status_callbacks:
+            self.status_callbacks.remove(callback)
+
+    def _notify(self, status, message=""):
+        for callback in list(self.status_callbacks):
+            try:
+                callback(status, message)
+            except Exception as e:
+                logging.error(f"Error in category workbook status callback: {e}")
+
+    def set_known_stamp(self, stamp):
+        """Stamp of the file content the page shows (taken right before it was read)"""
+        with self._lock:
+            self.known_stamp = stamp
+
+    def queue_status(self, excel_row, status, expected_status, patientennummer, name, timestamp=KEEP):
+        """
+        Queue a status change (and optionally the timestamp) for one row.
+
+        Args:
+            excel_row (int): Sheet row of the patient
+            status (str): New value for column N ("Ja"/"Nein")
+            expected_status (str): Status the user saw before the change (lowercase), used to detect conflicts
+            patientennummer, name: Identity of the patient, used to verify/locate the row
+            timestamp: New value for column M, KEEP to leave it unchanged
+        """
+        with self._lock:
+            self._sequence += 1
+            change = self._pending.get(excel_row)
+            if change is None:
+                change = {
+                    'row': excel_row,
+                    'expected_status': normalize_cell(expected_status).lower(),
+                    'patientennummer': normalize_cell(patientennummer),
+                    'name': normalize_cell(name),
+                    'timestamp': KEEP,
+                }
+                self._pending[excel_row] = change
+            change['status'] = status
+            change['seq'] = self._sequence
+            if timestamp is not KEEP:
+                change['timestamp'] = timestamp
+            # Changed back before it was written (e.g. Nein -> Ja -> Nein): nothing to write
+            if status.lower() == change['expected_status'] and timestamp is not KEEP and not timestamp:
+                del self._pending[excel_row]
+            count = len(self._pending)
+        self._notify(STATUS_PENDING if count else STATUS_SAVED, str(count))
+
+    def _find_row(self, ws, change):
+        """Row of the patient in the current sheet, None if missing or ambiguous"""
+        def matches(row):
+            return (normalize_cell(ws.cell(row=row, column=PATIENT_NUMBER_COLUMN).value) == change['patientennummer']
+                    and normalize_cell(ws.cell(row=row, column=NAME_COLUMN).value) == change['name'])
+
+        if change['row'] <= ws.max_row and matches(change['row']):
+            return change['row']
+        found = [row for row in range(HEADER_ROW + 1, ws.max_row + 1) if matches(row)]
+        return found[0] if len(found) == 1 else None
+
+    def _save(self, wb):
+        """Save via a sibling temp file and atomic replace (readers never see a partial file)"""
+        tmp_path = self.excel_path.with_name(f".{self.excel_path.name}.tmp")
+        try:
+            wb.save(tmp_path)
+            os.replace(tmp_path, self.excel_path)
+        except Exception:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+
+    def _write_once(self, changes):
+        """
+        One load/apply/save cycle.
+
+        Returns:
+            tuple: (applied changes, changes already in the file, conflicting changes,
+                    file was changed by another writer)
+        """
+        stamp_before = file_stamp(self.excel_path)
+        if stamp_before is None:
+            raise FileNotFoundError(f"Excel-Datei nicht gefunden: {self.excel_path}")
+        with self._lock:
+            external_change = self.known_stamp is not None and stamp_before != self.known_stamp
+
+        wb = load_workbook(self.excel_path)
+        try:
+            ws = wb.active
+            applied, handled, conflicts = [], [], []
+            for change in changes:
+                row = change['row']
+                if external_change:
+                    row = self._find_row(ws, change)
+                    current_status = normalize_cell(ws.cell(row=row, column=STATUS_COLUMN).value).lower() if row else None
+                    if current_status == change['status'].lower():
+                        # Someone else made the same change already (keep their timestamp)
+                        handled.append(change)
+                        continue
+                    # Someone else changed this patient's status in the meantime: theirs wins
+                    if row is None or current_status != change['expected_status']:
+                        conflicts.append(change)
+                        continue
+                ws.cell(row=row, column=STATUS_COLUMN, value=change['status'])
+                if change['timestamp'] is not KEEP:
+                    ws.cell(row=row, column=TIMESTAMP_COLUMN, value=change['timestamp'])
+                applied.append(change)
+
+            if applied:
+                # Last check right before replacing the file
+                if file_stamp(self.excel_path) != stamp_before:
+                    raise PermissionError("Datei wurde während des Speicherns von einem anderen Benutzer geändert")
+                self._save(wb)
+        finally:
+            wb.close()
+        return applied, handled, conflicts, external_change
+
+    def _write_to_disk(self):
+        """Write all queued changes (runs on the I/O thread, retries on lock errors)"""
+        with self._lock:
+            changes = [dict(change) for change in self._pending.values()]
+        if not changes:
+            return True
+
+        self._notify(STATUS_SAVING, str(len(changes)))
+        start = time.perf_counter()
+        try:
+            for attempt in range(self.retries):
+                try:
+                    applied, handled, conflicts, external_change = self._write_once(changes)
+                    break
+                except PermissionError as e:
+                    if attempt == self.retries - 1:
+                        raise
+                    logging.warning(f"Write attempt {attempt + 1} for {self.excel_path} failed ({e}), retrying...")
+                    time.sleep(self.retry_delay)
+        except Exception as e:
+            self.last_error = e
+            logging.error(f"Error writing category workbook {self.excel_path}: {e}")
+            self._notify(STATUS_ERROR, str(e))
+            raise
+
+        with self._lock:
+            # Drop what was handled, unless the row was changed again meanwhile
+            for change in applied + handled + conflicts:
+                pending = self._pending.get(change['row'])
+                if pending is not None and pending['seq'] == change['seq']:
+                    del self._pending[change['row']]
+            self.known_stamp = file_stamp(self.excel_path)
+            remaining = len(self._pending)
+        self.last_error = None
+        self.last_conflicts = conflicts
+        logging.info(f"Category workbook written: {self.excel_path} ({len(applied)} changes, "
+                     f"{len(conflicts)} conflicts, {time.perf_counter() - start:.2f}s)")
+
+        if conflicts:
+            names = ", ".join(change['name'] for change in conflicts)
+            self._notify(STATUS_CONFLICT, names)
+        elif external_change:
+            # Our changes are in, but the file also contains changes of another writer
+            self._notify(STATUS_CONFLICT, "")
+        elif remaining:
+            self._notify(STATUS_PENDING, str(remaining))
+        else:
+            self._notify(STATUS_SAVED, str(len(applied)))
+        return True
+
+    def flush_async(self):
+        """
+        Schedule a background write; changes queued before it starts are included.
+
+        Returns:
+            concurrent.futures.Future or None if nothing is pending
+        """
+        with self._lock:
+            if not self._pending:
+                return None
+            if self._pending_flush is not None and not self._pending_flush.running() and not self._pending_flush.done():
+                return self._pending_flush
+            self._pending_flush = self._executor.submit(self._write_to_disk)
+            return self._pending_flush
+
+    def flush(self):
+        """Write all pending changes and wait for completion; raises on write errors"""
+        pending = self._pending_flush
+        if pending is not None:
+            try:
+                pending.result()
+            except Exception:
+                pass  # Retried below
+        if self.pending_count:
+            self._executor.submit(self._write_to_disk).result()
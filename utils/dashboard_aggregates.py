@@ -0,0 +1,332 @@
+"""
+Incrementally maintained aggregate tables for the dashboard and analysis exports.
+
+The dashboard used to run COUNT(DISTINCT ...) joins over patients/sessions/entities on
+every refresh. Instead, TumorboardDatabase keeps these summary tables up to date whenever
+a session is written (collection import or direct session upsert):
+
+    agg_entity_month   sessions, cases and unique patients per entity x month
+    agg_icd            cases and unique patients per entity x ICD family / ICD code
+    agg_patient_status cases per entity x radiotherapy / Aufgebot / study value
+
+entity_id ALL_ENTITIES (0) and month ALL_MONTHS ('*') hold the totals, so every dashboard
+figure is a lookup in a table whose size depends on entities x months, not on patients.
+
+Distinct patient counts are not additive; agg_patient_refs keeps a reference count per
+(scope, patient) and unique_patients changes only when a count goes 0 -> 1 or 1 -> 0.
+agg_session_refs records which sessions are already counted.
+
+A session is applied by removing its previous contribution (sign -1) before its patient
+rows are rewritten and adding the new one (sign +1) afterwards, in the same transaction.
+"""
+
+import logging
+from collections import defaultdict
+
+# Bump when the aggregate definitions change; init_database then rebuilds them
+AGGREGATE_VERSION = 1
+
+ALL_ENTITIES = 0
+ALL_MONTHS = '*'
+
+# Values treated as "empty" in the patients table
+EMPTY_VALUES = ('', '-')
+
+
+def create_aggregate_tables(cursor):
+    """Create the aggregate tables (called from TumorboardDatabase.init_database)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS agg_entity_month (
+            entity_id INTEGER NOT NULL,
+            month TEXT NOT NULL,
+            sessions INTEGER NOT NULL DEFAULT 0,
+            cases INTEGER NOT NULL DEFAULT 0,
+            unique_patients INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (entity_id, month)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS agg_icd (
+            entity_id INTEGER NOT NULL,
+            level TEXT NOT NULL,
+            icd TEXT NOT NULL,
+            cases INTEGER NOT NULL DEFAULT 0,
+            unique_patients INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (entity_id, level, icd)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS agg_patient_status (
+            entity_id INTEGER NOT NULL,
+            field TEXT NOT NULL,
+            value TEXT NOT NULL,
+            cases INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (entity_id, field, value)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS agg_patient_refs (
+            scope TEXT NOT NULL,
+            patient_number TEXT NOT NULL,
+            cases INTEGER NOT NULL,
+            PRIMARY KEY (scope, patient_number)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS agg_session_refs (
+            session_id INTEGER PRIMARY KEY,
+            entity_id INTEGER NOT NULL,
+            month TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS agg_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    ''')
+
+
+def ensure_aggregates(cursor):
+    """Rebuild the aggregates once if they were never built or their definition changed"""
+    cursor.execute("SELECT value FROM agg_meta WHERE key = 'version'")
+    row = cursor.fetchone()
+    if row is None or row[0] != str(AGGREGATE_VERSION):
+        rebuild_aggregates(cursor)
+
+
+def rebuild_aggregates(cursor):
+    """Recompute all aggregate tables from patients/sessions (full scan, used for migration)"""
+    for table in ('agg_entity_month', 'agg_icd', 'agg_patient_status', 'agg_patient_refs', 'agg_session_refs'):
+        cursor.execute(f'DELETE FROM {table}')
+    cursor.execute('SELECT id FROM tumorboard_sessions')
+    session_ids = [row[0] for row in cursor.fetchall()]
+    apply_sessions(cursor, session_ids, +1)
+    cursor.execute("INSERT OR REPLACE INTO agg_meta (key, value) VALUES ('version', ?)", (str(AGGREGATE_VERSION),))
+    logging.info(f"Rebuilt dashboard aggregates for {len(session_ids)} sessions")
+
+
+def _is_empty(value):
+    return value is None or str(value).strip() in EMPTY_VALUES
+
+
+def apply_sessions(cursor, session_ids, sign):
+    """
+    Add (sign=+1) or remove (sign=-1) the current contribution of sessions to the aggregates.
+
+    Call with -1 before the patient rows of a session are rewritten and with +1 afterwards.
+    """
+    session_ids = list(session_ids)
+    if not session_ids:
+        return
+
+    entity_month = defaultdict(lambda: [0, 0, 0])   # (entity, month) -> [sessions, cases, unique]
+    icd = defaultdict(lambda: [0, 0])               # (entity, level, icd) -> [cases, unique]
+    status = defaultdict(int)                       # (entity, field, value) -> cases
+    refs = defaultdict(int)                         # (scope, patient) -> cases delta
+    scope_targets = {}                              # scope -> (table, key) whose unique count it drives
+
+    for start in range(0, len(session_ids), 500):
+        chunk = session_ids[start:start + 500]
+        placeholders = ','.join('?' * len(chunk))
+
+        # Sessions (also those without patients)
+        cursor.execute(f'''
+            SELECT s.id, s.entity_id, strftime('%Y-%m', s.session_date), r.session_id
+            FROM tumorboard_sessions s
+            LEFT JOIN agg_session_refs r ON r.session_id = s.id
+            WHERE s.id IN ({placeholders})
+        ''', chunk)
+        for session_id, entity_id, month, counted_id in cursor.fetchall():
+            month = month or ''
+            if sign > 0 and counted_id is None:
+                cursor.execute('INSERT INTO agg_session_refs (session_id, entity_id, month) VALUES (?, ?, ?)',
+                               (session_id, entity_id, month))
+            elif sign < 0 and counted_id is not None:
+                cursor.execute('DELETE FROM agg_session_refs WHERE session_id = ?', (session_id,))
+            else:
+                continue
+            for key in _entity_month_keys(entity_id, month):
+                entity_month[key][0] += sign
+
+        # Patients
+        cursor.execute(f'''
+            SELECT s.entity_id, strftime('%Y-%m', s.session_date), p.patient_number, p.icd_code,
+                   p.icd_family, p.radiotherapy_indicated, p.aufgebot_type, p.study_enrollment
+            FROM patients p
+            JOIN tumorboard_sessions s ON p.session_id = s.id
+            WHERE p.session_id IN ({placeholders})
+        ''', chunk)
+        for entity_id, month, patient_number, icd_code, icd_family, radiotherapy, aufgebot, study in cursor.fetchall():
+            month = month or ''
+            for entity_key in (entity_id, ALL_ENTITIES):
+                for key in ((entity_key, month), (entity_key, ALL_MONTHS)):
+                    entity_month[key][1] += sign
+                    _count_ref(refs, scope_targets, 'em', key, patient_number, sign)
+
+                for level, value in (('family', icd_family), ('code', icd_code)):
+                    if not _is_empty(value):
+                        key = (entity_key, level, str(value).strip())
+                        icd[key][0] += sign
+                        _count_ref(refs, scope_targets, 'icd', key, patient_number, sign)
+
+                # Radiotherapy: '' stands for not discussed (NULL, '' or '-')
+                radiotherapy_value = '' if _is_empty(radiotherapy) else str(radiotherapy)
+                status[(entity_key, 'radiotherapy', radiotherapy_value)] += sign
+                if radiotherapy == 'Ja':
+                    aufgebot_value = '' if _is_empty(aufgebot) else str(aufgebot)
+                    status[(entity_key, 'aufgebot', aufgebot_value)] += sign
+                if study is not None:
+                    status[(entity_key, 'study', str(study))] += sign
+
+    # Reference counts decide which unique patient counters change
+    for (scope, patient_number), delta in refs.items():
+        if not delta:
+            continue
+        cursor.execute('SELECT cases FROM agg_patient_refs WHERE scope = ? AND patient_number = ?',
+                       (scope, patient_number))
+        row = cursor.fetchone()
+        old_cases = row[0] if row else 0
+        new_cases = old_cases + delta
+        if new_cases > 0:
+            cursor.execute('INSERT OR REPLACE INTO agg_patient_refs (scope, patient_number, cases) VALUES (?, ?, ?)',
+                           (scope, patient_number, new_cases))
+        elif row:
+            cursor.execute('DELETE FROM agg_patient_refs WHERE scope = ? AND patient_number = ?',
+                           (scope, patient_number))
+        unique_delta = (new_cases > 0) - (old_cases > 0)
+        if unique_delta:
+            table, key = scope_targets[scope]
+            if table == 'em':
+                entity_month[key][2] += unique_delta
+            else:
+                icd[key][1] += unique_delta
+
+    cursor.executemany('''
+        INSERT INTO agg_entity_month (entity_id, month, sessions, cases, unique_patients) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(entity_id, month) DO UPDATE SET
+            sessions = sessions + excluded.sessions,
+            cases = cases + excluded.cases,
+            unique_patients = unique_patients + excluded.unique_patients
+    ''', [(*key, *values) for key, values in entity_month.items() if any(values)])
+    cursor.executemany('''
+        INSERT INTO agg_icd (entity_id, level, icd, cases, unique_patients) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(entity_id, level, icd) DO UPDATE SET
+            cases = cases + excluded.cases,
+            unique_patients = unique_patients + excluded.unique_patients
+    ''', [(*key, *values) for key, values in icd.items() if any(values)])
+    cursor.executemany('''
+        INSERT INTO agg_patient_status (entity_id, field, value, cases) VALUES (?, ?, ?, ?)
+        ON CONFLICT(entity_id, field, value) DO UPDATE SET cases = cases + excluded.cases
+    ''', [(*key, delta) for key, delta in status.items() if delta])
+
+    # Drop groups that became empty
+    cursor.execute('DELETE FROM agg_entity_month WHERE sessions <= 0 AND cases <= 0')
+    cursor.execute('DELETE FROM agg_icd WHERE cases <= 0')
+    cursor.execute('DELETE FROM agg_patient_status WHERE cases <= 0')
+
+
+def _entity_month_keys(entity_id, month):
+    return ((entity_id, month), (entity_id, ALL_MONTHS), (ALL_ENTITIES, month), (ALL_ENTITIES, ALL_MONTHS))
+
+
+def _count_ref(refs, scope_targets, table, key, patient_number, sign):
+    if patient_number is None:
+        return
+    scope = table + '|' + '|'.join(str(part) for part in key)
+    scope_targets[scope] = (table, key)
+    refs[(scope, str(patient_number))] += sign
+
+
+# --- Readers ---
+
+def get_totals(cursor, entity_id=ALL_ENTITIES):
+    """Returns (sessions, cases, unique_patients) over all months"""
+    cursor.execute('SELECT sessions, cases, unique_patients FROM agg_entity_month WHERE entity_id = ? AND month = ?',
+                   (entity_id, ALL_MONTHS))
+    return cursor.fetchone() or (0, 0, 0)
+
+
+def get_entity_totals(cursor):
+    """Returns [(entity name, sessions, unique_patients, cases)] for all entities, most cases first"""
+    cursor.execute('''
+        SELECT e.name, COALESCE(a.sessions, 0), COALESCE(a.unique_patients, 0), COALESCE(a.cases, 0)
+        FROM tumorboard_entities e
+        LEFT JOIN agg_entity_month a ON a.entity_id = e.id AND a.month = ?
+        ORDER BY COALESCE(a.cases, 0) DESC
+    ''', (ALL_MONTHS,))
+    return cursor.fetchall()
+
+
+def get_monthly(cursor, since_month, by_entity=False):
+    """
+    Returns monthly rows from since_month ('YYYY-MM') on.
+
+    by_entity=False: [(month, sessions, unique_patients, cases)]
+    by_entity=True:  [(month, entity name, sessions, unique_patients, cases)]
+    """
+    if by_entity:
+        cursor.execute('''
+            SELECT a.month, e.name, a.sessions, a.unique_patients, a.cases
+            FROM agg_entity_month a
+            JOIN tumorboard_entities e ON e.id = a.entity_id
+            WHERE a.month != ? AND a.month >= ?
+            ORDER BY a.month, e.name
+        ''', (ALL_MONTHS, since_month))
+    else:
+        cursor.execute('''
+            SELECT month, sessions, unique_patients, cases
+            FROM agg_entity_month
+            WHERE entity_id = ? AND month != ? AND month >= ?
+            ORDER BY month
+        ''', (ALL_ENTITIES, ALL_MONTHS, since_month))
+    return cursor.fetchall()
+
+
+def get_status_counts(cursor, field, entity_id=ALL_ENTITIES):
+    """Returns [(value, cases)] for 'radiotherapy', 'aufgebot' or 'study', most cases first"""
+    cursor.execute('''
+        SELECT value, cases FROM agg_patient_status
+        WHERE entity_id = ? AND field = ?
+        ORDER BY cases DESC
+    ''', (entity_id, field))
+    return cursor.fetchall()
+
+
+def get_status_counts_by_entity(cursor, field):
+    """Returns [(entity name, value, cases)] ordered by entity name and cases"""
+    cursor.execute('''
+        SELECT e.name, a.value, a.cases
+        FROM agg_patient_status a
+        JOIN tumorboard_entities e ON e.id = a.entity_id
+        WHERE a.field = ?
+        ORDER BY e.name, a.cases DESC
+    ''', (field,))
+    return cursor.fetchall()
+
+
+def get_icd_counts(cursor, level, limit=None):
+    """Returns [(icd, cases, unique_patients)] over all entities for level 'family' or 'code'"""
+    query = '''
+        SELECT icd, cases, unique_patients FROM agg_icd
+        WHERE entity_id = ? AND level = ?
+        ORDER BY cases DESC
+    '''
+    params = [ALL_ENTITIES, level]
+    if limit:
+        query += ' LIMIT ?'
+        params.append(limit)
+    cursor.execute(query, params)
+    return cursor.fetchall()
+
+
+def get_icd_counts_by_entity(cursor, level):
+    """Returns [(entity name, icd, cases, unique_patients)] ordered by entity name and cases"""
+    cursor.execute('''
+        SELECT e.name, a.icd, a.cases, a.unique_patients
+        FROM agg_icd a
+        JOIN tumorboard_entities e ON e.id = a.entity_id
+        WHERE a.level = ?
+        ORDER BY e.name, a.cases DESC
+    ''', (level,))
+    return cursor.fetchall()
@@ -5,6 +5,7 @@ from pathlib import Path
 from datetime import datetime
 import sys
 import os
+import tempfile
 
 # Add parent directory to Python path for imports
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -12,9 +13,34 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from utils.database_utils import TumorboardDatabase
+from utils import dashboard_aggregates
+from utils.path_monitor import resolve_tumorboard_base_path
+
+
+def dumps_compact(data):
+    """Compact JSON (no indentation) for files and for pushing data into the web view"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def write_text_atomic(path, text):
+    """
+    Write text to a temporary file next to path and move it into place, so readers of the
+    share never see a half-written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
 
 class DashboardDataExporter:
-    """Export database data for interactive dashboard"""
+    """Export database data for interactive dashboard (read from the aggregate tables)"""
     
     def __init__(self, tumorboard_base_path=None):
         # Determine correct database path based on tumorboard base path
@@ -26,8 +52,27 @@ class DashboardDataExporter:
         self.db = TumorboardDatabase(db_path=db_path)
         self.tumorboard_base_path = tumorboard_base_path
     
-    def export_dashboard_data(self, output_path=None):
-        """Export all data needed for dashboard as JSON"""
+    def build_dashboard_data(self):
+        """Collect all data needed for the dashboard as a dict (no file I/O)"""
+        try:
+            with sqlite3.connect(self.db.db_path) as conn:
+                return {
+                    'generated_at': datetime.now().isoformat(),
+                    'key_metrics': self._get_key_metrics(conn),
+                    'tumorboard_stats': self._get_tumorboard_stats(conn),
+                    'temporal_data': self._get_temporal_data(conn),
+                    'radiotherapy_data': self._get_radiotherapy_data(conn),
+                    'study_enrollment_data': self._get_study_enrollment_data(conn),
+                    'icd_data': self._get_icd_analysis_data(conn),
+                    'aufgebot_data': self._get_aufgebot_data(conn)
+                }
+                
+        except Exception as e:
+            logging.error(f"Error building dashboard data: {e}")
+            return None
+    
+    def export_dashboard_data(self, output_path=None, dashboard_data=None):
+        """Export all data needed for dashboard as compact JSON (written atomically)"""
         if output_path is None:
             # Use tumorboard base path if available, otherwise fall back to user home
             if self.tumorboard_base_path is not None:
@@ -35,47 +80,16 @@ class DashboardDataExporter:
             else:
                 output_path = Path.home() / "tumorboards" / "__SQLite_database" / "dashboard_data.json"
         
+        if dashboard_data is None:
+            dashboard_data = self.build_dashboard_data()
+        if dashboard_data is None:
+            return None
+        
         try:
-            with sqlite3.connect(self.db.db_path) as conn:
-                # Key metrics
-                key_metrics = self._get_key_metrics(conn)
-                
-                # Tumorboard statistics
-                tumorboard_stats = self._get_tumorboard_stats(conn)
-                
-                # Temporal data
-                temporal_data = self._get_temporal_data(conn)
-                
-                # Radiotherapy data
-                radiotherapy_data = self._get_radiotherapy_data(conn)
-                
-                # Study enrollment data
-                study_enrollment_data = self._get_study_enrollment_data(conn)
-                
-                # ICD analysis data
-                icd_analysis_data = self._get_icd_analysis_data(conn)
-                
-                # Aufgebot data
-                aufgebot_data = self._get_aufgebot_data(conn)
-                
-                dashboard_data = {
-                    'generated_at': datetime.now().isoformat(),
-                    'key_metrics': key_metrics,
-                    'tumorboard_stats': tumorboard_stats,
-                    'temporal_data': temporal_data,
-                    'radiotherapy_data': radiotherapy_data,
-                    'study_enrollment_data': study_enrollment_data,
-                    'icd_data': icd_analysis_data,
-                    'aufgebot_data': aufgebot_data
-                }
-                
-                # Write JSON file
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(dashboard_data, f, ensure_ascii=False, indent=2)
-                
-                logging.info(f"Dashboard data exported to: {output_path}")
-                return str(output_path)
-                
+            write_text_atomic(output_path, dumps_compact(dashboard_data))
+            logging.info(f"Dashboard data exported to: {output_path}")
+            return str(output_path)
+            
         except Exception as e:
             logging.error(f"Error exporting dashboard data: {e}")
             return None
@@ -84,44 +98,21 @@ class DashboardDataExporter:
         """Get key metrics for dashboard header"""
         cursor = conn.cursor()
         
-        # Basic counts
-        cursor.execute('''
-            SELECT 
-                COUNT(DISTINCT e.name) as tumorboard_types,
-                COUNT(DISTINCT s.id) as total_sessions,
-                COUNT(DISTINCT p.patient_number) as unique_patients,
-                COUNT(DISTINCT p.unique_key) as total_cases
-            FROM tumorboard_entities e
-            LEFT JOIN tumorboard_sessions s ON e.id = s.entity_id
-            LEFT JOIN patients p ON s.id = p.session_id
-        ''')
-        
-        result = cursor.fetchone()
+        cursor.execute('SELECT COUNT(*) FROM tumorboard_entities')
+        tumorboard_types = cursor.fetchone()[0]
+        total_sessions, total_cases, unique_patients = dashboard_aggregates.get_totals(cursor)
         return {
-            'tumorboard_types': result[0] or 0,
-            'total_sessions': result[1] or 0,
-            'unique_patients': result[2] or 0,
-            'total_cases': result[3] or 0
+            'tumorboard_types': tumorboard_types or 0,
+            'total_sessions': total_sessions or 0,
+            'unique_patients': unique_patients or 0,
+            'total_cases': total_cases or 0
         }
     
     def _get_tumorboard_stats(self, conn):
         """Get statistics by tumorboard type"""
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT 
-                e.name as tumorboard_type,
-                COUNT(DISTINCT s.id) as sessions,
-                COUNT(DISTINCT p.patient_number) as unique_patients,
-                COUNT(DISTINCT p.unique_key) as total_cases
-            FROM tumorboard_entities e
-            LEFT JOIN tumorboard_sessions s ON e.id = s.entity_id
-            LEFT JOIN patients p ON s.id = p.session_id
-            GROUP BY e.id, e.name
-            ORDER BY total_cases DESC
-        ''')
-        
-        results = cursor.fetchall()
+        results = dashboard_aggregates.get_entity_totals(cursor)
         return [
             {
                 'name': row[0],
@@ -136,23 +127,12 @@ class DashboardDataExporter:
         """Get temporal data for time series charts"""
         cursor = conn.cursor()
         
-        # Monthly data for last 12 months
-        cursor.execute('''
-            SELECT 
-                strftime('%Y-%m', s.session_date) as month,
-                COUNT(DISTINCT s.id) as sessions,
-                COUNT(DISTINCT p.patient_number) as unique_patients,
-                COUNT(DISTINCT p.unique_key) as total_cases
-            FROM tumorboard_sessions s
-            LEFT JOIN patients p ON s.id = p.session_id
-            WHERE s.session_date >= date('now', '-12 months')
-            GROUP BY strftime('%Y-%m', s.session_date)
-            ORDER BY month
-        ''')
+        # Monthly data for last 12 months (from the aggregates, whole months)
+        cursor.execute("SELECT strftime('%Y-%m', date('now', '-12 months'))")
+        since_month = cursor.fetchone()[0]
+        monthly_results = dashboard_aggregates.get_monthly(cursor, since_month)
         
-        monthly_results = cursor.fetchall()
-        
-        # Weekly data for last 8 weeks
+        # Weekly data for last 8 weeks (date index range, independent of database size)
         cursor.execute('''
             SELECT 
                 strftime('%Y-W%W', s.session_date) as week,
@@ -193,48 +173,22 @@ class DashboardDataExporter:
         """Get radiotherapy statistics"""
         cursor = conn.cursor()
         
-        # All patients
-        cursor.execute('''
-            SELECT 
-                CASE 
-                    WHEN radiotherapy_indicated = '-' OR radiotherapy_indicated IS NULL OR radiotherapy_indicated = '' 
-                    THEN 'Nicht besprochen'
-                    ELSE radiotherapy_indicated 
-                END as status,
-                COUNT(*) as count
-            FROM patients 
-            GROUP BY 
-                CASE 
-                    WHEN radiotherapy_indicated = '-' OR radiotherapy_indicated IS NULL OR radiotherapy_indicated = '' 
-                    THEN 'Nicht besprochen'
-                    ELSE radiotherapy_indicated 
-                END
-            ORDER BY count DESC
-        ''')
-        
-        all_results = cursor.fetchall()
+        counts = dashboard_aggregates.get_status_counts(cursor, 'radiotherapy')
         
-        # Only discussed patients
-        cursor.execute('''
-            SELECT 
-                radiotherapy_indicated as status,
-                COUNT(*) as count
-            FROM patients 
-            WHERE radiotherapy_indicated NOT IN ('-', '') AND radiotherapy_indicated IS NOT NULL
-            GROUP BY radiotherapy_indicated
-            ORDER BY count DESC
-        ''')
-        
-        discussed_results = cursor.fetchall()
+        # All patients ('' = not discussed: NULL, '' or '-')
+        all_results = {}
+        for status, count in counts:
+            label = status if status else 'Nicht besprochen'
+            all_results[label] = all_results.get(label, 0) + count
         
         return {
             'all_patients': [
-                {'status': row[0], 'count': row[1]}
-                for row in all_results
+                {'status': status, 'count': count}
+                for status, count in sorted(all_results.items(), key=lambda item: item[1], reverse=True)
             ],
             'discussed_only': [
-                {'status': row[0], 'count': row[1]}
-                for row in discussed_results
+                {'status': status, 'count': count}
+                for status, count in counts if status
             ]
         }
     
@@ -242,18 +196,7 @@ class DashboardDataExporter:
         """Get study enrollment data"""
         cursor = conn.cursor()
         
-        # Study enrollment data
-        cursor.execute('''
-            SELECT 
-                study_enrollment as status,
-                COUNT(*) as count
-            FROM patients 
-            WHERE study_enrollment IS NOT NULL
-            GROUP BY study_enrollment
-            ORDER BY count DESC
-        ''')
-        
-        results = cursor.fetchall()
+        results = dashboard_aggregates.get_status_counts(cursor, 'study')
         
         return [
             {'status': row[0], 'count': row[1]}
@@ -267,36 +210,10 @@ class DashboardDataExporter:
         cursor = conn.cursor()
         
         # Top ICD families (aggregated from individual codes)
-        cursor.execute('''
-            SELECT 
-                icd_family,
-                COUNT(DISTINCT unique_key) as total_cases,
-                COUNT(DISTINCT patient_number) as unique_patients
-            FROM patients 
-            WHERE icd_family IS NOT NULL AND icd_family != '' AND icd_family != '-'
-            GROUP BY icd_family
-            ORDER BY total_cases DESC
-            LIMIT 20
-        ''')
-        
-        top_families_results = cursor.fetchall()
+        top_families_results = dashboard_aggregates.get_icd_counts(cursor, 'family', limit=20)
         
         # ICD families by tumorboard
-        cursor.execute('''
-            SELECT 
-                e.name as tumorboard_type,
-                p.icd_family,
-                COUNT(DISTINCT p.unique_key) as total_cases,
-                COUNT(DISTINCT p.patient_number) as unique_patients
-            FROM patients p
-            JOIN tumorboard_sessions s ON p.session_id = s.id
-            JOIN tumorboard_entities e ON s.entity_id = e.id
-            WHERE p.icd_family IS NOT NULL AND p.icd_family != '' AND p.icd_family != '-'
-            GROUP BY e.name, p.icd_family
-            ORDER BY e.name, total_cases DESC
-        ''')
-        
-        by_tumorboard_results = cursor.fetchall()
+        by_tumorboard_results = dashboard_aggregates.get_icd_counts_by_entity(cursor, 'family')
         
         return {
             'top_codes': [
@@ -324,87 +241,30 @@ class DashboardDataExporter:
         """Get Aufgebot (call type) statistics"""
         cursor = conn.cursor()
         
-        # All patients with radiotherapy = "Ja" and aufgebot data
-        cursor.execute('''
-            SELECT 
-                CASE 
-                    WHEN aufgebot_type = '-' OR aufgebot_type IS NULL OR aufgebot_type = '' 
-                    THEN 'Nicht spezifiziert'
-                    ELSE aufgebot_type 
-                END as category,
-                COUNT(*) as count
-            FROM patients 
-            WHERE radiotherapy_indicated = 'Ja'
-            GROUP BY 
-                CASE 
-                    WHEN aufgebot_type = '-' OR aufgebot_type IS NULL OR aufgebot_type = '' 
-                    THEN 'Nicht spezifiziert'
-                    ELSE aufgebot_type 
-                END
-            ORDER BY count DESC
-        ''')
-        
-        all_results = cursor.fetchall()
-        
-        # Only patients with specified aufgebot type
-        cursor.execute('''
-            SELECT 
-                aufgebot_type as category,
-                COUNT(*) as count
-            FROM patients 
-            WHERE radiotherapy_indicated = 'Ja' 
-            AND aufgebot_type IS NOT NULL 
-            AND aufgebot_type NOT IN ('-', '')
-            GROUP BY aufgebot_type
-            ORDER BY 
-                CASE aufgebot_type
-                    WHEN 'Kat I' THEN 1
-                    WHEN 'Kat II' THEN 2
-                    WHEN 'Kat III' THEN 3
-                    ELSE 4
-                END
-        ''')
-        
-        specified_results = cursor.fetchall()
+        # All patients with radiotherapy = "Ja" ('' = not specified: NULL, '' or '-')
+        counts = dashboard_aggregates.get_status_counts(cursor, 'aufgebot')
+        category_order = {'Kat I': 1, 'Kat II': 2, 'Kat III': 3}
+        specified_results = sorted(
+            ((category, count) for category, count in counts if category),
+            key=lambda item: category_order.get(item[0], 4)
+        )
         
         # Aufgebot by tumorboard type
-        cursor.execute('''
-            SELECT 
-                e.name as tumorboard_type,
-                CASE 
-                    WHEN p.aufgebot_type = '-' OR p.aufgebot_type IS NULL OR p.aufgebot_type = '' 
-                    THEN 'Nicht spezifiziert'
-                    ELSE p.aufgebot_type 
-                END as category,
-                COUNT(*) as count
-            FROM patients p
-            JOIN tumorboard_sessions s ON p.session_id = s.id
-            JOIN tumorboard_entities e ON s.entity_id = e.id
-            WHERE p.radiotherapy_indicated = 'Ja'
-            GROUP BY e.name, 
-                CASE 
-                    WHEN p.aufgebot_type = '-' OR p.aufgebot_type IS NULL OR p.aufgebot_type = '' 
-                    THEN 'Nicht spezifiziert'
-                    ELSE p.aufgebot_type 
-                END
-            ORDER BY e.name, count DESC
-        ''')
-        
-        by_tumorboard_results = cursor.fetchall()
+        by_tumorboard_results = dashboard_aggregates.get_status_counts_by_entity(cursor, 'aufgebot')
         
         return {
             'all_patients': [
-                {'category': row[0], 'count': row[1]}
-                for row in all_results
+                {'category': category or 'Nicht spezifiziert', 'count': count}
+                for category, count in counts
             ],
             'specified_only': [
-                {'category': row[0], 'count': row[1]}
-                for row in specified_results
+                {'category': category, 'count': count}
+                for category, count in specified_results
             ],
             'by_tumorboard': [
                 {
                     'tumorboard_type': row[0],
-                    'category': row[1],
+                    'category': row[1] or 'Nicht spezifiziert',
                     'count': row[2]
                 }
                 for row in by_tumorboard_results
@@ -416,12 +276,8 @@ def generate_dashboard_data(tumorboard_base_path=None):
     """Generate dashboard data JSON file"""
     # Determine correct tumorboard base path if not provided
     if tumorboard_base_path is None:
-        # Try K: first, fall back to user home
-        k_path = Path("K:/RAO_Projekte/App/tumorboards")
-        if k_path.exists() and k_path.is_dir():
-            tumorboard_base_path = k_path
-        else:
-            tumorboard_base_path = Path.home() / "tumorboards"
+        # K: if the path monitor reports it as available, otherwise user home
+        tumorboard_base_path = resolve_tumorboard_base_path()
     
     exporter = DashboardDataExporter(tumorboard_base_path)
     return exporter.export_dashboard_data()
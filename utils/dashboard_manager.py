@@ -1,37 +1,43 @@
 import os
-import shutil
 import logging
-from pathlib import Path
+from datetime import datetime
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QMessageBox, QApplication
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtCore import QUrl, QTimer, pyqtSignal, Qt
-from .dashboard_data_export import DashboardDataExporter
+from .dashboard_data_export import DashboardDataExporter, dumps_compact
+from .dashboard_html_generator import DashboardHTMLGenerator
+from .path_monitor import resolve_tumorboard_base_path
+
+# Write dashboard.html / dashboard_data.json to the share after a refresh (for external access)
+WRITE_SHARE_COPY = True
 
 class DashboardManager(QWidget):
     """Dashboard manager widget for the main application"""
     
     data_updated = pyqtSignal()
     
-    def __init__(self, parent=None, tumorboard_base_path=None):
+    def __init__(self, parent=None, tumorboard_base_path=None, write_share_copy=WRITE_SHARE_COPY):
         super().__init__(parent)
         
         # Determine correct tumorboard base path
         if tumorboard_base_path is None:
-            # Try K: first, fall back to user home
-            k_path = Path("K:/RAO_Projekte/App/tumorboards")
-            if k_path.exists() and k_path.is_dir():
-                tumorboard_base_path = k_path
-            else:
-                tumorboard_base_path = Path.home() / "tumorboards"
+            # K: if the path monitor reports it as available, otherwise user home
+            tumorboard_base_path = resolve_tumorboard_base_path()
         
         self.tumorboard_base_path = tumorboard_base_path
-        self.exporter = DashboardDataExporter(tumorboard_base_path)
+        self.generator = DashboardHTMLGenerator(tumorboard_base_path)
+        self.exporter = self.generator.exporter
         self.dashboard_dir = tumorboard_base_path / "__SQLite_database" / "dashboard"
         self.data_file = self.dashboard_dir / "dashboard_data.json"
         self.html_file = self.dashboard_dir / "dashboard.html"
+        self.write_share_copy = write_share_copy
+        
+        # Latest data built in memory and the sections the page has already received
+        self.dashboard_data = None
+        self.pushed_data = {}
+        self.page_ready = False
         
         self.setup_ui()
-        self.setup_dashboard_files()
         
         # Auto-refresh timer
         self.refresh_timer = QTimer()
@@ -109,57 +115,93 @@ class DashboardManager(QWidget):
         # Web view for dashboard
         self.web_view = QWebEngineView()
         self.web_view.setMinimumHeight(600)
+        self.web_view.loadFinished.connect(self.on_page_loaded)
         layout.addWidget(self.web_view)
         
         # Load dashboard
         self.load_dashboard()
         
-    def setup_dashboard_files(self):
-        """Setup dashboard directory and copy HTML template"""
-        try:
-            # Create dashboard directory
-            self.dashboard_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Copy HTML template to dashboard directory
-            template_path = Path(__file__).parent.parent / "templates" / "dashboard_simple.html"
-            if template_path.exists():
-                shutil.copy2(template_path, self.html_file)
-                logging.info(f"Dashboard template copied to: {self.html_file}")
-            else:
-                logging.warning(f"Dashboard template not found at: {template_path}")
-                
-        except Exception as e:
-            logging.error(f"Error setting up dashboard files: {e}")
-            
     def load_dashboard(self):
-        """Load the dashboard in the web view"""
+        """Load the dashboard page once; data is pushed into it by refresh_data()"""
         try:
-            if self.html_file.exists():
-                url = QUrl.fromLocalFile(str(self.html_file))
-                self.web_view.load(url)
-                self.status_label.setText("Dashboard geladen")
-            else:
-                self.show_error("Dashboard-Datei nicht gefunden")
+            # Page without embedded data, so it stays small and is loaded from memory
+            html_content = self.generator.build_html(None, interactive=True)
+            if html_content is None:
+                self.show_error("Dashboard-Vorlage nicht gefunden")
+                return
+            
+            self.page_ready = False
+            self.pushed_data = {}
+            base_url = QUrl.fromLocalFile(str(self.generator.get_template_path().parent) + os.sep)
+            self.web_view.setHtml(html_content, base_url)
+            self.status_label.setText("Dashboard geladen")
                 
         except Exception as e:
             logging.error(f"Error loading dashboard: {e}")
             self.show_error(f"Fehler beim Laden des Dashboards: {e}")
             
+    def on_page_loaded(self, ok):
+        """Page (re)loaded: it has no data yet, so push all sections"""
+        if not ok:
+            logging.error("Dashboard page failed to load")
+            return
+        self.page_ready = True
+        self.pushed_data = {}
+        self.push_changed_sections()
+        
+    def get_changed_sections(self):
+        """Sections of the current data that differ from what the page already shows"""
+        if not self.dashboard_data:
+            return {}
+        changed = {
+            key: value for key, value in self.dashboard_data.items()
+            if key != 'generated_at' and self.pushed_data.get(key) != value
+        }
+        if changed or not self.pushed_data:
+            changed['generated_at'] = self.dashboard_data['generated_at']
+        return changed
+        
+    def push_changed_sections(self):
+        """
+        Send only the changed sections to the page (no reload).
+        
+        Returns:
+            list: Names of the pushed sections (empty if nothing changed or the page is not ready)
+        """
+        if not self.page_ready:
+            return []
+        changed = self.get_changed_sections()
+        if not changed:
+            return []
+        self.web_view.page().runJavaScript(f"window.updateDashboardSections({dumps_compact(changed)});")
+        self.pushed_data = dict(self.dashboard_data)
+        return [key for key in changed if key != 'generated_at']
+        
     def refresh_data(self):
         """Refresh dashboard data"""
         try:
             self.status_label.setText("Aktualisiere Daten...")
             self.refresh_btn.setEnabled(False)
             
-            # Export fresh data
-            output_path = self.exporter.export_dashboard_data(self.data_file)
+            # Build fresh data in memory
+            dashboard_data = self.exporter.build_dashboard_data()
             
-            if output_path:
-                # Reload the web view to pick up new data
-                self.web_view.reload()
-                self.status_label.setText(f"Daten aktualisiert: {Path(output_path).stat().st_mtime}")
+            if dashboard_data:
+                data_changed = self.has_data_changed(dashboard_data)
+                self.dashboard_data = dashboard_data
+                sections = self.push_changed_sections()
+                if data_changed and self.write_share_copy:
+                    self.write_share_files()
+                
+                timestamp = datetime.fromisoformat(dashboard_data['generated_at']).strftime('%H:%M:%S')
+                if sections:
+                    self.status_label.setText(f"Daten aktualisiert: {timestamp} ({len(sections)} Bereich(e) geändert)")
+                elif self.page_ready:
+                    self.status_label.setText(f"Daten aktualisiert: {timestamp} (keine Änderungen)")
+                else:
+                    self.status_label.setText(f"Daten aktualisiert: {timestamp}")
                 self.data_updated.emit()
-                logging.info("Dashboard data refreshed successfully")
+                logging.info(f"Dashboard data refreshed successfully (changed sections: {sections})")
             else:
                 self.show_error("Fehler beim Exportieren der Daten")
                 
@@ -170,6 +212,25 @@ class DashboardManager(QWidget):
         finally:
             self.refresh_btn.setEnabled(True)
             
+    def has_data_changed(self, dashboard_data):
+        """True if any section (ignoring the timestamp) differs from the current data"""
+        if self.dashboard_data is None:
+            return True
+        return any(
+            self.dashboard_data.get(key) != value
+            for key, value in dashboard_data.items() if key != 'generated_at'
+        )
+        
+    def write_share_files(self):
+        """Write the self-contained dashboard.html and dashboard_data.json to the share (compact, atomic)"""
+        try:
+            self.generator.generate_complete_html(self.html_file, interactive=True,
+                                                  dashboard_data=self.dashboard_data)
+            self.exporter.export_dashboard_data(self.data_file, dashboard_data=self.dashboard_data)
+        except Exception as e:
+            # The share copy is optional; the dashboard in the app is already up to date
+            logging.warning(f"Could not write dashboard share copy: {e}")
+            
     def toggle_auto_refresh(self):
         """Toggle auto-refresh functionality"""
         if self.auto_refresh_btn.isChecked():
@@ -251,12 +312,8 @@ def export_dashboard_data(tumorboard_base_path=None):
     """Standalone function to export dashboard data"""
     # Determine correct tumorboard base path if not provided
     if tumorboard_base_path is None:
-        # Try K: first, fall back to user home
-        k_path = Path("K:/RAO_Projekte/App/tumorboards")
-        if k_path.exists() and k_path.is_dir():
-            tumorboard_base_path = k_path
-        else:
-            tumorboard_base_path = Path.home() / "tumorboards"
+        # K: if the path monitor reports it as available, otherwise user home
+        tumorboard_base_path = resolve_tumorboard_base_path()
     
     exporter = DashboardDataExporter(tumorboard_base_path)
     return exporter.export_dashboard_data() 
\ No newline at end of file
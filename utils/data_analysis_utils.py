@@ -6,6 +6,8 @@ from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
 import seaborn as sns
 from .database_utils import TumorboardDatabase
+from . import dashboard_aggregates
+from .path_monitor import resolve_tumorboard_base_path
 
 class TumorboardAnalyzer:
     """Data analysis tool for tumorboard database"""
@@ -13,12 +15,8 @@ class TumorboardAnalyzer:
     def __init__(self, tumorboard_base_path=None):
         # Determine correct tumorboard base path if not provided
         if tumorboard_base_path is None:
-            # Try K: first, fall back to user home
-            k_path = Path("K:/RAO_Projekte/App/tumorboards")
-            if k_path.exists() and k_path.is_dir():
-                tumorboard_base_path = k_path
-            else:
-                tumorboard_base_path = Path.home() / "tumorboards"
+            # K: if the path monitor reports it as available, otherwise user home
+            tumorboard_base_path = resolve_tumorboard_base_path()
         
         self.tumorboard_base_path = tumorboard_base_path
         
@@ -27,77 +25,47 @@ class TumorboardAnalyzer:
         self.db = TumorboardDatabase(db_path=db_path)
     
     def get_patient_statistics(self):
-        """Get comprehensive patient statistics"""
+        """Get comprehensive patient statistics (from the aggregate tables)"""
         try:
             with sqlite3.connect(self.db.db_path) as conn:
+                cursor = conn.cursor()
+                
                 # Basic counts
-                basic_stats = pd.read_sql_query('''
-                    SELECT 
-                        COUNT(DISTINCT e.name) as total_tumorboard_types,
-                        COUNT(DISTINCT s.id) as total_sessions,
-                        COUNT(DISTINCT p.patient_number) as unique_patients,
-                        COUNT(DISTINCT p.unique_key) as total_patient_cases
-                    FROM tumorboard_entities e
-                    LEFT JOIN tumorboard_sessions s ON e.id = s.entity_id
-                    LEFT JOIN patients p ON s.id = p.session_id
-                ''', conn)
+                cursor.execute('SELECT COUNT(*) FROM tumorboard_entities')
+                total_tumorboard_types = cursor.fetchone()[0]
+                total_sessions, total_cases, unique_patients = dashboard_aggregates.get_totals(cursor)
+                basic_stats = pd.DataFrame([{
+                    'total_tumorboard_types': total_tumorboard_types,
+                    'total_sessions': total_sessions,
+                    'unique_patients': unique_patients,
+                    'total_patient_cases': total_cases
+                }])
                 
                 # Patients by tumorboard type
-                by_tumorboard = pd.read_sql_query('''
-                    SELECT 
-                        e.name as tumorboard_type,
-                        COUNT(DISTINCT s.id) as sessions_count,
-                        COUNT(DISTINCT p.patient_number) as unique_patients,
-                        COUNT(DISTINCT p.unique_key) as total_patient_cases
-                    FROM tumorboard_entities e
-                    LEFT JOIN tumorboard_sessions s ON e.id = s.entity_id
-                    LEFT JOIN patients p ON s.id = p.session_id
-                    GROUP BY e.id, e.name
-                    ORDER BY total_patient_cases DESC
-                ''', conn)
+                by_tumorboard = pd.DataFrame(
+                    dashboard_aggregates.get_entity_totals(cursor),
+                    columns=['tumorboard_type', 'sessions_count', 'unique_patients', 'total_patient_cases']
+                )
                 
-                # Radiotherapy statistics
-                radiotherapy_stats = pd.read_sql_query('''
-                    SELECT 
-                        CASE 
-                            WHEN radiotherapy_indicated = '-' OR radiotherapy_indicated IS NULL OR radiotherapy_indicated = '' 
-                            THEN 'Nicht besprochen'
-                            ELSE radiotherapy_indicated 
-                        END as status,
-                        COUNT(*) as count,
-                        ROUND(COUNT(*) * 100.0 / (SELECT COUNT(*) FROM patients), 2) as percentage_of_all
-                    FROM patients 
-                    GROUP BY 
-                        CASE 
-                            WHEN radiotherapy_indicated = '-' OR radiotherapy_indicated IS NULL OR radiotherapy_indicated = '' 
-                            THEN 'Nicht besprochen'
-                            ELSE radiotherapy_indicated 
-                        END
-                    ORDER BY count DESC
-                ''', conn)
+                # Radiotherapy statistics ('' = not discussed)
+                radiotherapy_counts = pd.DataFrame(
+                    dashboard_aggregates.get_status_counts(cursor, 'radiotherapy'), columns=['status', 'count']
+                )
+                discussed_radiotherapy_stats = radiotherapy_counts[radiotherapy_counts['status'] != ''].copy()
+                radiotherapy_counts['status'] = radiotherapy_counts['status'].replace('', 'Nicht besprochen')
+                radiotherapy_stats = (radiotherapy_counts.groupby('status', as_index=False)['count'].sum()
+                                      .sort_values('count', ascending=False, ignore_index=True))
+                radiotherapy_stats['percentage_of_all'] = self._percentages(radiotherapy_stats['count'])
                 
                 # Additional stats for discussed patients only
-                discussed_radiotherapy_stats = pd.read_sql_query('''
-                    SELECT 
-                        radiotherapy_indicated as status,
-                        COUNT(*) as count,
-                        ROUND(COUNT(*) * 100.0 / (SELECT COUNT(*) FROM patients WHERE radiotherapy_indicated NOT IN ('-', '') AND radiotherapy_indicated IS NOT NULL), 2) as percentage_of_discussed
-                    FROM patients 
-                    WHERE radiotherapy_indicated NOT IN ('-', '') AND radiotherapy_indicated IS NOT NULL
-                    GROUP BY radiotherapy_indicated
-                    ORDER BY count DESC
-                ''', conn)
+                discussed_radiotherapy_stats = discussed_radiotherapy_stats.reset_index(drop=True)
+                discussed_radiotherapy_stats['percentage_of_discussed'] = self._percentages(discussed_radiotherapy_stats['count'])
                 
                 # Study enrollment statistics
-                study_stats = pd.read_sql_query('''
-                    SELECT 
-                        study_enrollment,
-                        COUNT(*) as count
-                    FROM patients 
-                    WHERE study_enrollment IS NOT NULL AND study_enrollment != '' AND study_enrollment != '-'
-                    GROUP BY study_enrollment
-                    ORDER BY count DESC
-                ''', conn)
+                study_stats = pd.DataFrame(
+                    [row for row in dashboard_aggregates.get_status_counts(cursor, 'study') if row[0] not in ('', '-')],
+                    columns=['study_enrollment', 'count']
+                )
                 
                 return {
                     'basic_statistics': basic_stats,
@@ -111,42 +79,31 @@ class TumorboardAnalyzer:
             logging.error(f"Error getting patient statistics: {e}")
             return None
     
+    @staticmethod
+    def _percentages(counts):
+        total = counts.sum()
+        return (counts * 100.0 / total).round(2) if total else counts * 0.0
+    
     def get_temporal_analysis(self, months_back=12):
-        """Get temporal analysis of tumorboard activity"""
+        """Get temporal analysis of tumorboard activity (whole months from the aggregate tables)"""
         try:
             cutoff_date = datetime.now() - timedelta(days=months_back * 30)
-            cutoff_str = cutoff_date.strftime('%Y-%m-%d')
+            cutoff_month = cutoff_date.strftime('%Y-%m')
             
             with sqlite3.connect(self.db.db_path) as conn:
+                cursor = conn.cursor()
+                
                 # Sessions over time
-                sessions_over_time = pd.read_sql_query('''
-                    SELECT 
-                        strftime('%Y-%m', s.session_date) as month,
-                        e.name as tumorboard_type,
-                        COUNT(DISTINCT s.id) as sessions_count,
-                        COUNT(DISTINCT p.patient_number) as unique_patients,
-                        COUNT(DISTINCT p.unique_key) as total_patient_cases
-                    FROM tumorboard_sessions s
-                    JOIN tumorboard_entities e ON s.entity_id = e.id
-                    LEFT JOIN patients p ON s.id = p.session_id
-                    WHERE s.session_date >= ?
-                    GROUP BY strftime('%Y-%m', s.session_date), e.name
-                    ORDER BY month, tumorboard_type
-                ''', conn, params=[cutoff_str])
+                sessions_over_time = pd.DataFrame(
+                    dashboard_aggregates.get_monthly(cursor, cutoff_month, by_entity=True),
+                    columns=['month', 'tumorboard_type', 'sessions_count', 'unique_patients', 'total_patient_cases']
+                )
                 
                 # Monthly totals
-                monthly_totals = pd.read_sql_query('''
-                    SELECT 
-                        strftime('%Y-%m', s.session_date) as month,
-                        COUNT(DISTINCT s.id) as total_sessions,
-                        COUNT(DISTINCT p.patient_number) as unique_patients,
-                        COUNT(DISTINCT p.unique_key) as total_patient_cases
-                    FROM tumorboard_sessions s
-                    LEFT JOIN patients p ON s.id = p.session_id
-                    WHERE s.session_date >= ?
-                    GROUP BY strftime('%Y-%m', s.session_date)
-                    ORDER BY month
-                ''', conn, params=[cutoff_str])
+                monthly_totals = pd.DataFrame(
+                    dashboard_aggregates.get_monthly(cursor, cutoff_month),
+                    columns=['month', 'total_sessions', 'unique_patients', 'total_patient_cases']
+                )
                 
                 return {
                     'sessions_over_time': sessions_over_time,
@@ -158,36 +115,22 @@ class TumorboardAnalyzer:
             return None
     
     def get_diagnosis_analysis(self):
-        """Analyze ICD code patterns"""
+        """Analyze ICD code patterns (from the aggregate tables)"""
         try:
             with sqlite3.connect(self.db.db_path) as conn:
+                cursor = conn.cursor()
+                
                 # ICD code analysis
-                icd_analysis = pd.read_sql_query('''
-                    SELECT 
-                        icd_code,
-                        COUNT(DISTINCT unique_key) as total_cases,
-                        COUNT(DISTINCT patient_number) as unique_patients
-                    FROM patients 
-                    WHERE icd_code IS NOT NULL AND icd_code != '' AND icd_code != '-'
-                    GROUP BY icd_code
-                    ORDER BY total_cases DESC
-                    LIMIT 20
-                ''', conn)
+                icd_analysis = pd.DataFrame(
+                    dashboard_aggregates.get_icd_counts(cursor, 'code', limit=20),
+                    columns=['icd_code', 'total_cases', 'unique_patients']
+                )
                 
                 # ICD codes by tumorboard type
-                icd_by_tb = pd.read_sql_query('''
-                    SELECT 
-                        e.name as tumorboard_type,
-                        p.icd_code,
-                        COUNT(DISTINCT p.unique_key) as total_cases,
-                        COUNT(DISTINCT p.patient_number) as unique_patients
-                    FROM patients p
-                    JOIN tumorboard_sessions s ON p.session_id = s.id
-                    JOIN tumorboard_entities e ON s.entity_id = e.id
-                    WHERE p.icd_code IS NOT NULL AND p.icd_code != '' AND p.icd_code != '-'
-                    GROUP BY e.name, p.icd_code
-                    ORDER BY e.name, total_cases DESC
-                ''', conn)
+                icd_by_tb = pd.DataFrame(
+                    dashboard_aggregates.get_icd_counts_by_entity(cursor, 'code'),
+                    columns=['tumorboard_type', 'icd_code', 'total_cases', 'unique_patients']
+                )
                 
                 return {
                     'icd_analysis': icd_analysis,
@@ -198,8 +141,14 @@ class TumorboardAnalyzer:
             logging.error(f"Error getting diagnosis analysis: {e}")
             return None
     
-    def export_comprehensive_report(self, output_path=None):
-        """Export a comprehensive analysis report to Excel"""
+    def export_comprehensive_report(self, output_path=None, include_raw_data=True):
+        """
+        Export a comprehensive analysis report to Excel
+        
+        Args:
+            include_raw_data (bool): Add the 'Rohdaten' sheet with every patient row. This is the
+                only part whose cost grows with the database; the summary sheets read the aggregates.
+        """
         if output_path is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             output_path = self.tumorboard_base_path / f"tumorboard_analysis_report_{timestamp}.xlsx"
@@ -249,37 +198,38 @@ class TumorboardAnalyzer:
                 diagnosis_analysis['icd_analysis'].to_excel(writer, sheet_name='ICD_Codes', index=False)
                 diagnosis_analysis['icd_by_tumorboard'].to_excel(writer, sheet_name='ICD_nach_Tumorboard', index=False)
                 
-                # Raw data export with calculated age
-                raw_data_query = '''
-                    SELECT 
-                        p.unique_key as "Unique_Key",
-                        e.name as "Tumorboard_Typ",
-                        s.session_date as "Session_Datum",
-                        p.patient_number as "Patientennummer",
-                        p.name as "Patient_Name",
-                        p.birth_date as "Geburtsdatum",
-                        CASE 
-                            WHEN p.birth_date IS NOT NULL AND p.birth_date != '' AND p.birth_date != '-'
-                            THEN CAST((julianday(s.session_date) - julianday(p.birth_date)) / 365.25 AS INTEGER) || ' Jahre'
-                            ELSE '-'
-                        END as "Alter_bei_Session",
-                        p.diagnosis as "Diagnose",
-                        p.icd_code as "ICD_Code",
-                        p.radiotherapy_indicated as "Radiotherapie_indiziert",
-                        p.aufgebot_type as "Art_des_Aufgebots",
-                        p.study_enrollment as "Studie",
-                        p.remarks as "Bemerkungen",
-                        s.finalized_at as "Abgeschlossen_am",
-                        s.finalized_by as "Abgeschlossen_von"
-                    FROM patients p
-                    JOIN tumorboard_sessions s ON p.session_id = s.id
-                    JOIN tumorboard_entities e ON s.entity_id = e.id
-                    ORDER BY e.name, s.session_date DESC, p.name
-                '''
+                if include_raw_data:
+                    # Raw data export with calculated age
+                    raw_data_query = '''
+                        SELECT 
+                            p.unique_key as "Unique_Key",
+                            e.name as "Tumorboard_Typ",
+                            s.session_date as "Session_Datum",
+                            p.patient_number as "Patientennummer",
+                            p.name as "Patient_Name",
+                            p.birth_date as "Geburtsdatum",
+                            CASE 
+                                WHEN p.birth_date IS NOT NULL AND p.birth_date != '' AND p.birth_date != '-'
+                                THEN CAST((julianday(s.session_date) - julianday(p.birth_date)) / 365.25 AS INTEGER) || ' Jahre'
+                                ELSE '-'
+                            END as "Alter_bei_Session",
+                            p.diagnosis as "Diagnose",
+                            p.icd_code as "ICD_Code",
+                            p.radiotherapy_indicated as "Radiotherapie_indiziert",
+                            p.aufgebot_type as "Art_des_Aufgebots",
+                            p.study_enrollment as "Studie",
+                            p.remarks as "Bemerkungen",
+                            s.finalized_at as "Abgeschlossen_am",
+                            s.finalized_by as "Abgeschlossen_von"
+                        FROM patients p
+                        JOIN tumorboard_sessions s ON p.session_id = s.id
+                        JOIN tumorboard_entities e ON s.entity_id = e.id
+                        ORDER BY e.name, s.session_date DESC, p.name
+                    '''
                 
-                with sqlite3.connect(self.db.db_path) as conn:
-                    raw_data = pd.read_sql_query(raw_data_query, conn)
-                    raw_data.to_excel(writer, sheet_name='Rohdaten', index=False)
+                    with sqlite3.connect(self.db.db_path) as conn:
+                        raw_data = pd.read_sql_query(raw_data_query, conn)
+                        raw_data.to_excel(writer, sheet_name='Rohdaten', index=False)
             
             logging.info(f"Comprehensive analysis report exported to: {output_path}")
             return str(output_path)
@@ -13,16 +13,13 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.database_utils import TumorboardDatabase, sync_all_collection_files
 from utils.data_analysis_utils import generate_full_analysis_report
+from utils.path_monitor import resolve_tumorboard_base_path
 import logging
 
 def get_tumorboard_base_path():
     """Determine the correct tumorboard base path, prioritizing K: drive"""
-    k_path = Path("K:/RAO_Projekte/App/tumorboards")
-    if k_path.exists() and k_path.is_dir():
-        return k_path
-    else:
-        # Fall back to user home only if K: is not available
-        return Path.home() / "tumorboards"
+    # Cached availability from the path monitor (bounded probe, no hang on a dead mount)
+    return resolve_tumorboard_base_path()
 
 def get_database_path():
     """Get the correct database path"""
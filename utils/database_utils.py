@@ -4,8 +4,25 @@ import logging
 from pathlib import Path
 from datetime import datetime
 import os
-import re
 import shutil
+import hashlib
+from openpyxl import load_workbook
+from utils.sheet_normalization import normalize_patient_sheet, normalize_aufgebot_type, to_python_values
+from utils import dashboard_aggregates
+from utils.path_monitor import resolve_tumorboard_base_path
+
+# Mapping of TumorboardSessionPage.patients_data keys to collection Excel column names
+SESSION_FIELD_COLUMNS = {
+    'name': 'Name',
+    'birth_date': 'Geburtsdatum',
+    'patient_number': 'Patientennummer',
+    'diagnosis': 'Diagnose',
+    'icd_code': 'ICD-Code',
+    'radiotherapy': 'Radiotherapie indiziert',
+    'aufgebot': 'Art des Aufgebots',
+    'studie': 'Vormerken für Studie',
+    'bemerkung': 'Bemerkung/Procedere'
+}
 
 class TumorboardDatabase:
     """Central database for all tumorboard data"""
@@ -115,6 +132,44 @@ class TumorboardDatabase:
                     )
                 ''')
                 
+                # Create sync tracking table for incremental collection imports (one row per sheet)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS collection_sheet_sync (
+                        entity_id INTEGER NOT NULL,
+                        sheet_name TEXT NOT NULL,
+                        content_hash TEXT NOT NULL,
+                        row_count INTEGER,
+                        file_mtime REAL,
+                        file_size INTEGER,
+                        synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (entity_id, sheet_name),
+                        FOREIGN KEY (entity_id) REFERENCES tumorboard_entities(id)
+                    )
+                ''')
+                
+                # Create catalog of session folders on disk (see utils/tumorboard_catalog.py)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS tumorboard_catalog (
+                        entity TEXT NOT NULL,
+                        session_date TEXT NOT NULL,
+                        folder_path TEXT NOT NULL,
+                        is_finalized INTEGER NOT NULL DEFAULT 0,
+                        timestamp_file TEXT,
+                        excel_path TEXT,
+                        case_count INTEGER,
+                        dir_mtime REAL,
+                        excel_mtime REAL,
+                        indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (entity, session_date)
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS tumorboard_catalog_entities (
+                        entity TEXT PRIMARY KEY,
+                        dir_mtime REAL
+                    )
+                ''')
+                
                 # Create indexes for better performance (added ICD indexes)
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_patients_session ON patients(session_id)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_patients_number ON patients(patient_number)')
@@ -124,6 +179,9 @@ class TumorboardDatabase:
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_patients_icd_code ON patients(icd_code)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_patients_icd_family ON patients(icd_family)')
                 
+                # Create aggregate tables for dashboard/analysis (see utils/dashboard_aggregates.py)
+                dashboard_aggregates.create_aggregate_tables(cursor)
+                
                 # Migration: Add icd_family column if it doesn't exist
                 cursor.execute("PRAGMA table_info(patients)")
                 columns = [column[1] for column in cursor.fetchall()]
@@ -212,6 +270,9 @@ class TumorboardDatabase:
                     cursor.execute('ALTER TABLE tumorboard_sessions ADD COLUMN last_edited_by TEXT')
                     logging.info("Added last_edited_by column to tumorboard_sessions table")
                 
+                # Build the aggregates once for existing databases
+                dashboard_aggregates.ensure_aggregates(cursor)
+                
                 conn.commit()
                 logging.info(f"Database initialized successfully: {self.db_path}")
                 
@@ -244,189 +305,272 @@ class TumorboardDatabase:
             logging.error(f"Error getting/creating entity {entity_name}: {e}")
             raise e
     
-    def import_collection_excel(self, tumorboard_name, collection_excel_path, create_backup=True):
-        """Import data from a collection Excel file into the database"""
+    def import_collection_excel(self, tumorboard_name, collection_excel_path, create_backup=True, incremental=False):
+        """
+        Import data from a collection Excel file into the database
+        
+        Args:
+            tumorboard_name (str): Name of the tumorboard entity
+            collection_excel_path (Path): Path to the alle_tumorboards_*.xlsx file
+            create_backup (bool): Create a database backup before writing
+            incremental (bool): Only import sheets whose content changed since the last sync
+                (tracked in collection_sheet_sync). An unchanged file is skipped without parsing.
+        """
         try:
-            if not Path(collection_excel_path).exists():
+            collection_excel_path = Path(collection_excel_path)
+            if not collection_excel_path.exists():
                 logging.error(f"Collection Excel file not found: {collection_excel_path}")
                 return False
             
-            # Create backup before importing data (only if requested)
-            if create_backup:
-                backup_success = self.create_database_backup()
-                if not backup_success:
-                    logging.warning("Database backup failed, but continuing with import")
-            
             # Get or create entity
             entity_id = self.get_or_create_entity(tumorboard_name)
             
-            # Read Excel file
-            excel_file = pd.ExcelFile(collection_excel_path)
+            file_stat = collection_excel_path.stat()
+            sync_state = self._get_sheet_sync_state(entity_id)
+            
+            # Fast path: file untouched since the last sync
+            if incremental and sync_state and all(
+                mtime == file_stat.st_mtime and size == file_stat.st_size
+                for _, mtime, size in sync_state.values()
+            ):
+                logging.info(f"Collection file for {tumorboard_name} unchanged since last sync, skipping")
+                return True
+            
+            # Read all sheets in one pass and determine which ones changed
+            changed_sheets = []
+            unchanged_sheets = []
+            for sheet_name, header, rows in self._read_collection_sheets(collection_excel_path):
+                if sheet_name.lower() in ['übersicht', 'overview', 'tabelle1']:
+                    continue
+                
+                # Convert sheet name back to date format
+                try:
+                    # Sheet names are in format DD_MM_YYYY
+                    date_parts = sheet_name.split('_')
+                    if len(date_parts) == 3:
+                        session_date = f"{date_parts[0]}.{date_parts[1]}.{date_parts[2]}"
+                        date_obj = datetime.strptime(session_date, "%d.%m.%Y")
+                    else:
+                        logging.warning(f"Skipping sheet with invalid date format: {sheet_name}")
+                        continue
+                except Exception as e:
+                    logging.warning(f"Error parsing date from sheet name {sheet_name}: {e}")
+                    continue
+                
+                content_hash = self._hash_sheet_rows(header, rows)
+                if incremental and sheet_name in sync_state and sync_state[sheet_name][0] == content_hash:
+                    unchanged_sheets.append((sheet_name, content_hash, len(rows)))
+                else:
+                    changed_sheets.append((sheet_name, date_obj, header, rows, content_hash))
+            
+            # Create backup before importing data (only if requested and there is something to write)
+            if create_backup and changed_sheets:
+                backup_success = self.create_database_backup()
+                if not backup_success:
+                    logging.warning("Database backup failed, but continuing with import")
             
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 imported_sessions = 0
                 imported_patients = 0
+                sync_rows = []
                 
-                # Process each sheet (except overview)
-                for sheet_name in excel_file.sheet_names:
-                    if sheet_name.lower() in ['übersicht', 'overview', 'tabelle1']:
-                        continue
+                for sheet_name, date_obj, header, rows, content_hash in changed_sheets:
+                    sync_rows.append((entity_id, sheet_name, content_hash, len(rows), file_stat.st_mtime, file_stat.st_size))
                     
-                    # Convert sheet name back to date format
-                    try:
-                        # Sheet names are in format DD_MM_YYYY
-                        date_parts = sheet_name.split('_')
-                        if len(date_parts) == 3:
-                            session_date = f"{date_parts[0]}.{date_parts[1]}.{date_parts[2]}"
-                            # Convert to SQL date format
-                            date_obj = datetime.strptime(session_date, "%d.%m.%Y")
-                            sql_date = date_obj.strftime("%Y-%m-%d")
-                        else:
-                            logging.warning(f"Skipping sheet with invalid date format: {sheet_name}")
-                            continue
-                    except Exception as e:
-                        logging.warning(f"Error parsing date from sheet name {sheet_name}: {e}")
+                    if not rows:
                         continue
                     
-                    # Read sheet data
-                    df = pd.read_excel(collection_excel_path, sheet_name=sheet_name)
-                    
-                    if df.empty:
-                        continue
+                    sql_date = date_obj.strftime("%Y-%m-%d")
                     
                     # Get or create session - PRESERVE finalized_at and finalized_by
-                    cursor.execute('''
-                        INSERT INTO tumorboard_sessions 
-                        (entity_id, session_date, last_updated) 
-                        VALUES (?, ?, CURRENT_TIMESTAMP)
-                        ON CONFLICT(entity_id, session_date) DO UPDATE SET
-                        last_updated = CURRENT_TIMESTAMP
-                    ''', (entity_id, sql_date))
+                    session_id = self._upsert_session(cursor, entity_id, sql_date)
+                    imported_sessions += 1
                     
-                    session_id = cursor.lastrowid
-                    if session_id == 0:  # If it was an update, get the existing ID
-                        cursor.execute(
-                            'SELECT id FROM tumorboard_sessions WHERE entity_id = ? AND session_date = ?',
-                            (entity_id, sql_date)
-                        )
-                        session_id = cursor.fetchone()[0]
+                    sheet_df = pd.DataFrame(rows, columns=header)
+                    patient_rows = self._build_patient_rows(sheet_df, tumorboard_name, date_obj, session_id)
                     
-                    imported_sessions += 1
+                    dashboard_aggregates.apply_sessions(cursor, [session_id], -1)
+                    # Use INSERT OR REPLACE to handle duplicates
+                    cursor.executemany('''
+                        INSERT OR REPLACE INTO patients (
+                            unique_key, session_id, patient_number, name, birth_date, age_at_session,
+                            diagnosis, icd_code, icd_family, radiotherapy_indicated, aufgebot_type,
+                            study_enrollment, remarks, updated_at
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ''', patient_rows)
+                    dashboard_aggregates.apply_sessions(cursor, [session_id], +1)
                     
-                    # Import patients with unique key logic
-                    for _, row in df.iterrows():
-                        # Skip empty rows
-                        if pd.isna(row.get('Name', '')) or str(row.get('Name', '')).strip() == '':
-                            continue
-                        
-                        # Clean and prepare data
-                        patient_number = self._clean_value(row.get('Patientennummer', ''))
-                        if not patient_number:
-                            logging.warning(f"Skipping patient without patient number in {tumorboard_name} {session_date}")
-                            continue
-                        
-                        # Create unique key: DATUM_PATIENTENNUMMER_TUMORBOARD
-                        # Convert date back to DD-MM-YYYY format for unique key
-                        date_for_key = date_obj.strftime("%d-%m-%Y")
-                        unique_key = f"{date_for_key}_{patient_number}_{tumorboard_name}"
-                        
-                        # Clean and prepare data
-                        birth_date = self._clean_date(row.get('Geburtsdatum', ''))
-                        raw_icd_code = self._clean_value(row.get('ICD-Code', '') or row.get('ICD-10', '') or row.get('ICD Code', ''))
-                        
-                        # Calculate age automatically from birth_date and session_date
-                        calculated_age = None
-                        if birth_date:
-                            try:
-                                birth_date_obj = datetime.strptime(birth_date, "%Y-%m-%d")
-                                age_years = date_obj.year - birth_date_obj.year - ((date_obj.month, date_obj.day) < (birth_date_obj.month, birth_date_obj.day))
-                                if 0 <= age_years <= 150:  # Sanity check for reasonable age
-                                    calculated_age = age_years
-                            except Exception as e:
-                                logging.warning(f"Error calculating age for patient {patient_number}: {e}")
-                        
-                        # Extract ICD family (e.g., "D32.9" -> "D32", "C34.1" -> "C34")
-                        icd_family = None
-                        if raw_icd_code:
-                            # Remove dots and take the letter + first 1-2 digits
-                            clean_icd = raw_icd_code.upper().replace('.', '').replace(' ', '')
-                            # Match pattern like C34, D32, etc. (letter followed by digits)
-                            match = re.match(r'^([A-Z]\d{1,2})', clean_icd)
-                            if match:
-                                icd_family = match.group(1)
-                        
-                        patient_data = {
-                            'unique_key': unique_key,
-                            'session_id': session_id,
-                            'patient_number': patient_number,
-                            'name': self._clean_value(row.get('Name', '')),
-                            'birth_date': birth_date,
-                            'age_at_session': calculated_age,  # Now automatically calculated
-                            'diagnosis': self._clean_value(row.get('Diagnose', '')),
-                            'icd_code': raw_icd_code,
-                            'icd_family': icd_family,  # New field for grouped analysis
-                            'radiotherapy_indicated': self._clean_value(row.get('Radiotherapie indiziert', '')),
-                            'aufgebot_type': self._normalize_aufgebot_type(row.get('Art des Aufgebots', '')),
-                            'study_enrollment': self._clean_value(row.get('Vormerken für Studie', '')),
-                            'remarks': self._clean_value(row.get('Bemerkung/Procedere', ''))
-                        }
-                        
-                        # Use INSERT OR REPLACE to handle duplicates
-                        cursor.execute('''
-                            INSERT OR REPLACE INTO patients (
-                                unique_key, session_id, patient_number, name, birth_date, age_at_session,
-                                diagnosis, icd_code, icd_family, radiotherapy_indicated, aufgebot_type,
-                                study_enrollment, remarks, updated_at
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                        ''', (
-                            patient_data['unique_key'], patient_data['session_id'], patient_data['patient_number'],
-                            patient_data['name'], patient_data['birth_date'], patient_data['age_at_session'],
-                            patient_data['diagnosis'], patient_data['icd_code'], patient_data['icd_family'],
-                            patient_data['radiotherapy_indicated'], patient_data['aufgebot_type'], 
-                            patient_data['study_enrollment'], patient_data['remarks']
-                        ))
-                        
-                        imported_patients += 1
+                    imported_patients += len(patient_rows)
+                
+                # Unchanged sheets only get the new file stamp so the next run can take the fast path
+                sync_rows.extend(
+                    (entity_id, sheet_name, content_hash, row_count, file_stat.st_mtime, file_stat.st_size)
+                    for sheet_name, content_hash, row_count in unchanged_sheets
+                )
+                cursor.execute('DELETE FROM collection_sheet_sync WHERE entity_id = ?', (entity_id,))
+                cursor.executemany('''
+                    INSERT INTO collection_sheet_sync
+                    (entity_id, sheet_name, content_hash, row_count, file_mtime, file_size, synced_at)
+                    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', sync_rows)
                 
                 conn.commit()
-                logging.info(f"Successfully imported {imported_sessions} sessions and {imported_patients} patients from {tumorboard_name}")
+                logging.info(
+                    f"Successfully imported {imported_sessions} sessions and {imported_patients} patients from {tumorboard_name}"
+                    f" ({len(unchanged_sheets)} unchanged sheets skipped)"
+                )
                 return True
                 
         except Exception as e:
             logging.error(f"Error importing collection Excel for {tumorboard_name}: {e}")
             return False
     
-    def _clean_value(self, value):
-        """Clean and normalize values for database storage"""
-        if pd.isna(value) or value == '' or str(value).lower() == 'nan':
-            return None
+    def upsert_session_patients(self, tumorboard_name, session_date, patients_data):
+        """
+        Write a single session straight from the in-memory patient list of a tumorboard session
         
-        cleaned = str(value).strip()
+        This bypasses the collection Excel round trip. Patients of the session that are no
+        longer in the list (deleted during the session) are removed.
         
-        # Remove .0 from patient numbers
-        if cleaned.endswith('.0') and cleaned[:-2].isdigit():
-            cleaned = cleaned[:-2]
+        Args:
+            tumorboard_name (str): Name of the tumorboard entity
+            session_date (str): Date in format dd.mm.yyyy
+            patients_data (list): Patient dicts as held by TumorboardSessionPage.patients_data
+            
+        Returns:
+            int or None: Number of patients written, None on error
+        """
+        try:
+            date_obj = datetime.strptime(session_date, "%d.%m.%Y")
+            sql_date = date_obj.strftime("%Y-%m-%d")
+            
+            entity_id = self.get_or_create_entity(tumorboard_name)
+            
+            # Map session fields to the collection Excel column names used by the importer
+            records = []
+            for patient in patients_data:
+                record = {column: patient.get(field, '') for field, column in SESSION_FIELD_COLUMNS.items()}
+                # '-' is the placeholder shown for missing values; rows without a patient number are skipped below
+                for column in ('Diagnose', 'ICD-Code', 'Patientennummer'):
+                    if str(record[column]).strip() == '-':
+                        record[column] = ''
+                records.append(record)
+            
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                session_id = self._upsert_session(cursor, entity_id, sql_date)
+                patient_rows = self._build_patient_rows(pd.DataFrame(records), tumorboard_name, date_obj, session_id)
+                
+                dashboard_aggregates.apply_sessions(cursor, [session_id], -1)
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO patients (
+                        unique_key, session_id, patient_number, name, birth_date, age_at_session,
+                        diagnosis, icd_code, icd_family, radiotherapy_indicated, aufgebot_type,
+                        study_enrollment, remarks, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', patient_rows)
+                
+                # Remove patients that were deleted from the session
+                current_keys = [row[0] for row in patient_rows]
+                placeholders = ','.join('?' * len(current_keys))
+                if current_keys:
+                    cursor.execute(
+                        f'DELETE FROM patients WHERE session_id = ? AND unique_key NOT IN ({placeholders})',
+                        [session_id] + current_keys
+                    )
+                else:
+                    cursor.execute('DELETE FROM patients WHERE session_id = ?', (session_id,))
+                dashboard_aggregates.apply_sessions(cursor, [session_id], +1)
+                
+                conn.commit()
+                logging.info(f"Upserted {len(patient_rows)} patients for session {tumorboard_name} {session_date} directly")
+                return len(patient_rows)
+                
+        except Exception as e:
+            logging.error(f"Error upserting session {tumorboard_name} {session_date}: {e}")
+            return None
+    
+    def _get_sheet_sync_state(self, entity_id):
+        """Return {sheet_name: (content_hash, file_mtime, file_size)} from the last sync of an entity"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT sheet_name, content_hash, file_mtime, file_size FROM collection_sheet_sync WHERE entity_id = ?',
+                (entity_id,)
+            )
+            return {row[0]: (row[1], row[2], row[3]) for row in cursor.fetchall()}
+    
+    @staticmethod
+    def _read_collection_sheets(collection_excel_path):
+        """Yield (sheet_name, header, rows) for every sheet of a collection workbook, opened once"""
+        wb = load_workbook(collection_excel_path, read_only=True, data_only=True)
+        try:
+            for ws in wb.worksheets:
+                row_iter = ws.iter_rows(values_only=True)
+                header = next(row_iter, None)
+                if header is None:
+                    yield ws.title, [], []
+                    continue
+                header = [str(col).strip() if col is not None else f"Unnamed: {i}" for i, col in enumerate(header)]
+                # Drop fully empty rows (openpyxl reports formatted but empty rows)
+                rows = [row for row in row_iter if any(value is not None and str(value).strip() != '' for value in row)]
+                yield ws.title, header, rows
+        finally:
+            wb.close()
+    
+    @staticmethod
+    def _hash_sheet_rows(header, rows):
+        """Content hash of a sheet's header and cell values"""
+        digest = hashlib.sha1()
+        digest.update(repr(tuple(header)).encode('utf-8'))
+        for row in rows:
+            digest.update(repr(row).encode('utf-8'))
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _upsert_session(cursor, entity_id, sql_date):
+        """Insert or touch a session row and return its ID (finalization fields are preserved)"""
+        cursor.execute('''
+            INSERT INTO tumorboard_sessions 
+            (entity_id, session_date, last_updated) 
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(entity_id, session_date) DO UPDATE SET
+            last_updated = CURRENT_TIMESTAMP
+        ''', (entity_id, sql_date))
         
-        return cleaned if cleaned != '' else None
+        cursor.execute(
+            'SELECT id FROM tumorboard_sessions WHERE entity_id = ? AND session_date = ?',
+            (entity_id, sql_date)
+        )
+        return cursor.fetchone()[0]
     
-    def _clean_date(self, date_value):
-        """Clean and normalize date values"""
-        if pd.isna(date_value) or date_value == '' or str(date_value).lower() == 'nan':
-            return None
+    def _build_patient_rows(self, sheet_df, tumorboard_name, date_obj, session_id):
+        """Convert a patient sheet (DataFrame with Excel column names) into parameter tuples for the patients table"""
+        session_date = date_obj.strftime("%d.%m.%Y")
+        # Unique key format: DATUM_PATIENTENNUMMER_TUMORBOARD with DD-MM-YYYY date
+        date_for_key = date_obj.strftime("%d-%m-%Y")
+        
+        patients = normalize_patient_sheet(sheet_df, reference_date=date_obj)
         
-        date_str = str(date_value).strip()
+        missing_number = patients['patient_number'].isna()
+        if missing_number.any():
+            logging.warning(f"Skipping {int(missing_number.sum())} patients without patient number in {tumorboard_name} {session_date}")
+            patients = patients[~missing_number]
         
-        # Try to parse different date formats
-        for fmt in ["%d.%m.%Y", "%d/%m/%Y", "%Y-%m-%d"]:
-            try:
-                date_obj = datetime.strptime(date_str, fmt)
-                return date_obj.strftime("%Y-%m-%d")  # Store in SQL format
-            except ValueError:
-                continue
+        unique_keys = date_for_key + "_" + patients['patient_number'] + "_" + tumorboard_name
+        birth_dates = patients['birth_date'].dt.strftime("%Y-%m-%d")  # Store in SQL format
         
-        return None  # Could not parse date
+        columns = [
+            unique_keys, pd.Series(session_id, index=patients.index), patients['patient_number'],
+            patients['name'], birth_dates, patients['age'],
+            patients['diagnosis'], patients['icd_code'], patients['icd_family'],
+            patients['radiotherapy'], patients['aufgebot_type'],
+            patients['studie'], patients['bemerkung']
+        ]
+        return list(zip(*(to_python_values(column) for column in columns)))
     
     def export_to_excel(self, output_path=None):
         """Export entire database to Excel for analysis"""
@@ -611,37 +755,20 @@ class TumorboardDatabase:
     @staticmethod
     def _normalize_aufgebot_type(value):
         """Normalize aufgebot type to categorical values"""
-        if not value or str(value).strip() in ['-', '', 'nan']:
-            return None
-        
-        value_str = str(value).strip()
-        
-        # Map long descriptions to short categories
-        if "Kat I:" in value_str or "1-3 Tagen" in value_str:
-            return "Kat I"
-        elif "Kat II:" in value_str or "5-7 Tagen" in value_str:
-            return "Kat II"
-        elif "Kat III:" in value_str or "Nach Eingang des Konsils" in value_str:
-            return "Kat III"
-        elif value_str in ["Kat I", "Kat II", "Kat III"]:
-            return value_str
-        else:
-            # Log unknown values for debugging
-            logging.warning(f"Unknown aufgebot type value: {value_str}")
-            return value_str  # Return as-is for unknown values
+        return normalize_aufgebot_type(value)
 
 
-def sync_all_collection_files(tumorboard_base_path=None):
-    """Sync all collection Excel files to the central database"""
+def sync_all_collection_files(tumorboard_base_path=None, incremental=True):
+    """
+    Sync all collection Excel files to the central database
+    
+    With incremental=True (default) only sheets that changed since the last sync are imported.
+    """
     try:
         # Determine correct tumorboard base path if not provided
         if tumorboard_base_path is None:
-            # Try K: first, fall back to user home
-            k_path = Path("K:/RAO_Projekte/App/tumorboards")
-            if k_path.exists() and k_path.is_dir():
-                tumorboard_base_path = k_path
-            else:
-                tumorboard_base_path = Path.home() / "tumorboards"
+            # K: if the path monitor reports it as available, otherwise user home
+            tumorboard_base_path = resolve_tumorboard_base_path()
         
         # Initialize database with correct path
         db_path = tumorboard_base_path / "__SQLite_database" / "master_tumorboard.db"
@@ -670,7 +797,7 @@ def sync_all_collection_files(tumorboard_base_path=None):
                 
                 if collection_file and collection_file.exists():
                     logging.info(f"Syncing collection file: {collection_file}")
-                    success = db.import_collection_excel(entity_dir.name, collection_file, create_backup=False)
+                    success = db.import_collection_excel(entity_dir.name, collection_file, create_backup=False, incremental=incremental)
                     if success:
                         synced_count += 1
                     else:
@@ -6,9 +6,58 @@ from openpyxl.utils.dataframe import dataframe_to_rows
 import os
 import shutil
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 from .database_utils import TumorboardDatabase
 
 
+# Single background worker so collection workbooks are never written concurrently
+_collection_export_executor = None
+_collection_export_lock = threading.Lock()
+
+
+def find_collection_file(tumorboard_dir):
+    """Return the collection Excel file (alle_tumorboards_*.xlsx) of a tumorboard folder or None"""
+    for file in Path(tumorboard_dir).glob("alle_tumorboards_*.xlsx"):
+        return file
+    return None
+
+
+def schedule_collection_export(tumorboard_name, date_str, tumorboard_base_path=None, skip_database_sync=True, retries=3, retry_delay=5.0):
+    """
+    Regenerate the session sheet in the collection Excel file as a deferred background job
+    
+    Used after the session was written directly to the database, so by default the
+    collection file is not synced back into the database again. Failed exports (e.g. the
+    workbook is open in Excel on another workstation) are retried.
+    
+    Returns:
+        concurrent.futures.Future: Resolves to True on success, False otherwise
+    """
+    global _collection_export_executor
+    
+    def run_export():
+        base_path = tumorboard_base_path if tumorboard_base_path is not None else Path.home() / "tumorboards"
+        if find_collection_file(base_path / tumorboard_name) is None:
+            logging.error(f"Collection Excel file not found for {tumorboard_name}, deferred export skipped")
+            return False
+        for attempt in range(1, retries + 1):
+            if export_tumorboard_to_collection(tumorboard_name, date_str, tumorboard_base_path, skip_database_sync=skip_database_sync):
+                return True
+            if attempt < retries:
+                logging.warning(f"Deferred collection export for {tumorboard_name} {date_str} failed (attempt {attempt}/{retries}), retrying in {retry_delay}s")
+                time.sleep(retry_delay)
+        logging.error(f"Deferred collection export for {tumorboard_name} {date_str} failed after {retries} attempts")
+        return False
+    
+    with _collection_export_lock:
+        if _collection_export_executor is None:
+            _collection_export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="CollectionExport")
+        future = _collection_export_executor.submit(run_export)
+    
+    logging.info(f"Scheduled deferred collection export for {tumorboard_name} {date_str}")
+    return future
 
 
 def export_tumorboard_to_collection(tumorboard_name, date_str, tumorboard_base_path=None, skip_database_sync=False):
@@ -23,10 +72,7 @@ def export_tumorboard_to_collection(tumorboard_name, date_str, tumorboard_base_p
         daily_excel_path = tumorboard_dir / date_str / f"{date_str}.xlsx"
         
         # Find collection file flexibly - look for any file starting with "alle_tumorboards_"
-        collection_file_path = None
-        for file in tumorboard_dir.glob("alle_tumorboards_*.xlsx"):
-            collection_file_path = file
-            break
+        collection_file_path = find_collection_file(tumorboard_dir)
         
         # Check if daily Excel file exists
         if not daily_excel_path.exists():
@@ -123,7 +169,8 @@ def sync_collection_to_database(tumorboard_name, collection_excel_path, tumorboa
             db_path = None  # Use default user home path
         
         db = TumorboardDatabase(db_path=db_path)
-        success = db.import_collection_excel(tumorboard_name, collection_excel_path, create_backup=True)
+        # Incremental: only the sheets changed since the last sync are parsed and upserted
+        success = db.import_collection_excel(tumorboard_name, collection_excel_path, create_backup=True, incremental=True)
         
         if success:
             logging.info(f"Successfully synced {tumorboard_name} collection to central database")
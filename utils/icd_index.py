@@ -0,0 +1,224 @@
+import heapq
+import json
+import logging
+import re
+import threading
+from bisect import bisect_left
+from pathlib import Path
+
+# Default location of the ICD-10 catalogue shipped with the app
+ICD_DATABASE_PATH = Path(__file__).resolve().parent / "icd_database.json"
+
+# Maximum number of hits returned to the ICD editor
+MAX_RESULTS = 50
+
+# Umlaut folding: "ä" -> "a" for what users type on a Swiss keyboard without umlauts,
+# "ä" -> "ae" for the classic transliteration. Both variants are indexed.
+_BASE_FOLD = str.maketrans({'ä': 'a', 'ö': 'o', 'ü': 'u', 'ß': 'ss', 'é': 'e', 'è': 'e', 'à': 'a'})
+_TRANSLIT_FOLD = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss', 'é': 'e', 'è': 'e', 'à': 'a'})
+# Words of descriptions and queries: letters (incl. umlauts and accents) and digits
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+def fold_text(text):
+    """Lowercase and fold umlauts/ß to their base letters"""
+    return str(text).lower().translate(_BASE_FOLD)
+
+
+def split_words(text):
+    """Lowercase words of a description or query (shared by indexing and search)"""
+    return _WORD_PATTERN.findall(str(text).lower())
+
+
+def tokenize(text):
+    """Split text into folded search tokens"""
+    return [word.translate(_BASE_FOLD) for word in split_words(text)]
+
+
+def normalize_code(code):
+    """Normalize an ICD code for lookups ("c34.1 " -> "C341")"""
+    return str(code).upper().replace('.', '').replace(' ', '').strip()
+
+
+class _TrieNode:
+    """Node of the ICD code prefix trie"""
+    __slots__ = ('children', 'codes')
+
+    def __init__(self):
+        self.children = {}
+        self.codes = []  # All codes in this subtree, in sorted order
+
+
+class ICDIndex:
+    """In-memory ICD-10 index with a prefix trie over codes and an inverted token index over descriptions"""
+
+    def __init__(self, entries):
+        self.entries = dict(entries)
+        self._sorted_codes = sorted(self.entries)
+        self._normalized_codes = {code: normalize_code(code) for code in self._sorted_codes}
+        self._folded_descriptions = {code: fold_text(desc) for code, desc in self.entries.items()}
+
+        # Prefix trie over normalized codes
+        self._trie = _TrieNode()
+        for code in self._sorted_codes:
+            node = self._trie
+            for char in self._normalized_codes[code]:
+                node = node.children.setdefault(char, _TrieNode())
+                node.codes.append(code)
+
+        # Inverted index: token -> {code: position of first occurrence}
+        self._postings = {}
+        for code, description in self.entries.items():
+            for position, (token, translit) in enumerate(_token_variants(description)):
+                self._postings.setdefault(token, {}).setdefault(code, position)
+                if translit != token:
+                    self._postings.setdefault(translit, {}).setdefault(code, position)
+        self._sorted_tokens = sorted(self._postings)
+
+        logging.info(f"ICD index built with {len(self.entries)} codes and {len(self._sorted_tokens)} tokens")
+
+    @classmethod
+    def from_json(cls, json_path=None):
+        """Build the index from the ICD JSON catalogue"""
+        json_path = Path(json_path) if json_path else ICD_DATABASE_PATH
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_description(self, icd_code):
+        """Exact lookup with fallback to the 3-character main category"""
+        icd_code = str(icd_code).strip().upper()
+        if icd_code in self.entries:
+            return self.entries[icd_code]
+        return self.entries.get(icd_code[:3])
+
+    def search_code(self, search_term, limit=MAX_RESULTS):
+        """
+        Search codes by pattern.
+
+        Ranking: exact match, then prefix matches (trie walk), then codes that
+        merely contain the term, each group in code order.
+        """
+        term = normalize_code(search_term)
+        if not term:
+            return []
+
+        results = []
+        seen = set()
+
+        node = self._trie
+        for char in term:
+            node = node.children.get(char)
+            if node is None:
+                break
+        else:
+            # Exact hit first, then the remaining subtree
+            exact = [code for code in node.codes if self._normalized_codes[code] == term]
+            for code in exact + node.codes:
+                if code not in seen:
+                    seen.add(code)
+                    results.append(code)
+                    if len(results) >= limit:
+                        break
+
+        if len(results) < limit:
+            for code in self._sorted_codes:
+                if code not in seen and term in self._normalized_codes[code]:
+                    seen.add(code)
+                    results.append(code)
+                    if len(results) >= limit:
+                        break
+
+        return [(code, self.entries[code]) for code in results]
+
+    def search_description(self, search_term, limit=MAX_RESULTS):
+        """
+        Search descriptions by tokens; every query token must match a token prefix.
+
+        Ranking: more whole-word matches first, then earlier match position,
+        then shorter descriptions. Falls back to folded substring matching
+        when the token search yields nothing.
+        """
+        query_tokens = tokenize(search_term)
+        if not query_tokens:
+            return []
+
+        candidates = None
+        for query_token in query_tokens:
+            matches = self._match_token_prefix(query_token)
+            if candidates is None:
+                candidates = matches
+            else:
+                candidates = {code: info for code, info in candidates.items() if code in matches}
+                for code in candidates:
+                    exact, position = candidates[code]
+                    other_exact, other_position = matches[code]
+                    candidates[code] = (exact + other_exact, min(position, other_position))
+            if not candidates:
+                break
+
+        if candidates:
+            ranked = heapq.nsmallest(
+                limit,
+                candidates.items(),
+                key=lambda item: (-item[1][0], item[1][1], len(self.entries[item[0]]), item[0])
+            )
+            return [(code, self.entries[code]) for code, _ in ranked]
+
+        # Fallback: substring search across folded descriptions
+        folded_term = fold_text(search_term).strip()
+        results = [code for code in self._sorted_codes if folded_term in self._folded_descriptions[code]]
+        return [(code, self.entries[code]) for code in results[:limit]]
+
+    def _match_token_prefix(self, query_token):
+        """Return {code: (exact_matches, first_position)} for all tokens starting with query_token"""
+        matches = {}
+        tokens = self._sorted_tokens
+        for i in range(bisect_left(tokens, query_token), len(tokens)):
+            token = tokens[i]
+            if not token.startswith(query_token):
+                break
+            is_exact = 1 if token == query_token else 0
+            for code, position in self._postings[token].items():
+                previous = matches.get(code)
+                if previous is None:
+                    matches[code] = (is_exact, position)
+                else:
+                    matches[code] = (max(previous[0], is_exact), min(previous[1], position))
+        return matches
+
+
+def _token_variants(description):
+    """Yield (folded, transliterated) pairs for each word of a description"""
+    for word in split_words(description):
+        yield word.translate(_BASE_FOLD), word.translate(_TRANSLIT_FOLD)
+
+
+_index = None
+_index_lock = threading.Lock()
+_loader_thread = None
+
+
+def get_icd_index():
+    """Return the process-wide ICD index, building it on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                try:
+                    _index = ICDIndex.from_json()
+                except Exception as e:
+                    logging.error(f"Error loading ICD database: {e}")
+                    return ICDIndex({})
+    return _index
+
+
+def preload_icd_index():
+    """Build the ICD index in a background thread so the first search is instant"""
+    global _loader_thread
+    if _index is not None or (_loader_thread is not None and _loader_thread.is_alive()):
+        return
+    _loader_thread = threading.Thread(target=get_icd_index, name="ICDIndexLoader", daemon=True)
+    _loader_thread.start()
@@ -0,0 +1,102 @@
+"""
+Lazy page registry for the main window.
+
+main.py used to import every page module at startup, which pulls in pandas, openpyxl,
+the KISIM automation scripts (pyautogui, OCR) and the dashboard utilities before the
+first frame is shown. Pages are registered here by class name and their module is
+imported the first time the page is navigated to.
+
+Widgets are identified by class name (see is_page), so checking which page is shown
+never forces an import of a page module that has not been used yet.
+"""
+
+import importlib
+import logging
+import time
+
+# Page class name -> module that defines it
+PAGE_MODULES = {
+    # Tumor navigator
+    "TumorGroupPage": "pages.tumorgroup_pages.tumor_group_page",
+    "NeuroonkologiePage": "pages.tumorgroup_pages.neuroonkologie_page",
+    "KopfHalsTumorePage": "pages.tumorgroup_pages.KopfHalsTumorePage",
+    "ThorakaleTumorePage": "pages.tumorgroup_pages.ThorakaleTumorePage",
+    "GastrointestinaleTumorePage": "pages.tumorgroup_pages.GastrointestinaleTumorePage",
+    "UrogenitaleTumorePage": "pages.tumorgroup_pages.UrogenitaleTumorePage",
+    "GynPage": "pages.tumorgroup_pages.GynPage",
+    "BindegewebstumorePage": "pages.tumorgroup_pages.bindegewebstumore_page",
+    "HauttumorePage": "pages.tumorgroup_pages.HauttumorePage",
+    "LymphomePage": "pages.tumorgroup_pages.LymphomePage",
+    "FernmetastasenPage": "pages.tumorgroup_pages.FernmetastasenPage",
+    "GutartigeErkrankungenPage": "pages.tumorgroup_pages.GutartigeErkrankungenPage",
+    "PlaceholderGroupPage": "pages.tumorgroup_pages.placeholder_group_page",
+    "EntityPage": "pages.entity_pages.EntityPage",
+    "SOPPage": "pages.entity_pages.sop_page",
+    "ContouringPage": "pages.entity_pages.contouring_page",
+    "PdfReaderPage": "pages.pdf_reader",
+    # KISIM / Utilities
+    "KisimPage": "pages.kisim_page",
+    "UtilitiesPage": "pages.utilities_page",
+    "CmdScriptsPage": "pages.cmdscripts_page",
+    # Tumorboards
+    "TumorboardsPage": "pages.tumorboards_page",
+    "SpecificTumorboardPage": "pages.specific_tumorboard_page",
+    "ExcelViewerPage": "pages.excel_viewer_page",
+    "TumorboardSessionPage": "pages.tumorboard_session_page",
+    # Backoffice / Developer Area
+    "BackofficePage": "pages.backoffice_page",
+    "BackofficeTumorboardsPage": "pages.backoffice_tumorboards_page",
+    "BackofficeExcelViewerPage": "pages.backoffice_excel_viewer_page",
+    "BackofficePageLeistungsabrechnungen": "pages.backoffice_page_leistungsabrechnungen",
+    "BackofficePageErstkonsultationen": "pages.backoffice_page_erstkonsultationen",
+    "DeveloperAreaPage": "pages.developer_area_page_simple",
+}
+
+# Tumor group tile name -> page class name
+GROUP_PAGES = {
+    "Neuroonkologie": "NeuroonkologiePage",
+    "Kopf-Hals-Tumore": "KopfHalsTumorePage",
+    "Thorakale Tumore": "ThorakaleTumorePage",
+    "Gastrointestinale Tumore": "GastrointestinaleTumorePage",
+    "Urogenitale Tumore": "UrogenitaleTumorePage",
+    "Gynäkologische Tumore": "GynPage",
+    "Bindegewebstumore": "BindegewebstumorePage",
+    "Hauttumore": "HauttumorePage",
+    "Lymphome": "LymphomePage",
+    "Fernmetastasen": "FernmetastasenPage",
+    "Gutartige Erkrankungen": "GutartigeErkrankungenPage",
+}
+
+# Seconds spent importing each page module on first use (reported in the startup timing log)
+import_times = {}
+
+
+def get_page_class(class_name):
+    """
+    Return a page class, importing its module on first use.
+
+    Raises:
+        KeyError: If the page is not registered
+    """
+    module_name = PAGE_MODULES[class_name]
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    if module_name not in import_times:
+        import_times[module_name] = time.perf_counter() - start
+        logging.info(f"Imported page module {module_name} in {import_times[module_name] * 1000:.0f} ms")
+    return getattr(module, class_name)
+
+
+def is_page(widget, page_type):
+    """
+    Check whether a widget is an instance of a page class or a subclass of it.
+
+    Args:
+        widget: Widget from the stacked widget (may be None)
+        page_type (str | type): Page class name or page class
+    """
+    if widget is None:
+        return False
+    if isinstance(page_type, type):
+        return isinstance(widget, page_type)
+    return any(cls.__name__ == page_type for cls in type(widget).__mro__)
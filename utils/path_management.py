@@ -3,15 +3,25 @@ Path management utilities for Backoffice functionality.
 
 This module provides centralized path management for all Backoffice pages,
 implementing priority logic for network vs local paths.
+
+The availability of the network path comes from the background monitor in
+utils.path_monitor (cached, bounded probe timeout), so no lookup blocks on a dead mount.
 """
 
 import os
 import logging
 from pathlib import Path
 from PyQt6.QtWidgets import QMessageBox
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QObject, pyqtSignal
 from PyQt6.QtGui import QFont
 
+from utils.path_monitor import get_network_monitor, NETWORK_BASE_PATH, LOCAL_BASE_PATH, BACKOFFICE_DIRNAME
+
+
+class PathStatusSignals(QObject):
+    """Forwards availability changes from the network monitor thread to the GUI thread"""
+    network_availability_changed = pyqtSignal(bool)
+
 
 class BackofficePathManager:
     """Manages path resolution for Backoffice functionality with network/local priority."""
@@ -20,9 +30,33 @@ class BackofficePathManager:
     _network_path_available = None
     _local_path_available = None
     _warning_shown = False
+    _signals = None
+    
+    NETWORK_BASE_PATH = NETWORK_BASE_PATH
+    LOCAL_BASE_PATH = LOCAL_BASE_PATH
+    
+    @classmethod
+    def signals(cls):
+        """
+        Qt signals of the path monitor (create from the GUI thread, e.g. at startup).
+        
+        Returns:
+            PathStatusSignals: network_availability_changed(bool) is emitted when K: goes away or comes back
+        """
+        if cls._signals is None:
+            cls._signals = PathStatusSignals()
+            get_network_monitor().add_listener(cls._on_network_availability_changed)
+        return cls._signals
     
-    NETWORK_BASE_PATH = Path("K:/RAO_Projekte/App/tumorboards")
-    LOCAL_BASE_PATH = Path.home() / "tumorboards"
+    @classmethod
+    def _on_network_availability_changed(cls, available):
+        """Called from the monitor thread"""
+        cls._network_path_available = available
+        if available:
+            # Warn again the next time the share goes away
+            cls.reset_warning_state()
+        if cls._signals is not None:
+            cls._signals.network_availability_changed.emit(available)
     
     @classmethod
     def get_backoffice_path(cls, show_warnings=True):
@@ -42,12 +76,12 @@ class BackofficePathManager:
         Raises:
             FileNotFoundError: If neither path is available
         """
-        # Check network path
-        network_backoffice = cls.NETWORK_BASE_PATH / "_Backoffice"
-        local_backoffice = cls.LOCAL_BASE_PATH / "_Backoffice"
+        # Check network path (cached by the monitor), the local path is on the local disk
+        network_backoffice = cls.NETWORK_BASE_PATH / BACKOFFICE_DIRNAME
+        local_backoffice = cls.LOCAL_BASE_PATH / BACKOFFICE_DIRNAME
         
         # Update class-level status variables
-        cls._network_path_available = network_backoffice.exists()
+        cls._network_path_available = get_network_monitor().is_backoffice_available()
         cls._local_path_available = local_backoffice.exists()
         
         logging.info(f"Path status check: Network={cls._network_path_available}, Local={cls._local_path_available}")
@@ -82,8 +116,8 @@ class BackofficePathManager:
         Returns:
             tuple: (Path object for base tumorboard directory, bool indicating if network path was used)
         """
-        # Check network path
-        if cls.NETWORK_BASE_PATH.exists():
+        # Check network path (cached by the monitor)
+        if cls.is_network_path_available():
             return cls.NETWORK_BASE_PATH, True
         
         # Fallback to local path
@@ -209,8 +243,8 @@ class BackofficePathManager:
     
     @classmethod
     def is_network_path_available(cls):
-        """Check if the network path is currently available."""
-        return cls.NETWORK_BASE_PATH.exists()
+        """Check if the network path is currently available (cached status of the path monitor)."""
+        return get_network_monitor().is_available()
     
     @classmethod
     def is_local_path_available(cls):
@@ -244,5 +278,6 @@ class BackofficePathManager:
             "network_available": network_available,
             "local_available": local_available,
             "network_path": str(cls.NETWORK_BASE_PATH),
-            "local_path": str(cls.LOCAL_BASE_PATH)
+            "local_path": str(cls.LOCAL_BASE_PATH),
+            "network_checked_at": get_network_monitor().get_status()["checked_at"]
         } 
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""
+Background availability monitor for the tumorboard share (K:).
+
+Path("K:/...").exists() blocks until the SMB timeout when the share is slow or not mounted,
+and the path lookups ran on the GUI thread several times per navigation. NetworkPathMonitor
+probes the share on a daemon thread and caches the result, so path resolution only reads
+the cached status:
+
+- the first lookup waits for the first probe, but at most PROBE_TIMEOUT_S
+- a probe that does not answer within PROBE_TIMEOUT_S counts as "not available"; a hung
+  probe is never started twice (the next one starts once it has returned)
+- the share is probed again every PROBE_INTERVAL_S (PROBE_INTERVAL_UNAVAILABLE_S while it is
+  down, so a reconnect is noticed quickly) or on request_probe()
+- listeners are called with the new availability whenever it changes (from the probe thread)
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+NETWORK_BASE_PATH = Path("K:/RAO_Projekte/App/tumorboards")
+LOCAL_BASE_PATH = Path.home() / "tumorboards"
+BACKOFFICE_DIRNAME = "_Backoffice"
+
+PROBE_TIMEOUT_S = 2.0
+PROBE_INTERVAL_S = 30.0
+PROBE_INTERVAL_UNAVAILABLE_S = 10.0
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+class NetworkPathMonitor:
+    """Cached, periodically refreshed availability of the network tumorboard base path"""
+
+    def __init__(self, base_path=NETWORK_BASE_PATH, probe_timeout=PROBE_TIMEOUT_S,
+                 interval=PROBE_INTERVAL_S, unavailable_interval=PROBE_INTERVAL_UNAVAILABLE_S):
+        self.base_path = Path(base_path)
+        self.probe_timeout = probe_timeout
+        self.interval = interval
+        self.unavailable_interval = unavailable_interval
+        self._lock = threading.Lock()
+        self._available = None               # None = not probed yet
+        self._backoffice_available = None
+        self._checked_at = None
+        self._last_probe_seconds = None
+        self._probe_thread = None
+        self._first_probe_done = threading.Event()
+        self._wake = threading.Event()
+        self._loop_thread = None
+        self._listeners = []
+
+    # --- Status (never blocks longer than probe_timeout) ---
+
+    def is_available(self):
+        """True if the network base path was reachable at the last probe"""
+        self._wait_for_first_probe()
+        with self._lock:
+            return bool(self._available)
+
+    def is_backoffice_available(self):
+        """True if <network base>/_Backoffice was reachable at the last probe"""
+        self._wait_for_first_probe()
+        with self._lock:
+            return bool(self._backoffice_available)
+
+    def get_status(self):
+        """
+        Returns:
+            dict: available, backoffice_available, checked_at (time.time() of the last probe,
+                  None if none finished yet), probe_seconds, probe_running
+        """
+        with self._lock:
+            return {
+                "available": self._available,
+                "backoffice_available": self._backoffice_available,
+                "checked_at": self._checked_at,
+                "probe_seconds": self._last_probe_seconds,
+                "probe_running": self._probe_thread is not None and self._probe_thread.is_alive(),
+            }
+
+    def is_dir(self, path):
+        """
+        Bounded isdir() for a path on the share (e.g. one tumorboard folder).
+
+        Returns False right away while the share is down; a check that does not answer
+        within probe_timeout marks the share as unavailable.
+        """
+        if not self.is_available():
+            return False
+        result = {}
+
+        def check():
+            result["is_dir"] = os.path.isdir(path)
+
+        thread = threading.Thread(target=check, name="NetworkPathCheck", daemon=True)
+        thread.start()
+        thread.join(self.probe_timeout)
+        if thread.is_alive():
+            logging.warning(f"Network path check timed out after {self.probe_timeout}s: {path}")
+            self._set_status(False, False, None)
+            self.request_probe()
+            return False
+        return result.get("is_dir", False)
+
+    # --- Listeners ---
+
+    def add_listener(self, callback):
+        """callback(available: bool); called from the probe thread when the availability changes"""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    # --- Probing ---
+
+    def start(self):
+        """Start the periodic probe loop (idempotent)"""
+        with self._lock:
+            if self._loop_thread is not None:
+                return
+            self._loop_thread = threading.Thread(target=self._run, name="NetworkPathMonitor", daemon=True)
+            self._loop_thread.start()
+
+    def request_probe(self):
+        """Probe again now instead of waiting for the next interval (non-blocking)"""
+        self.start()
+        self._wake.set()
+
+    def _wait_for_first_probe(self):
+        if self._first_probe_done.is_set():
+            return
+        self.start()
+        if not self._first_probe_done.wait(self.probe_timeout):
+            # Share does not answer: report it as unavailable until the probe returns
+            self._set_status(False, False, None)
+
+    def _run(self):
+        while True:
+            self._probe()
+            with self._lock:
+                interval = self.interval if self._available else self.unavailable_interval
+            self._wake.wait(interval)
+            self._wake.clear()
+
+    def _probe(self):
+        """Run one probe and wait for it at most probe_timeout (a hung probe is not restarted)"""
+        with self._lock:
+            thread = self._probe_thread
+            started = thread is None or not thread.is_alive()
+            if started:
+                thread = threading.Thread(target=self._probe_worker, name="NetworkPathProbe", daemon=True)
+                self._probe_thread = thread
+                thread.start()
+        thread.join(self.probe_timeout)
+        if thread.is_alive():
+            if started:
+                logging.warning(f"Network path probe timed out after {self.probe_timeout}s: {self.base_path}")
+            self._set_status(False, False, None)
+
+    def _probe_worker(self):
+        start = time.perf_counter()
+        try:
+            available = os.path.isdir(self.base_path)
+            backoffice_available = available and os.path.isdir(self.base_path / BACKOFFICE_DIRNAME)
+        except OSError as e:
+            logging.warning(f"Network path probe failed: {e}")
+            available = backoffice_available = False
+        seconds = time.perf_counter() - start
+        if seconds > self.probe_timeout:
+            # Answered, but too slow to be used from the GUI
+            available = backoffice_available = False
+        self._set_status(available, backoffice_available, seconds)
+
+    def _set_status(self, available, backoffice_available, probe_seconds):
+        with self._lock:
+            changed = self._available != available
+            self._available = available
+            self._backoffice_available = backoffice_available
+            self._checked_at = time.time()
+            if probe_seconds is not None:
+                self._last_probe_seconds = probe_seconds
+            listeners = list(self._listeners)
+        self._first_probe_done.set()
+        if changed:
+            logging.info(f"Network path {self.base_path} {'available' if available else 'not available'}")
+            for callback in listeners:
+                try:
+                    callback(available)
+                except Exception as e:
+                    logging.error(f"Error in network path listener: {e}")
+
+
+def get_network_monitor():
+    """Shared monitor for the whole app (started on first use)"""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = NetworkPathMonitor()
+        monitor = _monitor
+    monitor.start()
+    return monitor
+
+
+def resolve_tumorboard_base_path():
+    """
+    Tumorboard base path: K: if the monitor reports it as available, otherwise {home}/tumorboards.
+
+    Returns:
+        Path: Base tumorboard directory
+    """
+    if get_network_monitor().is_available():
+        return NETWORK_BASE_PATH
+    return LOCAL_BASE_PATH
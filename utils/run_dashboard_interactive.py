@@ -18,6 +18,7 @@ if parent_dir not in sys.path:
 from utils.dashboard_html_generator import generate_complete_dashboard
 from utils.database_utils import sync_all_collection_files
 from utils.dashboard_data_export import test_aufgebot_mapping
+from utils.path_monitor import resolve_tumorboard_base_path, NETWORK_BASE_PATH
 
 def main():
     """Main function to generate and open dashboard"""
@@ -46,12 +47,10 @@ def main():
         print("\n🎨 Generiere Dashboard HTML...")
         
         # Determine correct tumorboard base path
-        k_path = Path("K:/RAO_Projekte/App/tumorboards")
-        if k_path.exists() and k_path.is_dir():
-            tumorboard_base_path = k_path
+        tumorboard_base_path = resolve_tumorboard_base_path()
+        if tumorboard_base_path == NETWORK_BASE_PATH:
             print(f"✅ Verwende K:-Pfad: {tumorboard_base_path}")
         else:
-            tumorboard_base_path = Path.home() / "tumorboards"
             print(f"⚠️ K:-Pfad nicht verfügbar, verwende Fallback: {tumorboard_base_path}")
         
         dashboard_path = generate_complete_dashboard(interactive=True, tumorboard_base_path=tumorboard_base_path)
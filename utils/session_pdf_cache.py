@@ -0,0 +1,215 @@
+"""
+PDF resolution and prefetch cache for the tumorboard session PDF viewer.
+
+Resolving a patient's PDF used to probe up to eight file name patterns with
+Path.exists() against the network share on every patient click. The resolver
+lists the session's date folder once, resolves patients against that listing and
+copies the PDFs of the next patients into a local cache directory in the
+background, so switching patients during a live tumorboard is served locally.
+
+The cache lives in ~/patdata/pdf_cache/ and is bounded in size (least recently
+used files are evicted first). A session's cached files are removed when the
+session is finalized.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PDF_CACHE_DIR = Path.home() / "patdata" / "pdf_cache"
+
+# Upper bound for all cached PDFs of all sessions
+MAX_CACHE_BYTES = 500 * 1024 * 1024
+
+# Minimum seconds between two listings of the date folder after a cache miss
+RELIST_INTERVAL = 10
+
+
+def candidate_pdf_names(patient_name, patient_number, patient_position):
+    """
+    File names to try for a patient, in priority order, with the viewer zoom for each.
+
+    Current naming is "Nachname - Patientennummer.pdf"; the others are older conventions.
+    """
+    first_word = patient_name.strip().split()[0] if patient_name.strip() else "Unknown"
+    return [
+        (f"{first_word} - {patient_number}.pdf", 120),
+        (f"{first_word}-{patient_number}.pdf", 115),  # Without spaces
+        (f"{patient_number}.pdf", 115),  # Just the patient number
+        (f"{first_word}_{patient_number}.pdf", 115),  # Underscore instead of dash
+        (f"{first_word} _ {patient_number}.pdf", 115),  # Spaces with underscore
+        (f"{patient_position} - {patient_number}.pdf", 115),  # Old position-based naming
+        (f"{patient_position}-{patient_number}.pdf", 115),  # Old position-based without spaces
+        (f"Patient_{patient_position}.pdf", 115),  # Generic pattern
+    ]
+
+
+class SessionPdfResolver:
+    """Resolves session PDFs from a single folder listing and prefetches them into a local cache"""
+
+    def __init__(self, date_folder, cache_name, cache_dir=None, max_cache_bytes=MAX_CACHE_BYTES):
+        self.date_folder = Path(date_folder)
+        self.cache_dir = Path(cache_dir or PDF_CACHE_DIR) / cache_name
+        self.cache_root = self.cache_dir.parent
+        self.max_cache_bytes = max_cache_bytes
+        self._lock = threading.Lock()
+        self._listing = None      # lower-case file name -> (Path, size, mtime_ns)
+        self._listed_at = 0
+        self._in_flight = set()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="SessionPdfPrefetch")
+
+    def _list_folder(self):
+        """List the date folder once (file names are matched case-insensitively like on Windows)"""
+        listing = {}
+        try:
+            with os.scandir(self.date_folder) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.lower().endswith('.pdf'):
+                        stat = entry.stat()
+                        listing[entry.name.lower()] = (Path(entry.path), stat.st_size, stat.st_mtime_ns)
+        except OSError as e:
+            logging.error(f"Could not list PDF folder {self.date_folder}: {e}")
+        with self._lock:
+            self._listing = listing
+            self._listed_at = time.monotonic()
+        logging.info(f"Indexed {len(listing)} PDFs in {self.date_folder}")
+        return listing
+
+    def preload(self):
+        """List the date folder in the background so the first patient click does not wait for it"""
+        self._executor.submit(self._get_listing)
+
+    def _get_listing(self):
+        with self._lock:
+            listing = self._listing
+        return listing if listing is not None else self._list_folder()
+
+    def resolve(self, patient_name, patient_number, patient_position):
+        """
+        Find a patient's PDF on the share.
+
+        Returns:
+            tuple: (Path, zoom, size, mtime_ns) or None if no PDF exists
+        """
+        candidates = candidate_pdf_names(patient_name, patient_number, patient_position)
+        listing = self._get_listing()
+        match = self._match(listing, candidates)
+        if match is None and time.monotonic() - self._listed_at > RELIST_INTERVAL:
+            # The PDF may have been added after the folder was listed
+            match = self._match(self._list_folder(), candidates)
+        return match
+
+    @staticmethod
+    def _match(listing, candidates):
+        for name, zoom in candidates:
+            entry = listing.get(name.lower())
+            if entry is not None:
+                path, size, mtime_ns = entry
+                return path, zoom, size, mtime_ns
+        return None
+
+    def _cache_path(self, path, size, mtime_ns):
+        # Size and mtime in the name: a replaced PDF on the share never hits a stale copy
+        return self.cache_dir / f"{path.stem}__{size}_{mtime_ns}.pdf"
+
+    def get_local_path(self, path, size, mtime_ns):
+        """Return the cached copy of a resolved PDF if available, otherwise the share path"""
+        cache_path = self._cache_path(path, size, mtime_ns)
+        if cache_path.exists():
+            try:
+                os.utime(cache_path)  # Mark as recently used for eviction
+            except OSError:
+                pass
+            return cache_path
+        self._schedule_copy(path, size, mtime_ns)
+        return path
+
+    def prefetch(self, patients):
+        """
+        Copy the PDFs of the given patients into the local cache in the background.
+
+        Args:
+            patients (iterable): (patient_name, patient_number, patient_position) tuples
+        """
+        try:
+            self._executor.submit(self._prefetch_job, list(patients))
+        except RuntimeError:
+            pass  # Resolver was closed (session finalized)
+
+    def _prefetch_job(self, patients):
+        for patient_name, patient_number, patient_position in patients:
+            match = self.resolve(patient_name, patient_number, patient_position)
+            if match is not None:
+                path, _, size, mtime_ns = match
+                self._schedule_copy(path, size, mtime_ns)
+
+    def _schedule_copy(self, path, size, mtime_ns):
+        cache_path = self._cache_path(path, size, mtime_ns)
+        with self._lock:
+            if cache_path in self._in_flight or cache_path.exists():
+                return
+            self._in_flight.add(cache_path)
+        try:
+            self._executor.submit(self._copy_to_cache, path, cache_path)
+        except RuntimeError:
+            # Resolver was closed (session finalized)
+            with self._lock:
+                self._in_flight.discard(cache_path)
+
+    def _copy_to_cache(self, path, cache_path):
+        """Copy one PDF into the cache via a partial file and atomic rename"""
+        part_path = cache_path.with_suffix('.part')
+        try:
+            if self._closed:
+                return
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(path, part_path)
+            if self._closed:
+                # clear_cache() ran during the copy and does not wait for it
+                shutil.rmtree(self.cache_dir, ignore_errors=True)
+                return
+            os.replace(part_path, cache_path)
+            logging.info(f"Prefetched PDF into cache: {path.name}")
+            self._evict()
+        except Exception as e:
+            if not self._closed:
+                logging.warning(f"Could not prefetch PDF {path}: {e}")
+            try:
+                part_path.unlink()
+            except OSError:
+                pass
+        finally:
+            with self._lock:
+                self._in_flight.discard(cache_path)
+
+    def _evict(self):
+        """Delete least recently used cached PDFs until the cache fits its size bound"""
+        try:
+            files = []
+            for pdf in self.cache_root.glob("*/*.pdf"):
+                stat = pdf.stat()
+                files.append((stat.st_mtime, stat.st_size, pdf))
+        except OSError as e:
+            logging.warning(f"Could not scan PDF cache: {e}")
+            return
+        total = sum(size for _, size, _ in files)
+        for _, size, pdf in sorted(files):
+            if total <= self.max_cache_bytes:
+                break
+            try:
+                pdf.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def clear_cache(self):
+        """Remove this session's cached PDFs (returns without waiting for a running copy)"""
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        logging.info(f"Cleared PDF cache: {self.cache_dir}")
@@ -0,0 +1,444 @@
+"""
+In-memory workbook for the temporary tumorboard session file.
+
+The session page used to parse the whole *_temp_session.xlsx with pandas for every
+read and rewrite it with DataFrame.to_excel for every save. SessionWorkbook loads
+the file once with openpyxl, serves reads from memory, patches only the cells that
+changed and writes the workbook back on a dedicated I/O thread. Formatting of the
+session Excel is preserved since the workbook is never rebuilt from a DataFrame.
+
+Every edit is first appended to a local journal (SessionJournal) before it is
+applied in memory. If the app crashes before the background write reached the
+(network) session file, the journal is replayed the next time the session is
+opened, so no edit is lost. Each write appends a commit marker right before the
+atomic replace of the session file (and an abort marker if it fails), so a
+replay never re-applies edits that already reached the file.
+
+Row indices are DataFrame indices as produced by pd.read_excel (0 = first row
+below the header), so existing patient['index'] values keep working.
+"""
+
+import io
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import load_workbook
+
+HEADER_ROW = 1
+
+# Columns used to verify a journaled row deletion before it is replayed
+ROW_IDENTITY_COLUMNS = ['Patientennummer', 'Name']
+
+# Save states reported to the status callback
+STATUS_PENDING = 'pending'
+STATUS_SAVED = 'saved'
+STATUS_ERROR = 'error'
+
+
+def get_session_journal_path(tumorboard_name, date_str):
+    """Local journal location for a session (~/patdata/session_journal/)"""
+    return Path.home() / "patdata" / "session_journal" / f"{tumorboard_name}_{date_str}.jsonl"
+
+
+class SessionJournal:
+    """Append-only local JSON-lines journal of session edits not yet written to the session file"""
+
+    def __init__(self, journal_path):
+        self.journal_path = Path(journal_path)
+
+    def read(self):
+        """Return all intact entries; a torn last line (crash while appending) is ignored"""
+        entries = []
+        if not self.journal_path.exists():
+            return entries
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logging.warning(f"Ignoring incomplete journal line in {self.journal_path}")
+        return entries
+
+    def append(self, entry):
+        """Append one entry and force it to disk"""
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def rewrite(self, entries):
+        """Replace the journal with the given entries (atomic), removing it if empty"""
+        if not entries:
+            self.clear()
+            return
+        tmp_path = self.journal_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+    def clear(self):
+        """Delete the journal"""
+        try:
+            self.journal_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SessionWorkbook:
+    """Session Excel held in memory with cell-level patches, a crash-safe journal and write-behind I/O"""
+
+    def __init__(self, excel_path, journal_path=None, status_callback=None, retries=3, retry_delay=1.0):
+        self.excel_path = Path(excel_path)
+        self.journal = SessionJournal(journal_path) if journal_path else None
+        self.status_callback = status_callback
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._lock = threading.RLock()
+        # Single dedicated I/O thread: writes and file operations run in submission order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SessionWorkbookIO")
+        self._pending_flush = None
+        self._version = 0          # Incremented on every modification
+        self._flushed_version = 0  # Version that was last written to disk
+        self._journal_entries = []
+        self.last_error = None
+
+        self._workbook = load_workbook(self.excel_path)
+        self._sheet = self._workbook.worksheets[0]
+        self._columns = {}
+        for cell in self._sheet[HEADER_ROW]:
+            if cell.value is not None and str(cell.value) not in self._columns:
+                self._columns[str(cell.value)] = cell.column
+        logging.info(f"Loaded session workbook into memory: {self.excel_path}")
+
+        if self.journal:
+            self._replay_journal()
+
+    @property
+    def columns(self):
+        """Column names in sheet order"""
+        return list(self._columns)
+
+    @property
+    def is_dirty(self):
+        """True if the in-memory workbook has changes not yet written to disk"""
+        return self._version != self._flushed_version
+
+    @staticmethod
+    def _excel_row(row_index):
+        return HEADER_ROW + 1 + row_index
+
+    def _notify(self, status, message=""):
+        if self.status_callback:
+            try:
+                self.status_callback(status, message)
+            except Exception as e:
+                logging.error(f"Error in session workbook status callback: {e}")
+
+    def _last_data_row(self):
+        """Last sheet row with any value (trailing formatted-but-empty rows are ignored)"""
+        for row in range(self._sheet.max_row, HEADER_ROW, -1):
+            if any(cell.value is not None for cell in self._sheet[row]):
+                return row
+        return HEADER_ROW
+
+    def row_count(self):
+        """Number of data rows, as len(pd.read_excel(...)) would report"""
+        with self._lock:
+            return self._last_data_row() - HEADER_ROW
+
+    def find_column(self, candidates):
+        """Return the first of the candidate column names that exists in the sheet"""
+        for name in candidates:
+            if name in self._columns:
+                return name
+        return None
+
+    def get_value(self, row_index, column):
+        """Cell value as string ('' for empty cells or missing columns)"""
+        with self._lock:
+            col = self._columns.get(column)
+            if col is None:
+                return ''
+            value = self._sheet.cell(row=self._excel_row(row_index), column=col).value
+            if value is None:
+                return ''
+            value = str(value)
+            return '' if value == 'nan' else value
+
+    def get_row_values(self, row_index, columns):
+        """Dict of column -> string value for one row"""
+        with self._lock:
+            return {column: self.get_value(row_index, column) for column in columns}
+
+    def _record(self, entry):
+        """Journal an edit before it is applied in memory"""
+        if self.journal is None:
+            return
+        entry['v'] = self._version + 1
+        self.journal.append(entry)
+        self._journal_entries.append(entry)
+
+    def _apply_set(self, row_index, column, value):
+        col = self._columns.get(column)
+        if col is None:
+            col = self._sheet.max_column + 1
+            self._sheet.cell(row=HEADER_ROW, column=col, value=column)
+            self._columns[column] = col
+        self._sheet.cell(row=self._excel_row(row_index), column=col).value = value
+
+    def set_value(self, row_index, column, value):
+        """
+        Patch a single cell; a missing column is appended to the header.
+
+        Returns:
+            bool: True if the cell value changed
+        """
+        if value == '' or (isinstance(value, float) and pd.isna(value)):
+            value = None
+        with self._lock:
+            col = self._columns.get(column)
+            if col is not None and self._sheet.cell(row=self._excel_row(row_index), column=col).value == value:
+                return False
+            self._record({'op': 'set', 'row': row_index, 'column': column, 'value': value})
+            self._apply_set(row_index, column, value)
+            self._version += 1
+            return True
+
+    def set_row_values(self, row_index, values):
+        """Patch several cells of one row; returns True if any cell changed"""
+        with self._lock:
+            changed = False
+            for column, value in values.items():
+                changed = self.set_value(row_index, column, value) or changed
+            return changed
+
+    def delete_row(self, row_index):
+        """Delete a data row; following rows move up like DataFrame.drop().reset_index()"""
+        with self._lock:
+            if row_index < 0 or row_index >= self.row_count():
+                raise ValueError(f"Invalid row index {row_index}. Excel has {self.row_count()} rows.")
+            identity = self.get_row_values(row_index, [c for c in ROW_IDENTITY_COLUMNS if c in self._columns])
+            self._record({'op': 'delete_row', 'row': row_index, 'identity': identity})
+            self._sheet.delete_rows(self._excel_row(row_index))
+            self._version += 1
+
+    def _replay_journal(self):
+        """Re-apply edits that were journaled but possibly not written to the session file"""
+        entries = self.journal.read()
+        highest_version = max((e.get('v', 0) for e in entries), default=0)
+
+        # A commit without abort whose temp file is gone means the replace happened
+        committed_version = 0
+        for entry in entries:
+            if entry.get('op') == 'commit':
+                committed_version = entry['v']
+            elif entry.get('op') == 'abort' and entry['v'] == committed_version:
+                committed_version = 0
+        if committed_version and not self._tmp_path().exists():
+            entries = [e for e in entries if e['v'] > committed_version]
+        entries = [e for e in entries if e.get('op') in ('set', 'delete_row')]
+
+        if not entries:
+            self.journal.clear()
+            return
+        with self._lock:
+            replayed = 0
+            for entry in entries:
+                try:
+                    if entry.get('op') == 'set':
+                        self._apply_set(entry['row'], entry['column'], entry['value'])
+                        replayed += 1
+                    elif entry.get('op') == 'delete_row':
+                        # Deletions are not idempotent: only replay if the row is still the deleted one
+                        row_index = entry['row']
+                        identity = entry.get('identity') or {}
+                        if (identity and row_index < self.row_count() and
+                                self.get_row_values(row_index, list(identity)) == identity):
+                            self._sheet.delete_rows(self._excel_row(row_index))
+                            replayed += 1
+                except Exception as e:
+                    logging.error(f"Error replaying journal entry {entry}: {e}")
+            # All recovered edits count as one unsaved change; the journal stays until it is written.
+            # Versions continue above everything in the old journal, and the journal is compacted
+            # to the re-versioned edits (without the old commit/abort markers), so edits made after
+            # this replay are never mistaken for already committed ones if the app crashes again.
+            self._version = max(self._version, highest_version) + 1
+            for entry in entries:
+                entry['v'] = self._version
+            self._journal_entries = entries
+            try:
+                self.journal.rewrite(entries)
+            except Exception as e:
+                logging.error(f"Error compacting session journal: {e}")
+        logging.warning(f"Recovered {replayed} unsaved session edits from journal {self.journal.journal_path}")
+        self.flush_async()
+
+    def find_empty_row(self, columns):
+        """Index of the first data row whose given columns are all empty, or row_count() if none"""
+        with self._lock:
+            row_count = self.row_count()
+            for row_index in range(row_count):
+                if all(self.get_value(row_index, column).strip() == '' for column in columns):
+                    return row_index
+            return row_count
+
+    def to_dataframe(self):
+        """Build a DataFrame equivalent to pd.read_excel() of the workbook, without touching the file"""
+        with self._lock:
+            last_row = self._last_data_row()
+            max_col = self._sheet.max_column
+            header = []
+            for i, cell in enumerate(self._sheet[HEADER_ROW][:max_col]):
+                header.append(cell.value if cell.value is not None else f"Unnamed: {i}")
+            # Empty cells become NaN like in pd.read_excel (callers check for 'nan')
+            rows = [
+                [value if value is not None else float('nan') for value in row]
+                for row in self._sheet.iter_rows(
+                    min_row=HEADER_ROW + 1, max_row=last_row, max_col=max_col, values_only=True
+                )
+            ]
+        return pd.DataFrame(rows, columns=header)
+
+    def _serialize(self):
+        """Serialize the workbook to bytes (in memory, under the lock)"""
+        with self._lock:
+            buffer = io.BytesIO()
+            self._workbook.save(buffer)
+            return buffer.getvalue(), self._version
+
+    def _tmp_path(self):
+        return self.excel_path.with_name(f".{self.excel_path.name}.tmp")
+
+    def _write_once(self, data, version):
+        """Write bytes to the session file via a sibling temp file and atomic replace"""
+        tmp_path = self._tmp_path()
+        committed = False
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if self.journal:
+                self.journal.append({'op': 'commit', 'v': version})
+                committed = True
+            os.replace(tmp_path, self.excel_path)
+        except Exception:
+            # Abort marker before removing the temp file, so a replay never skips these edits
+            if committed:
+                self.journal.append({'op': 'abort', 'v': version})
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+
+    def _write_to_disk(self):
+        """Write the current state to the session file (runs on the I/O thread, retries on lock errors)"""
+        data, version = self._serialize()
+        if version == self._flushed_version:
+            return True
+
+        try:
+            for attempt in range(self.retries):
+                try:
+                    self._write_once(data, version)
+                    break
+                except PermissionError as e:
+                    if attempt == self.retries - 1:
+                        raise
+                    logging.warning(f"Write attempt {attempt + 1} for {self.excel_path} failed ({e}), retrying...")
+                    time.sleep(self.retry_delay)
+        except Exception as e:
+            self.last_error = e
+            logging.error(f"Error writing session workbook {self.excel_path}: {e}")
+            self._notify(STATUS_ERROR, str(e))
+            raise
+
+        with self._lock:
+            self._flushed_version = max(self._flushed_version, version)
+            # The journal only needs the edits made after the written version
+            if self.journal:
+                self._journal_entries = [e for e in self._journal_entries if e['v'] > version]
+                try:
+                    self.journal.rewrite(self._journal_entries)
+                except Exception as e:
+                    logging.error(f"Error truncating session journal: {e}")
+            dirty = self.is_dirty
+        self.last_error = None
+        logging.info(f"Session workbook written: {self.excel_path} (version {version})")
+        if not dirty:
+            self._notify(STATUS_SAVED)
+        return True
+
+    def flush_async(self):
+        """
+        Schedule a background write; edits made while a write is queued are coalesced into it.
+
+        Returns:
+            concurrent.futures.Future or None if nothing is dirty
+        """
+        with self._lock:
+            if not self.is_dirty:
+                return None
+            self._notify(STATUS_PENDING)
+            if self._pending_flush is not None and not self._pending_flush.running() and not self._pending_flush.done():
+                return self._pending_flush
+            self._pending_flush = self._executor.submit(self._write_to_disk)
+            return self._pending_flush
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Run a file operation on the I/O thread, after all previously queued writes.
+
+        Returns:
+            concurrent.futures.Future
+        """
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def write_now(self):
+        """Write pending changes on the calling thread (for jobs already running on the I/O thread)"""
+        if self.is_dirty:
+            self._write_to_disk()
+
+    def flush(self):
+        """Write all pending changes and wait for completion; raises on write errors"""
+        pending = self._pending_flush
+        if pending is not None:
+            try:
+                pending.result()
+            except Exception:
+                pass  # Retried below
+        if self.is_dirty:
+            self._executor.submit(self._write_to_disk).result()
+
+    def discard(self):
+        """Drop the workbook and its journal without writing pending edits"""
+        self.close(flush=False)
+        if self.journal:
+            self.journal.clear()
+
+    def close(self, flush=True):
+        """Flush (optional) and release the workbook"""
+        try:
+            if flush:
+                self.flush()
+            elif self._pending_flush is not None:
+                # Never let a queued write overwrite a file that is about to be replaced
+                self._pending_flush.cancel()
+                try:
+                    self._pending_flush.result()
+                except (CancelledError, Exception):
+                    pass
+        finally:
+            self._executor.shutdown(wait=True)
+            self._workbook.close()
@@ -0,0 +1,177 @@
+"""
+Column-wise normalization of tumorboard patient sheets.
+
+TumorboardDatabase (collection Excel import, session upsert) and TumorboardSessionPage
+(loading a session's Excel file) both turn a raw sheet into cleaned patient records.
+Both used to do this row by row; normalize_patient_sheet does it for the whole sheet
+with vectorized pandas operations: patient number cleanup, birth date parsing, age,
+ICD code and family, and Aufgebot normalization in one pass.
+
+See utils/benchmark_sheet_normalization.py for a throughput comparison with the former
+row-wise implementation.
+"""
+
+import logging
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Accepted birth date formats, in priority order. The last one is how datetime cells
+# read from Excel look when converted to text.
+DATE_FORMATS = ["%d.%m.%Y", "%d/%m/%Y", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S"]
+
+# Column names under which the ICD code has been stored over time, in priority order
+ICD_COLUMNS = ['ICD-Code', 'ICD-10', 'ICD Code', 'ICD10']
+
+# Plain text columns: normalized column -> sheet column
+TEXT_COLUMNS = {
+    'name': 'Name',
+    'patient_number': 'Patientennummer',
+    'diagnosis': 'Diagnose',
+    'radiotherapy': 'Radiotherapie indiziert',
+    'aufgebot': 'Art des Aufgebots',
+    'studie': 'Vormerken für Studie',
+    'bemerkung': 'Bemerkung/Procedere',
+    'teams': 'Teams Priorisierung',
+}
+
+# Aufgebot category -> substrings of the long descriptions that map to it
+AUFGEBOT_CATEGORIES = {
+    "Kat I": ("Kat I:", "1-3 Tagen"),
+    "Kat II": ("Kat II:", "5-7 Tagen"),
+    "Kat III": ("Kat III:", "Nach Eingang des Konsils"),
+}
+
+NORMALIZED_COLUMNS = [
+    'name', 'patient_number', 'birth_date_text', 'birth_date', 'age',
+    'diagnosis', 'icd_code', 'icd_family', 'radiotherapy', 'aufgebot', 'aufgebot_type',
+    'studie', 'bemerkung', 'teams'
+]
+
+
+def clean_text(series):
+    """
+    Strip values and drop the ".0" that numeric cells (e.g. patient numbers) get from Excel.
+
+    Empty strings and "nan" become missing values.
+    """
+    missing = series.isna()
+    text = series.astype(str).str.strip()
+    float_like = text.str.endswith('.0', na=False)
+    if float_like.any():
+        head = text[float_like].str[:-2]
+        text = text.where(~float_like, head.where(head.str.isdigit(), text[float_like]))
+    return text.where(~(missing | (text == '') | (text.str.lower() == 'nan')))
+
+
+def parse_dates(text):
+    """Parse date strings with the accepted formats (first matching format wins); unparseable -> NaT"""
+    parsed = pd.Series(pd.NaT, index=text.index, dtype='datetime64[ns]')
+    for fmt in DATE_FORMATS:
+        pending = parsed.isna() & text.notna()
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(text[pending], format=fmt, errors='coerce')
+    return parsed
+
+
+def calculate_ages(birth_dates, reference_date):
+    """Age in completed years at reference_date (nullable Int64, implausible ages are dropped)"""
+    ref = pd.Timestamp(reference_date)
+    had_birthday = (birth_dates.dt.month * 100 + birth_dates.dt.day) <= ref.month * 100 + ref.day
+    ages = ref.year - birth_dates.dt.year - (~had_birthday).astype(int)
+    ages = ages.where(birth_dates.notna() & ages.between(0, 150))
+    return ages.astype('Int64')
+
+
+def extract_icd_family(icd_codes):
+    """ICD family of each code, e.g. "D32.9" -> "D32", "C34.1" -> "C34" """
+    compact = icd_codes.str.upper().str.replace('.', '', regex=False).str.replace(' ', '', regex=False)
+    return compact.str.extract(r'^([A-Z]\d{1,2})', expand=False)
+
+
+def normalize_aufgebot_series(aufgebot):
+    """Map Aufgebot descriptions to the categories "Kat I", "Kat II" and "Kat III" """
+    text = clean_text(aufgebot)
+    text = text.where(text != '-')
+    present = text.notna()
+    matches = []
+    for patterns in AUFGEBOT_CATEGORIES.values():
+        match = pd.Series(False, index=text.index)
+        for pattern in patterns:
+            match |= text.str.contains(pattern, regex=False, na=False)
+        matches.append(match)
+    normalized = np.select(matches, list(AUFGEBOT_CATEGORIES), default=None)
+    normalized = pd.Series(normalized, index=text.index, dtype=object)
+
+    unknown = present & ~np.logical_or.reduce(matches) & ~text.isin(list(AUFGEBOT_CATEGORIES))
+    for value in text[unknown].unique():
+        # Log unknown values for debugging
+        logging.warning(f"Unknown aufgebot type value: {value}")
+    # Exact category names and unknown values are kept as they are
+    return normalized.where(normalized.notna(), text.astype(object)).where(present, None)
+
+
+def normalize_aufgebot_type(value):
+    """Normalize a single Aufgebot value (see normalize_aufgebot_series)"""
+    return normalize_aufgebot_series(pd.Series([value], dtype=object)).iloc[0]
+
+
+def normalize_patient_sheet(df, reference_date=None):
+    """
+    Clean a raw patient sheet in one vectorized pass.
+
+    Args:
+        df (DataFrame): Sheet as read from Excel (column names as in the tumorboard Excel files)
+        reference_date (date): Date for the age calculation (session date), defaults to today
+
+    Returns:
+        DataFrame: One row per patient with a name, keeping the index of df. Text columns
+            hold stripped strings or missing values, 'birth_date' is datetime64, 'age' is Int64.
+    """
+    if reference_date is None:
+        reference_date = datetime.today()
+
+    # With duplicate column names the last one wins (as with dict(zip(header, row)))
+    df = df.loc[:, ~df.columns.duplicated(keep='last')]
+
+    def column(name):
+        if name in df.columns:
+            return df[name].astype(object)
+        return pd.Series(None, index=df.index, dtype=object)
+
+    out = pd.DataFrame(index=df.index)
+    for field, sheet_column in TEXT_COLUMNS.items():
+        out[field] = clean_text(column(sheet_column))
+
+    # Rows without a name are empty or formatting leftovers
+    out = out[out['name'].notna()]
+    df = df.loc[out.index]
+
+    birth_date_raw = column('Geburtsdatum')
+    birth_date_text = clean_text(birth_date_raw)
+    out['birth_date'] = parse_dates(birth_date_text)
+    # Display text: datetime cells are shown like text dates
+    is_datetime = birth_date_raw.map(lambda value: isinstance(value, datetime)).astype(bool)
+    birth_date_text = birth_date_text.astype(object)
+    birth_date_text[is_datetime] = out.loc[is_datetime, 'birth_date'].dt.strftime('%d.%m.%Y')
+    out['birth_date_text'] = birth_date_text
+    out['age'] = calculate_ages(out['birth_date'], reference_date)
+
+    icd_code = pd.Series(np.nan, index=out.index, dtype=object)
+    for icd_column in ICD_COLUMNS:
+        if icd_column in df.columns:
+            icd_code = icd_code.fillna(clean_text(column(icd_column)))
+    out['icd_code'] = icd_code
+    out['icd_family'] = extract_icd_family(icd_code)
+
+    out['aufgebot_type'] = normalize_aufgebot_series(out['aufgebot'])
+
+    return out[NORMALIZED_COLUMNS]
+
+
+def to_python_values(series):
+    """Convert a normalized column to Python objects with None for missing values (e.g. for sqlite3)"""
+    values = series.astype(object)
+    return values.where(series.notna(), None)
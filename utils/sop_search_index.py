@@ -0,0 +1,319 @@
+"""
+Full-text search index over the SOP and guideline PDFs.
+
+The SOP search in the header used to match the query against file names only, from a
+list collected with os.walk over assets/sop at every startup. SopSearchIndex extracts the
+text of every SOP (assets/sop) and contouring guideline (assets/guidelines) once with
+PyMuPDF and stores it page by page in an SQLite FTS5 table (an inverted index persisted
+in ~/patdata/sop_search_index.db):
+
+- update() re-extracts only files whose size/content hash changed and drops removed
+  files; it runs on a background thread after startup, searches keep working meanwhile
+  (not the mtime: the one-file build extracts assets/ with fresh mtimes on every launch)
+- search() returns ranked page-level hits (bm25, file name weighted above page text)
+  with a text snippet; every query term is a prefix ("mamma" finds "Mammakarzinom"),
+  umlauts and accents are folded ("korper" finds "Körper")
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+SOP_INDEX_PATH = Path.home() / "patdata" / "sop_search_index.db"
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+
+# (kind, folder below assets/) of the indexed PDFs
+SOURCES = [
+    ("SOP", "sop"),
+    ("Guideline", "guidelines"),
+]
+
+# Bumped when the schema or the text extraction changes (forces a full rebuild)
+INDEX_VERSION = 2
+
+MAX_RESULTS = 10
+MAX_HITS_PER_FILE = 2
+SNIPPET_TOKENS = 12
+TITLE_WEIGHT = 10.0
+
+PRIVATE_USE_CHARS = re.compile("[\ue000-\uf8ff]")
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def fts5_available():
+    """True if the sqlite3 module was built with FTS5"""
+    try:
+        with sqlite3.connect(":memory:") as conn:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(a)")
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def collect_pdf_files(assets_dir=ASSETS_DIR):
+    """
+    Returns:
+        list: (kind, path relative to assets_dir with '/' separators, absolute path) of all indexed PDFs
+    """
+    assets_dir = Path(assets_dir)
+    files = []
+    for kind, folder in SOURCES:
+        source_dir = assets_dir / folder
+        if not source_dir.is_dir():
+            logging.warning(f"SOP search: folder not found: {source_dir}")
+            continue
+        for root, dirs, names in os.walk(source_dir):
+            for name in names:
+                if name.lower().endswith('.pdf'):
+                    full_path = Path(root) / name
+                    files.append((kind, full_path.relative_to(assets_dir).as_posix(), full_path))
+    return files
+
+
+def title_for(rel_path):
+    """Display title of a PDF: file name without .pdf, underscores as spaces"""
+    return Path(rel_path).stem.replace('_', ' ')
+
+
+def load_pymupdf():
+    """
+    Returns:
+        module | None: fitz, or None if PyMuPDF is not installed
+    """
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        return None
+    return fitz
+
+
+def extract_pages(pdf_path, fitz):
+    """
+    Args:
+        fitz: PyMuPDF module from load_pymupdf() (checked once per update, not per file)
+
+    Returns:
+        list: Text of every page (whitespace collapsed); empty if PyMuPDF is missing or the file is unreadable
+    """
+    if fitz is None:
+        return []
+    try:
+        with fitz.open(pdf_path) as doc:
+            # Symbol font bullets are extracted as private use characters
+            return [" ".join(PRIVATE_USE_CHARS.sub("•", page.get_text("text")).split()) for page in doc]
+    except Exception as e:
+        logging.error(f"SOP search: could not read {pdf_path}: {e}")
+        return []
+
+
+def file_hash(path):
+    """SHA-1 of the file content"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_match_query(query):
+    """
+    FTS5 MATCH expression for a user query: all terms must occur, each as a prefix.
+
+    Returns:
+        str | None: None if the query has no searchable terms
+    """
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+class SopSearchIndex:
+    """Persisted page-level full-text index of the SOP and guideline PDFs"""
+
+    def __init__(self, db_path=SOP_INDEX_PATH, assets_dir=ASSETS_DIR):
+        self.db_path = Path(db_path)
+        self.assets_dir = Path(assets_dir)
+        self._update_lock = threading.Lock()
+        self._update_thread = None
+        self.last_update = None   # (changed files, removed files, seconds) of the last update()
+        self.init_database()
+
+    def init_database(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            # WAL: searches on the GUI thread are not blocked by a running update
+            conn.execute("PRAGMA journal_mode=WAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != INDEX_VERSION:
+                conn.execute("DROP TABLE IF EXISTS files")
+                conn.execute("DROP TABLE IF EXISTS pages")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    page_count INTEGER NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5(
+                    title, body, path UNINDEXED, page UNINDEXED,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            """)
+            conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+
+    # --- Incremental rebuild ---
+
+    def update(self):
+        """
+        Index new and changed PDFs, remove deleted ones (by size and content hash).
+
+        Returns:
+            tuple: (number of (re)indexed files, number of removed files)
+        """
+        with self._update_lock:
+            start = time.perf_counter()
+            fitz = load_pymupdf()
+            if fitz is None:
+                logging.warning("SOP search: PyMuPDF is not installed, only file names are indexed")
+            with sqlite3.connect(self.db_path) as conn:
+                indexed = {path: (size, content_hash) for path, size, content_hash
+                           in conn.execute("SELECT path, size, content_hash FROM files")}
+
+            current = set()
+            changed = 0
+            for kind, rel_path, full_path in collect_pdf_files(self.assets_dir):
+                current.add(rel_path)
+                try:
+                    size = full_path.stat().st_size
+                    content_hash = file_hash(full_path)
+                except OSError:
+                    continue
+                if indexed.get(rel_path) == (size, content_hash):
+                    continue
+                # Extract outside the transaction, then replace the file's pages in one commit
+                page_texts = extract_pages(full_path, fitz)
+                title = title_for(rel_path)
+                with sqlite3.connect(self.db_path) as conn:
+                    conn.execute("DELETE FROM pages WHERE path = ?", (rel_path,))
+                    conn.executemany(
+                        "INSERT INTO pages (title, body, path, page) VALUES (?, ?, ?, ?)",
+                        [(title, text, rel_path, number) for number, text in enumerate(page_texts or [""], start=1)]
+                    )
+                    # Without extracted text (PyMuPDF missing, unreadable file) try again next update
+                    conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                                 (rel_path, kind, title, size, content_hash if page_texts else '', len(page_texts)))
+                changed += 1
+
+            removed = [path for path in indexed if path not in current]
+            if removed:
+                with sqlite3.connect(self.db_path) as conn:
+                    conn.executemany("DELETE FROM pages WHERE path = ?", [(path,) for path in removed])
+                    conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed])
+
+            seconds = time.perf_counter() - start
+            self.last_update = (changed, len(removed), seconds)
+            logging.info(f"SOP search index updated: {changed} indexed, {len(removed)} removed, "
+                         f"{len(current)} files ({seconds:.2f}s)")
+            return changed, len(removed)
+
+    def update_async(self):
+        """Run update() on a background thread (no-op while one is running)"""
+        if self._update_thread is not None and self._update_thread.is_alive():
+            return self._update_thread
+
+        def run():
+            try:
+                self.update()
+            except Exception as e:
+                logging.error(f"Error updating SOP search index: {e}")
+
+        self._update_thread = threading.Thread(target=run, name="SopSearchIndex", daemon=True)
+        self._update_thread.start()
+        return self._update_thread
+
+    # --- Search ---
+
+    def search(self, query, limit=MAX_RESULTS, per_file=MAX_HITS_PER_FILE):
+        """
+        Ranked page-level hits for a query.
+
+        Returns:
+            list: dicts with path (absolute), kind, title, page (1-based), snippet
+        """
+        match = build_match_query(query)
+        if match is None:
+            return []
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT path, page, title,
+                       snippet(pages, 1, '\x02', '\x03', '…', {SNIPPET_TOKENS})
+                FROM pages
+                WHERE pages MATCH ?
+                ORDER BY bm25(pages, {TITLE_WEIGHT}, 1.0)
+                LIMIT ?
+                """,
+                (match, limit * per_file * 10)
+            ).fetchall()
+            kinds = dict(conn.execute("SELECT path, kind FROM files"))
+
+        hits = []
+        seen = set()
+        per_file_count = {}
+        for rel_path, page, title, snippet in rows:
+            if per_file_count.get(rel_path, 0) >= per_file:
+                continue
+            if '\x02' not in snippet:
+                # Only the file name matched: one hit for the document, opened on the first page
+                page, snippet = 1, ""
+            if (rel_path, page) in seen:
+                continue
+            seen.add((rel_path, page))
+            per_file_count[rel_path] = per_file_count.get(rel_path, 0) + 1
+            hits.append({
+                'path': str(self.assets_dir / rel_path),
+                'kind': kinds.get(rel_path, "SOP"),
+                'title': title,
+                'page': int(page),
+                'snippet': snippet.replace('\x02', '').replace('\x03', ''),
+            })
+            if len(hits) >= limit:
+                break
+        return hits
+
+    def file_count(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+
+def get_sop_search_index():
+    """
+    Shared index for the app.
+
+    Returns:
+        SopSearchIndex | None: None if SQLite has no FTS5 or the index file cannot be opened
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            if not fts5_available():
+                logging.warning("SOP search: SQLite without FTS5, falling back to file name search")
+                return None
+            try:
+                _index = SopSearchIndex()
+            except (sqlite3.Error, OSError) as e:
+                logging.error(f"SOP search: could not open index {SOP_INDEX_PATH}: {e}")
+                return None
+        return _index
@@ -0,0 +1,109 @@
+"""
+Startup timing report.
+
+Records how long each startup phase takes (module imports, QApplication, update and
+license check, main window, first frame) and appends one JSON line per start to
+~/patdata/startup_timing.jsonl, so the cold-start time of the PyInstaller build can
+be tracked across versions and workstations.
+"""
+
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+STARTUP_LOG_FILE = Path.home() / "patdata" / "startup_timing.jsonl"
+
+# Older entries are dropped so the log stays small
+MAX_LOG_ENTRIES = 500
+
+
+def _process_start_offset():
+    """
+    Seconds between process creation and now (Windows only, otherwise None).
+
+    For the onefile PyInstaller build this includes the bootloader unpacking the
+    bundle, which happens before any Python code runs.
+    """
+    if sys.platform != 'win32':
+        return None
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        creation, exit_, kernel, user = (wintypes.FILETIME() for _ in range(4))
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.kernel32.GetProcessTimes(handle, ctypes.byref(creation), ctypes.byref(exit_),
+                                                      ctypes.byref(kernel), ctypes.byref(user)):
+            return None
+        # FILETIME counts 100 ns intervals since 1601-01-01
+        created = ((creation.dwHighDateTime << 32) | creation.dwLowDateTime) / 1e7 - 11644473600
+        return max(time.time() - created, 0.0)
+    except Exception:
+        return None
+
+
+class StartupTimer:
+    """Collects phase durations from the first line of main.py to the first shown frame"""
+
+    def __init__(self, start=None):
+        # Offset of the Python start relative to process creation (bootloader time)
+        self.pre_python = _process_start_offset()
+        self.start = start if start is not None else time.perf_counter()
+        self._last = self.start
+        self.phases = []
+
+    def mark(self, phase):
+        """Record the time since the previous mark under the given phase name"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    @property
+    def total(self):
+        return self._last - self.start
+
+    def report(self, app_version=None, extra=None):
+        """
+        Build the report lines and append the entry to the startup log.
+
+        Args:
+            app_version (str): Version shown in the window title
+            extra (dict): Additional timings to store, e.g. page import times
+
+        Returns:
+            list: Human readable report lines
+        """
+        frozen = bool(getattr(sys, 'frozen', False))
+        lines = [f"Startup timing ({'PyInstaller build' if frozen else 'source'}, version {app_version}):"]
+        if self.pre_python is not None:
+            lines.append(f"  {'process start -> python':<28}{self.pre_python * 1000:8.0f} ms")
+        for phase, duration in self.phases:
+            lines.append(f"  {phase:<28}{duration * 1000:8.0f} ms")
+        lines.append(f"  {'total':<28}{self.total * 1000:8.0f} ms")
+
+        entry = {
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "version": app_version,
+            "frozen": frozen,
+            "pre_python_ms": round(self.pre_python * 1000) if self.pre_python is not None else None,
+            "phases_ms": {phase: round(duration * 1000) for phase, duration in self.phases},
+            "total_ms": round(self.total * 1000),
+        }
+        if extra:
+            entry.update(extra)
+        self._append_entry(entry)
+        return lines
+
+    def _append_entry(self, entry):
+        try:
+            STARTUP_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+            lines = []
+            if STARTUP_LOG_FILE.exists():
+                lines = STARTUP_LOG_FILE.read_text(encoding='utf-8').splitlines()
+            lines.append(json.dumps(entry, ensure_ascii=False))
+            STARTUP_LOG_FILE.write_text("\n".join(lines[-MAX_LOG_ENTRIES:]) + "\n", encoding='utf-8')
+        except Exception as e:
+            logging.warning(f"Could not write startup timing log: {e}")
@@ -0,0 +1,212 @@
+"""
+Persistent catalog of tumorboard session folders.
+
+The catalog mirrors the folder tree {tumorboards}/{Entität}/{dd.mm.yyyy}/ in the
+tumorboard_catalog table of master_tumorboard.db, including finalization status
+(*timestamp* file) and case count of the session Excel. All backoffice pages read
+from the catalog instead of walking the (network) tree themselves.
+
+Refreshing is incremental: entity and date folders whose modification time is
+unchanged are not listed again, and session Excel files are only re-read when
+their own modification time changed.
+"""
+
+import logging
+import re
+import sqlite3
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+from .database_utils import TumorboardDatabase
+
+DATE_FOLDER_PATTERN = re.compile(r"^\d{2}\.\d{2}\.\d{4}$")
+
+
+def is_valid_date_format(folder_name):
+    """Check if folder name matches dd.mm.yyyy format"""
+    return bool(DATE_FOLDER_PATTERN.match(folder_name))
+
+
+def get_excel_case_count(excel_path):
+    """Count data rows (below the header) that contain at least one non-empty cell"""
+    try:
+        wb = load_workbook(excel_path, read_only=True, data_only=True)
+        try:
+            ws = wb.worksheets[0]
+            case_count = 0
+            for row in ws.iter_rows(min_row=2, values_only=True):
+                if any(cell is not None and str(cell).strip() for cell in row):
+                    case_count += 1
+            return case_count
+        finally:
+            wb.close()
+    except Exception as e:
+        logging.warning(f"Could not read Excel file {excel_path}: {e}")
+        return 0
+
+
+class TumorboardCatalog:
+    """Incrementally refreshed index of tumorboard sessions (finalized status, case counts, mtimes)"""
+
+    def __init__(self, tumorboard_base_path):
+        self.tumorboard_base_path = Path(tumorboard_base_path)
+        # TumorboardDatabase creates/migrates the catalog tables
+        self.db_path = TumorboardDatabase(
+            db_path=self.tumorboard_base_path / "__SQLite_database" / "master_tumorboard.db"
+        ).db_path
+
+    def refresh(self, should_stop=None, progress_callback=None):
+        """
+        Bring the catalog up to date with the folder tree.
+
+        Args:
+            should_stop (callable): Optional, returns True to abort the refresh
+            progress_callback (callable): Optional, receives progress messages
+
+        Returns:
+            bool: True if the refresh completed
+        """
+        if not self.tumorboard_base_path.exists():
+            logging.error(f"Tumorboards path does not exist: {self.tumorboard_base_path}")
+            return False
+
+        entity_folders = [f for f in self.tumorboard_base_path.iterdir()
+                          if f.is_dir() and not f.name.startswith('_')]
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('SELECT entity, dir_mtime FROM tumorboard_catalog_entities')
+            known_entity_mtimes = dict(cursor.fetchall())
+
+            # Entities removed from disk
+            current_entities = {f.name for f in entity_folders}
+            for entity in set(known_entity_mtimes) - current_entities:
+                cursor.execute('DELETE FROM tumorboard_catalog WHERE entity = ?', (entity,))
+                cursor.execute('DELETE FROM tumorboard_catalog_entities WHERE entity = ?', (entity,))
+
+            total_entities = len(entity_folders)
+            for i, entity_folder in enumerate(entity_folders):
+                if should_stop and should_stop():
+                    conn.commit()
+                    return False
+                if progress_callback:
+                    progress_callback(f"Prüfe {entity_folder.name} ({i+1}/{total_entities})...")
+
+                try:
+                    self._refresh_entity(cursor, entity_folder, known_entity_mtimes.get(entity_folder.name))
+                except Exception as e:
+                    logging.error(f"Error refreshing catalog for {entity_folder}: {e}")
+
+            conn.commit()
+
+        logging.info(f"Tumorboard catalog refreshed for {total_entities} entities")
+        return True
+
+    def _refresh_entity(self, cursor, entity_folder, known_mtime):
+        """Refresh all date folders of one entity"""
+        entity_name = entity_folder.name
+        entity_mtime = entity_folder.stat().st_mtime
+
+        cursor.execute(
+            'SELECT session_date, dir_mtime, excel_mtime FROM tumorboard_catalog WHERE entity = ?',
+            (entity_name,)
+        )
+        known_sessions = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+        if known_mtime == entity_mtime:
+            # No date folder added or removed - only check the known ones
+            date_folders = [entity_folder / name for name in known_sessions]
+        else:
+            date_folders = [f for f in entity_folder.iterdir() if f.is_dir() and is_valid_date_format(f.name)]
+            removed = set(known_sessions) - {f.name for f in date_folders}
+            for session_date in removed:
+                cursor.execute('DELETE FROM tumorboard_catalog WHERE entity = ? AND session_date = ?',
+                               (entity_name, session_date))
+
+        for date_folder in date_folders:
+            try:
+                self._refresh_session(cursor, entity_name, date_folder, known_sessions.get(date_folder.name))
+            except FileNotFoundError:
+                cursor.execute('DELETE FROM tumorboard_catalog WHERE entity = ? AND session_date = ?',
+                               (entity_name, date_folder.name))
+            except Exception as e:
+                logging.error(f"Error refreshing catalog entry {date_folder}: {e}")
+
+        cursor.execute(
+            'INSERT OR REPLACE INTO tumorboard_catalog_entities (entity, dir_mtime) VALUES (?, ?)',
+            (entity_name, entity_mtime)
+        )
+
+    def _refresh_session(self, cursor, entity_name, date_folder, known_mtimes, force=False):
+        """Re-index a single date folder if its folder or Excel modification time changed"""
+        dir_mtime = date_folder.stat().st_mtime
+        excel_file = date_folder / f"{date_folder.name}.xlsx"
+        excel_mtime = excel_file.stat().st_mtime if excel_file.is_file() else None
+
+        if not force and known_mtimes == (dir_mtime, excel_mtime):
+            return
+
+        timestamp_files = list(date_folder.glob("*timestamp*"))
+        is_finalized = bool(timestamp_files) and excel_mtime is not None
+        # Case counts are only needed for finalized sessions
+        case_count = get_excel_case_count(excel_file) if is_finalized else None
+
+        cursor.execute('''
+            INSERT OR REPLACE INTO tumorboard_catalog (
+                entity, session_date, folder_path, is_finalized, timestamp_file,
+                excel_path, case_count, dir_mtime, excel_mtime, indexed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (
+            entity_name, date_folder.name, str(date_folder), int(is_finalized),
+            str(timestamp_files[0]) if timestamp_files else None,
+            str(excel_file) if excel_mtime is not None else None,
+            case_count, dir_mtime, excel_mtime
+        ))
+
+    def update_session(self, entity_name, date_str):
+        """Eagerly re-index one session folder (e.g. right after finalization)"""
+        date_folder = self.tumorboard_base_path / entity_name / date_str
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                if date_folder.is_dir():
+                    self._refresh_session(cursor, entity_name, date_folder, None, force=True)
+                else:
+                    cursor.execute('DELETE FROM tumorboard_catalog WHERE entity = ? AND session_date = ?',
+                                   (entity_name, date_str))
+                conn.commit()
+            logging.info(f"Tumorboard catalog updated for {entity_name} {date_str}")
+            return True
+        except Exception as e:
+            logging.error(f"Error updating tumorboard catalog for {entity_name} {date_str}: {e}")
+            return False
+
+    def get_finalized_tumorboards(self):
+        """
+        Get all finalized tumorboards from the catalog, newest first
+
+        Returns:
+            list: Dicts with entity, date, path, excel_path, timestamp_file and case_count
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT entity, session_date, folder_path, excel_path, timestamp_file, case_count
+                FROM tumorboard_catalog
+                WHERE is_finalized = 1
+            ''')
+            rows = cursor.fetchall()
+
+        tumorboards = [{
+            'entity': entity,
+            'date': session_date,
+            'path': folder_path,
+            'excel_path': Path(excel_path),
+            'timestamp_file': Path(timestamp_file) if timestamp_file else None,
+            'case_count': case_count or 0
+        } for entity, session_date, folder_path, excel_path, timestamp_file, case_count in rows]
+
+        tumorboards.sort(key=lambda tb: tb['date'][6:] + tb['date'][3:5] + tb['date'][:2], reverse=True)
+        return tumorboards